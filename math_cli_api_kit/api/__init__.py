@@ -3,14 +3,32 @@ Math API.
 
 It sets up the Sanic app with the specified configurations, including
 API metadata and settings, and registers the OpenAPI3 Blueprint and the
-math operations Blueprint.
+math operations Blueprint. When enabled in the configuration, a result
+cache, a persistent memo store and an executor for expensive
+operations and a micro-batcher for cheap ones are attached to the
+application context, the enabled lookup tables are built at startup,
+and request metrics are recorded by middleware.
+Requests and responses are serialized with the configured JSON backend.
+The workers are profiled when the profiling environment variable is set.
 """
 
 from sanic import Sanic
 from sanic_openapi import openapi3_blueprint
 
+from .cache import register_result_cache
+from .executor import register_executor
+from .memo import register_memo_store
+from .metrics import register_metrics
+from .microbatch import register_microbatcher
+from .profiling import register_profiling
+from .tables import register_lookup_tables
 from .main.blueprint import math_blueprint
 from ..config import APIConfig
+from ..core.async_operations import AsyncOperations
+from ..core.memo import memo_directory
+from ..core.profiling import profile_output_prefix
+from ..core.serialization import Serializer
+from ..core.tables import lookup_tables
 
 
 def create_app(app_name: str) -> Sanic:
@@ -29,6 +47,39 @@ def create_app(app_name: str) -> Sanic:
     app.config.API_LICENSE_NAME = api_config.API_LICENSE_NAME
     app.config.API_LICENSE_URL = api_config.API_LICENSE_URL
 
+    app.ctx.serializer = Serializer(api_config.JSON_BACKEND)
+
+    app.ctx.result_cache = None
+    if api_config.RESULT_CACHE_ENABLED:
+        register_result_cache(app, api_config)
+
+    app.ctx.memo = None
+    memo = memo_directory()
+    if memo:
+        register_memo_store(app, memo)
+
+    if lookup_tables.tables():
+        register_lookup_tables(app)
+
+    app.ctx.executor = None
+    app.ctx.operations = AsyncOperations()
+    if api_config.EXECUTOR != "inline":
+        register_executor(app, api_config)
+
+    app.ctx.metrics = None
+    if api_config.METRICS_ENABLED:
+        register_metrics(app, api_config)
+
+    # registered after the metrics, whose store it records to
+    app.ctx.microbatcher = None
+    if api_config.MICROBATCH_ENABLED:
+        register_microbatcher(app, api_config)
+
+    app.ctx.profile = None
+    profile_prefix = profile_output_prefix()
+    if profile_prefix is not None:
+        register_profiling(app, profile_prefix)
+
     app.blueprint(openapi3_blueprint)
     app.blueprint(math_blueprint)
 
@@ -0,0 +1,68 @@
+"""This module sets up the optional result cache of the Math API.
+
+With the "memory" backend every worker keeps its own in-process LRU
+cache. With the "socket" backend the main process starts a cache server
+on a local Unix socket before the workers are spawned, and every worker
+connects to it, so all workers share one cache. The workers talk to the
+cache server on a dedicated thread, off the event loop, and count their
+hits and misses with the other metrics when they are enabled.
+"""
+
+import multiprocessing
+import os
+import time
+
+from sanic import Sanic
+
+from ..config import APIConfig
+from ..core.cache import AsyncResultCache, ResultCache, \
+    SocketResultCache, serve_result_cache
+
+_SERVER_START_TIMEOUT = 5.0
+
+
+def register_result_cache(app: Sanic, api_config: APIConfig) -> None:
+    """Attach the configured result cache to `app.ctx.result_cache`."""
+    if api_config.RESULT_CACHE_BACKEND == "memory":
+        app.ctx.result_cache = AsyncResultCache(ResultCache(
+            api_config.RESULT_CACHE_MAX_ENTRIES,
+            api_config.RESULT_CACHE_MAX_BYTES,
+            api_config.RESULT_CACHE_TTL,
+        ))
+    elif api_config.RESULT_CACHE_BACKEND == "socket":
+        path = api_config.RESULT_CACHE_SOCKET_PATH
+
+        @app.main_process_start
+        async def start_cache_server(app: Sanic, _) -> None:
+            if os.path.exists(path):
+                os.unlink(path)
+            app.ctx.result_cache_server = multiprocessing.Process(
+                target=serve_result_cache,
+                args=(path, api_config.RESULT_CACHE_MAX_ENTRIES,
+                      api_config.RESULT_CACHE_MAX_BYTES,
+                      api_config.RESULT_CACHE_TTL),
+                daemon=True,
+            )
+            app.ctx.result_cache_server.start()
+
+            deadline = time.monotonic() + _SERVER_START_TIMEOUT
+            while not os.path.exists(path) and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        @app.main_process_stop
+        async def stop_cache_server(app: Sanic, _) -> None:
+            app.ctx.result_cache_server.terminate()
+            app.ctx.result_cache_server.join()
+
+        @app.before_server_start
+        async def connect_result_cache(app: Sanic, _) -> None:
+            app.ctx.result_cache = AsyncResultCache(SocketResultCache(
+                path, api_config.RESULT_CACHE_SOCKET_TIMEOUT
+            ))
+
+        @app.after_server_stop
+        async def close_result_cache(app: Sanic, _) -> None:
+            app.ctx.result_cache.close()
+    else:
+        raise ValueError(f"unknown result cache backend"
+                         f" '{api_config.RESULT_CACHE_BACKEND}'")
@@ -0,0 +1,45 @@
+"""This module sets up the executor of the Math API.
+
+Every Sanic worker creates its own executor when it starts and shuts it
+down when it stops. Requests whose estimated cost exceeds
+`APIConfig.EXECUTOR_COST_THRESHOLD` are run on it through the
+`AsyncOperations` of `app.ctx.operations`, so that expensive operations
+do not block the event loop for cheap requests. The default "isolated"
+executor runs each of them in its own process, which is terminated when
+the operation times out or its client disconnects.
+
+The worker processes of a "process" executor load the factorial
+checkpoints of the memo store, when it is enabled, like the Sanic
+workers.
+"""
+
+from sanic import Sanic
+
+from ..config import APIConfig
+from ..core.async_operations import AsyncOperations
+from ..core.executors import EXECUTOR_KINDS, create_executor
+from ..core.memo import memo_directory, warm_factorial_engine
+
+
+def register_executor(app: Sanic, api_config: APIConfig) -> None:
+    """Attach the configured executor to `app.ctx.executor`."""
+    if api_config.EXECUTOR not in EXECUTOR_KINDS:
+        raise ValueError(f"unknown executor kind '{api_config.EXECUTOR}'")
+
+    @app.before_server_start
+    async def start_executor(app: Sanic, _) -> None:
+        directory = memo_directory()
+        app.ctx.executor = create_executor(
+            api_config.EXECUTOR, api_config.EXECUTOR_WORKERS,
+            warm_factorial_engine if directory else None, (directory,)
+        )
+        app.ctx.operations = AsyncOperations(
+            app.ctx.executor, api_config.EXECUTOR_COST_THRESHOLD,
+            api_config.COMPUTE_TIMEOUT, api_config.COMPUTE_MAX_PENDING
+        )
+
+    @app.after_server_stop
+    async def stop_executor(app: Sanic, _) -> None:
+        app.ctx.executor.shutdown(wait=True, cancel_futures=True)
+        app.ctx.executor = None
+        app.ctx.operations = AsyncOperations()
@@ -1,7 +1,10 @@
 """This module defines the API blueprint for the math
 operations' calculator. It contains routes for algebraic and geometric
 operations, which are implemented in the AlgebraAPI and GeometryAPI
-classes.
+classes, a batch route implemented in the BatchAPI class, an
+expression route implemented in the ExpressionAPI class, a shapes
+route implemented in the ShapesAPI class and a WebSocket stream route
+implemented by the stream_operations handler.
 
 The routes include endpoints for performing algebraic and geometric
 calculations and are prefixed with '/{APIConfig.API_BASEPATH}/math/api'.
@@ -9,7 +12,8 @@ calculations and are prefixed with '/{APIConfig.API_BASEPATH}/math/api'.
 
 from sanic import Blueprint
 
-from .math_api import AlgebraAPI, GeometryAPI
+from .math_api import AlgebraAPI, GeometryAPI, BatchAPI, ExpressionAPI, \
+    ShapesAPI, stream_operations
 from ....config import APIConfig
 
 math_blueprint = Blueprint(
@@ -30,3 +34,31 @@ math_blueprint.add_route(
     strict_slashes=True,
     name="geometry_operation",
 )
+
+math_blueprint.add_route(
+    handler=BatchAPI.as_view(),
+    uri="/batch",
+    strict_slashes=True,
+    name="batch_operation",
+)
+
+math_blueprint.add_route(
+    handler=ExpressionAPI.as_view(),
+    uri="/expression",
+    strict_slashes=True,
+    name="expression_operation",
+)
+
+math_blueprint.add_route(
+    handler=ShapesAPI.as_view(),
+    uri="/shapes/<operation>",
+    strict_slashes=True,
+    name="shape_operation",
+)
+
+math_blueprint.add_websocket_route(
+    handler=stream_operations,
+    uri="/stream",
+    strict_slashes=True,
+    name="stream_operation",
+)
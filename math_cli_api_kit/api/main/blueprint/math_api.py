@@ -10,32 +10,335 @@ by making POST requests to the respective endpoints.
 
 The API endpoints support JSON input data for performing the
 operations, and they return JSON responses with the results and status
-messages. The module also includes OpenAPI documentation for each
-endpoint, specifying the input format, response format, and error handling.
+messages, or compact float64 or MessagePack responses when requested
+through the `Accept` header. The module also includes OpenAPI
+documentation for each endpoint, specifying the input format, response
+format, and error handling.
+
+Algebraic and geometric operations can also be computed with the
+arbitrary-precision "decimal" and exact-rational "fraction" numeric
+backends, selected with the `numeric` and `precision` query arguments.
+Their results are returned as strings.
+
+The BatchAPI class evaluates many algebraic and geometric operations in
+a single request. Large groups of the same operation are dispatched to
+the vectorized engine when NumPy is available and it computes the same
+results as the scalar kernels.
+
+The ExpressionAPI class evaluates expressions composed of the algebraic
+and geometric operations, for scalar variables or for whole lists of
+them, with compiled plans that are cached by expression text.
+
+The ShapesAPI class computes the areas and perimeters of many polygons,
+the distances between point sets and convex hulls. Coordinates are
+sent as flat arrays in JSON, or as raw little-endian float64 bodies
+(`application/x-float64`) that are used without copying.
+
+The `stream_operations` WebSocket handler computes a continuous stream
+of operations over a single connection. Every text frame holds one
+operation, `{"id", "operation", "operands"}`, and is answered with a
+frame `{"id", "result", "message", "status"}`, or an error `message`
+and `status`, as soon as it is computed, so answers may arrive out of
+order. At most `APIConfig.STREAM_MAX_IN_FLIGHT` frames of a connection
+are computed at a time.
 """
 
-from sanic import Request, HTTPResponse, json
-from sanic.exceptions import SanicException
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, \
+    Tuple, Union
+
+from sanic import Request, HTTPResponse
+from sanic.exceptions import SanicException, WebsocketClosed
+from sanic.server.websockets.impl import WebsocketImplProtocol as Websocket
 from sanic.views import HTTPMethodView
 from sanic_openapi.openapi3 import openapi
+from websockets.exceptions import ConnectionClosed
+
+from math_cli_api_kit.api.metrics import count_metric, record_stage
+from math_cli_api_kit.config import APIConfig, CoreConfig
+from math_cli_api_kit.core.async_operations import ComputeRejectedError, \
+    ComputeTimeoutError, ComputeUnavailableError
+from math_cli_api_kit.core.batch import batch_result, evaluate_batch
+from math_cli_api_kit.core.cache import make_cache_key
+from math_cli_api_kit.core.costs import estimate_batch_cost, \
+    estimate_cost, estimate_decimal_cost, estimate_precise_cost, \
+    estimate_shape_cost
+from math_cli_api_kit.core.executors import run_kernel
+from math_cli_api_kit.core.expressions import EXPRESSION_ERRORS, \
+    ExpressionError, compile_expression, evaluate_expression, \
+    evaluate_expression_many
+from math_cli_api_kit.core.factorial import decimal_text
+from math_cli_api_kit.core.metrics import COMPUTE, PARSE, SERIALIZE
+from math_cli_api_kit.core.precision import NUMERIC_BACKENDS, run_precise
+from math_cli_api_kit.core.registry import ALGEBRA_OPERATIONS, \
+    GEOMETRY_OPERATIONS, OPERATIONS, Operation
+from math_cli_api_kit.core.serialization import CONTENT_TYPES, FLOAT64, \
+    JSON, negotiate_format
+from math_cli_api_kit.core.shape_operations import SHAPE_OPERATIONS, \
+    ShapeOperation
+from math_cli_api_kit.core.vector_operations import has_numpy, np
+
+_COMPUTE_ERRORS = (ValueError, ZeroDivisionError, OverflowError)
+# the numeric backends also validate the operand types while computing
+_PRECISE_ERRORS = _COMPUTE_ERRORS + (TypeError,)
+
+
+def _operands_schema(name: str, operations: Dict[str, Operation]) -> type:
+    """Build the OpenAPI operands schema of a family of operations from
+    the operation registry.
+    """
+    annotations: Dict[str, type] = {}
+    for operation in operations.values():
+        for operand, operand_type in zip(operation.operands,
+                                         operation.operand_types):
+            if annotations.get(operand) is not float:
+                annotations[operand] = operand_type
+    return type(name, (), {"__annotations__": annotations})
+
+
+def _operation_names(operations: Dict[str, Operation]) -> str:
+    return ", ".join(f"'{name}'" for name in operations)
+
+
+def _parse_json(request: Request, exact: bool = False) -> Any:
+    """Return the parsed JSON body of the request, timing the parse.
+    With `exact`, fractional numbers are parsed as `Decimal`.
+    """
+    start = time.perf_counter()
+    serializer = request.app.ctx.serializer
+    try:
+        body = serializer.loads_exact(request.body) if exact \
+            else serializer.loads(request.body)
+    except ValueError:
+        raise SanicException(message="Failed when parsing body as json",
+                             status_code=400)
+    record_stage(request, PARSE, start)
+    return body
+
+
+def _response_format(request: Request) -> str:
+    return negotiate_format(request.headers.get("accept"),
+                            APIConfig.BINARY_FORMATS_ENABLED)
+
+
+def _numeric_options(request: Request) -> Tuple[str, int]:
+    """Return the numeric backend and precision selected by the query
+    arguments of the request and raise a 400 error if they are not
+    valid.
+    """
+    numeric = request.args.get("numeric", APIConfig.NUMERIC_BACKEND)
+    if numeric not in NUMERIC_BACKENDS:
+        raise SanicException(
+            message=f"The numeric backend must be one of"
+                    f" {', '.join(NUMERIC_BACKENDS)}",
+            status_code=400
+        )
+    try:
+        precision = int(request.args.get(
+            "precision", CoreConfig.DEFAULT_PRECISION
+        ))
+    except ValueError:
+        precision = 0
+    if not 1 <= precision <= CoreConfig.MAX_PRECISION:
+        raise SanicException(
+            message=f"The precision must be an integer between 1 and"
+                    f" {CoreConfig.MAX_PRECISION}",
+            status_code=400
+        )
+    return numeric, precision
+
+
+def _validate_operands(
+        operation: Operation, operands: Any, typed: bool = True
+) -> Tuple[Any, ...]:
+    """Extract the operands of an operation from the request body and
+    raise a 400 error if they are not valid. Without `typed`, only the
+    presence of the operands is checked.
+    """
+    if not isinstance(operands, Mapping):
+        raise SanicException(
+            message="The request body must be a JSON object",
+            status_code=400
+        )
+    try:
+        if typed:
+            return operation.validator(operands)
+        return tuple(operands[name] for name in operation.operands)
+    except KeyError as e:
+        raise SanicException(message=f"missing operand {e}",
+                             status_code=400)
+    except TypeError as e:
+        raise SanicException(message=str(e), status_code=400)
+
+
+def _cache_key(
+        request: Request, name: str, response_format: str,
+        operands: Tuple[Any, ...]
+) -> Optional[bytes]:
+    """Return the result cache key of a computation in a response
+    format, None when no result cache is configured or the operands
+    cannot be cached.
+    """
+    if request.app.ctx.result_cache is None:
+        return None
+    return make_cache_key(
+        name if response_format == JSON else f"{name}:{response_format}",
+        operands
+    )
+
+
+async def _cached_body(
+        request: Request, cache_key: bytes
+) -> Optional[bytes]:
+    """Look up a serialized body in the result cache, counting the hit
+    or miss.
+    """
+    body = await request.app.ctx.result_cache.get(cache_key)
+    count_metric(request, "result_cache_misses_total" if body is None
+                 else "result_cache_hits_total")
+    return body
 
-from math_cli_api_kit.config import APIConfig
-from math_cli_api_kit.core.math_operations import Algebra, Geometry
 
-_algebra = Algebra()
-_geometry = Geometry()
+async def _offload(
+        request: Request, cost: float, function: Callable, *args: Any
+) -> Any:
+    """Call a function, on the executor of the app when the estimated
+    cost is above the threshold, and in the event loop otherwise.
+    Expensive calls answer 400 when no executor is configured, 504 when
+    they time out and 503 when too many are already in progress.
+    """
+    try:
+        return await request.app.ctx.operations.compute(cost, function,
+                                                        *args)
+    except ComputeRejectedError as e:
+        raise SanicException(message=str(e), status_code=400)
+    except ComputeTimeoutError as e:
+        raise SanicException(message=str(e), status_code=504)
+    except ComputeUnavailableError as e:
+        raise SanicException(message=str(e), status_code=503)
 
 
-class AlgebraOperands:
-    x: float
-    y: float
+async def _decimal_result(request: Request, result: Any) -> Any:
+    """Convert the integers of a result, or of a list of results, that
+    are too large for a single string conversion to `DecimalText`, on
+    the executor when the conversion is expensive.
+    """
+    cost = estimate_decimal_cost(result)
+    if not cost:
+        return result
+    return await _offload(request, cost, decimal_text, result)
 
 
-class GeometryOperands:
-    a: float
-    b: float
-    h: float
-    r: float
+async def _compute_result(
+        request: Request, operation: Operation, operands: Tuple[Any, ...],
+        numeric: str, precision: Optional[int]
+) -> Any:
+    """Compute an operation with a numeric backend. Cheap float
+    computations go through the micro-batcher and expensive ones through
+    the memo store, when they are configured.
+    """
+    if numeric != "float":
+        cost = estimate_precise_cost(operation.name, numeric, precision,
+                                     operands)
+        return await _offload(request, cost, run_precise, operation.name,
+                              numeric, precision, *operands)
+
+    batcher = request.app.ctx.microbatcher
+    if batcher is not None and batcher.accepts(operation, operands):
+        return await batcher.submit(operation, operands)
+
+    cost = estimate_cost(operation.name, operands)
+    memo = request.app.ctx.memo
+    if memo is None or cost < memo.min_cost:
+        return await _offload(request, cost, run_kernel, operation.name,
+                              *operands)
+    result = await memo.get(operation.name, operands)
+    if result is None:
+        result = await _offload(request, cost, run_kernel, operation.name,
+                                *operands)
+        memo.set(operation.name, operands, result)
+    return result
+
+
+async def _respond(
+        request: Request, key: str, operation: Operation,
+        operands: Tuple[Any, ...], numeric: str = "float",
+        precision: Optional[int] = None
+) -> HTTPResponse:
+    """Compute an operation with a numeric backend and send its result
+    under `key`, in the response format negotiated from the `Accept`
+    header.
+
+    Serialized float responses are looked up in and stored to the
+    result cache, when one is configured. The results of the other
+    numeric backends are formatted as text with the computation, and
+    integers too large for a single string conversion, such as big
+    factorials, are converted to decimal text like it, off the event
+    loop when it is expensive.
+    """
+    response_format = _response_format(request)
+    cache_key = _cache_key(request, operation.name, response_format,
+                           operands) if numeric == "float" else None
+    if cache_key is not None:
+        body = await _cached_body(request, cache_key)
+        if body is not None:
+            return HTTPResponse(body, status=200,
+                                content_type=CONTENT_TYPES[response_format])
+
+    start = time.perf_counter()
+    try:
+        result = await _compute_result(request, operation, operands,
+                                       numeric, precision)
+    except (_COMPUTE_ERRORS if numeric == "float" else _PRECISE_ERRORS) \
+            as e:
+        raise SanicException(message=str(e), status_code=400)
+    if numeric == "float":
+        result = await _decimal_result(request, result)
+    record_stage(request, COMPUTE, start)
+    return _send_result(request, key, result, response_format, cache_key)
+
+
+def _send_result(
+        request: Request, key: str, result: Any, response_format: str,
+        cache_key: Optional[bytes] = None
+) -> HTTPResponse:
+    """Send a result under `key` in the given response format, storing
+    the serialized body to the result cache under `cache_key`.
+    """
+    start = time.perf_counter()
+    try:
+        body = request.app.ctx.serializer.result_body(response_format,
+                                                      key, result)
+    except ValueError as e:
+        raise SanicException(message=str(e), status_code=400)
+    record_stage(request, SERIALIZE, start)
+    if cache_key is not None:
+        request.app.ctx.result_cache.set(cache_key, body)
+    return HTTPResponse(body, status=200,
+                        content_type=CONTENT_TYPES[response_format])
+
+
+async def _compute(
+        request: Request, key: str, operation: Operation
+) -> HTTPResponse:
+    """Validate the operands of a request and respond with the result
+    of the operation, computed with the requested numeric backend.
+    """
+    numeric, precision = _numeric_options(request)
+    if numeric == "float":
+        operands = _validate_operands(operation, _parse_json(request))
+        return await _respond(request, key, operation, operands)
+    operands = _validate_operands(
+        operation, _parse_json(request, exact=True), typed=False
+    )
+    return await _respond(request, key, operation, operands, numeric,
+                          precision)
+
+
+AlgebraOperands = _operands_schema("AlgebraOperands", ALGEBRA_OPERATIONS)
+GeometryOperands = _operands_schema("GeometryOperands", GEOMETRY_OPERATIONS)
+BatchOperands = _operands_schema("BatchOperands", OPERATIONS)
 
 
 class AlgebraAPI(HTTPMethodView):
@@ -46,14 +349,21 @@ class AlgebraAPI(HTTPMethodView):
                          " and powers.")
     @openapi.summary("Performs algebraic operations based on the provided"
                      " 'operation' parameter. The 'operation' parameter must"
-                     " be one of the supported operations: 'sum', 'sub', "
-                     "'mul', 'div', 'pow'.")
+                     " be one of the supported operations: "
+                     f"{_operation_names(ALGEBRA_OPERATIONS)}.")
     @openapi.body(
         {"application/json": AlgebraOperands},
         description="Input data for algebraic operations. The format depends"
                     " on the 'operation' specified.",
         required=True
     )
+    @openapi.parameter("numeric", str, "query",
+                       description="Numeric backend: 'float' (default),"
+                                   " 'decimal' or 'fraction'. Results of"
+                                   " 'decimal' and 'fraction' are strings.")
+    @openapi.parameter("precision", int, "query",
+                       description="Significant digits of the 'decimal'"
+                                   " and 'fraction' results.")
     @openapi.response(
         200, {"result": float, "message": str},
         description="Success - The operation was successful."
@@ -67,60 +377,30 @@ class AlgebraAPI(HTTPMethodView):
         description="Internal server error - Something went wrong during"
                     " the operation."
     )
-    async def post(self, request: Request, operation: str) -> HTTPResponse:
-        if operation in ("sum", "sub", "mul", "div", "pow"):
-            x, y = request.json["x"], request.json["y"]
-
-            if operation == "sum":
-                return json(
-                    {"results": _algebra.sum(x, y), "message": "Success"},
-                    status=200
-                )
-            elif operation == "sub":
-                return json(
-                    {"results": _algebra.sub(x, y), "message": "Success"},
-                    status=200
-                )
-            elif operation == "mul":
-                return json(
-                    {"results": _algebra.mul(x, y), "message": "Success"},
-                    status=200
-                )
-            elif operation == "div":
-                return json(
-                    {"results": _algebra.div(x, y), "message": "Success"},
-                    status=200
-                )
-            else:
-                return json(
-                    {"results": _algebra.pow(x, y), "message": "Success"},
-                    status=200
-                )
-        elif operation in ("square_root", "factorial", "exp"):
-            x = request.json["x"]
+    @openapi.response(
+        503, {"message": str},
+        description="Service unavailable - Too many expensive operations"
+                    " are in progress."
+    )
+    @openapi.response(
+        504, {"message": str},
+        description="Gateway timeout - The operation did not finish"
+                    " within the compute timeout."
+    )
+    async def post(
+            self, request: Request, operation: str
+    ) -> HTTPResponse:
+        entry = ALGEBRA_OPERATIONS.get(operation)
 
-            if operation == "square_root":
-                return json(
-                    {"results": _algebra.square_root(x), "message": "Success"},
-                    status=200
-                )
-            elif operation == "factorial":
-                return json(
-                    {"results": _algebra.factorial(x), "message": "Success"},
-                    status=200
-                )
-            else:
-                return json(
-                    {"results": _algebra.exp(x), "message": "Success"},
-                    status=200
-                )
-        else:
+        if entry is None:
             raise SanicException(
                 message=f"Requested URL {APIConfig.API_BASEPATH}/math/api"
                         f"/algebra/{operation} not found",
                 status_code=404
             )
 
+        return await _compute(request, "results", entry)
+
 
 class GeometryAPI(HTTPMethodView):
     """This class defines an API for geometric operations."""
@@ -130,16 +410,21 @@ class GeometryAPI(HTTPMethodView):
                          " and hypotenuse.")
     @openapi.summary("Performs geometric operations based on the provided"
                      " 'operation' parameter. The 'operation' parameter must"
-                     " be one of the supported operations:"
-                     " 'surface_of_square', 'surface_of_circle',"
-                     " 'surface_of_triangle', 'surface_of_trapezoid',"
-                     " 'hypotenuse'.")
+                     " be one of the supported operations: "
+                     f"{_operation_names(GEOMETRY_OPERATIONS)}.")
     @openapi.body(
         {"application/json": GeometryOperands},
         description="Input data for geometric operations. The format depends"
                     " on the 'operation' specified.",
         required=True
     )
+    @openapi.parameter("numeric", str, "query",
+                       description="Numeric backend: 'float' (default),"
+                                   " 'decimal' or 'fraction'. Results of"
+                                   " 'decimal' and 'fraction' are strings.")
+    @openapi.parameter("precision", int, "query",
+                       description="Significant digits of the 'decimal'"
+                                   " and 'fraction' results.")
     @openapi.response(
         200, {"result": float, "message": str},
         description="Success - The operation was successful."
@@ -153,55 +438,513 @@ class GeometryAPI(HTTPMethodView):
         description="Internal server error - Something went wrong during"
                     " the operation."
     )
-    async def post(self, request: Request, operation: str) -> HTTPResponse:
-        if operation in ("surface_of_square", "surface_of_trapezoid",
-                         "hypotenuse"):
-            a = request.json["a"]
-
-            if operation == "surface_of_square":
-                return json(
-                    {
-                        "result": _geometry.surface_of_square(a),
-                        "message": "Success"
-                    }, status=200
+    @openapi.response(
+        503, {"message": str},
+        description="Service unavailable - Too many expensive operations"
+                    " are in progress."
+    )
+    @openapi.response(
+        504, {"message": str},
+        description="Gateway timeout - The operation did not finish"
+                    " within the compute timeout."
+    )
+    async def post(
+            self, request: Request, operation: str
+    ) -> HTTPResponse:
+        entry = GEOMETRY_OPERATIONS.get(operation)
+
+        if entry is None:
+            raise SanicException(
+                message=f"Requested URL {APIConfig.API_BASEPATH}/math/api"
+                        f"/geometry/{operation} not found",
+                status_code=404
+            )
+
+        return await _compute(request, "result", entry)
+
+
+class BatchItem:
+    operation: str
+    operands: BatchOperands
+
+
+class BatchResult:
+    result: float
+    message: str
+    status: int
+
+
+class BatchAPI(HTTPMethodView):
+    """This class defines an API for evaluating many algebraic and
+    geometric operations in a single request.
+    """
+
+    @openapi.description("API for performing many algebraic and geometric"
+                         " operations in a single request. Results are"
+                         " returned in the same order as the requested"
+                         " items, with errors reported per item.")
+    @openapi.summary("Performs a batch of operations. Each item must"
+                     " contain an 'operation' name and an 'operands'"
+                     " object with the operands of that operation.")
+    @openapi.body(
+        {"application/json": [BatchItem]},
+        description="List of operations to perform.",
+        required=True
+    )
+    @openapi.response(
+        200, {"results": [BatchResult], "message": str},
+        description="Success - The batch was evaluated, see the 'status'"
+                    " of each result."
+    )
+    @openapi.response(
+        400, {"message": str},
+        description="Bad request - Invalid input data."
+    )
+    @openapi.response(
+        500, {"message": str},
+        description="Internal server error - Something went wrong during"
+                    " the operation."
+    )
+    @openapi.response(
+        503, {"message": str},
+        description="Service unavailable - Too many expensive operations"
+                    " are in progress."
+    )
+    @openapi.response(
+        504, {"message": str},
+        description="Gateway timeout - The operation did not finish"
+                    " within the compute timeout."
+    )
+    async def post(self, request: Request) -> HTTPResponse:
+        items = _parse_json(request)
+
+        if not isinstance(items, list):
+            raise SanicException(
+                message="The request body must be a list of operations",
+                status_code=400
+            )
+        if len(items) > APIConfig.BATCH_MAX_ITEMS:
+            raise SanicException(
+                message=f"A batch may contain at most"
+                        f" {APIConfig.BATCH_MAX_ITEMS} operations",
+                status_code=400
+            )
+
+        start = time.perf_counter()
+        results = await _offload(
+            request, estimate_batch_cost(items), evaluate_batch, items,
+            APIConfig.BATCH_VECTORIZE_THRESHOLD
+        )
+        record_stage(request, COMPUTE, start)
+
+        response_format = _response_format(request)
+        start = time.perf_counter()
+        body, headers = request.app.ctx.serializer.batch_body(
+            response_format, results
+        )
+        record_stage(request, SERIALIZE, start)
+        return HTTPResponse(body, status=200, headers=headers,
+                            content_type=CONTENT_TYPES[response_format])
+
+
+class ExpressionBody:
+    expression: str
+    variables: dict
+
+
+class ExpressionAPI(HTTPMethodView):
+    """This class defines an API for evaluating expressions composed of
+    algebraic and geometric operations.
+    """
+
+    @openapi.description("API for evaluating an expression composed of"
+                         " algebraic and geometric operations, such as"
+                         " 'surface_of_circle(r) * h + sum(x, y)'. The"
+                         " operators +, -, *, / and ** and the constants"
+                         " pi and e are also supported.")
+    @openapi.summary("Evaluates an expression for the given variables."
+                     " When the variables are lists of the same length,"
+                     " the expression is evaluated for every row and a"
+                     " list of results is returned.")
+    @openapi.body(
+        {"application/json": ExpressionBody},
+        description="The expression and the values of its variables.",
+        required=True
+    )
+    @openapi.response(
+        200, {"result": float, "message": str},
+        description="Success - The expression was evaluated."
+    )
+    @openapi.response(
+        400, {"message": str},
+        description="Bad request - Invalid expression or input data."
+    )
+    @openapi.response(
+        500, {"message": str},
+        description="Internal server error - Something went wrong during"
+                    " the operation."
+    )
+    @openapi.response(
+        503, {"message": str},
+        description="Service unavailable - Too many expensive operations"
+                    " are in progress."
+    )
+    @openapi.response(
+        504, {"message": str},
+        description="Gateway timeout - The operation did not finish"
+                    " within the compute timeout."
+    )
+    async def post(self, request: Request) -> HTTPResponse:
+        body = _parse_json(request)
+
+        if not isinstance(body, Mapping) or \
+                not isinstance(body.get("expression"), str):
+            raise SanicException(
+                message="The request body must be a JSON object with an"
+                        " 'expression' string",
+                status_code=400
+            )
+        variables = body.get("variables", {})
+        if not isinstance(variables, Mapping):
+            raise SanicException(message="'variables' must be an object",
+                                 status_code=400)
+        text = body["expression"]
+        try:
+            expression = compile_expression(text)
+        except ExpressionError as e:
+            raise SanicException(message=str(e), status_code=400)
+
+        values = [variables.get(name) for name in expression.variables]
+        many = any(isinstance(value, list) for value in values)
+        if many and not all(isinstance(value, list) for value in values):
+            raise SanicException(
+                message="The variables must be all numbers or all lists",
+                status_code=400
+            )
+        if many and len(values[0]) > APIConfig.BATCH_MAX_ITEMS:
+            raise SanicException(
+                message=f"The variables may contain at most"
+                        f" {APIConfig.BATCH_MAX_ITEMS} values",
+                status_code=400
+            )
+
+        response_format = _response_format(request)
+        cache_key = None if many else _cache_key(
+            request, f"expression:{text}", response_format, values
+        )
+        if cache_key is not None:
+            cached = await _cached_body(request, cache_key)
+            if cached is not None:
+                return HTTPResponse(
+                    cached, status=200,
+                    content_type=CONTENT_TYPES[response_format]
+                )
+
+        start = time.perf_counter()
+        try:
+            if many:
+                result = await _offload(
+                    request, expression.estimate_many_cost(variables),
+                    evaluate_expression_many, text, variables
                 )
             else:
-                b = request.json.get("b")
-
-                if operation == "surface_of_trapezoid":
-                    h = request.json.get("h")
-                    return json(
-                        {
-                            "result": _geometry.surface_of_trapezoid(a, b, h),
-                            "message": "Success"
-                        }, status=200
-                    )
-                else:
-                    return json(
-                        {
-                            "result": _geometry.hypotenuse(a, b),
-                            "message": "Success"
-                        }, status=200
-                    )
-        elif operation == "surface_of_circle":
-            r = request.json.get("r")
-            return json(
-                {
-                    "result": _geometry.surface_of_circle(r),
-                    "message": "Success"
-                }, status=200
+                result = await _offload(
+                    request, expression.estimate_cost(variables),
+                    evaluate_expression, text, variables
+                )
+        except EXPRESSION_ERRORS as e:
+            raise SanicException(message=str(e), status_code=400)
+        # lists of results hold large integers as decimal strings
+        result = await _decimal_result(request, result)
+        record_stage(request, COMPUTE, start)
+
+        return _send_result(
+            request, "results" if many else "result", result,
+            response_format, cache_key
+        )
+
+
+def _shape_arrays(
+        request: Request, operation: ShapeOperation
+) -> List[Optional["np.ndarray"]]:
+    """Return the operand arrays of a shape operation, None for the
+    optional operands that are not given, and raise a 400 error if they
+    are not valid.
+
+    float64 bodies hold the arrays one after the other, and the `sizes`
+    query argument the comma-separated lengths of all but the last.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.partition(";")[0].strip().lower() != \
+            CONTENT_TYPES[FLOAT64]:
+        body = _parse_json(request)
+        if not isinstance(body, Mapping):
+            raise SanicException(
+                message="The request body must be a JSON object",
+                status_code=400
             )
-        elif operation == "surface_of_triangle":
-            b, h = request.json.get("b"), request.json.get("h")
-            return json(
-                {
-                    "result": _geometry.surface_of_triangle(b, h),
-                    "message": "Success"
-                }, status=200
+        values = [body.get(name) for name in operation.operands]
+        for name, value in zip(operation.operands, values):
+            if value is not None and not isinstance(value, list):
+                raise SanicException(
+                    message=f"'{name}' must be a list of numbers",
+                    status_code=400
+                )
+        try:
+            arrays = [None if value is None else np.asarray(value)
+                      for value in values]
+        except ValueError:
+            raise SanicException(message="The operands must be flat lists"
+                                         " of numbers", status_code=400)
+    else:
+        if len(request.body) % 8:
+            raise SanicException(message="A float64 body must hold a whole"
+                                         " number of values",
+                                 status_code=400)
+        try:
+            sizes = [int(size) for size in
+                     request.args.get("sizes", "").split(",") if size]
+        except ValueError:
+            sizes = [-1]
+        values = np.frombuffer(request.body, dtype="<f8")
+        if len(sizes) >= len(operation.operands) or \
+                min(sizes, default=0) < 0 or sum(sizes) > values.size:
+            raise SanicException(
+                message=f"'sizes' must hold the lengths of up to"
+                        f" {len(operation.operands) - 1} arrays of the"
+                        f" body", status_code=400
             )
-        else:
+        arrays = np.split(values, np.cumsum(sizes))
+        arrays += [None] * (len(operation.operands) - len(arrays))
+
+    for name, array in zip(operation.operands[:operation.required], arrays):
+        if array is None:
+            raise SanicException(message=f"missing operand '{name}'",
+                                 status_code=400)
+    return arrays
+
+
+def _check_shape_limits(
+        operation: ShapeOperation, sizes: List[int]
+) -> None:
+    """Raise a 400 error if the distances of a request exceed the
+    configured limits.
+    """
+    if operation.name not in ("pairwise_distances", "nearest_distances"):
+        return
+    pairs = (sizes[0] // 2) * (sizes[1] // 2 if len(sizes) > 1
+                               else sizes[0] // 2)
+    if operation.name == "pairwise_distances" and \
+            pairs > APIConfig.SHAPES_MAX_DISTANCES:
+        raise SanicException(
+            message=f"A distance matrix may hold at most"
+                    f" {APIConfig.SHAPES_MAX_DISTANCES} distances",
+            status_code=400
+        )
+    if pairs > APIConfig.SHAPES_MAX_PAIRS:
+        raise SanicException(
+            message=f"At most {APIConfig.SHAPES_MAX_PAIRS} distances may"
+                    f" be computed per request", status_code=400
+        )
+
+
+def run_shape_operation(name: str, *arrays: Any) -> Any:
+    """Compute a shape operation, with the nearest targets as a mapping
+    of named arrays.
+    """
+    operation = SHAPE_OPERATIONS[name]
+    while arrays and arrays[-1] is None:
+        arrays = arrays[:-1]
+    result = operation.function(*arrays)
+    if name == "nearest_distances":
+        distances, indices = result
+        return {"distances": distances, "indices": indices}
+    return result
+
+
+class ShapeOperands:
+    coordinates: [float]
+    offsets: [int]
+    points: [float]
+    targets: [float]
+
+
+class ShapesAPI(HTTPMethodView):
+    """This class defines an API for geometric operations on polygons
+    and point clouds.
+    """
+
+    @openapi.description("API for computing the areas and perimeters of"
+                         " many polygons, the distances between point sets"
+                         " and convex hulls. Points are flat coordinate"
+                         " arrays, x0, y0, x1, y1, ..., and polygon 'i' has"
+                         " the vertices offsets[i] to offsets[i + 1] - 1.")
+    @openapi.summary("Performs shape operations based on the provided"
+                     " 'operation' parameter. The 'operation' parameter must"
+                     " be one of the supported operations: "
+                     f"{_operation_names(SHAPE_OPERATIONS)}.")
+    @openapi.body(
+        {"application/json": ShapeOperands,
+         "application/x-float64": bytes},
+        description="Coordinate arrays of the operation: 'coordinates' and"
+                    " 'offsets' for polygons, 'points' and 'targets' for"
+                    " distances and 'points' for convex hulls. float64"
+                    " bodies hold the arrays one after the other.",
+        required=True
+    )
+    @openapi.parameter("sizes", str, "query",
+                       description="Comma-separated lengths of all but the"
+                                   " last array of a float64 body.")
+    @openapi.response(
+        200, {"result": [float], "message": str},
+        description="Success - The operation was successful. Nearest"
+                    " distances are returned as 'distances' and"
+                    " 'indices'."
+    )
+    @openapi.response(
+        400, {"message": str},
+        description="Bad request - Invalid input data."
+    )
+    @openapi.response(
+        500, {"message": str},
+        description="Internal server error - Something went wrong during"
+                    " the operation."
+    )
+    @openapi.response(
+        501, {"message": str},
+        description="Not implemented - NumPy is not installed."
+    )
+    @openapi.response(
+        503, {"message": str},
+        description="Service unavailable - Too many expensive operations"
+                    " are in progress."
+    )
+    @openapi.response(
+        504, {"message": str},
+        description="Gateway timeout - The operation did not finish"
+                    " within the compute timeout."
+    )
+    async def post(self, request: Request, operation: str) -> HTTPResponse:
+        entry = SHAPE_OPERATIONS.get(operation)
+
+        if entry is None:
             raise SanicException(
                 message=f"Requested URL {APIConfig.API_BASEPATH}/math/api"
-                        f"/geometry/{operation} not found",
+                        f"/shapes/{operation} not found",
+                status_code=404
+            )
+        if not has_numpy():
+            raise SanicException(message="Shape operations require NumPy",
+                                 status_code=501)
+
+        arrays = _shape_arrays(request, entry)
+        sizes = [array.size for array in arrays if array is not None]
+        _check_shape_limits(entry, sizes)
+
+        start = time.perf_counter()
+        try:
+            result = await _offload(
+                request, estimate_shape_cost(entry.name, sizes),
+                run_shape_operation, entry.name, *arrays
+            )
+        except (TypeError, ValueError) as e:
+            raise SanicException(message=str(e), status_code=400)
+        record_stage(request, COMPUTE, start)
+
+        response_format = _response_format(request)
+        start = time.perf_counter()
+        body = request.app.ctx.serializer.array_body(response_format,
+                                                     "result", result)
+        record_stage(request, SERIALIZE, start)
+        return HTTPResponse(body, status=200,
+                            content_type=CONTENT_TYPES[response_format])
+
+
+async def _answer_frame(request: Request, frame: Union[str, bytes]) -> str:
+    """Compute the operation of a stream frame and return the answer
+    frame, with the result or the error of the operation.
+    """
+    frame_id = None
+    try:
+        try:
+            message = request.app.ctx.serializer.loads(
+                frame.encode() if isinstance(frame, str) else frame
+            )
+        except ValueError:
+            raise SanicException(message="Failed when parsing frame as json",
+                                 status_code=400)
+        if not isinstance(message, Mapping) or \
+                not isinstance(message.get("operands"), Mapping):
+            raise SanicException(
+                message="Each frame must contain an 'operation' and an"
+                        " 'operands' object",
+                status_code=400
+            )
+        frame_id = message.get("id")
+        name = message.get("operation")
+        operation = OPERATIONS.get(name) if isinstance(name, str) else None
+        if operation is None:
+            raise SanicException(
+                message=f"Operation {name} not found",
                 status_code=404
             )
+        operands = _validate_operands(operation, message["operands"])
+        try:
+            answer = batch_result(await _decimal_result(
+                request, await _compute_result(request, operation, operands,
+                                               "float", None)
+            ))
+        except _COMPUTE_ERRORS as e:
+            raise SanicException(message=str(e), status_code=400)
+    except SanicException as e:
+        answer = {"message": str(e), "status": e.status_code}
+    if answer["status"] >= 400:
+        count_metric(request, "stream_errors_total")
+    return request.app.ctx.serializer.dumps(
+        {"id": frame_id, **answer}
+    ).decode()
+
+
+async def _send_answer(
+        request: Request, ws: Websocket, frame: Union[str, bytes]
+) -> None:
+    answer = await _answer_frame(request, frame)
+    try:
+        await ws.send(answer)
+    except (ConnectionClosed, WebsocketClosed):
+        # the stream handler cancels the remaining frames
+        pass
+
+
+async def stream_operations(request: Request, ws: Websocket) -> None:
+    """Answer the frames of a WebSocket stream of operations, each as
+    soon as it is computed, with at most `APIConfig.STREAM_MAX_IN_FLIGHT`
+    frames computed at a time. Further frames are not read until one of
+    them is answered, so the client is pushed back on by TCP flow
+    control.
+    """
+    count_metric(request, "stream_connections_total")
+    in_flight = asyncio.Semaphore(APIConfig.STREAM_MAX_IN_FLIGHT)
+    tasks: Set[asyncio.Task] = set()
+
+    def done(task: asyncio.Task) -> None:
+        tasks.discard(task)
+        in_flight.release()
+
+    try:
+        while True:
+            if in_flight.locked():
+                count_metric(request, "stream_backpressure_total")
+            await in_flight.acquire()
+            frame = await ws.recv()
+            if frame is None:
+                break
+            count_metric(request, "stream_frames_total")
+            task = asyncio.create_task(_send_answer(request, ws, frame))
+            tasks.add(task)
+            task.add_done_callback(done)
+    except ConnectionClosed:
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
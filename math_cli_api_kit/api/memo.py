@@ -0,0 +1,32 @@
+"""This module sets up the optional persistent memo store of the Math
+API.
+
+Every Sanic worker opens the store when it starts, and loads the most
+recently used factorials into the checkpoints of the factorial engine,
+so a restarted server resumes with the expensive results computed
+before; the worker processes of a "process" executor load them too,
+see `register_executor`. The store is shared with the other workers and
+with the CLI, and is accessed on a dedicated thread of every worker so
+that its I/O never blocks the event loop.
+"""
+
+from sanic import Sanic
+
+from ..core.factorial import factorial_engine
+from ..core.memo import AsyncMemoStore, MemoStore
+
+
+def register_memo_store(app: Sanic, directory: str) -> None:
+    """Attach the memo store in `directory` to `app.ctx.memo` in every
+    worker.
+    """
+
+    @app.before_server_start
+    async def open_memo_store(app: Sanic, _) -> None:
+        app.ctx.memo = AsyncMemoStore(MemoStore(directory))
+        await app.ctx.memo.warm_factorials(factorial_engine)
+
+    @app.after_server_stop
+    async def close_memo_store(app: Sanic, _) -> None:
+        app.ctx.memo.close()
+        app.ctx.memo = None
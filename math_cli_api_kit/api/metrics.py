@@ -0,0 +1,187 @@
+"""This module sets up the metrics of the Math API.
+
+Request and error counts and latency histograms are recorded by
+request and response middleware, labeled by route family and operation
+name. The handlers add the time spent parsing the JSON body, computing
+the result and serializing the response, the WebSocket streams count
+their frames, the result cache its hits and misses and the
+micro-batcher its batches. Everything is
+exposed on `APIConfig.METRICS_PATH` in the Prometheus text format.
+
+When the server runs through `app.run`, the main process creates a
+directory in which every worker keeps its counters in a memory-mapped
+file, so a scrape served by any worker reports the totals of all of
+them.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from typing import List, Optional
+
+from sanic import HTTPResponse, Request, Sanic, text
+from sanic_openapi.openapi3 import openapi
+
+from ..config import APIConfig
+from ..core.cache import RESULT_CACHE_COUNTERS
+from ..core.metrics import Labels, MetricsStore, render_metrics
+from ..core.microbatch import MICROBATCH_COUNTERS
+from ..core.registry import ALGEBRA, GEOMETRY, OPERATIONS
+from ..core.shape_operations import SHAPE_OPERATIONS
+
+BATCH = "batch"
+EXPRESSION = "expression"
+SHAPES = "shapes"
+UNKNOWN_OPERATION = "unknown"
+
+# route families by the name of their route in the math blueprint
+_ROUTE_FAMILIES = {
+    "algebra_operation": ALGEBRA,
+    "geometry_operation": GEOMETRY,
+    "batch_operation": BATCH,
+    "expression_operation": EXPRESSION,
+    "shape_operation": SHAPES,
+}
+
+# counters of the WebSocket streams
+STREAM_COUNTERS = (
+    ("stream_connections_total", "Total number of opened streams."),
+    ("stream_frames_total", "Total number of frames read from streams."),
+    ("stream_errors_total",
+     "Total number of stream frames answered with an error."),
+    ("stream_backpressure_total",
+     "Total number of times a stream stopped reading frames because its"
+     " in-flight limit was reached."),
+)
+
+_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metric_label_sets() -> List[Labels]:
+    """Return the label sets of all tracked requests: one per registered
+    operation and shape operation, one for unknown operations of every
+    family, one for batches and one for expressions.
+    """
+    label_sets = [
+        (("family", operation.family), ("operation", name))
+        for name, operation in OPERATIONS.items()
+    ]
+    label_sets += [
+        (("family", SHAPES), ("operation", name))
+        for name in SHAPE_OPERATIONS
+    ]
+    label_sets += [
+        (("family", family), ("operation", UNKNOWN_OPERATION))
+        for family in (ALGEBRA, GEOMETRY, SHAPES)
+    ]
+    label_sets.append((("family", BATCH), ("operation", BATCH)))
+    label_sets.append((("family", EXPRESSION), ("operation", EXPRESSION)))
+    return label_sets
+
+
+def request_labels(route_name: str, operation: str) -> Optional[Labels]:
+    """Return the label set of a request to a route of the math
+    blueprint, or None if the route is not tracked.
+
+    Operation names that are not operations of the route family are
+    labeled `UNKNOWN_OPERATION`, so that requested names never add
+    label sets.
+    """
+    family = _ROUTE_FAMILIES.get(route_name.rsplit(".", 1)[-1])
+    if family is None:
+        return None
+    if family in (BATCH, EXPRESSION):
+        operation = family
+    elif family == SHAPES:
+        if operation not in SHAPE_OPERATIONS:
+            operation = UNKNOWN_OPERATION
+    elif OPERATIONS.get(operation, None) is None or \
+            OPERATIONS[operation].family != family:
+        operation = UNKNOWN_OPERATION
+    return ("family", family), ("operation", operation)
+
+
+def record_stage(request: Request, stage: int, start: float) -> None:
+    """Record the time since `start` as a stage of the request, if
+    metrics are enabled.
+    """
+    stages = getattr(request.ctx, "metrics_stages", None)
+    if stages is not None:
+        stages.append((stage, time.perf_counter() - start))
+
+
+def count_metric(request: Request, name: str, amount: int = 1) -> None:
+    """Increment a named counter, if metrics are enabled."""
+    metrics = request.app.ctx.metrics
+    if metrics is not None:
+        metrics.increment(name, amount)
+
+
+def register_metrics(app: Sanic, api_config: APIConfig) -> None:
+    """Record request metrics in `app.ctx.metrics` and add the metrics
+    route.
+    """
+    app.ctx.metrics_directory = None
+
+    @app.main_process_start
+    async def create_metrics_directory(app: Sanic, _) -> None:
+        app.ctx.metrics_directory = tempfile.mkdtemp(
+            prefix="math-cli-api-kit-metrics-"
+        )
+
+    @app.main_process_stop
+    async def remove_metrics_directory(app: Sanic, _) -> None:
+        shutil.rmtree(app.ctx.metrics_directory, ignore_errors=True)
+        app.ctx.metrics_directory = None
+
+    @app.before_server_start
+    async def open_metrics_store(app: Sanic, _) -> None:
+        directory = app.ctx.metrics_directory
+        path = os.path.join(directory, f"{os.getpid()}.metrics") \
+            if directory is not None else None
+        counters = STREAM_COUNTERS
+        if api_config.RESULT_CACHE_ENABLED:
+            counters += RESULT_CACHE_COUNTERS
+        if api_config.MICROBATCH_ENABLED:
+            counters += MICROBATCH_COUNTERS
+        app.ctx.metrics = MetricsStore(metric_label_sets(),
+                                       api_config.METRICS_BUCKETS, path,
+                                       counters)
+
+    @app.after_server_stop
+    async def close_metrics_store(app: Sanic, _) -> None:
+        app.ctx.metrics.close()
+
+    @app.on_request
+    async def start_request_metrics(request: Request) -> None:
+        if request.route is not None:
+            request.ctx.metrics_start = time.perf_counter()
+            request.ctx.metrics_stages = []
+
+    @app.on_response
+    async def record_request_metrics(
+            request: Request, response: HTTPResponse
+    ) -> None:
+        start = getattr(request.ctx, "metrics_start", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        labels = request_labels(request.route.name,
+                                request.match_info.get("operation", ""))
+        offset = app.ctx.metrics.offset(labels) \
+            if labels is not None else None
+        if offset is not None:
+            app.ctx.metrics.record(offset, elapsed, response.status >= 400,
+                                   request.ctx.metrics_stages)
+
+    @openapi.exclude()
+    async def metrics(request: Request) -> HTTPResponse:
+        return text(
+            render_metrics(app.ctx.metrics, api_config.METRICS_PREFIX,
+                           app.ctx.metrics_directory),
+            content_type=_CONTENT_TYPE
+        )
+
+    app.add_route(metrics, api_config.METRICS_PATH, methods=["GET"],
+                  name="metrics")
@@ -0,0 +1,31 @@
+"""This module sets up the optional micro-batcher of the Math API.
+
+Every Sanic worker creates its own `MicroBatcher` when it starts. The
+algebra and geometry handlers submit their cheap float computations to
+it, so that concurrent requests for the same operation are evaluated
+together and identical requests in flight are computed once. Its
+counters are exported with the other metrics when they are enabled.
+"""
+
+from sanic import Sanic
+
+from ..config import APIConfig
+from ..core.microbatch import MicroBatcher
+
+
+def register_microbatcher(app: Sanic, api_config: APIConfig) -> None:
+    """Attach a micro-batcher to `app.ctx.microbatcher` in every
+    worker.
+    """
+
+    @app.before_server_start
+    async def start_microbatcher(app: Sanic, _) -> None:
+        app.ctx.microbatcher = MicroBatcher(
+            api_config.MICROBATCH_WINDOW, api_config.MICROBATCH_MAX_ITEMS,
+            api_config.BATCH_VECTORIZE_THRESHOLD, app.ctx.metrics
+        )
+
+    @app.after_server_stop
+    async def stop_microbatcher(app: Sanic, _) -> None:
+        app.ctx.microbatcher.flush()
+        app.ctx.microbatcher = None
@@ -0,0 +1,37 @@
+"""This module sets up the optional profiling of the Math API workers.
+
+When the profiling environment variable is set, every worker profiles
+the core operations from its start. Sending SIGUSR1 to a running worker
+writes its profile so far, and every worker writes its profile when it
+stops, to files named after the prefix and the worker's process id.
+"""
+
+import asyncio
+import os
+import signal
+
+from sanic import Sanic
+from sanic.log import logger
+
+from ..core.profiling import Profile
+
+
+def register_profiling(app: Sanic, prefix: str) -> None:
+    """Profile every worker of `app` into `app.ctx.profile`."""
+
+    def write_profile() -> None:
+        paths = app.ctx.profile.dump(f"{prefix}.{os.getpid()}")
+        logger.info(f"Profile written to {', '.join(paths)}")
+
+    @app.before_server_start
+    async def start_profiling(app: Sanic, _) -> None:
+        app.ctx.profile = Profile(cprofile=True).enable()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1,
+                                                      write_profile)
+
+    @app.after_server_stop
+    async def stop_profiling(app: Sanic, _) -> None:
+        asyncio.get_running_loop().remove_signal_handler(signal.SIGUSR1)
+        app.ctx.profile.disable()
+        write_profile()
+        app.ctx.profile = None
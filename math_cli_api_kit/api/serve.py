@@ -0,0 +1,149 @@
+"""This module runs the Math API with a tuned multi-worker runtime.
+
+`serve` starts one Sanic worker per CPU by default, on uvloop when it
+is installed, with the keep-alive, request size and shutdown settings
+of `APIConfig`, and without an access log unless it is asked for. The
+workers share one listening socket opened with `SO_REUSEPORT`, so a
+new server can bind the same port while an old one is draining, for
+rolling restarts.
+
+Every worker is prewarmed before it accepts traffic: it computes every
+operation once, through the scalar kernels and the vectorized engine,
+builds the enabled lookup tables, compiles a sample expression and
+starts the processes of its executor. On SIGINT or SIGTERM, the workers
+stop accepting connections and drain the requests in progress for up
+to `APIConfig.SERVE_GRACEFUL_SHUTDOWN_TIMEOUT` seconds.
+
+`local_server` runs an app inside the current event loop on a free
+local port instead, for benchmarks and tests of the clients.
+"""
+
+import importlib.util
+import os
+import socket
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from sanic import Sanic
+from sanic.log import logger
+
+from . import create_app
+from ..config import APIConfig
+from ..core.batch import evaluate_batch
+from ..core.executors import run_kernel
+from ..core.expressions import compile_expression
+from ..core.registry import OPERATIONS
+from ..core.serialization import JSON
+from ..core.tables import lookup_tables
+
+# sample operands by operand type, valid for every operation
+_SAMPLE_OPERANDS = {int: 2, float: 2.5}
+
+
+def listen_socket(host: str, port: int) -> socket.socket:
+    """Bind a TCP socket to the address with `SO_REUSEADDR` and, where
+    the platform has it, `SO_REUSEPORT`.
+    """
+    family, kind, protocol, _, address = socket.getaddrinfo(
+        host, port, type=socket.SOCK_STREAM
+    )[0]
+    sock = socket.socket(family, kind, protocol)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind(address)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def prewarm(app: Sanic) -> None:
+    """Compute every operation once, build the enabled lookup tables,
+    compile a sample expression and start the processes of the executor
+    of `app`, so that the first requests do not pay for it.
+    """
+    items = []
+    for name, operation in OPERATIONS.items():
+        operands = [_SAMPLE_OPERANDS[operand_type]
+                    for operand_type in operation.operand_types]
+        operation.kernel(*operands)
+        items.append({"operation": name,
+                      "operands": dict(zip(operation.operands, operands))})
+    # a threshold of 1 imports the vectorized engine, when available
+    evaluate_batch(items, vectorize_threshold=1)
+    lookup_tables.build()
+    compile_expression("sum(x, y)").evaluate({"x": 1, "y": 2})
+    app.ctx.serializer.result_body(JSON, "result", 1.0)
+
+    executor = app.ctx.executor
+    if isinstance(executor, ProcessPoolExecutor):
+        workers = APIConfig.EXECUTOR_WORKERS or os.cpu_count() or 1
+        list(executor.map(run_kernel, ["sum"] * workers, range(workers),
+                          range(workers)))
+
+
+def register_prewarm(app: Sanic) -> None:
+    """Prewarm every worker of `app` before it starts serving. It must
+    be registered after the listeners that set up the executor.
+    """
+
+    @app.before_server_start
+    async def prewarm_worker(app: Sanic, _) -> None:
+        prewarm(app)
+        logger.info(f"Worker {os.getpid()} prewarmed")
+
+
+@asynccontextmanager
+async def local_server(app: Sanic) -> AsyncIterator[str]:
+    """Serve `app` in the current event loop on a free port of the
+    loopback interface, and yield the base URL of the server.
+    """
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = await app.create_server(sock=sock, access_log=False,
+                                     return_asyncio_server=True)
+    await server.startup()
+    await server.before_start()
+    await server.start_serving()
+    await server.after_start()
+    try:
+        yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+    finally:
+        await server.before_stop()
+        await server.close()
+        await server.after_stop()
+
+
+def serve(
+        host: Optional[str] = None, port: Optional[int] = None,
+        workers: Optional[int] = None, access_log: Optional[bool] = None,
+        uvloop: bool = True
+) -> None:
+    """Run the Math API until it receives SIGINT or SIGTERM, with the
+    settings of `APIConfig` for the arguments that are not given.
+    """
+    api_config = APIConfig()
+    app = create_app("math_cli_api_kit")
+    app.config.KEEP_ALIVE_TIMEOUT = api_config.SERVE_KEEP_ALIVE_TIMEOUT
+    app.config.REQUEST_MAX_SIZE = api_config.SERVE_REQUEST_MAX_SIZE
+    app.config.REQUEST_TIMEOUT = api_config.SERVE_REQUEST_TIMEOUT
+    app.config.RESPONSE_TIMEOUT = api_config.SERVE_RESPONSE_TIMEOUT
+    app.config.GRACEFUL_SHUTDOWN_TIMEOUT = \
+        api_config.SERVE_GRACEFUL_SHUTDOWN_TIMEOUT
+    app.config.USE_UVLOOP = uvloop and \
+        importlib.util.find_spec("uvloop") is not None
+    register_prewarm(app)
+
+    sock = listen_socket(api_config.SERVE_HOST if host is None else host,
+                         api_config.SERVE_PORT if port is None else port)
+    app.run(
+        sock=sock,
+        workers=workers or api_config.SERVE_WORKERS or os.cpu_count() or 1,
+        backlog=api_config.SERVE_BACKLOG,
+        access_log=api_config.SERVE_ACCESS_LOG
+        if access_log is None else access_log,
+        motd=False
+    )
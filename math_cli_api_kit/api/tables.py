@@ -0,0 +1,23 @@
+"""This module builds the enabled lookup tables of the Math API.
+
+Every Sanic worker builds its tables when it starts, rather than on the
+first request that looks them up, and logs the memory they use.
+"""
+
+from sanic import Sanic
+from sanic.log import logger
+
+from ..core.tables import lookup_tables
+
+
+def register_lookup_tables(app: Sanic) -> None:
+    """Build the enabled lookup tables in every worker of `app`."""
+
+    @app.before_server_start
+    async def build_lookup_tables(app: Sanic, _) -> None:
+        lookup_tables.build()
+        usage = lookup_tables.memory_usage()
+        logger.info(
+            f"Lookup tables use {sum(usage.values())} bytes: "
+            + ", ".join(f"{name} {size}" for name, size in usage.items())
+        )
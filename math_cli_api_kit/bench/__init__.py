@@ -0,0 +1,17 @@
+"""This package provides the benchmark suite of the Math CLI API Kit.
+
+It measures the per-call latency and throughput of every registered
+math operation and of the validation functions, the cold-start time of
+the command-line interface and the request throughput of the API. The
+results are emitted as JSON so that they can be compared across
+commits, see `python -m math_cli_api_kit.bench --help`.
+"""
+
+from .report import compare_results, load_results, make_report, \
+    save_results
+from .suites import SUITES, run_suites
+
+__all__ = [
+    "SUITES", "compare_results", "load_results", "make_report",
+    "run_suites", "save_results",
+]
@@ -0,0 +1,61 @@
+"""This module defines the entry point of the benchmark suite.
+
+Run all suites and print the JSON report:
+
+    python -m math_cli_api_kit.bench
+
+Save a report and check a later run against it:
+
+    python -m math_cli_api_kit.bench -o baseline.json
+    python -m math_cli_api_kit.bench --baseline baseline.json
+
+The command exits with status 1 when a metric regressed by more than
+the threshold.
+"""
+
+import json
+import sys
+from typing import Optional, Tuple
+
+import click
+
+from math_cli_api_kit.bench.report import compare_results, load_results, \
+    make_report, save_results
+from math_cli_api_kit.bench.suites import SUITES, run_suites
+
+
+@click.command("bench", help="Run the benchmark suites and emit a JSON"
+                             " report.")
+@click.option("-s", "--suite", "suites", multiple=True,
+              type=click.Choice(list(SUITES)),
+              help="Suite to run, may be repeated (all by default)")
+@click.option("-o", "--output", type=click.Path(dir_okay=False),
+              help="Write the report to this file instead of stdout")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False),
+              help="Compare the results with this earlier report")
+@click.option("--threshold", type=click.FloatRange(min=0), default=0.1,
+              show_default=True,
+              help="Relative slowdown reported as a regression")
+@click.option("--quick", is_flag=True,
+              help="Use fewer repetitions, for a faster but noisier run")
+def bench(
+        suites: Tuple[str, ...], output: Optional[str],
+        baseline: Optional[str], threshold: float, quick: bool
+) -> None:
+    report = make_report(run_suites(suites or SUITES, quick))
+    if output:
+        save_results(report, output)
+    else:
+        click.echo(json.dumps(report, indent=2, sort_keys=True))
+
+    if baseline:
+        regressions = compare_results(load_results(baseline), report,
+                                      threshold)
+        for regression in regressions:
+            click.echo(f"regression: {regression}", err=True)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    bench()
@@ -0,0 +1,91 @@
+"""This module builds, stores and compares benchmark reports.
+
+A report is a JSON document with the environment the benchmarks ran in
+and their results. Two reports are compared metric by metric: a metric
+regresses when it is slower than in the baseline by more than the
+threshold, e.g. a latency more than 10% higher or a throughput more
+than 10% lower for a threshold of 0.1.
+"""
+
+import json
+import os
+import platform
+import time
+from typing import Any, Dict, List, NamedTuple
+
+from math_cli_api_kit.config import APIConfig
+
+REPORT_VERSION = 1
+
+LOWER_IS_BETTER = ("latency_ns", "latency_ms", "p99_ms")
+HIGHER_IS_BETTER = ("throughput", "speedup")
+
+
+class Regression(NamedTuple):
+    benchmark: str
+    metric: str
+    baseline: float
+    current: float
+    slowdown: float
+
+    def __str__(self) -> str:
+        return (f"{self.benchmark} {self.metric}: {self.baseline:.6g} ->"
+                f" {self.current:.6g} ({self.slowdown - 1:+.1%} slower)")
+
+
+def make_report(results: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+    """Wrap benchmark results with a description of the environment."""
+    return {
+        "version": REPORT_VERSION,
+        "environment": {
+            "package_version": APIConfig.API_VERSION,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ",
+                                       time.gmtime()),
+        },
+        "results": results,
+    }
+
+
+def save_results(report: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as fh:
+        report = json.load(fh)
+    if report.get("version") != REPORT_VERSION:
+        raise ValueError(f"unsupported benchmark report version in {path}")
+    return report
+
+
+def compare_results(
+        baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[Regression]:
+    """Return the metrics of `current` that regressed against `baseline`
+    by more than `threshold`. Benchmarks or metrics missing from either
+    report are ignored.
+    """
+    regressions = []
+    for name, metrics in current["results"].items():
+        base_metrics = baseline["results"].get(name, {})
+        for metric, value in metrics.items():
+            base = base_metrics.get(metric)
+            if not base or not value:
+                continue
+            if metric in LOWER_IS_BETTER:
+                slowdown = value / base
+            elif metric in HIGHER_IS_BETTER:
+                slowdown = base / value
+            else:
+                continue
+            if slowdown > 1 + threshold:
+                regressions.append(
+                    Regression(name, metric, base, value, slowdown)
+                )
+    return regressions
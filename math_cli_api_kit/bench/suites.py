@@ -0,0 +1,252 @@
+"""This module defines the benchmark suites.
+
+- `core`: every registered algebra and geometry operation.
+- `kernels`: the trusted kernels of the operations, with their speedup
+  over the validating methods.
+- `tables`: the kernels with precomputed lookup tables, with their
+  speedup over the computed kernels and the memory of the tables.
+- `validation`: the operand validation functions.
+- `cli`: the cold-start time of CLI commands, run as subprocesses.
+- `http`: the request throughput of an in-process API server, driven by
+  a local keep-alive HTTP client.
+
+Every suite returns a mapping of benchmark names to metrics. Latencies
+(`latency_ns`, `latency_ms`, `p99_ms`) are lower-is-better and
+`throughput` is higher-is-better.
+"""
+
+import asyncio
+import itertools
+import json
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from math_cli_api_kit.bench.timing import measure_call, summarize_latencies
+from math_cli_api_kit.config import APIConfig
+from math_cli_api_kit.core import validation
+from math_cli_api_kit.core.registry import OPERATIONS
+from math_cli_api_kit.core.tables import TABLE_OPERATIONS, lookup_tables
+
+Results = Dict[str, Dict[str, float]]
+
+# sample operands by operand type; factorials are measured on a small
+# input, since large ones are dominated by big-integer arithmetic
+_SAMPLE_OPERANDS = {int: 20, float: 3.5}
+
+_VALIDATION_CALLS: Tuple[Tuple[str, Callable, Tuple[Any, ...]], ...] = (
+    ("validate_int_or_float", validation.validate_int_or_float, (3, 4.5)),
+    ("validate_factorial", validation.validate_factorial, (20,)),
+    ("is_numeric_string", validation.is_numeric_string, ("4.5",)),
+    ("is_integer_string", validation.is_integer_string, ("20",)),
+    ("all_not_none_and_numeric", validation.all_not_none_and_numeric,
+     ("3", "4.5")),
+    ("all_not_none_and_integer", validation.all_not_none_and_integer,
+     ("3", "4")),
+    ("operands_validator", OPERATIONS["sum"].validator,
+     ({"x": 3, "y": 4.5},)),
+)
+
+# int operands within the default ranges of the lookup tables, and
+# above the factorials cached by the factorial engine
+_TABLE_OPERANDS = {
+    "factorial": (tuple(range(64, 1001)),),
+    "pow": (tuple(range(-32, 33)), (3, 17, 40)),
+    "surface_of_square": (tuple(range(0, 10_001, 7)),),
+    "surface_of_circle": (tuple(range(0, 10_001, 7)),),
+}
+
+_CLI_COMMANDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("interpreter", ("-c", "pass")),
+    ("help", ("-m", "math_cli_api_kit.cli", "--help")),
+    ("algebra.sum", ("-m", "math_cli_api_kit.cli", "algebra", "sum",
+                     "-x", "3", "-y", "4.5")),
+    ("geometry.hypotenuse", ("-m", "math_cli_api_kit.cli", "geometry",
+                             "hypotenuse", "-a", "3", "-b", "4")),
+)
+
+_HTTP_REQUESTS: Tuple[Tuple[str, str, Any], ...] = (
+    ("algebra.sum", "/algebra/sum", {"x": 3, "y": 4.5}),
+    ("geometry.hypotenuse", "/geometry/hypotenuse", {"a": 3, "b": 4}),
+    ("batch.100", "/batch", [
+        {"operation": "sum", "operands": {"x": i, "y": 4.5}}
+        for i in range(100)
+    ]),
+)
+
+
+def sample_operands(operation: str) -> Tuple[Any, ...]:
+    entry = OPERATIONS[operation]
+    return tuple(_SAMPLE_OPERANDS[t] for t in entry.operand_types)
+
+
+def bench_core(quick: bool = False) -> Results:
+    """Measure every registered operation on sample operands."""
+    repeat = 3 if quick else 5
+    return {
+        f"core.{entry.family}.{name}": measure_call(
+            entry.function, *sample_operands(name), repeat=repeat
+        )
+        for name, entry in OPERATIONS.items()
+    }
+
+
+def bench_kernels(quick: bool = False) -> Results:
+    """Measure the trusted kernel of every registered operation and its
+    `speedup` over the validating method.
+    """
+    repeat = 3 if quick else 5
+    results = {}
+    for name, entry in OPERATIONS.items():
+        operands = sample_operands(name)
+        checked = measure_call(entry.function, *operands, repeat=repeat)
+        kernel = measure_call(entry.kernel, *operands, repeat=repeat)
+        results[f"kernels.{entry.family}.{name}"] = {
+            **kernel, "speedup": checked["latency_ns"] / kernel["latency_ns"]
+        }
+    return results
+
+
+def bench_tables(quick: bool = False) -> Results:
+    """Measure the kernels of the operations with lookup tables over a
+    range of int operands, computed and looked up, and report the
+    `speedup` of the tables and their `memory_bytes`.
+    """
+    repeat = 3 if quick else 5
+    enabled = tuple(lookup_tables.tables())
+    results = {}
+    try:
+        for name in TABLE_OPERATIONS:
+            kernel = OPERATIONS[name].kernel
+            rows = list(itertools.product(*_TABLE_OPERANDS[name]))
+
+            def run() -> None:
+                for operands in rows:
+                    kernel(*operands)
+
+            lookup_tables.disable(name)
+            computed = measure_call(run, repeat=repeat)
+            lookup_tables.enable(name)
+            lookup_tables.tables()[name].build()
+            looked_up = measure_call(run, repeat=repeat)
+            results[f"tables.{name}"] = {
+                "latency_ns": looked_up["latency_ns"] / len(rows),
+                "speedup": computed["latency_ns"] / looked_up["latency_ns"],
+                "memory_bytes": lookup_tables.memory_usage()[name],
+            }
+    finally:
+        lookup_tables.disable()
+        lookup_tables.enable(*enabled)
+    return results
+
+
+def bench_validation(quick: bool = False) -> Results:
+    """Measure the validation functions on valid operands."""
+    repeat = 3 if quick else 5
+    return {
+        f"validation.{name}": measure_call(function, *args, repeat=repeat)
+        for name, function, args in _VALIDATION_CALLS
+    }
+
+
+def bench_cli(quick: bool = False) -> Results:
+    """Measure the cold-start time of CLI commands, each run in a fresh
+    interpreter. `cli.interpreter` is the start time of a bare
+    interpreter, for reference.
+    """
+    runs = 3 if quick else 10
+    results = {}
+    for name, args in _CLI_COMMANDS:
+        latencies = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run((sys.executable, *args), check=True,
+                           stdout=subprocess.DEVNULL)
+            latencies.append(time.perf_counter() - start)
+        results[f"cli.{name}"] = summarize_latencies(latencies)
+    return results
+
+
+async def _request_loop(
+        port: int, request: bytes, count: int, latencies: List[float]
+) -> None:
+    """Send `count` requests over one keep-alive connection, recording
+    the latency of each.
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            if not head.startswith(b"HTTP/1.1 200"):
+                raise RuntimeError(f"unexpected response: {head!r}")
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def _bench_http(
+        requests: Iterable[Tuple[str, str, Any]], total: int,
+        concurrency: int
+) -> Results:
+    from math_cli_api_kit.api import create_app
+    from math_cli_api_kit.api.serve import local_server
+
+    prefix = f"/{APIConfig.API_BASEPATH}/math/api".replace("//", "/")
+    results = {}
+    async with local_server(create_app("math_cli_api_kit_bench")) as url:
+        port = int(url.rsplit(":", 1)[1])
+        for name, path, body in requests:
+            payload = json.dumps(body).encode()
+            request = (
+                f"POST {prefix}{path} HTTP/1.1\r\n"
+                f"Host: 127.0.0.1\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n\r\n"
+            ).encode() + payload
+            # warm up the connection handling and the route
+            await _request_loop(port, request, 10, [])
+
+            latencies: List[float] = []
+            start = time.perf_counter()
+            await asyncio.gather(*(
+                _request_loop(port, request, total // concurrency, latencies)
+                for _ in range(concurrency)
+            ))
+            elapsed = time.perf_counter() - start
+            results[f"http.{name}"] = {
+                "throughput": len(latencies) / elapsed,
+                **summarize_latencies(latencies),
+            }
+    return results
+
+
+def bench_http(quick: bool = False) -> Results:
+    """Measure the request throughput and latency of the API."""
+    total = 400 if quick else 2000
+    return asyncio.run(_bench_http(_HTTP_REQUESTS, total, concurrency=8))
+
+
+SUITES: Dict[str, Callable[[bool], Results]] = {
+    "core": bench_core,
+    "kernels": bench_kernels,
+    "tables": bench_tables,
+    "validation": bench_validation,
+    "cli": bench_cli,
+    "http": bench_http,
+}
+
+
+def run_suites(names: Iterable[str], quick: bool = False) -> Results:
+    """Run the named suites and return their merged results."""
+    results: Results = {}
+    for name in names:
+        results.update(SUITES[name](quick))
+    return results
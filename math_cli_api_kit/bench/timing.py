@@ -0,0 +1,43 @@
+"""This module provides the timing helpers of the benchmark suite."""
+
+import statistics
+import timeit
+from functools import partial
+from typing import Any, Callable, Dict, Sequence
+
+DEFAULT_MIN_TIME = 0.05
+DEFAULT_REPEAT = 5
+
+
+def measure_call(
+        function: Callable, *args: Any, min_time: float = DEFAULT_MIN_TIME,
+        repeat: int = DEFAULT_REPEAT
+) -> Dict[str, float]:
+    """Measure the per-call latency and throughput of `function(*args)`.
+
+    The number of calls per run grows tenfold until one run takes at
+    least `min_time` seconds, then the fastest of `repeat` runs is
+    reported, which is the least disturbed by other load on the machine.
+    """
+    timer = timeit.Timer(partial(function, *args))
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 10
+    best = min(timer.repeat(repeat, number)) / number
+    return {
+        "latency_ns": best * 1e9,
+        "throughput": 1 / best,
+        "calls": number * repeat,
+    }
+
+
+def summarize_latencies(latencies: Sequence[float]) -> Dict[str, float]:
+    """Return the median and the 99th percentile of latencies given in
+    seconds, in milliseconds.
+    """
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return {
+        "latency_ms": statistics.median(ordered) * 1e3,
+        "p99_ms": p99 * 1e3,
+    }
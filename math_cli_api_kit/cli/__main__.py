@@ -1,19 +1,51 @@
 """This module defines the command-line interface (CLI) for the math operations'
 calculator. It allows users to perform algebraic and geometric calculations through the CLI.
+
+Commands are imported only when they are used, which keeps the start-up
+time of a single command low. When the profiling environment variable
+is set, the core operations are profiled while the command runs.
 """
 
+import os
+
 import click
 
-from .math_cli import algebra, geometry
+from .lazy_group import LazyGroup
+from ..config import CoreConfig
+
+
+def start_profiling(ctx: click.Context, prefix: str) -> None:
+    """Profile the core operations until the command finishes, then
+    write the profile files with the given path prefix.
+    """
+    from ..core.profiling import Profile
+
+    profile = Profile(cprofile=True).enable()
+
+    def write_profile() -> None:
+        profile.disable()
+        paths = profile.dump(prefix)
+        click.echo(f"Profile written to {', '.join(paths)}", err=True)
 
+    ctx.call_on_close(write_profile)
 
-@click.group()
-def cli():
-    pass
 
+@click.group(cls=LazyGroup, lazy_commands={
+    "algebra": "math_cli_api_kit.cli.math_cli:algebra",
+    "geometry": "math_cli_api_kit.cli.math_cli:geometry",
+    "stream": "math_cli_api_kit.cli.stream_cli:stream",
+    "columns": "math_cli_api_kit.cli.columnar_cli:columns",
+    "expression": "math_cli_api_kit.cli.expression_cli:expression",
+    "shapes": "math_cli_api_kit.cli.shapes_cli:shapes",
+    "serve": "math_cli_api_kit.cli.serve_cli:serve",
+    "daemon": "math_cli_api_kit.cli.daemon:daemon",
+})
+@click.pass_context
+def cli(ctx: click.Context):
+    prefix = os.environ.get(CoreConfig.PROFILE_ENV_VAR)
+    if prefix:
+        start_profiling(ctx, prefix)
 
-cli.add_command(algebra)
-cli.add_command(geometry)
 
 if __name__ == '__main__':
     cli()
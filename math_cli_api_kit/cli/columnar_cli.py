@@ -0,0 +1,64 @@
+"""This module defines the `columns` command of the command-line
+interface (CLI), which applies an operation to very large binary
+columns of operands.
+
+Every operand is given as `NAME=PATH`, where the file is either a raw
+native-endian float64/int64 column or a `.npy` file. The inputs and the
+output file are memory-mapped and evaluated chunk by chunk, on several
+worker processes with `--workers`.
+"""
+
+from typing import Tuple
+
+import click
+
+from math_cli_api_kit.config import CoreConfig
+from math_cli_api_kit.core.columnar import RAW_DTYPES, evaluate_columns
+from math_cli_api_kit.core.executors import create_executor
+
+
+@click.command("columns", help="Apply an operation to memory-mapped"
+                               " columns of operands and write the results"
+                               " to a memory-mapped output file.")
+@click.argument("operation")
+@click.option("-i", "--input", "inputs", multiple=True, required=True,
+              metavar="NAME=PATH",
+              help="Column file of an operand, e.g. 'a=sides.npy'")
+@click.option("-o", "--output", required=True,
+              help="Output file, written as '.npy' when it has that"
+                   " extension and as a raw column otherwise")
+@click.option("--dtype", type=click.Choice(RAW_DTYPES), default="float64",
+              show_default=True, help="Data type of raw input columns")
+@click.option("--output-dtype", type=click.Choice(RAW_DTYPES),
+              default="float64", show_default=True,
+              help="Data type of the output column")
+@click.option("--chunk-size", type=click.IntRange(min=1),
+              default=CoreConfig.COLUMNAR_CHUNK_SIZE, show_default=True,
+              help="Number of rows evaluated at once")
+@click.option("-w", "--workers", type=click.IntRange(min=1), default=1,
+              show_default=True,
+              help="Number of worker processes evaluating chunks")
+def columns(
+        operation: str, inputs: Tuple[str, ...], output: str, dtype: str,
+        output_dtype: str, chunk_size: int, workers: int
+) -> None:
+    paths = {}
+    for spec in inputs:
+        name, separator, path = spec.partition("=")
+        if not separator or not name or not path:
+            raise click.BadParameter(f"'{spec}' is not NAME=PATH",
+                                     param_hint="'-i'")
+        paths[name] = path
+
+    executor = create_executor("process", workers) if workers > 1 \
+        else None
+    try:
+        rows = evaluate_columns(operation, paths, output, chunk_size,
+                                dtype, output_dtype, executor)
+    except (ImportError, OSError, TypeError, ValueError,
+            ZeroDivisionError) as e:
+        raise click.ClickException(str(e))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    print(f"{rows} rows written to {output}")
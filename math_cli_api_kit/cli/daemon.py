@@ -0,0 +1,209 @@
+"""This module defines the CLI daemon and the `daemon` command that
+manages it.
+
+The daemon is a resident process that runs the CLI commands forwarded
+by the `math-cli` shim, see `math_cli_api_kit.cli.shim`, so that they
+skip the interpreter start-up and the imports of a new process. It
+listens on a Unix socket readable by its user only, builds the
+operation commands before it accepts connections, answers one request
+per connection in turn, and exits after `CoreConfig.DAEMON_IDLE_TIMEOUT`
+seconds without a request.
+
+Forwarded commands run with the environment of the invocation that
+started the daemon, and their output is captured and sent back to the
+shim with their exit status.
+"""
+
+import contextlib
+import io
+import os
+import socket
+import time
+import traceback
+from typing import Optional, Sequence
+
+import click
+
+from .shim import Reply, decode_request, encode_request, send_request, \
+    start_daemon
+from ..config import CoreConfig
+
+# seconds to wait for a whole request once a shim is connected
+_REQUEST_TIMEOUT = 5.0
+
+
+class CLIDaemon:
+    """Runs the forwarded CLI commands received on the Unix socket at
+    `path`, see the module documentation.
+    """
+
+    def __init__(self, path: str, idle_timeout: float):
+        self.path = path
+        self.idle_timeout = idle_timeout
+
+    def serve(self) -> None:
+        """Serve requests until the daemon is idle for the timeout or is
+        asked to stop. Return at once if another daemon is listening on
+        the socket.
+        """
+        if send_request(self.path, encode_request("ping")) is not None:
+            return
+        with contextlib.suppress(FileNotFoundError):
+            # a socket left by a daemon that did not exit cleanly
+            os.unlink(self.path)
+        self.prewarm()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)
+        try:
+            server.bind(self.path)
+        finally:
+            os.umask(umask)
+        try:
+            server.listen()
+            server.settimeout(self.idle_timeout)
+            while True:
+                try:
+                    connection, _ = server.accept()
+                except socket.timeout:
+                    break
+                with connection:
+                    if not self.handle(connection):
+                        break
+        finally:
+            server.close()
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.path)
+
+    @staticmethod
+    def prewarm() -> None:
+        """Import and build the commands forwarded to the daemon."""
+        from .__main__ import cli
+
+        for name in CoreConfig.DAEMON_COMMANDS:
+            command = cli.get_command(None, name)
+            if isinstance(command, click.Group):
+                for subcommand in command.list_commands(None):
+                    command.get_command(None, subcommand)
+
+    def handle(self, connection: socket.socket) -> bool:
+        """Answer the request of a connection, and return False if the
+        daemon must stop.
+        """
+        connection.settimeout(_REQUEST_TIMEOUT)
+        chunks = []
+        try:
+            while True:
+                chunk = connection.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except OSError:
+            return True
+        verb, *fields = decode_request(b"".join(chunks))
+        if verb == "run" and fields:
+            status, output, error = self.run(fields[0], fields[1:])
+        elif verb == "ping":
+            status, output, error = 0, f"{os.getpid()}\n".encode(), b""
+        elif verb == "stop":
+            status, output, error = 0, b"", b""
+        else:
+            status, output, error = 2, b"", b"Invalid daemon request\n"
+        with contextlib.suppress(OSError):
+            connection.sendall(f"{status} {len(output)}\n".encode() +
+                               output + error)
+        return verb != "stop"
+
+    @staticmethod
+    def run(prog_name: str, args: Sequence[str]) -> Reply:
+        """Run a command line of a forwarded command and return its exit
+        status and its captured output.
+        """
+        from .__main__ import cli
+
+        if not args or args[0] not in CoreConfig.DAEMON_COMMANDS:
+            return 2, b"", b"Command not served by the daemon\n"
+        output, error = io.StringIO(), io.StringIO()
+        status = 0
+        with contextlib.redirect_stdout(output), \
+                contextlib.redirect_stderr(error):
+            try:
+                cli.main(list(args), prog_name=prog_name)
+            except SystemExit as e:
+                if isinstance(e.code, int) or e.code is None:
+                    status = e.code or 0
+                else:
+                    print(e.code, file=error)
+                    status = 1
+            except Exception:
+                traceback.print_exc(file=error)
+                status = 1
+        return status, output.getvalue().encode(), error.getvalue().encode()
+
+
+def daemon_pid(path: str) -> Optional[int]:
+    """Return the process ID of the daemon listening on `path`, or None
+    if no daemon answers.
+    """
+    reply = send_request(path, encode_request("ping"))
+    return None if reply is None else int(reply[1])
+
+
+@click.group("daemon", help="Manage the resident CLI daemon, which runs"
+                            f" the {', '.join(CoreConfig.DAEMON_COMMANDS)}"
+                            " commands when the"
+                            f" {CoreConfig.DAEMON_ENV_VAR} environment"
+                            " variable is set to 1.")
+def daemon():
+    pass
+
+
+socket_option = click.option(
+    "-s", "--socket", "path", default=CoreConfig.DAEMON_SOCKET_PATH,
+    show_default=True, help="Unix socket of the daemon"
+)
+idle_timeout_option = click.option(
+    "-t", "--idle-timeout", type=click.FloatRange(min=0, min_open=True),
+    default=CoreConfig.DAEMON_IDLE_TIMEOUT, show_default=True,
+    help="Seconds without a request after which the daemon exits"
+)
+
+
+@daemon.command("run", help="Run the daemon in the foreground.")
+@socket_option
+@idle_timeout_option
+def run_daemon(path: str, idle_timeout: float) -> None:
+    CLIDaemon(path, idle_timeout).serve()
+
+
+@daemon.command("start", help="Start the daemon in the background.")
+@socket_option
+@idle_timeout_option
+def start(path: str, idle_timeout: float) -> None:
+    pid = daemon_pid(path)
+    if pid is None:
+        start_daemon(path, idle_timeout)
+        deadline = time.monotonic() + 10.0
+        while pid is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+            pid = daemon_pid(path)
+    if pid is None:
+        raise click.ClickException("The daemon did not start")
+    click.echo(f"Daemon running with PID {pid}")
+
+
+@daemon.command("stop", help="Stop the daemon.")
+@socket_option
+def stop(path: str) -> None:
+    if send_request(path, encode_request("stop")) is None:
+        click.echo("Daemon not running")
+    else:
+        click.echo("Daemon stopped")
+
+
+@daemon.command("status", help="Show whether the daemon is running.")
+@socket_option
+def status(path: str) -> None:
+    pid = daemon_pid(path)
+    click.echo("Daemon not running" if pid is None
+               else f"Daemon running with PID {pid}")
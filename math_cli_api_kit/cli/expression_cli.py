@@ -0,0 +1,70 @@
+"""This module defines the `expression` command of the command-line
+interface (CLI), which evaluates an expression composed of the
+algebraic and geometric operations.
+
+Every variable is given as `NAME=VALUE`. When the values are
+comma-separated lists of the same length, the expression is evaluated
+for every row in a single pass and one result is printed per row; a
+single value is then used for every row.
+"""
+
+from typing import Tuple, Union
+
+import click
+
+from math_cli_api_kit.cli.math_cli import echo_result
+from math_cli_api_kit.core.expressions import EXPRESSION_ERRORS, \
+    compile_expression
+from math_cli_api_kit.core.validation import is_integer_string, \
+    is_numeric_string
+
+
+def parse_number(value: str) -> Union[int, float]:
+    """Parse an int or float variable and raise a BadParameter error if
+    it is not a number.
+    """
+    if is_integer_string(value):
+        return int(value)
+    if is_numeric_string(value):
+        return float(value)
+    raise click.BadParameter(f"'{value}' is not an int or a float",
+                             param_hint="'-v'")
+
+
+@click.command("expression", help="Evaluate an expression composed of"
+                                  " operations, such as"
+                                  " 'surface_of_circle(r) * h + sum(x, y)'.")
+@click.argument("expression")
+@click.option("-v", "--var", "variables", multiple=True,
+              metavar="NAME=VALUE",
+              help="Value of a variable, e.g. 'r=2', or comma-separated"
+                   " values to evaluate the expression for every row,"
+                   " e.g. 'r=1,2,3'")
+def expression(expression: str, variables: Tuple[str, ...]) -> None:
+    values = {}
+    for spec in variables:
+        name, separator, value = spec.partition("=")
+        if not separator or not name or not value:
+            raise click.BadParameter(f"'{spec}' is not NAME=VALUE",
+                                     param_hint="'-v'")
+        values[name] = [parse_number(item) for item in value.split(",")] \
+            if "," in value else parse_number(value)
+
+    try:
+        plan = compile_expression(expression)
+        if any(isinstance(value, list) for value in values.values()):
+            columns = {
+                name: value if isinstance(value, list) else [value]
+                for name, value in values.items()
+            }
+            rows = max(len(column) for column in columns.values())
+            for name, column in columns.items():
+                if len(column) == 1:
+                    columns[name] = column * rows
+            results = plan.evaluate_many(columns)
+        else:
+            results = [plan.evaluate(values)]
+    except EXPRESSION_ERRORS as e:
+        raise click.ClickException(str(e))
+    for result in results:
+        echo_result(result)
@@ -0,0 +1,34 @@
+"""This module provides a click group that imports its commands lazily.
+
+Commands are registered as "module:attribute" references and imported
+only when they are invoked or listed, so running one command does not
+pay for importing the dependencies of the others.
+"""
+
+import importlib
+from typing import Any, Dict, List, Optional
+
+import click
+
+
+class LazyGroup(click.Group):
+    """Click group whose commands are imported on first use."""
+
+    def __init__(
+            self, *args: Any, lazy_commands: Optional[Dict[str, str]] = None,
+            **kwargs: Any
+    ):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(
+            self, ctx: click.Context, cmd_name: str
+    ) -> Optional[click.Command]:
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            module_name, attribute = self.lazy_commands[cmd_name].split(":")
+            module = importlib.import_module(module_name)
+            self.add_command(getattr(module, attribute), cmd_name)
+        return super().get_command(ctx, cmd_name)
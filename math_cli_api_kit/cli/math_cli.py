@@ -1,174 +1,166 @@
 """This module defines a command-line interface (CLI) for performing
 math operations.
 
-It provides both algebraic and geometric operations.
+It provides both algebraic and geometric operations. The commands are
+generated from the operation registry, with one option per operand, and
+are only built when they are used. The `--numeric` and `--precision`
+options compute an operation with the arbitrary-precision "decimal" or
+the exact-rational "fraction" numeric backend. Expensive results are
+looked up in and stored to the persistent memo store, when it is
+enabled.
 """
 
-import click
-
-from math_cli_api_kit.core.math_operations import Algebra, Geometry
-from math_cli_api_kit.core.validation import all_not_none_and_numeric
-
-_algebra = Algebra()
-_geometry = Geometry()
-
-
-# algebra commands
-@click.group("algebra")
-def algebra():
-    """Provides algebraic operations: `addition`, `subtraction`,
-    `multiplication`, `division`, and `powers`.
-    """
-
-
-@algebra.command("sum", help="Return the sum of x and y.")
-@click.option("-x", help="Calculate the sum by 'y'")
-@click.option("-y", help="Calculate the sum by 'x'")
-def sum(x: str, y: str) -> None:
-    if all_not_none_and_numeric(x, y):
-        print(_algebra.sum(float(x), float(y)))
-    else:
-        print("You did not enter parameter(s) or the parameter(s) is not 'int'"
-              " or 'float'")
-
-
-@algebra.command("sub", help="Return the subtraction of x by y.")
-@click.option("-x", help="Calculate the subtraction by 'y'")
-@click.option("-y", help="Calculate the subtraction by 'x'")
-def sub(x: str, y: str) -> None:
-    if all_not_none_and_numeric(x, y):
-        print(_algebra.sub(float(x), float(y)))
-    else:
-        print("You did not enter parameter(s) or the parameter(s) is not 'int'"
-              " or 'float'")
-
-
-@algebra.command("mul", help="Return the multiplication of x by y.")
-@click.option("-x", help="Calculate the multiplication by 'y'")
-@click.option("-y", help="Calculate the multiplication by 'x'")
-def mul(x: str, y: str) -> None:
-    if all_not_none_and_numeric(x, y):
-        print(_algebra.mul(float(x), float(y)))
-    else:
-        print("You did not enter parameter(s) or the parameter(s) is not 'int'"
-              " or 'float'")
+import os
+import sys
+from typing import Any, List, Optional
 
+import click
 
-@algebra.command("div", help="Return the division of x by y.")
-@click.option("-x", help="Calculate the division by 'y'")
-@click.option("-y", help="Calculate the division by 'x'")
-def div(x: str, y: str) -> None:
-    if all_not_none_and_numeric(x, y):
-        print(_algebra.div(float(x), float(y)))
+from math_cli_api_kit.config import NUMERIC_BACKENDS, CoreConfig
+from math_cli_api_kit.core.factorial import is_large_int, iter_decimal
+from math_cli_api_kit.core.registry import ALGEBRA, GEOMETRY, OPERATIONS, \
+    Operation
+from math_cli_api_kit.core.validation import all_not_none_and_numeric, \
+    all_not_none_and_integer
+
+
+def _invalid_operands_message(operation: Operation) -> str:
+    if int in operation.operand_types:
+        return "You did not enter parameter or the parameter is not 'int'"
+    if operation.arity > 1:
+        return "You did not enter parameter(s) or the parameter(s) is not" \
+               " 'int' or 'float'"
+    return "You did not enter parameter or the parameter is not 'int' or" \
+           " 'float'"
+
+
+def echo_result(result: Any) -> None:
+    """Print a result, streaming the digits of very large integers."""
+    if is_large_int(result):
+        for chunk in iter_decimal(result):
+            sys.stdout.write(chunk)
+        sys.stdout.write("\n")
     else:
-        print("You did not enter parameter(s) or the parameter(s) is not 'int'"
-              " or 'float'")
+        print(result)
 
 
-@algebra.command("pow", help="Return x**y (x to the power of y).")
-@click.option("-x", help="Calculate x to the power of 'y'")
-@click.option("-y", help="Calculate 'x' to the power of its")
-def pow(x: str, y: str) -> None:
-    if all_not_none_and_numeric(x, y):
-        print(_algebra.pow(float(x), float(y)))
-    else:
-        print("You did not enter parameter(s) or the parameter(s) is not 'int'"
-              " or 'float'")
-
+def compute(operation: Operation, operands: List[Any]) -> Any:
+    """Compute an operation for validated operands, through the memo
+    store when it is enabled and the operation is expensive enough.
+    """
+    # the memo store is disabled, see `memo_directory`
+    if not (os.environ.get(CoreConfig.MEMO_ENV_VAR) or
+            CoreConfig.MEMO_DIRECTORY):
+        return operation.kernel(*operands)
+
+    # imported here, as costs are only estimated for the memo store
+    from math_cli_api_kit.core.costs import estimate_cost
+
+    if estimate_cost(operation.name, operands) < CoreConfig.MEMO_MIN_COST:
+        return operation.kernel(*operands)
+
+    # imported here, as the store is only opened for expensive operations
+    from math_cli_api_kit.core.factorial import factorial_engine
+    from math_cli_api_kit.core.memo import open_memo_store
+
+    memo = open_memo_store()
+    if memo is None:
+        return operation.kernel(*operands)
+    try:
+        memo.warm_factorials(factorial_engine)
+        result = memo.get(operation.name, operands)
+        if result is None:
+            result = operation.kernel(*operands)
+            memo.set(operation.name, operands, result)
+        return result
+    finally:
+        memo.close()
+
+
+def make_command(operation: Operation) -> click.Command:
+    """Build the click command of a registered operation."""
+    integer_operands = int in operation.operand_types
+    message = _invalid_operands_message(operation)
+
+    def command(numeric: str, precision: int, **options: str) -> None:
+        values = [options[name] for name in operation.operands]
+        if numeric != "float":
+            # imported here, as most commands compute with floats
+            from math_cli_api_kit.core.precision import parse_operand, \
+                run_precise
+
+            try:
+                if None in values:
+                    raise ValueError("missing operand")
+                operands = [parse_operand(value) for value in values]
+            except ValueError:
+                print(message)
+                return
+            echo_result(run_precise(
+                operation.name, numeric, precision, *operands
+            ))
+            return
+        valid = all_not_none_and_integer(*values) if integer_operands \
+            else all_not_none_and_numeric(*values)
+        if valid:
+            echo_result(compute(operation, [
+                operand_type(value) for operand_type, value
+                in zip(operation.operand_types, values)
+            ]))
+        else:
+            print(message)
+
+    command = click.option(
+        "--precision", type=click.IntRange(1, CoreConfig.MAX_PRECISION),
+        default=CoreConfig.DEFAULT_PRECISION, show_default=True,
+        help="Significant digits of the 'decimal' and 'fraction' results"
+    )(command)
+    command = click.option(
+        "--numeric", type=click.Choice(NUMERIC_BACKENDS), default="float",
+        show_default=True, help="Numeric backend of the computation"
+    )(command)
+    for name, help in reversed(tuple(zip(operation.operands,
+                                         operation.operand_help))):
+        command = click.option(f"-{name}", help=help)(command)
+    return click.command(operation.name, help=operation.help)(command)
+
+
+class OperationGroup(click.Group):
+    """Click group of the registered operations of a family, building
+    every command on first use.
+    """
 
-@algebra.command("square_root", help="Return the square root of x.")
-@click.option("-x", help="Calculate its square root")
-def square_root(x: str) -> None:
-    if all_not_none_and_numeric(x):
-        print(_algebra.square_root(float(x)))
-    else:
-        print("You did not enter parameter or the parameter is not 'int'"
-              " or 'float'")
+    def __init__(self, *args: Any, family: str, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.family = family
 
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return [
+            name for name, operation in OPERATIONS.items()
+            if operation.family == self.family
+        ]
 
-@algebra.command("factorial", help="Find x! Raises a ValueError if x is"
-                                   " negative or non-integral.")
-@click.option("-x", help="Calculate its factorial")
-def factorial(x: str) -> None:
-    if all_not_none_and_numeric(x):
-        print(_algebra.factorial(int(x)))
-    else:
-        print("You did not enter parameter or the parameter is not 'int'")
+    def get_command(
+            self, ctx: click.Context, cmd_name: str
+    ) -> Optional[click.Command]:
+        operation = OPERATIONS.get(cmd_name)
+        if cmd_name not in self.commands and operation is not None and \
+                operation.family == self.family:
+            self.add_command(make_command(operation))
+        return super().get_command(ctx, cmd_name)
 
 
-@algebra.command("exp", help="Return e raised to the power of x.")
-@click.option("-x", help="Calculate 'e' raised to the power of its")
-def exp(x: str) -> None:
-    if all_not_none_and_numeric(x):
-        print(_algebra.exp(float(x)))
-    else:
-        print("You did not enter parameter or the parameter is not 'int' or"
-              " 'float'")
+# algebra commands
+@click.group("algebra", cls=OperationGroup, family=ALGEBRA)
+def algebra():
+    """Provides algebraic operations: `addition`, `subtraction`,
+    `multiplication`, `division`, and `powers`.
+    """
 
 
 # geometry commands
-@click.group("geometry")
+@click.group("geometry", cls=OperationGroup, family=GEOMETRY)
 def geometry():
     """Provides geometric operations: surface of a `square`, `circle`,
     `triangle`, `trapezoid`, and `hypotenuse`.
     """
-
-
-@geometry.command("surface_of_square", help="Return the surface of square.")
-@click.option("-a", help="Calculate the surface of a square")
-def surface_of_square(a: str) -> None:
-    if all_not_none_and_numeric(a):
-        print(_geometry.surface_of_square(float(a)))
-    else:
-        print("You did not enter parameter or the parameter is not 'int' or"
-              " 'float'")
-
-
-@geometry.command("surface_of_circle", help="Return the surface of a circle.")
-@click.option("-r", help="Calculate the surface of a circle by radius")
-def surface_of_circle(r: str) -> None:
-    if all_not_none_and_numeric(r):
-        print(_geometry.surface_of_circle(float(r)))
-    else:
-        print("You did not enter parameter or the parameter is not 'int' or"
-              " 'float'")
-
-
-@geometry.command("surface_of_triangle", help="Return the surface of a"
-                                              " triangle.")
-@click.option("-b", help="Calculate the surface of a triangle by its base")
-@click.option("-h", help="Calculate the surface of a triangle by its height")
-def surface_of_triangle(b: str, h: str) -> None:
-    if all_not_none_and_numeric(b, h):
-        print(_geometry.surface_of_triangle(float(b), float(h)))
-    else:
-        print("You did not enter parameter(s) or the parameter(s) is not 'int'"
-              " or 'float'")
-
-
-@geometry.command("surface_of_trapezoid", help="Return the surface of a"
-                                               " trapezoid.")
-@click.option("-a", help="Calculate the surface of a trapezoid by base 1")
-@click.option("-b", help="Calculate the surface of a trapezoid by base 2")
-@click.option("-h", help="Calculate the surface of a trapezoid by its height")
-def surface_of_trapezoid(a: str, b: str, h: str) -> None:
-    if all_not_none_and_numeric(a, b, h):
-        print(_geometry.surface_of_trapezoid(float(a), float(b), float(h)))
-    else:
-        print("You did not enter parameter(s) or the parameter(s) is not 'int'"
-              " or 'float'")
-
-
-@geometry.command("hypotenuse", help="The square of the hypotenuse is equal to"
-                                     " the sum of the areas of the squares on"
-                                     " the other two sides. Return the"
-                                     " hypotenuse of a triangle.")
-@click.option("-a", help="Calculate the hypotenuse by the size of the base")
-@click.option("-b", help="Calculate the hypotenuse by the size of the"
-                         " altitude")
-def hypotenuse(a: str, b: str) -> None:
-    if all_not_none_and_numeric(a, b):
-        print(_geometry.hypotenuse(float(a), float(b)))
-    else:
-        print("You did not enter parameter(s) or the parameter(s) is not 'int'"
-              " or 'float'")
@@ -0,0 +1,36 @@
+"""This module defines the `serve` command of the command-line interface
+(CLI), which runs the Math API with a tuned multi-worker runtime.
+
+The server and its dependencies are only imported when the command
+runs, so that its help stays as fast as the other commands.
+"""
+
+from typing import Optional
+
+import click
+
+from math_cli_api_kit.config import APIConfig
+
+
+@click.command("serve", help="Run the Math API with one prewarmed worker"
+                             " per CPU until SIGINT or SIGTERM, draining"
+                             " the requests in progress on shutdown.")
+@click.option("-h", "--host", default=APIConfig.SERVE_HOST,
+              show_default=True, help="Address to listen on")
+@click.option("-p", "--port", type=click.IntRange(0, 65535),
+              default=APIConfig.SERVE_PORT, show_default=True,
+              help="Port to listen on")
+@click.option("-w", "--workers", type=click.IntRange(min=1), default=None,
+              help="Number of worker processes  [default: one per CPU]")
+@click.option("--access-log/--no-access-log",
+              default=APIConfig.SERVE_ACCESS_LOG, show_default=True,
+              help="Log every request")
+@click.option("--uvloop/--no-uvloop", default=True, show_default=True,
+              help="Run the workers on uvloop, when it is installed")
+def serve(
+        host: str, port: int, workers: Optional[int], access_log: bool,
+        uvloop: bool
+) -> None:
+    from math_cli_api_kit.api.serve import serve as run_server
+
+    run_server(host, port, workers, access_log, uvloop)
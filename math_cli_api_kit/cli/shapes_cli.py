@@ -0,0 +1,97 @@
+"""This module defines the `shapes` commands of the command-line
+interface (CLI), which compute the areas and perimeters of polygons,
+the distances between point sets and convex hulls.
+
+Every array operand is given either as a file, a raw native-endian
+float64 column (int64 for offsets) or a `.npy` file that is
+memory-mapped, or inline as comma-separated numbers. Points are flat
+coordinates, `x0,y0,x1,y1,...`. Results are written to stdout, one per
+line.
+"""
+
+import os
+import sys
+from typing import Any, Optional
+
+import click
+
+from math_cli_api_kit.core.shape_operations import SHAPE_OPERATIONS, \
+    ShapeOperation
+
+_OPERAND_HELP = {
+    "coordinates": "Flat vertex coordinates of the polygons",
+    "offsets": "Index of the first vertex of every polygon, followed by"
+               " the number of vertices  [default: a single polygon]",
+    "points": "Flat coordinates of the points",
+    "targets": "Flat coordinates of the targets  [default: the points]",
+}
+
+
+def read_array(value: str, dtype: str = "float64") -> Any:
+    """Memory-map an array file, or parse comma-separated numbers."""
+    from math_cli_api_kit.core.columnar import open_column
+    from math_cli_api_kit.core.vector_operations import np
+
+    if os.path.isfile(value):
+        return open_column(value, dtype)
+    return np.array(value.split(","), dtype=dtype)
+
+
+def echo_array(result: Any) -> None:
+    """Print the rows of a result array, one per line."""
+    lines = (" ".join(map(repr, row)) if isinstance(row, list)
+             else repr(row) for row in result.tolist())
+    sys.stdout.write("".join(f"{line}\n" for line in lines))
+
+
+def make_command(operation: ShapeOperation) -> click.Command:
+    """Build the click command of a shape operation."""
+
+    def command(**options: Optional[str]) -> None:
+        try:
+            arrays = [
+                read_array(options[name],
+                           "int64" if name == "offsets" else "float64")
+                for name in operation.operands if options[name] is not None
+            ]
+            result = operation.function(*arrays)
+        except (ImportError, OSError, TypeError, ValueError) as e:
+            raise click.ClickException(str(e))
+        if operation.name == "nearest_distances":
+            distances, indices = result
+            for distance, index in zip(distances.tolist(), indices.tolist()):
+                sys.stdout.write(f"{distance!r} {index}\n")
+        else:
+            echo_array(result)
+
+    for position, name in reversed(tuple(enumerate(operation.operands))):
+        command = click.option(
+            f"--{name}", required=position < operation.required,
+            metavar="PATH|NUMBERS", help=_OPERAND_HELP[name]
+        )(command)
+    return click.command(operation.name, help=operation.help)(command)
+
+
+class ShapeGroup(click.Group):
+    """Click group of the shape operations, building every command on
+    first use.
+    """
+
+    def list_commands(self, ctx: click.Context) -> list:
+        return list(SHAPE_OPERATIONS)
+
+    def get_command(
+            self, ctx: click.Context, cmd_name: str
+    ) -> Optional[click.Command]:
+        operation = SHAPE_OPERATIONS.get(cmd_name)
+        if cmd_name not in self.commands and operation is not None:
+            self.add_command(make_command(operation))
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group("shapes", cls=ShapeGroup)
+def shapes():
+    """Provides operations on polygons and point clouds: `polygon_area`,
+    `polygon_perimeter`, `pairwise_distances`, `nearest_distances`, and
+    `convex_hull`. They require NumPy.
+    """
@@ -0,0 +1,107 @@
+"""This module is the entry point of the `math-cli` command, a shim
+that forwards commands to the CLI daemon when daemon mode is on.
+
+Daemon mode is opted into by setting `CoreConfig.DAEMON_ENV_VAR` to 1.
+The `algebra`, `geometry` and `expression` commands are then sent to a
+resident daemon over a Unix socket and its reply is printed, so that
+the command does not import click, the core modules and the command
+it runs. When no daemon is listening, the command runs in-process as
+usual and a daemon is started in the background for the next ones.
+Other commands always run in-process.
+
+The shim imports only the standard library modules it needs to talk to
+the socket. A request is the NUL-separated fields `run`, the program
+name and the arguments; the reply is a header line with the exit
+status and the length of the standard output, followed by the standard
+output and the standard error.
+"""
+
+import os
+import socket
+import sys
+from typing import List, Optional, Sequence, Tuple
+
+from math_cli_api_kit.config import CoreConfig
+
+Reply = Tuple[int, bytes, bytes]
+
+
+def encode_request(verb: str, *fields: str) -> bytes:
+    return "\0".join((verb, *fields)).encode("utf-8", "surrogateescape")
+
+
+def decode_request(request: bytes) -> List[str]:
+    return request.decode("utf-8", "surrogateescape").split("\0")
+
+
+def send_request(path: str, request: bytes) -> Optional[Reply]:
+    """Send a request to the daemon listening on `path` and return its
+    reply, or None if no daemon answered.
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+            sock.sendall(request)
+            sock.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return None
+    header, _, body = b"".join(chunks).partition(b"\n")
+    try:
+        status, length = map(int, header.split())
+    except ValueError:
+        return None
+    return status, body[:length], body[length:]
+
+
+def start_daemon(
+        path: Optional[str] = None, idle_timeout: Optional[float] = None
+) -> None:
+    """Start a daemon in a new background session, without waiting for
+    it to listen.
+    """
+    # imported here, as a daemon is only started once in a while
+    import subprocess
+
+    args = [sys.executable, "-m", "math_cli_api_kit.cli", "daemon", "run"]
+    if path is not None:
+        args += ["--socket", path]
+    if idle_timeout is not None:
+        args += ["--idle-timeout", str(idle_timeout)]
+    subprocess.Popen(args, stdin=subprocess.DEVNULL,
+                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                     start_new_session=True)
+
+
+def forwards(args: Sequence[str]) -> bool:
+    """Check whether a command line should be sent to the daemon."""
+    return os.environ.get(CoreConfig.DAEMON_ENV_VAR) == "1" and \
+        not os.environ.get(CoreConfig.PROFILE_ENV_VAR) and \
+        len(args) > 0 and args[0] in CoreConfig.DAEMON_COMMANDS
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    if forwards(args):
+        prog_name = os.path.basename(sys.argv[0])
+        reply = send_request(CoreConfig.DAEMON_SOCKET_PATH,
+                             encode_request("run", prog_name, *args))
+        if reply is not None:
+            status, output, error = reply
+            sys.stdout.buffer.write(output)
+            sys.stderr.buffer.write(error)
+            sys.exit(status)
+        start_daemon()
+
+    from math_cli_api_kit.cli.__main__ import cli
+
+    cli()
+
+
+if __name__ == '__main__':
+    main()
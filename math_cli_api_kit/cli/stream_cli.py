@@ -0,0 +1,157 @@
+"""This module defines the `stream` command of the command-line
+interface (CLI), which evaluates many operations in one process.
+
+Rows are read from NDJSON or CSV input, evaluated in fixed-size chunks
+through the batch engine and written out chunk by chunk, so memory use
+does not depend on the size of the input. A row that cannot be
+evaluated produces an error result instead of aborting the stream.
+
+NDJSON rows have the same format as the items of the batch endpoint,
+e.g. `{"operation": "sum", "operands": {"x": 1, "y": 2}}`, and every
+result is written as one JSON line. CSV input must have a header row
+with an `operation` column and one column per operand name; empty cells
+are ignored. CSV results are written as `result,error` rows.
+"""
+
+import csv
+import itertools
+import json
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+import click
+
+from math_cli_api_kit.config import APIConfig
+from math_cli_api_kit.core.batch import evaluate_batch
+from math_cli_api_kit.core.executors import create_executor, map_bounded
+from math_cli_api_kit.core.validation import is_integer_string, \
+    is_numeric_string
+
+DEFAULT_CHUNK_SIZE = 1024
+
+
+def _parse_number(value: str) -> Any:
+    """Convert a CSV cell to an int or float, leaving other strings
+    unchanged so that they are reported as invalid operands.
+    """
+    if is_integer_string(value):
+        return int(value)
+    if is_numeric_string(value):
+        return float(value)
+    return value
+
+
+def read_ndjson_rows(stream: TextIO) -> Iterator[Any]:
+    """Yield the batch items of NDJSON input, one per non-empty line.
+
+    Lines that are not valid JSON are yielded as None, which the batch
+    engine reports as an invalid item.
+    """
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def read_csv_rows(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """Yield the batch items of CSV input with an `operation` column."""
+    for row in csv.DictReader(stream):
+        operation = row.pop("operation", None)
+        yield {
+            "operation": operation,
+            "operands": {
+                name: _parse_number(value.strip())
+                for name, value in row.items()
+                if name is not None and value is not None and value.strip()
+            },
+        }
+
+
+def write_ndjson_results(stream: TextIO, results: Iterable[dict]) -> None:
+    stream.writelines(
+        json.dumps(result, separators=(",", ":")) + "\n"
+        for result in results
+    )
+
+
+def write_csv_results(stream: TextIO, results: Iterable[dict]) -> None:
+    writer = csv.writer(stream)
+    writer.writerows(
+        (result["result"], "") if "result" in result
+        else ("", result["message"])
+        for result in results
+    )
+
+
+def _iter_chunks(rows: Iterable[Any], chunk_size: int) -> Iterator[List]:
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def stream_evaluate(
+        rows: Iterable[Any], output: TextIO, output_format: str,
+        chunk_size: int, vectorize_threshold: int,
+        executor: Optional[Executor] = None, max_pending: int = 1
+) -> None:
+    """Evaluate rows chunk by chunk and write their results in order.
+
+    With an executor, up to `max_pending` chunks are evaluated
+    concurrently while the results are still written in input order.
+    """
+    write = write_csv_results if output_format == "csv" \
+        else write_ndjson_results
+    if output_format == "csv":
+        csv.writer(output).writerow(("result", "error"))
+
+    evaluate = partial(evaluate_batch,
+                       vectorize_threshold=vectorize_threshold)
+    chunks = _iter_chunks(rows, chunk_size)
+    results = map(evaluate, chunks) if executor is None \
+        else map_bounded(executor, evaluate, chunks, max_pending)
+    for chunk_results in results:
+        write(output, chunk_results)
+        output.flush()
+
+
+@click.command("stream", help="Evaluate NDJSON or CSV rows of operations"
+                              " from a file or stdin and write one result"
+                              " per row to stdout.")
+@click.option("-i", "--input", "input_file", type=click.File("r"),
+              default="-", help="Read rows from this file instead of stdin")
+@click.option("-f", "--format", "input_format",
+              type=click.Choice(["ndjson", "csv"]), default=None,
+              help="Input format, inferred from the file extension by"
+                   " default and 'ndjson' for stdin")
+@click.option("--chunk-size", type=click.IntRange(min=1),
+              default=DEFAULT_CHUNK_SIZE, show_default=True,
+              help="Number of rows evaluated at once")
+@click.option("-w", "--workers", type=click.IntRange(min=1), default=1,
+              show_default=True,
+              help="Number of worker processes evaluating chunks")
+def stream(
+        input_file: TextIO, input_format: str, chunk_size: int, workers: int
+) -> None:
+    if input_format is None:
+        input_format = "csv" if input_file.name.endswith(".csv") \
+            else "ndjson"
+
+    rows = read_csv_rows(input_file) if input_format == "csv" \
+        else read_ndjson_rows(input_file)
+    executor = create_executor("process", workers) if workers > 1 \
+        else None
+    try:
+        stream_evaluate(rows, click.get_text_stream("stdout"),
+                        input_format, chunk_size,
+                        APIConfig.BATCH_VECTORIZE_THRESHOLD, executor,
+                        max_pending=2 * workers)
+    finally:
+        if executor is not None:
+            executor.shutdown()
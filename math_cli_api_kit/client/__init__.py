@@ -0,0 +1,23 @@
+"""This package provides the Python clients of the Math API: the
+synchronous `MathClient` and the asynchronous `AsyncMathClient`.
+
+Both keep a pool of keep-alive connections, retry failed requests with
+a jittered exponential backoff and merge concurrent calls into requests
+to the batch endpoint. Their `algebra` and `geometry` attributes mirror
+the methods of `Algebra` and `Geometry`:
+
+    with MathClient("http://127.0.0.1:8000") as client:
+        client.algebra.sum(3, 4.5)
+
+The clients require httpx, installed with the `client` extra.
+"""
+
+from math_cli_api_kit.client.async_client import AsyncMathClient
+from math_cli_api_kit.client.common import ClientAlgebra, ClientGeometry, \
+    MathAPIError, RetryPolicy, has_httpx
+from math_cli_api_kit.client.sync_client import MathClient
+
+__all__ = [
+    "AsyncMathClient", "ClientAlgebra", "ClientGeometry", "MathAPIError",
+    "MathClient", "RetryPolicy", "has_httpx",
+]
@@ -0,0 +1,171 @@
+"""This module provides `AsyncMathClient`, the asynchronous client of
+the Math API.
+
+The client keeps a pool of keep-alive connections and retries the
+requests that fail on a transport error or a 502, 503 or 504 response
+with a jittered exponential backoff, like `MathClient`.
+
+Concurrent calls are batched: the calls made within `batch_window`
+seconds, or within the current event loop iteration when it is 0, are
+sent together in one request to the batch endpoint, and a batch is sent
+as soon as `max_batch_items` calls are pending. A call made alone is
+sent to its own endpoint.
+"""
+
+import asyncio
+import json
+from typing import Any, List, Mapping, Optional, Set, Tuple
+
+from math_cli_api_kit.client.common import RETRY_STATUSES, \
+    ClientAlgebra, ClientGeometry, RetryPolicy, batch_request, \
+    entry_result, find_operation, httpx, operation_request, \
+    read_batch_results, read_result, require_httpx
+from math_cli_api_kit.config import APIConfig
+
+# operation name, operands and the future of the caller
+_Call = Tuple[str, Mapping[str, Any], "asyncio.Future[Any]"]
+
+
+class AsyncMathClient:
+    """Asynchronous client of the Math API served at `base_url`, see
+    the module documentation. The operations are available through the
+    `algebra` and `geometry` attributes, whose methods mirror `Algebra`
+    and `Geometry` and return awaitables, or by name through `compute`.
+
+    An httpx `transport` can be given to send the requests to something
+    else than the network, for instance in tests.
+    """
+
+    def __init__(
+            self, base_url: str = APIConfig.CLIENT_BASE_URL, *,
+            timeout: float = APIConfig.CLIENT_TIMEOUT,
+            max_connections: int = APIConfig.CLIENT_MAX_CONNECTIONS,
+            retry: Optional[RetryPolicy] = None,
+            batch_window: Optional[float] = APIConfig.CLIENT_BATCH_WINDOW,
+            max_batch_items: int = APIConfig.CLIENT_BATCH_MAX_ITEMS,
+            transport: Any = None
+    ):
+        require_httpx()
+        self.retry = RetryPolicy() if retry is None else retry
+        self.batch_window = batch_window
+        self.max_batch_items = max_batch_items
+        self.algebra = ClientAlgebra(self)
+        self.geometry = ClientGeometry(self)
+        self._http = httpx.AsyncClient(
+            base_url=base_url, timeout=timeout, transport=transport,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections)
+        )
+        self._pending: List[_Call] = []
+        self._handle: Optional[asyncio.Handle] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    async def compute(self, operation: str, **operands: Any) -> Any:
+        """Compute an operation by name and return its result, or raise
+        a MathAPIError if the API answers with an error.
+        """
+        find_operation(operation)
+        if self.batch_window is None:
+            return await self._send_one(operation, operands)
+
+        loop = asyncio.get_running_loop()
+        # every caller waits for its own future, so that a cancelled
+        # caller does not cancel the others
+        future = loop.create_future()
+        self._pending.append((operation, operands, future))
+        if len(self._pending) >= self.max_batch_items:
+            self.flush()
+        elif len(self._pending) == 1:
+            self._handle = loop.call_later(
+                self.batch_window, self.flush
+            ) if self.batch_window > 0 else loop.call_soon(self.flush)
+        return await future
+
+    def flush(self) -> None:
+        """Send the pending calls now."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        calls, self._pending = self._pending, []
+        if calls:
+            task = asyncio.get_running_loop().create_task(
+                self._send_batch(calls)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def aclose(self) -> None:
+        """Send the pending calls, wait for the batches in progress and
+        close the connections of the pool.
+        """
+        self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._http.aclose()
+
+    async def __aenter__(self) -> "AsyncMathClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _post(self, path: str, body: Any) -> Tuple[int, bytes]:
+        """Send a request, with retries, and return the status and the
+        body of its response.
+        """
+        content = json.dumps(body).encode()
+        headers = {"Content-Type": "application/json"}
+        attempt = 0
+        while True:
+            try:
+                response = await self._http.post(path, content=content,
+                                                 headers=headers)
+            except httpx.TransportError:
+                if attempt >= self.retry.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or \
+                        attempt >= self.retry.retries:
+                    return response.status_code, response.content
+            await asyncio.sleep(self.retry.delay(attempt))
+            attempt += 1
+
+    async def _send_one(
+            self, operation: str, operands: Mapping[str, Any]
+    ) -> Any:
+        return read_result(*await self._post(
+            *operation_request(operation, operands)
+        ))
+
+    async def _send_batch(self, calls: List[_Call]) -> None:
+        """Send the calls, a lone one to its own endpoint, and resolve
+        the futures of the callers still waiting.
+        """
+        if len(calls) == 1:
+            operation, operands, future = calls[0]
+            try:
+                result = await self._send_one(operation, operands)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            return
+
+        try:
+            entries = read_batch_results(*await self._post(*batch_request(
+                [(operation, operands) for operation, operands, _ in calls]
+            )))
+        except Exception as e:
+            for _, _, future in calls:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, _, future), entry in zip(calls, entries):
+            if future.done():
+                continue
+            try:
+                future.set_result(entry_result(entry))
+            except Exception as e:
+                future.set_exception(e)
@@ -0,0 +1,229 @@
+"""This module provides the parts of the Math API clients shared by the
+synchronous and the asynchronous client: the error type, the retry
+policy, the parsing of the responses and the `ClientAlgebra` and
+`ClientGeometry` facades, whose methods mirror `Algebra` and `Geometry`.
+
+Responses are parsed with the standard library `json` module, with
+integers of any length, so that big factorials are returned exactly.
+"""
+
+import json
+import random
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple, Union
+
+from math_cli_api_kit.config import APIConfig
+from math_cli_api_kit.core.factorial import parse_decimal
+from math_cli_api_kit.core.registry import OPERATIONS, Operation
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+Number = Union[int, float]
+
+# statuses of the responses worth retrying: the server was restarting,
+# too busy, or timed out computing
+RETRY_STATUSES = (502, 503, 504)
+
+API_PATH = f"/{APIConfig.API_BASEPATH}/math/api".replace("//", "/")
+
+
+class MathAPIError(Exception):
+    """The Math API answered a request, or an item of a batch, with an
+    error.
+    """
+
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def has_httpx() -> bool:
+    """Check whether httpx is available for the Math API clients."""
+    return httpx is not None
+
+
+def require_httpx() -> None:
+    """Raise an ImportError if httpx, the HTTP client of the Math API
+    clients, is not installed.
+    """
+    if not has_httpx():
+        raise ImportError("the Math API clients require httpx, install it"
+                          " with `pip install math-cli-api-kit[client]`")
+
+
+class RetryPolicy:
+    """Retries failed requests up to `retries` times, waiting a random
+    delay between 0 and an exponentially growing backoff ("full
+    jitter"), so that clients failing together do not retry together.
+    """
+
+    def __init__(
+            self, retries: Optional[int] = None,
+            backoff: Optional[float] = None,
+            max_backoff: Optional[float] = None
+    ):
+        self.retries = APIConfig.CLIENT_RETRIES \
+            if retries is None else retries
+        self.backoff = APIConfig.CLIENT_RETRY_BACKOFF \
+            if backoff is None else backoff
+        self.max_backoff = APIConfig.CLIENT_RETRY_MAX_BACKOFF \
+            if max_backoff is None else max_backoff
+
+    def delay(self, attempt: int) -> float:
+        """Return the delay in seconds before retry number `attempt`,
+        counted from 0.
+        """
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** attempt)
+        )
+
+
+def _parse_int(text: str) -> int:
+    return parse_decimal(text) if len(text) > 4000 else int(text)
+
+
+def parse_body(body: bytes) -> Any:
+    """Parse a JSON response body, with integers of any length."""
+    return json.loads(body, parse_int=_parse_int)
+
+
+def find_operation(name: str) -> Operation:
+    """Return a registered operation and raise a ValueError if there is
+    none with that name.
+    """
+    operation = OPERATIONS.get(name)
+    if operation is None:
+        raise ValueError(f"unknown operation '{name}'")
+    return operation
+
+
+def operation_request(
+        name: str, operands: Mapping[str, Any]
+) -> Tuple[str, Dict[str, Any]]:
+    """Return the path and the JSON body of the request of an
+    operation.
+    """
+    operation = find_operation(name)
+    return f"{API_PATH}/{operation.family}/{name}", dict(operands)
+
+
+def batch_request(
+        calls: Sequence[Tuple[str, Mapping[str, Any]]]
+) -> Tuple[str, list]:
+    """Return the path and the JSON body of the batch request of the
+    operations.
+    """
+    return f"{API_PATH}/batch", [
+        {"operation": name, "operands": dict(operands)}
+        for name, operands in calls
+    ]
+
+
+def read_result(status: int, body: bytes) -> Any:
+    """Return the result of an operation response, or raise a
+    MathAPIError if it failed.
+    """
+    try:
+        content = parse_body(body)
+    except ValueError:
+        content = None
+    if not isinstance(content, Mapping):
+        raise MathAPIError(f"unexpected response with status {status}",
+                           status)
+    if status != 200:
+        raise MathAPIError(str(content.get("message")), status)
+    # the algebra endpoints answer under "results"
+    return content["result"] if "result" in content else content["results"]
+
+
+def read_batch_results(status: int, body: bytes) -> list:
+    """Return the result entries of a batch response, or raise a
+    MathAPIError if the whole batch failed.
+    """
+    if status != 200:
+        read_result(status, body)
+    return parse_body(body)["results"]
+
+
+def entry_result(entry: Mapping[str, Any]) -> Any:
+    """Return the result of a batch entry, or raise a MathAPIError if
+    its item failed.
+    """
+    if entry.get("status") != 200:
+        raise MathAPIError(str(entry.get("message")), entry.get("status"))
+    result = entry["result"]
+    # integers too large for JSON numbers are sent as decimal strings
+    return parse_decimal(result) if isinstance(result, str) else result
+
+
+class ClientAlgebra:
+    """Provides the operations of `Algebra` through a Math API client.
+    The methods of an asynchronous client return awaitables.
+    """
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    def sum(self, x: Number, y: Number) -> Any:
+        """Return the sum of x and y."""
+        return self._client.compute("sum", x=x, y=y)
+
+    def sub(self, x: Number, y: Number) -> Any:
+        """Return the subtraction of x by y."""
+        return self._client.compute("sub", x=x, y=y)
+
+    def mul(self, x: Number, y: Number) -> Any:
+        """Return the multiplication of x by y."""
+        return self._client.compute("mul", x=x, y=y)
+
+    def div(self, x: Number, y: Number) -> Any:
+        """Return the division of x by y."""
+        return self._client.compute("div", x=x, y=y)
+
+    def pow(self, x: Number, y: Number) -> Any:
+        """Return x**y (x to the power of y)."""
+        return self._client.compute("pow", x=x, y=y)
+
+    def square_root(self, x: Number) -> Any:
+        """Return the square root of x."""
+        return self._client.compute("square_root", x=x)
+
+    def factorial(self, x: int) -> Any:
+        """Find x!."""
+        return self._client.compute("factorial", x=x)
+
+    def exp(self, x: Number) -> Any:
+        """Return e raised to the power of x."""
+        return self._client.compute("exp", x=x)
+
+
+class ClientGeometry:
+    """Provides the operations of `Geometry` through a Math API client.
+    The methods of an asynchronous client return awaitables.
+    """
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    def surface_of_square(self, a: Number) -> Any:
+        """Return the surface of square."""
+        return self._client.compute("surface_of_square", a=a)
+
+    def surface_of_circle(self, r: Number) -> Any:
+        """Return the surface of a circle."""
+        return self._client.compute("surface_of_circle", r=r)
+
+    def surface_of_triangle(self, b: Number, h: Number) -> Any:
+        """Return the surface of a triangle."""
+        return self._client.compute("surface_of_triangle", b=b, h=h)
+
+    def surface_of_trapezoid(self, a: Number, b: Number, h: Number) -> Any:
+        """Return the surface of a trapezoid."""
+        return self._client.compute("surface_of_trapezoid", a=a, b=b, h=h)
+
+    def hypotenuse(self, a: Number, b: Number) -> Any:
+        """Return the hypotenuse of a triangle."""
+        return self._client.compute("hypotenuse", a=a, b=b)
@@ -0,0 +1,162 @@
+"""This module provides `MathClient`, the synchronous client of the Math
+API.
+
+The client keeps a pool of keep-alive connections, so that consecutive
+calls reuse them, and retries the requests that fail on a transport
+error or a 502, 503 or 504 response with a jittered exponential
+backoff.
+
+Calls from one thread never overlap, so batching is disabled by
+default. With a `batch_window`, the calls made by concurrent threads
+within the window are merged: the first call of a batch waits for the
+window, or until `max_batch_items` calls are pending, then sends them
+all in one request to the batch endpoint while the other threads wait
+for their results.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, List, Mapping, Optional, Tuple
+
+from math_cli_api_kit.client.common import RETRY_STATUSES, \
+    ClientAlgebra, ClientGeometry, RetryPolicy, batch_request, \
+    entry_result, find_operation, httpx, operation_request, \
+    read_batch_results, read_result, require_httpx
+from math_cli_api_kit.config import APIConfig
+
+# operation name, operands and the future of the caller
+_Call = Tuple[str, Mapping[str, Any], "Future[Any]"]
+
+
+class _Batch:
+    """The calls of one batch, and an event set when it is full."""
+
+    def __init__(self):
+        self.calls: List[_Call] = []
+        self.full = threading.Event()
+
+
+class MathClient:
+    """Synchronous client of the Math API served at `base_url`, see the
+    module documentation. The operations are available through the
+    `algebra` and `geometry` attributes, whose methods mirror `Algebra`
+    and `Geometry`, or by name through `compute`.
+
+    An httpx `transport` can be given to send the requests to something
+    else than the network, for instance in tests.
+    """
+
+    def __init__(
+            self, base_url: str = APIConfig.CLIENT_BASE_URL, *,
+            timeout: float = APIConfig.CLIENT_TIMEOUT,
+            max_connections: int = APIConfig.CLIENT_MAX_CONNECTIONS,
+            retry: Optional[RetryPolicy] = None,
+            batch_window: Optional[float] = None,
+            max_batch_items: int = APIConfig.CLIENT_BATCH_MAX_ITEMS,
+            transport: Any = None
+    ):
+        require_httpx()
+        self.retry = RetryPolicy() if retry is None else retry
+        self.batch_window = batch_window
+        self.max_batch_items = max_batch_items
+        self.algebra = ClientAlgebra(self)
+        self.geometry = ClientGeometry(self)
+        self._http = httpx.Client(
+            base_url=base_url, timeout=timeout, transport=transport,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections)
+        )
+        self._batch: Optional[_Batch] = None
+        self._lock = threading.Lock()
+
+    def compute(self, operation: str, **operands: Any) -> Any:
+        """Compute an operation by name and return its result, or raise
+        a MathAPIError if the API answers with an error.
+        """
+        find_operation(operation)
+        if self.batch_window is None:
+            return self._send_one(operation, operands)
+
+        future: "Future[Any]" = Future()
+        with self._lock:
+            batch = self._batch
+            leader = batch is None
+            if leader:
+                batch = self._batch = _Batch()
+            batch.calls.append((operation, operands, future))
+            if len(batch.calls) >= self.max_batch_items:
+                # later calls start a new batch
+                self._batch = None
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.batch_window)
+            with self._lock:
+                if self._batch is batch:
+                    self._batch = None
+            self._send_batch(batch.calls)
+        return future.result()
+
+    def close(self) -> None:
+        """Close the connections of the pool."""
+        self._http.close()
+
+    def __enter__(self) -> "MathClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _post(self, path: str, body: Any) -> Tuple[int, bytes]:
+        """Send a request, with retries, and return the status and the
+        body of its response.
+        """
+        content = json.dumps(body).encode()
+        headers = {"Content-Type": "application/json"}
+        attempt = 0
+        while True:
+            try:
+                response = self._http.post(path, content=content,
+                                           headers=headers)
+            except httpx.TransportError:
+                if attempt >= self.retry.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or \
+                        attempt >= self.retry.retries:
+                    return response.status_code, response.content
+            time.sleep(self.retry.delay(attempt))
+            attempt += 1
+
+    def _send_one(self, operation: str, operands: Mapping[str, Any]) -> Any:
+        return read_result(*self._post(
+            *operation_request(operation, operands)
+        ))
+
+    def _send_batch(self, calls: List[_Call]) -> None:
+        """Send the calls, a lone one to its own endpoint, and resolve
+        their futures.
+        """
+        if len(calls) == 1:
+            operation, operands, future = calls[0]
+            try:
+                future.set_result(self._send_one(operation, operands))
+            except Exception as e:
+                future.set_exception(e)
+            return
+
+        try:
+            entries = read_batch_results(*self._post(*batch_request(
+                [(operation, operands) for operation, operands, _ in calls]
+            )))
+        except Exception as e:
+            for _, _, future in calls:
+                future.set_exception(e)
+            return
+        for (_, _, future), entry in zip(calls, entries):
+            try:
+                future.set_result(entry_result(entry))
+            except Exception as e:
+                future.set_exception(e)
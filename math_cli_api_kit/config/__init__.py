@@ -9,8 +9,80 @@ refer to the project's documentation or the official GitHub repository:
 https://github.com/gasparyanvazgen/math-cli-api-kit
 """
 
+import os
+import tempfile
+
 GITHUB_REPO_URL = "https://github.com/gasparyanvazgen/math-cli-api-kit"
 
+# numeric backends of the operations, defined here so that the CLI
+# builds its options without importing the precise backends
+NUMERIC_BACKENDS = ("float", "decimal", "fraction")
+
+
+class CoreConfig:
+    # factorial engine settings
+    FACTORIAL_MAX_INPUT = 100_000
+    FACTORIAL_CACHE_SIZE = 32
+
+    # integer powers whose result would have more bits, estimated as
+    # abs(y) * x.bit_length(), are rejected before any work is done
+    POW_MAX_RESULT_BITS = 1 << 21
+
+    # "decimal" and "fraction" backend settings, precisions are numbers
+    # of significant digits; constants and kernel results are memoized
+    # per precision
+    DEFAULT_PRECISION = 28
+    MAX_PRECISION = 10_000
+    PRECISION_CACHE_SIZE = 256
+
+    # compiled expression plans are kept in an LRU cache keyed by the
+    # expression text
+    EXPRESSION_CACHE_SIZE = 1024
+    EXPRESSION_MAX_LENGTH = 4096
+
+    # persistent memo store of the results whose estimated cost reaches
+    # the minimum, shared by the CLI and the API workers; it is enabled
+    # by setting its directory here or in the environment variable
+    MEMO_DIRECTORY = None
+    MEMO_ENV_VAR = "MATH_CLI_API_KIT_MEMO_DIR"
+    MEMO_MAX_BYTES = 256 * 1024 * 1024
+    MEMO_MIN_COST = 100_000
+
+    # operations whose kernels consult precomputed lookup tables of the
+    # results for small int operands, among "factorial", "pow",
+    # "surface_of_square" and "surface_of_circle"; the tables cover the
+    # operands from 0, or from -POW_TABLE_MAX_BASE for the bases of
+    # powers, up to their maximum
+    LOOKUP_TABLES = ()
+    FACTORIAL_TABLE_MAX = 1000
+    SQUARE_TABLE_MAX = 10_000
+    CIRCLE_TABLE_MAX = 10_000
+    POW_TABLE_MAX_BASE = 32
+    POW_TABLE_MAX_EXPONENT = 64
+
+    # number of rows per chunk of the memory-mapped column evaluator
+    COLUMNAR_CHUNK_SIZE = 1 << 20
+
+    # number of point-to-target distances computed at a time when
+    # searching the nearest targets of points
+    DISTANCE_CHUNK_SIZE = 1 << 20
+
+    # environment variable holding the output path prefix of the
+    # profiles of the CLI and the API workers; profiling is off when it
+    # is not set
+    PROFILE_ENV_VAR = "MATH_CLI_API_KIT_PROFILE"
+
+    # CLI daemon settings; when the environment variable is set to 1,
+    # the `math-cli` command forwards the daemon commands to a resident
+    # process listening on the Unix socket, started on first use, which
+    # exits after the idle timeout in seconds
+    DAEMON_ENV_VAR = "MATH_CLI_API_KIT_DAEMON"
+    DAEMON_SOCKET_PATH = os.path.join(
+        tempfile.gettempdir(), "math-cli-api-kit-daemon.sock"
+    )
+    DAEMON_IDLE_TIMEOUT = 600.0
+    DAEMON_COMMANDS = ("algebra", "geometry", "expression")
+
 
 class APIConfig:
     API_BASEPATH = "/api"
@@ -26,3 +98,105 @@ class APIConfig:
     API_CONTACT_EMAIL = "gvazgen@outlook.com"
     API_LICENSE_NAME = "MIT"
     API_LICENSE_URL = f"{GITHUB_REPO_URL}/blob/master/LICENSE"
+
+    # batch endpoint settings
+    BATCH_MAX_ITEMS = 100_000
+    BATCH_VECTORIZE_THRESHOLD = 64
+
+    # shape endpoint settings, the largest distance matrix returned and
+    # the largest number of point-to-target distances computed by the
+    # nearest search of a request
+    SHAPES_MAX_DISTANCES = 4_000_000
+    SHAPES_MAX_PAIRS = 100_000_000
+
+    # WebSocket stream settings, at most this many frames of a stream
+    # are computed at a time; further frames are not read until one of
+    # them is answered
+    STREAM_MAX_IN_FLIGHT = 64
+
+    # result cache settings, the "socket" backend shares one cache
+    # between all Sanic workers through a local Unix socket
+    RESULT_CACHE_ENABLED = False
+    RESULT_CACHE_BACKEND = "memory"
+    RESULT_CACHE_MAX_ENTRIES = 10_000
+    RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    RESULT_CACHE_TTL = 60.0
+    RESULT_CACHE_SOCKET_PATH = os.path.join(
+        tempfile.gettempdir(), "math-cli-api-kit-cache.sock"
+    )
+    # seconds a worker waits for the shared cache before treating a
+    # request to it as a miss
+    RESULT_CACHE_SOCKET_TIMEOUT = 0.05
+
+    # serializer settings, the JSON backend is "auto" (the fastest
+    # installed of orjson and ujson, else json), "orjson", "ujson" or
+    # "json"; binary response formats are selected through the Accept
+    # header when enabled
+    JSON_BACKEND = "auto"
+    BINARY_FORMATS_ENABLED = True
+
+    # default numeric backend of the algebra and geometry endpoints,
+    # "float", "decimal" or "fraction"; requests select another backend
+    # and precision with the `numeric` and `precision` query arguments
+    NUMERIC_BACKEND = "float"
+
+    # executor settings, "inline", "thread", "process" or "isolated";
+    # operations and batches with an estimated cost above the threshold
+    # are offloaded from the event loop to the executor, and rejected
+    # with "inline"; pure-Python work on "thread" holds the GIL and
+    # still stalls the event loop, and only "isolated" stops a running
+    # operation when it times out
+    EXECUTOR = "isolated"
+    EXECUTOR_WORKERS = None
+    EXECUTOR_COST_THRESHOLD = 200_000
+    # offloaded operations answer 504 after the timeout in seconds, and
+    # 503 while the maximum number of them is in progress in a worker
+    COMPUTE_TIMEOUT = 30.0
+    COMPUTE_MAX_PENDING = 64
+
+    # micro-batching settings, concurrent requests for the same cheap
+    # operation are collected for up to the window in seconds (0 waits
+    # for the end of the current event loop iteration) or the maximum
+    # number of items, then evaluated together, identical requests only
+    # once; groups of at least BATCH_VECTORIZE_THRESHOLD are vectorized
+    # for the operations whose vectorized kernel is exact
+    MICROBATCH_ENABLED = False
+    MICROBATCH_WINDOW = 0.001
+    MICROBATCH_MAX_ITEMS = 256
+
+    # `serve` command settings; the workers default to one per CPU,
+    # and in-progress requests are drained for up to the graceful
+    # shutdown timeout in seconds, longer than COMPUTE_TIMEOUT
+    SERVE_HOST = "127.0.0.1"
+    SERVE_PORT = 8000
+    SERVE_WORKERS = None
+    SERVE_BACKLOG = 1024
+    SERVE_ACCESS_LOG = False
+    SERVE_KEEP_ALIVE_TIMEOUT = 30
+    SERVE_REQUEST_MAX_SIZE = 16 * 1024 * 1024
+    SERVE_REQUEST_TIMEOUT = 30
+    SERVE_RESPONSE_TIMEOUT = 60
+    SERVE_GRACEFUL_SHUTDOWN_TIMEOUT = 35.0
+
+    # Python client settings; the async client sends the calls made
+    # within the batch window in seconds together to the batch endpoint
+    # (0 merges the calls of one event loop iteration, None disables
+    # batching), and failed requests are retried up to CLIENT_RETRIES
+    # times after a random delay of up to the backoff, doubled on every
+    # retry
+    CLIENT_BASE_URL = "http://127.0.0.1:8000"
+    CLIENT_TIMEOUT = 30.0
+    CLIENT_MAX_CONNECTIONS = 16
+    CLIENT_BATCH_WINDOW = 0.0
+    CLIENT_BATCH_MAX_ITEMS = 1000
+    CLIENT_RETRIES = 3
+    CLIENT_RETRY_BACKOFF = 0.05
+    CLIENT_RETRY_MAX_BACKOFF = 2.0
+
+    # metrics settings, exposed in the Prometheus text format; latency
+    # histogram buckets are in seconds
+    METRICS_ENABLED = True
+    METRICS_PATH = "/metrics"
+    METRICS_PREFIX = "math_api"
+    METRICS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                       0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
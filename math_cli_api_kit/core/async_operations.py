@@ -0,0 +1,179 @@
+"""This module provides asynchronous counterparts of the Algebra and
+Geometry classes, for use inside an event loop such as the API workers.
+
+Every operation estimates its cost from the size of its operands with
+`estimate_cost`. Cheap operations are computed inline, since a round
+trip to an executor would cost more than the operation itself, while
+expensive ones, such as big factorials and integer powers with huge
+exponents, are sent to the executor so that they never block the event
+loop. Without an executor, expensive operations are rejected instead.
+
+The awaiting task stops waiting for an offloaded operation when it is
+cancelled, e.g. when the HTTP client disconnects, or when the operation
+exceeds the timeout. A task still queued in the executor is then
+dropped, and a running task of an "isolated" executor is stopped by
+terminating its process, but a thread or process pool keeps running it
+in the background until it finishes. Pure-Python work, such as big
+integer arithmetic, holds the GIL on a thread pool: it stalls the event
+loop, which cannot even fire the timeout meanwhile, so such operations
+belong on a process or isolated executor. The number of offloaded
+operations in flight can be limited, so that a flood of expensive
+requests is rejected early instead of queueing up.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Callable, Optional
+
+from math_cli_api_kit.config import APIConfig
+from math_cli_api_kit.core.costs import estimate_cost
+from math_cli_api_kit.core.executors import run_kernel
+from math_cli_api_kit.core.registry import OPERATIONS
+
+
+class ComputeTimeoutError(TimeoutError):
+    """An offloaded operation did not finish within the timeout."""
+
+
+class ComputeUnavailableError(RuntimeError):
+    """Too many offloaded operations are already in flight."""
+
+
+class ComputeRejectedError(ValueError):
+    """An operation is too expensive to be computed without an
+    executor.
+    """
+
+
+class AsyncOperations:
+    """Computes the registered operations without blocking the event
+    loop, see the module documentation.
+
+    Operations whose estimated cost reaches `cost_threshold`, by default
+    `APIConfig.EXECUTOR_COST_THRESHOLD`, are run on `executor`, and fail
+    with `ComputeRejectedError` when it is None. They fail with
+    `ComputeTimeoutError` after `timeout` seconds, or with
+    `ComputeUnavailableError` when `max_pending` operations are already
+    offloaded.
+    """
+
+    def __init__(
+            self, executor: Optional[Executor] = None,
+            cost_threshold: Optional[float] = None,
+            timeout: Optional[float] = None,
+            max_pending: Optional[int] = None
+    ):
+        self.executor = executor
+        self.cost_threshold = APIConfig.EXECUTOR_COST_THRESHOLD \
+            if cost_threshold is None else cost_threshold
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.pending = 0
+
+    async def run(self, operation: str, *operands: Any) -> Any:
+        """Validate the operands of a registered operation and compute
+        it.
+        """
+        entry = OPERATIONS[operation]
+        if len(operands) != entry.arity:
+            raise TypeError(f"{operation} takes {entry.arity} operand(s),"
+                            f" got {len(operands)}")
+        operands = entry.validator(dict(zip(entry.operands, operands)))
+        return await self.compute(estimate_cost(operation, operands),
+                                  run_kernel, operation, *operands)
+
+    async def compute(
+            self, cost: float, function: Callable, *args: Any
+    ) -> Any:
+        """Call a function inline when its estimated cost is below the
+        threshold, and on the executor otherwise. The function must be
+        picklable to run on a process executor.
+        """
+        if cost < self.cost_threshold:
+            return function(*args)
+        if self.executor is None:
+            raise ComputeRejectedError(
+                "the operation is too expensive to be computed without an"
+                " executor"
+            )
+        if self.max_pending is not None and \
+                self.pending >= self.max_pending:
+            raise ComputeUnavailableError(
+                f"{self.pending} operations are already in progress"
+            )
+
+        self.pending += 1
+        future = self.executor.submit(function, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future),
+                                          self.timeout)
+        except asyncio.TimeoutError:
+            raise ComputeTimeoutError(f"the operation did not finish"
+                                      f" within {self.timeout} seconds")
+        finally:
+            self.pending -= 1
+            # drops a queued task, or stops a running isolated task,
+            # when the operation was cancelled or timed out; a running
+            # task of a pool is left to finish
+            future.cancel()
+
+
+class AsyncAlgebra(AsyncOperations):
+    """Provides the operations of `Algebra` as coroutines."""
+
+    async def sum(self, x: Any, y: Any) -> Any:
+        """Return the sum of x and y."""
+        return await self.run("sum", x, y)
+
+    async def sub(self, x: Any, y: Any) -> Any:
+        """Return the subtraction of x by y."""
+        return await self.run("sub", x, y)
+
+    async def mul(self, x: Any, y: Any) -> Any:
+        """Return the multiplication of x by y."""
+        return await self.run("mul", x, y)
+
+    async def div(self, x: Any, y: Any) -> Any:
+        """Return the division of x by y."""
+        return await self.run("div", x, y)
+
+    async def pow(self, x: Any, y: Any) -> Any:
+        """Return x**y (x to the power of y)."""
+        return await self.run("pow", x, y)
+
+    async def square_root(self, x: Any) -> Any:
+        """Return the square root of x."""
+        return await self.run("square_root", x)
+
+    async def factorial(self, x: Any) -> int:
+        """Find x!. Raises a ValueError if x is negative or
+        non-integral, or exceeds the configured maximum input."""
+        return await self.run("factorial", x)
+
+    async def exp(self, x: Any) -> Any:
+        """Return e raised to the power of x."""
+        return await self.run("exp", x)
+
+
+class AsyncGeometry(AsyncOperations):
+    """Provides the operations of `Geometry` as coroutines."""
+
+    async def surface_of_square(self, a: Any) -> Any:
+        """Return the surface of square."""
+        return await self.run("surface_of_square", a)
+
+    async def surface_of_circle(self, r: Any) -> Any:
+        """Return the surface of a circle."""
+        return await self.run("surface_of_circle", r)
+
+    async def surface_of_triangle(self, b: Any, h: Any) -> Any:
+        """Return the surface of a triangle."""
+        return await self.run("surface_of_triangle", b, h)
+
+    async def surface_of_trapezoid(self, a: Any, b: Any, h: Any) -> Any:
+        """Return the surface of a trapezoid."""
+        return await self.run("surface_of_trapezoid", a, b, h)
+
+    async def hypotenuse(self, a: Any, b: Any) -> Any:
+        """Return the hypotenuse of a triangle."""
+        return await self.run("hypotenuse", a, b)
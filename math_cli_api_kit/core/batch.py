@@ -0,0 +1,163 @@
+"""This module evaluates batches of math operations.
+
+A batch is a sequence of items, each with an `operation` name from the
+operation registry and a mapping of named `operands`. Every item gets
+its own result entry, in the same order, with a `status` and either a
+`result` or an error `message`, so one invalid item never fails the
+whole batch. Large groups of the same operation are evaluated with the
+vectorized engine when NumPy is available, for the operations whose
+vectorized kernel computes the same floats as the scalar one.
+"""
+
+import math
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from math_cli_api_kit.core.factorial import is_large_int, iter_decimal
+from math_cli_api_kit.core.registry import OPERATIONS, Operation
+from math_cli_api_kit.core.vector_operations import has_numpy
+
+BATCH_ERRORS = (TypeError, ValueError, ZeroDivisionError, OverflowError)
+
+
+def batch_result(result: Any) -> dict:
+    """Build the result entry of a successfully evaluated item."""
+    if isinstance(result, complex):
+        return {"message": "The result is not a real number", "status": 400}
+    if is_large_int(result):
+        # too large for a JSON number, sent as a decimal string instead
+        result = "".join(iter_decimal(result))
+    return {"result": result, "message": "Success", "status": 200}
+
+
+def evaluate_item(operation: Operation, operands: Mapping) -> dict:
+    """Evaluate one operation with its scalar kernel, after validating
+    its operands.
+    """
+    try:
+        return batch_result(
+            operation.kernel(*operation.validator(operands))
+        )
+    except BATCH_ERRORS as e:
+        return {"message": str(e), "status": 400}
+
+
+# integers up to this magnitude are converted to float64 exactly
+_MAX_EXACT_INT = 2 ** 53
+
+
+def is_vectorizable(values: Sequence[Any], float_result: bool) -> bool:
+    """Check that operands can be evaluated in float64 without changing
+    the result or its type, i.e. they are plain numbers, their integers
+    are converted to float64 exactly, and the scalar result would be a
+    float anyway: `float_result` tells whether it is for int operands.
+    """
+    has_float = False
+    for value in values:
+        value_type = type(value)
+        if value_type is float:
+            has_float = True
+        elif value_type is not int or \
+                not -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT:
+            return False
+    return float_result or has_float
+
+
+def vector_evaluate(
+        operation: Operation, rows: Sequence[Sequence[Any]]
+) -> List[Optional[float]]:
+    """Evaluate rows of operands of one operation at once with its
+    vectorized kernel.
+
+    Rows the vectorized kernel cannot reproduce exactly, because their
+    result would not be a float, an integer operand is too large for
+    float64 or the result is not finite, get None and must be
+    evaluated by the scalar path, which also reports their errors. So
+    do all rows of an operation without `exact_vector`, whose NumPy
+    kernel may round differently from the scalar one.
+    """
+    results: List[Optional[float]] = [None] * len(rows)
+    if not operation.exact_vector:
+        return results
+    indices = [
+        i for i, row in enumerate(rows)
+        if is_vectorizable(row, operation.float_result)
+    ]
+    if not indices:
+        return results
+    try:
+        columns = [
+            [float(rows[i][k]) for i in indices]
+            for k in range(operation.arity)
+        ]
+        values = operation.vector_function(*columns).tolist()
+    except BATCH_ERRORS:
+        return results
+    for i, value in zip(indices, values):
+        if not isinstance(value, complex) and math.isfinite(value):
+            results[i] = value
+    return results
+
+
+def _evaluate_group(
+        operation: str, indices: List[int], items: Sequence[Any],
+        results: List[Optional[dict]], vectorize_threshold: int
+) -> None:
+    """Evaluate every item of one operation, vectorizing the group when
+    it is large enough and the operation has an exact vectorized
+    kernel, and falling back to the scalar path per item for anything
+    the vectorized kernel cannot reproduce exactly.
+    """
+    entry = OPERATIONS[operation]
+    scalar_indices = indices
+
+    if entry.exact_vector and has_numpy() and \
+            len(indices) >= vectorize_threshold:
+        rows = [
+            [items[i]["operands"].get(name) for name in entry.operands]
+            for i in indices
+        ]
+        scalar_indices = []
+        for i, value in zip(indices, vector_evaluate(entry, rows)):
+            if value is None:
+                scalar_indices.append(i)
+            else:
+                results[i] = batch_result(value)
+
+    for i in scalar_indices:
+        results[i] = evaluate_item(entry, items[i]["operands"])
+
+
+def evaluate_batch(
+        items: Sequence[Any], vectorize_threshold: int
+) -> List[dict]:
+    """Evaluate a batch of items and return their result entries in the
+    same order.
+
+    Groups of at least `vectorize_threshold` items with the same
+    operation are dispatched to the vectorized engine, when it computes
+    the same results as the scalar kernels.
+    """
+    results: List[Optional[dict]] = [None] * len(items)
+    groups: Dict[str, List[int]] = {}
+
+    for i, item in enumerate(items):
+        if not isinstance(item, Mapping) or \
+                not isinstance(item.get("operands"), Mapping):
+            results[i] = {
+                "message": "Each item must contain an 'operation' and"
+                           " an 'operands' object",
+                "status": 400
+            }
+        elif item.get("operation") not in OPERATIONS:
+            results[i] = {
+                "message": f"Operation {item.get('operation')} not found",
+                "status": 404
+            }
+        else:
+            groups.setdefault(item["operation"], []).append(i)
+
+    for operation, indices in groups.items():
+        _evaluate_group(operation, indices, items, results,
+                        vectorize_threshold)
+
+    return results
@@ -0,0 +1,295 @@
+"""This module provides a content-addressed result cache.
+
+Results are keyed on the operation name and its normalized operands and
+stored as already-serialized bytes, so a cache hit skips both the
+computation and the serialization of the result.
+
+Two backends are available: `ResultCache`, an in-process LRU cache
+bounded by entry count, total size and time-to-live, and
+`SocketResultCache`, a client for a `ResultCache` served by
+`serve_result_cache` on a local Unix socket, which lets several worker
+processes share a single cache. `AsyncResultCache` gives the handlers
+of an event loop access to either backend without blocking it.
+"""
+
+import asyncio
+import os
+import signal
+import socket
+import socketserver
+import struct
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from math_cli_api_kit.core.factorial import is_large_int
+
+# counters of the cache lookups made by the API workers
+RESULT_CACHE_COUNTERS = (
+    ("result_cache_hits_total", "Total number of result cache hits."),
+    ("result_cache_misses_total", "Total number of result cache misses."),
+)
+
+_GET, _SET, _STATS, _CLEAR = b"G", b"S", b"I", b"C"
+_HEADER = struct.Struct("!cII")
+_REPLY = struct.Struct("!cI")
+
+
+def make_cache_key(
+        operation: str, operands: Iterable[Any]
+) -> Optional[bytes]:
+    """Return the cache key of an operation applied to its operands, or
+    None if the operands cannot be cached.
+
+    Operands are normalized by type and exact `repr`, so `2` and `2.0`
+    (whose results differ in type) map to different keys while equal
+    values always map to the same one.
+    """
+    parts = [operation]
+    for value in operands:
+        if type(value) not in (int, float) or is_large_int(value):
+            return None
+        parts.append(f"{type(value).__name__[0]}{value!r}")
+    return "\x1f".join(parts).encode()
+
+
+class ResultCache:
+    """In-process LRU cache of serialized results with a time-to-live
+    and hit/miss counters.
+    """
+
+    def __init__(
+            self, max_entries: int, max_bytes: int, ttl: Optional[float]
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, bytes]]" = \
+            OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, value = entry
+            if expires and expires < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: bytes, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires, value)
+            self._size += len(value)
+            while len(self._entries) > self.max_entries or \
+                    self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key: bytes) -> None:
+        _, value = self._entries.pop(key)
+        self._size -= len(value)
+
+
+class SocketResultCache:
+    """Client of a `ResultCache` shared through a local Unix socket.
+
+    Every process keeps one persistent connection, the cache server
+    handles each connection in its own thread. Errors talking to the
+    server, and requests not answered within `timeout` seconds, are
+    treated as cache misses and drop the connection, so a missing or
+    stalled server never fails or blocks a request for long.
+    """
+
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        self.path = path
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        found, value = self._request(_GET, key)
+        return value if found == b"1" else None
+
+    def set(self, key: bytes, value: bytes) -> None:
+        self._request(_SET, key, value)
+
+    def stats(self) -> Dict[str, int]:
+        found, value = self._request(_STATS)
+        if found != b"1":
+            return {}
+        hits, misses, entries, size = struct.unpack("!4Q", value)
+        return {"hits": hits, "misses": misses, "entries": entries,
+                "bytes": size}
+
+    def clear(self) -> None:
+        self._request(_CLEAR)
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def _request(
+            self, command: bytes, key: bytes = b"", value: bytes = b""
+    ) -> Tuple[bytes, bytes]:
+        with self._lock:
+            try:
+                if self._socket is None:
+                    self._socket = socket.socket(socket.AF_UNIX,
+                                                 socket.SOCK_STREAM)
+                    self._socket.settimeout(self.timeout)
+                    self._socket.connect(self.path)
+                self._socket.sendall(
+                    _HEADER.pack(command, len(key), len(value)) + key + value
+                )
+                found, length = _REPLY.unpack(
+                    _recv_exactly(self._socket, _REPLY.size)
+                )
+                return found, _recv_exactly(self._socket, length)
+            except OSError:
+                # including timeouts: the reply may still arrive, so the
+                # connection cannot be reused
+                self.close()
+                return b"0", b""
+
+
+class AsyncResultCache:
+    """Asynchronous access to a result cache from an event loop.
+
+    The requests of a `SocketResultCache` run on a dedicated thread, so
+    that waiting for the cache server never blocks the event loop:
+    lookups are awaited, while results are stored in the background.
+    An in-process `ResultCache` is used directly. `close` waits for the
+    pending writes.
+    """
+
+    def __init__(self, cache: Union[ResultCache, SocketResultCache]):
+        self.cache = cache
+        self._thread = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="result-cache"
+        ) if isinstance(cache, SocketResultCache) else None
+
+    async def get(self, key: bytes) -> Optional[bytes]:
+        """Return the cached body under `key`, or None."""
+        if self._thread is None:
+            return self.cache.get(key)
+        return await asyncio.wrap_future(
+            self._thread.submit(self.cache.get, key)
+        )
+
+    def set(self, key: bytes, value: bytes) -> None:
+        """Store a body under `key`, in the background for a socket."""
+        if self._thread is None:
+            self.cache.set(key, value)
+        else:
+            self._thread.submit(self.cache.set, key, value)
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._thread.shutdown(wait=True)
+            self.cache.close()
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("cache connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+class _CacheRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        cache: ResultCache = self.server.cache
+        sock = self.request
+        while True:
+            try:
+                command, key_length, value_length = _HEADER.unpack(
+                    _recv_exactly(sock, _HEADER.size)
+                )
+                key = _recv_exactly(sock, key_length)
+                value = _recv_exactly(sock, value_length)
+            except (ConnectionError, OSError):
+                return
+
+            reply = b""
+            found = b"1"
+            if command == _GET:
+                reply = cache.get(key)
+                if reply is None:
+                    found, reply = b"0", b""
+            elif command == _SET:
+                cache.set(key, value)
+            elif command == _STATS:
+                stats = cache.stats()
+                reply = struct.pack("!4Q", stats["hits"], stats["misses"],
+                                    stats["entries"], stats["bytes"])
+            elif command == _CLEAR:
+                cache.clear()
+            else:
+                found = b"0"
+            sock.sendall(_REPLY.pack(found, len(reply)) + reply)
+
+
+def _exit_on_signal(signum: int, _) -> None:
+    raise SystemExit(0)
+
+
+class _CacheServer(socketserver.ThreadingMixIn,
+                   socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve_result_cache(
+        path: str, max_entries: int, max_bytes: int, ttl: Optional[float]
+) -> None:
+    """Serve a shared `ResultCache` on a Unix socket until the process
+    is terminated.
+    """
+    # a forked server must not inherit the event loop signal handling
+    # of its parent process
+    signal.set_wakeup_fd(-1)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, _exit_on_signal)
+
+    if os.path.exists(path):
+        os.unlink(path)
+    with _CacheServer(path, _CacheRequestHandler) as server:
+        server.cache = ResultCache(max_entries, max_bytes, ttl)
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(path)
@@ -0,0 +1,172 @@
+"""This module evaluates operations over very large binary columns.
+
+Input columns are memory-mapped, either raw native-endian float64/int64
+files or `.npy` files, and the operation is applied chunk by chunk
+through the vectorized engine, writing into a memory-mapped output
+file. Only one chunk of every column is resident at a time and no
+whole-file copies are made, so columns may be much larger than the
+available memory.
+
+Chunks can be evaluated concurrently by an executor. Process pool
+workers memory-map the input and output files themselves, so no column
+data is pickled between processes.
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Mapping, Optional, Union
+
+from math_cli_api_kit.config import CoreConfig
+from math_cli_api_kit.core.registry import OPERATIONS
+from math_cli_api_kit.core.vector_operations import as_array, np
+
+RAW_DTYPES = ("float64", "int64")
+
+
+def open_column(path: str, dtype: str = "float64") -> "np.ndarray":
+    """Memory-map an input column read-only.
+
+    `.npy` files carry their own dtype and shape, any other file is read
+    as a flat array of `dtype`.
+    """
+    if path.endswith(".npy"):
+        column = np.load(path, mmap_mode="r")
+    else:
+        if dtype not in RAW_DTYPES:
+            raise ValueError(f"unsupported column dtype '{dtype}'. Expected"
+                             f" one of {', '.join(RAW_DTYPES)}.")
+        column = np.memmap(path, dtype=dtype, mode="r")
+    if column.ndim != 1:
+        raise ValueError(f"column {path} must be one-dimensional,"
+                         f" got shape {column.shape}")
+    return column
+
+
+def create_output_column(
+        path: str, length: int, dtype: str = "float64"
+) -> "np.ndarray":
+    """Create a writable memory-mapped output column of `length` items,
+    as a `.npy` file when the path has that extension.
+    """
+    if path.endswith(".npy"):
+        return np.lib.format.open_memmap(path, mode="w+", dtype=dtype,
+                                         shape=(length,))
+    return np.memmap(path, dtype=dtype, mode="w+", shape=(length,))
+
+
+def open_output_column(path: str, dtype: str = "float64") -> "np.ndarray":
+    """Memory-map an existing output column for writing."""
+    if path.endswith(".npy"):
+        return np.load(path, mmap_mode="r+")
+    return np.memmap(path, dtype=dtype, mode="r+")
+
+
+def _evaluate_chunk(
+        operation: str, inputs: Mapping[str, "np.ndarray"],
+        out: "np.ndarray", start: int, stop: int
+) -> None:
+    entry = OPERATIONS[operation]
+    result = entry.vector_function(
+        *(inputs[name][start:stop] for name in entry.operands)
+    )
+    if result.dtype.kind == "c":
+        raise ValueError(f"operation {operation} has non-real results"
+                         f" in rows {start} to {stop - 1}")
+    out[start:stop] = result
+
+
+def _evaluate_file_chunk(
+        operation: str, paths: Mapping[str, str], dtype: str,
+        output: str, output_dtype: str, start: int, stop: int
+) -> None:
+    """Evaluate one chunk in a worker process, memory-mapping the column
+    files in the worker.
+    """
+    inputs = {name: open_column(path, dtype) for name, path in paths.items()}
+    out = open_output_column(output, output_dtype)
+    _evaluate_chunk(operation, inputs, out, start, stop)
+    out.flush()
+
+
+def evaluate_columns(
+        operation: str,
+        columns: Mapping[str, Union[str, "np.ndarray"]],
+        output: Union[str, "np.ndarray"],
+        chunk_size: Optional[int] = None,
+        dtype: str = "float64",
+        output_dtype: str = "float64",
+        executor: Optional[Executor] = None,
+) -> int:
+    """Apply an operation to whole columns of operands, chunk by chunk.
+
+    `columns` maps every operand name of the operation to a file path or
+    an array, and `output` is the path or array the results are written
+    to. Raw input files are read as `dtype`. When an executor is given,
+    chunks are evaluated concurrently on it; a process pool requires
+    file paths for all columns and the output. Returns the number of
+    evaluated rows.
+    """
+    entry = OPERATIONS.get(operation)
+    if entry is None:
+        raise ValueError(f"operation {operation} not found")
+    if entry.vector_function is None:
+        raise ValueError(f"operation {operation} cannot be evaluated over"
+                         f" columns")
+
+    missing = [name for name in entry.operands if name not in columns]
+    if missing:
+        raise TypeError(f"missing column(s) for operand(s):"
+                        f" {', '.join(missing)}")
+
+    inputs: Dict[str, "np.ndarray"] = {
+        name: open_column(columns[name], dtype)
+        if isinstance(columns[name], str) else as_array(columns[name])
+        for name in entry.operands
+    }
+    lengths = {len(column) for column in inputs.values()}
+    if len(lengths) != 1:
+        raise ValueError("all columns must have the same length")
+    length = lengths.pop()
+
+    out = create_output_column(output, length, output_dtype) \
+        if isinstance(output, str) else output
+    if len(out) != length:
+        raise ValueError("the output must have the same length as the"
+                         " input columns")
+
+    chunk_size = chunk_size or CoreConfig.COLUMNAR_CHUNK_SIZE
+    bounds = [
+        (start, min(start + chunk_size, length))
+        for start in range(0, length, chunk_size)
+    ]
+
+    if executor is None:
+        for start, stop in bounds:
+            _evaluate_chunk(operation, inputs, out, start, stop)
+    else:
+        if isinstance(executor, ProcessPoolExecutor):
+            if not isinstance(output, str) or not all(
+                    isinstance(columns[name], str) for name in entry.operands
+            ):
+                raise ValueError("a process pool requires file paths for"
+                                 " all columns and the output")
+            out.flush()
+            futures = [
+                executor.submit(
+                    _evaluate_file_chunk, operation,
+                    {name: columns[name] for name in entry.operands},
+                    dtype, output, output_dtype, start, stop
+                )
+                for start, stop in bounds
+            ]
+        else:
+            futures = [
+                executor.submit(_evaluate_chunk, operation, inputs, out,
+                                start, stop)
+                for start, stop in bounds
+            ]
+        for future in futures:
+            future.result()
+
+    if isinstance(out, np.memmap):
+        out.flush()
+    return length
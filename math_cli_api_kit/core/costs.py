@@ -0,0 +1,159 @@
+"""This module estimates the cost of math operations.
+
+The estimates are rough numbers of bits of big-integer work, which
+callers compare with thresholds to decide whether an operation is cheap
+enough to compute inline, worth offloading to an executor or worth
+storing in the memo store. This module has no dependencies, so that
+the CLI can estimate costs without importing the executors.
+"""
+
+import math
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+from typing import Any, Iterable, Sequence
+
+from math_cli_api_kit.config import CoreConfig
+from math_cli_api_kit.core.factorial import is_large_int
+from math_cli_api_kit.core.registry import OPERATIONS
+from math_cli_api_kit.core.validation import power_bits
+
+# estimated cost of one constant-time operation, in the same units as
+# the bits of big-integer work of factorials and powers (about 100 is
+# the cost of evaluating one item of a batch)
+BASE_COST = 100.0
+
+# decimal digits per bit, log10(2)
+_DIGITS_PER_BIT = 0.30103
+
+# converting an integer to decimal text is about quadratic in its size:
+# n bits cost about n * n / _DECIMAL_COST_SCALE bits of big-integer work
+_DECIMAL_COST_SCALE = 25_000
+
+# operations of the "decimal" backend computed on the coefficients of
+# their operands, rounded to the precision; the others convert their
+# operands to exact rationals first, whose size grows with the exponent
+_CONTEXT_OPERATIONS = ("sum", "sub", "mul", "div", "pow")
+
+
+def estimate_cost(operation: str, operands: Sequence[Any]) -> float:
+    """Return a rough cost estimate of an operation, proportional to the
+    number of bits of work, with `BASE_COST` for constant-time
+    operations.
+
+    Only the operations whose cost grows with the operand values are
+    estimated: factorials and integer powers, whose results grow with
+    the operands.
+    """
+    if operation == "factorial" and operands and type(operands[0]) is int:
+        x = operands[0]
+        return max(x * math.log2(x), BASE_COST) if x > 2 else BASE_COST
+    if operation == "pow" and len(operands) == 2 and \
+            type(operands[0]) is int and type(operands[1]) is int:
+        return max(power_bits(*operands), BASE_COST)
+    return BASE_COST
+
+
+def _operand_digits(value: Any, exact: bool) -> float:
+    """Return the rough number of decimal digits of an operand of the
+    numeric backends: of the exact rational number it stands for with
+    `exact`, and of its coefficient otherwise.
+    """
+    if type(value) is int:
+        return value.bit_length() * _DIGITS_PER_BIT
+    if type(value) is float:
+        exponent = math.frexp(value)[1] if math.isfinite(value) else 0
+        return 17 + (abs(exponent) * _DIGITS_PER_BIT if exact else 0)
+    if type(value) is Fraction:
+        return (value.numerator.bit_length() +
+                value.denominator.bit_length()) * _DIGITS_PER_BIT
+    if type(value) is str:
+        if "/" in value:
+            return len(value)
+        try:
+            value = Decimal(value.strip())
+        except InvalidOperation:
+            return len(value)
+    if type(value) is not Decimal or not value.is_finite():
+        return 0
+    _, digits, exponent = value.as_tuple()
+    return len(digits) + (abs(exponent) if exact else 0)
+
+
+def estimate_precise_cost(
+        operation: str, numeric: str, precision: int,
+        operands: Sequence[Any]
+) -> float:
+    """Return a rough cost estimate of an operation computed with the
+    "decimal" or "fraction" numeric backend, in the units of
+    `estimate_cost`.
+
+    The cost grows with the precision and with the digits of the
+    operands, exponents included when they are converted exactly, and
+    for powers with the exponent, up to the largest accepted one:
+    integral powers of fractions are exact, so their size grows with
+    it.
+    """
+    exact = numeric == "fraction" or operation not in _CONTEXT_OPERATIONS
+    digits = [_operand_digits(value, exact) for value in operands]
+    cost = BASE_COST * (precision + sum(digits))
+    if operation == "pow" and len(digits) == 2:
+        # the exponent is below 10 ** its number of digits, exponent
+        # included; larger integral exponents than POW_MAX_RESULT_BITS
+        # are rejected before any work is done
+        exponent_bits = min(
+            _operand_digits(operands[1], True) / _DIGITS_PER_BIT,
+            CoreConfig.POW_MAX_RESULT_BITS.bit_length()
+        )
+        if numeric == "fraction":
+            cost += 2 ** exponent_bits * digits[0] / _DIGITS_PER_BIT
+        else:
+            cost += BASE_COST * precision * exponent_bits
+    elif operation == "factorial" and digits and digits[0] < 18:
+        try:
+            x = int(Fraction(str(operands[0])))
+        except (ValueError, ZeroDivisionError):
+            return cost
+        cost += estimate_cost(operation, [x])
+        if x > 2:
+            # the result is formatted as decimal text, see `format_exact`
+            cost += (x * math.log2(x)) ** 2 / _DECIMAL_COST_SCALE
+    return cost
+
+
+def estimate_decimal_cost(result: Any) -> float:
+    """Return a rough cost estimate of converting the large integers of
+    a result, or of a list of results, to decimal text with
+    `decimal_text`, 0 when it holds none.
+    """
+    values = result if type(result) is list else (result,)
+    return sum(
+        value.bit_length() ** 2 / _DECIMAL_COST_SCALE
+        for value in values if is_large_int(value)
+    )
+
+
+def estimate_batch_cost(items: Iterable[Any]) -> float:
+    """Return the summed cost estimate of the items of a batch."""
+    cost = 0.0
+    for item in items:
+        try:
+            entry = OPERATIONS[item["operation"]]
+            operands = [
+                item["operands"].get(name) for name in entry.operands
+            ]
+        except (KeyError, TypeError, AttributeError):
+            continue
+        cost += estimate_cost(entry.name, operands)
+    return cost
+
+
+def estimate_shape_cost(operation: str, sizes: Sequence[int]) -> float:
+    """Return a rough cost estimate of a shape operation from the
+    lengths of its coordinate arrays, proportional to the number of
+    array elements it computes.
+    """
+    if operation in ("pairwise_distances", "nearest_distances"):
+        points = sizes[0] // 2
+        targets = sizes[1] // 2 if len(sizes) > 1 else points
+        return max(points * targets, 1) * BASE_COST / 100
+    return max(sizes[0] if sizes else 0, 1) * BASE_COST / 100
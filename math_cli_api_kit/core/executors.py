@@ -0,0 +1,357 @@
+"""This module provides the pluggable executor layer used to run math
+operations off the calling thread.
+
+Four kinds of executors are available: "inline" runs every task in
+the caller, "thread" uses a thread pool, which only runs NumPy kernels
+concurrently since pure-Python work holds the GIL, "process" uses a
+process pool, which also parallelizes pure-Python
+big-integer work such as large factorials and powers, and "isolated"
+runs every task in its own process, so that a running task can be
+cancelled by terminating its process.
+
+Operations are submitted by name through `run_operation`, or
+`run_kernel` for validated operands, so they can be pickled to worker
+processes. `parallel_evaluate` splits a large vectorized evaluation
+into chunks evaluated on several cores, sharing input and output
+buffers with worker processes through shared memory.
+"""
+
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import CancelledError, Executor, Future, \
+    ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import connection, forkserver, shared_memory
+from typing import Any, Callable, Dict, Iterable, Iterator, List, \
+    Optional, Sequence, Tuple
+
+from math_cli_api_kit.core.registry import OPERATIONS
+from math_cli_api_kit.core.vector_operations import as_array, np
+
+EXECUTOR_KINDS = ("inline", "thread", "process", "isolated")
+
+
+class InlineExecutor(Executor):
+    """Executor running every task immediately in the calling thread."""
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def _run_task(
+        conn: connection.Connection, fn: Callable, args: Tuple,
+        kwargs: dict
+) -> None:
+    """Run a task in the child process of an `IsolatedProcessExecutor`
+    and send back (succeeded, result or exception).
+    """
+    try:
+        outcome = (True, fn(*args, **kwargs))
+    except BaseException as e:
+        outcome = (False, e)
+    try:
+        conn.send(outcome)
+    except Exception as e:
+        # unpicklable result or exception
+        conn.send((False, RuntimeError(f"cannot send the result: {e}")))
+    conn.close()
+
+
+class _IsolatedFuture(Future):
+    """Future of an `IsolatedProcessExecutor` task. Cancelling it also
+    succeeds while the task is running, by terminating its process.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.process: Optional[multiprocessing.process.BaseProcess] = None
+
+    def cancel(self) -> bool:
+        if super().cancel():
+            return True
+        process = self.process
+        if process is None or self.done():
+            return False
+        process.terminate()
+        try:
+            self.set_exception(CancelledError())
+        except Exception:
+            # the task finished in the meantime
+            return False
+        return True
+
+
+class IsolatedProcessExecutor(Executor):
+    """Executor running every task in a new process started by a fork
+    server, at most `max_workers` at a time.
+
+    Starting a process costs a few milliseconds, so this executor is
+    meant for expensive tasks only. Unlike the workers of a process
+    pool, a running task can be stopped: cancelling its future
+    terminates its process.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self._context = multiprocessing.get_context("forkserver")
+        # imported once by the fork server instead of by every task
+        self._context.set_forkserver_preload([
+            "math_cli_api_kit.core.executors", "math_cli_api_kit.core.batch",
+            "math_cli_api_kit.core.precision",
+            "math_cli_api_kit.core.expressions",
+        ])
+        # started now rather than by the first task, whose submission
+        # would wait for the server to import the modules above
+        forkserver.ensure_running()
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._queue: "deque[Tuple[_IsolatedFuture, Callable, Tuple, dict]]" \
+            = deque()
+        self._running: Dict[connection.Connection, _IsolatedFuture] = {}
+        self._shutdown = False
+        self._wakeup_reader, self._wakeup_writer = \
+            multiprocessing.Pipe(duplex=False)
+        self._waiter = threading.Thread(target=self._wait_results,
+                                        daemon=True)
+        self._waiter.start()
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        future = _IsolatedFuture()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new tasks after"
+                                   " shutdown")
+            self._queue.append((future, fn, args, kwargs))
+            if self._start_queued():
+                # let the waiter thread watch the new process
+                self._wakeup_writer.send(None)
+        return future
+
+    def shutdown(
+            self, wait: bool = True, *, cancel_futures: bool = False
+    ) -> None:
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                for future, _, _, _ in self._queue:
+                    future.cancel()
+                self._queue.clear()
+        self._wakeup_writer.send(None)
+        if wait:
+            self._waiter.join()
+
+    def _start_queued(self) -> bool:
+        """Start queued tasks while workers are free, with the lock
+        held, and return whether any was started.
+        """
+        started = False
+        while self._queue and len(self._running) < self._max_workers:
+            future, fn, args, kwargs = self._queue.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            reader, writer = self._context.Pipe(duplex=False)
+            process = self._context.Process(
+                target=_run_task, args=(writer, fn, args, kwargs),
+                daemon=True
+            )
+            try:
+                process.start()
+            except BaseException as e:
+                future.set_exception(e)
+                reader.close()
+                continue
+            finally:
+                writer.close()
+            future.process = process
+            self._running[reader] = future
+            started = True
+        return started
+
+    def _wait_results(self) -> None:
+        while True:
+            with self._lock:
+                readers = list(self._running)
+                if self._shutdown and not readers and not self._queue:
+                    return
+            for reader in connection.wait([self._wakeup_reader, *readers]):
+                if reader is self._wakeup_reader:
+                    reader.recv()
+                    continue
+                with self._lock:
+                    future = self._running.pop(reader)
+                try:
+                    succeeded, value = reader.recv()
+                except EOFError:
+                    succeeded, value = False, RuntimeError(
+                        "the task process exited unexpectedly"
+                    )
+                reader.close()
+                future.process.join()
+                if not future.done():
+                    if succeeded:
+                        future.set_result(value)
+                    else:
+                        future.set_exception(value)
+            with self._lock:
+                self._start_queued()
+
+
+def create_executor(
+        kind: str, max_workers: Optional[int] = None,
+        initializer: Optional[Callable] = None, initargs: Tuple = ()
+) -> Executor:
+    """Create an executor of the given kind, with one worker per CPU by
+    default. The workers of a process pool call `initializer` with
+    `initargs` when they start.
+    """
+    if kind == "inline":
+        return InlineExecutor()
+    max_workers = max_workers or os.cpu_count() or 1
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=max_workers,
+                                   initializer=initializer,
+                                   initargs=initargs)
+    if kind == "isolated":
+        return IsolatedProcessExecutor(max_workers=max_workers)
+    raise ValueError(f"unknown executor kind '{kind}'. Expected one of"
+                     f" {', '.join(EXECUTOR_KINDS)}.")
+
+
+def run_operation(operation: str, *operands: Any) -> Any:
+    """Compute a registered operation, looked up by name so that the
+    call can be sent to a worker process.
+    """
+    return OPERATIONS[operation].function(*operands)
+
+
+def run_kernel(operation: str, *operands: Any) -> Any:
+    """Compute a registered operation with its trusted kernel, for
+    operands already checked by the operation's validator.
+    """
+    return OPERATIONS[operation].kernel(*operands)
+
+
+def map_bounded(
+        executor: Executor, fn: Callable, items: Iterable[Any],
+        max_pending: int
+) -> Iterator[Any]:
+    """Yield `fn(item)` for every item in order, keeping at most
+    `max_pending` tasks submitted at once so that memory use stays
+    bounded regardless of the number of items.
+    """
+    pending: "deque[Future]" = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _chunk_bounds(length: int, chunk_size: int) -> List[Tuple[int, int]]:
+    return [
+        (start, min(start + chunk_size, length))
+        for start in range(0, length, chunk_size)
+    ]
+
+
+def _evaluate_chunk(
+        operation: str, operands: Sequence["np.ndarray"], out: "np.ndarray",
+        start: int, stop: int
+) -> None:
+    out[start:stop] = OPERATIONS[operation].vector_function(
+        *(operand[start:stop] for operand in operands)
+    )
+
+
+def _evaluate_shared_chunk(
+        operation: str, inputs: Sequence[Tuple[str, str, int]],
+        output: Tuple[str, str, int], start: int, stop: int
+) -> None:
+    """Evaluate one chunk in a worker process, reading the operands from
+    and writing the results to shared memory blocks given as
+    (name, dtype, length).
+    """
+    blocks = [shared_memory.SharedMemory(name=name)
+              for name, _, _ in (*inputs, output)]
+    try:
+        arrays = [
+            np.ndarray((length,), dtype=dtype, buffer=block.buf)
+            for block, (_, dtype, length) in zip(blocks, (*inputs, output))
+        ]
+        _evaluate_chunk(operation, arrays[:-1], arrays[-1], start, stop)
+        del arrays
+    finally:
+        for block in blocks:
+            block.close()
+
+
+def parallel_evaluate(
+        operation: str, operands: Sequence[Any], executor: Executor,
+        chunk_size: int, dtype: str = "float64"
+) -> "np.ndarray":
+    """Evaluate a vectorizable operation over whole operand arrays,
+    splitting them into chunks evaluated concurrently by the executor.
+
+    Operands must be one-dimensional and of equal length. With a
+    process pool the operands and the results are exchanged through
+    shared memory instead of being pickled.
+    """
+    entry = OPERATIONS[operation]
+    if entry.vector_function is None:
+        raise ValueError(f"operation {operation} cannot be vectorized")
+    arrays = [as_array(operand) for operand in operands]
+    length = len(arrays[0])
+    if any(array.ndim != 1 or len(array) != length for array in arrays):
+        raise ValueError("operands must be one-dimensional arrays of the"
+                         " same length")
+    bounds = _chunk_bounds(length, chunk_size)
+
+    if not isinstance(executor, ProcessPoolExecutor):
+        out = np.empty(length, dtype=dtype)
+        futures = [
+            executor.submit(_evaluate_chunk, operation, arrays, out,
+                            start, stop)
+            for start, stop in bounds
+        ]
+        for future in futures:
+            future.result()
+        return out
+
+    blocks = []
+    try:
+        inputs = []
+        for array in arrays:
+            block = shared_memory.SharedMemory(create=True,
+                                               size=max(array.nbytes, 1))
+            blocks.append(block)
+            np.ndarray(array.shape, dtype=array.dtype,
+                       buffer=block.buf)[:] = array
+            inputs.append((block.name, array.dtype.str, length))
+
+        out_block = shared_memory.SharedMemory(
+            create=True, size=max(length * np.dtype(dtype).itemsize, 1)
+        )
+        blocks.append(out_block)
+        output = (out_block.name, np.dtype(dtype).str, length)
+
+        futures = [
+            executor.submit(_evaluate_shared_chunk, operation, inputs,
+                            output, start, stop)
+            for start, stop in bounds
+        ]
+        for future in futures:
+            future.result()
+        return np.ndarray((length,), dtype=dtype,
+                          buffer=out_block.buf).copy()
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
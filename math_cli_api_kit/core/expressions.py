@@ -0,0 +1,462 @@
+"""This module evaluates expressions composed of the registered math
+operations, such as `surface_of_circle(r) * h + sum(x, y)`.
+
+An expression is made of int and float literals, the constants `pi`
+and `e`, variables, the operators `+`, `-`, `*`, `/` and `**`, and
+calls of the registered operations with positional or named operands.
+The operators compute the `sum`, `sub`, `mul`, `div` and `pow`
+operations, so an expression gives the same results as the equivalent
+chain of operations.
+
+`compile_expression` parses an expression once and compiles it into a
+plan of nested closures, which is kept in an LRU cache keyed by the
+expression text, so evaluating a repeated expression skips parsing and
+compilation. Sub-expressions without variables are folded into
+constants when they are compiled, except for expensive factorials and
+powers, whose operands are only checked against the configured maximum
+sizes, so that oversized results are rejected before any work is done.
+A plan is evaluated against scalar variables with `Expression.evaluate`,
+or against whole columns of variables in a single pass with
+`Expression.evaluate_many`, which uses the vectorized engine when NumPy
+is available.
+"""
+
+import ast
+import math
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, \
+    Tuple
+
+from math_cli_api_kit.config import CoreConfig
+from math_cli_api_kit.core.batch import is_vectorizable
+from math_cli_api_kit.core.constants import PI, E
+from math_cli_api_kit.core.costs import BASE_COST, estimate_cost
+from math_cli_api_kit.core.factorial import factorial_engine
+from math_cli_api_kit.core.registry import OPERATIONS, Operation
+from math_cli_api_kit.core.validation import get_object_type_name, \
+    validate_power
+from math_cli_api_kit.core.vector_operations import as_array, has_numpy, np
+
+EXPRESSION_ERRORS = (TypeError, ValueError, ZeroDivisionError,
+                     OverflowError)
+
+CONSTANTS = {"pi": PI, "e": E}
+
+_BINARY_OPERATIONS = {
+    ast.Add: "sum", ast.Sub: "sub", ast.Mult: "mul", ast.Div: "div",
+    ast.Pow: "pow",
+}
+# operations whose cost grows with their operand values, see
+# `estimate_cost`
+_UNBOUNDED_OPERATIONS = ("factorial", "pow")
+# bit length assumed for an integer computed by a sub-expression
+_ASSUMED_BITS = 64
+# factorial and power calls of constants are folded when they are
+# compiled up to this estimated cost
+_MAX_FOLDED_COST = 10_000
+# maximum nesting of the operations of an expression, which keeps the
+# evaluation of its closures well within the recursion limit
+_MAX_DEPTH = 100
+
+Scalar = Callable[[Mapping[str, Any]], Any]
+
+
+class ExpressionError(ValueError):
+    """An expression cannot be parsed or uses an unsupported construct."""
+
+
+class _Node:
+    """A compiled node of an expression: its scalar closure, its
+    vectorized closure (None when an operation of the node has no
+    vectorized kernel), its constant value when it has no variables,
+    its number of nodes, and whether its value is a float even when all
+    the variables are ints.
+    """
+
+    __slots__ = ("scalar", "vector", "constant", "is_constant", "size",
+                 "float_result")
+
+    def __init__(
+            self, scalar: Scalar, vector: Optional[Callable],
+            size: int = 1, constant: Any = None, is_constant: bool = False,
+            float_result: bool = False
+    ):
+        self.scalar = scalar
+        self.vector = vector
+        self.size = size
+        self.constant = constant
+        self.is_constant = is_constant
+        self.float_result = float_result
+
+
+def _constant_node(value: Any) -> _Node:
+    return _Node(lambda variables: value, lambda columns: value,
+                 constant=value, is_constant=True,
+                 float_result=type(value) is float)
+
+
+def _variable_node(name: str) -> _Node:
+    return _Node(lambda variables: variables[name],
+                 lambda columns: columns[name])
+
+
+def _real(result: Any) -> Any:
+    if type(result) is complex:
+        raise ValueError("The result is not a real number")
+    return result
+
+
+def _scalar_call(operation: Operation, args: Sequence[_Node]) -> Scalar:
+    """Return the scalar closure of an operation call. Operations with
+    integer operands, such as factorials, validate them; the others are
+    computed with their trusted kernels, as every value of an
+    expression is an int or a float.
+    """
+    function = operation.function if int in operation.operand_types \
+        else operation.kernel
+    scalars = tuple(arg.scalar for arg in args)
+    if len(scalars) == 1:
+        (x,) = scalars
+        return lambda variables: _real(function(x(variables)))
+    if len(scalars) == 2:
+        x, y = scalars
+        return lambda variables: _real(function(x(variables),
+                                                y(variables)))
+    return lambda variables: _real(
+        function(*[arg(variables) for arg in scalars])
+    )
+
+
+def _vector_call(
+        operation: Operation, args: Sequence[_Node]
+) -> Optional[Callable]:
+    if operation.vector_function is None or \
+            any(arg.vector is None for arg in args):
+        return None
+    function = operation.vector_function
+    vectors = tuple(arg.vector for arg in args)
+    return lambda columns: function(*[arg(columns) for arg in vectors])
+
+
+def _leaf_value(
+        node: ast.AST, compiled: _Node, variables: Mapping[str, Any]
+) -> Tuple[bool, Any]:
+    """Return whether the value of an operand is known before the
+    expression is evaluated, and that value.
+    """
+    if compiled.is_constant:
+        return True, compiled.constant
+    if isinstance(node, ast.Constant):
+        return True, node.value
+    if isinstance(node, ast.Name):
+        if node.id in CONSTANTS:
+            return True, CONSTANTS[node.id]
+        return True, variables.get(node.id)
+    return False, None
+
+
+def _cost_function(
+        operation: Operation, args: Sequence[ast.AST],
+        nodes: Sequence[_Node]
+) -> Callable[[Mapping[str, Any]], float]:
+    """Return the cost estimate of a factorial or power call for given
+    variables. Integers computed by sub-expressions are assumed to have
+    `_ASSUMED_BITS` bits, and a computed factorial operand or exponent
+    is assumed to make the call expensive.
+    """
+    def cost(variables: Mapping[str, Any]) -> float:
+        operands = []
+        for arg, node in zip(args, nodes):
+            known, value = _leaf_value(arg, node, variables)
+            if not known:
+                if operation.name == "pow" and not operands:
+                    value = 1 << (_ASSUMED_BITS - 1)
+                else:
+                    return math.inf
+            operands.append(value)
+        return estimate_cost(operation.name, operands)
+
+    return cost
+
+
+class _Compiler:
+    """Compiles the AST of an expression into nested closures."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.depth = 0
+        self.variables: Dict[str, None] = {}
+        self.costs: List[Callable[[Mapping[str, Any]], float]] = []
+
+    def compile(self, node: ast.AST) -> _Node:
+        self.depth += 1
+        if self.depth > _MAX_DEPTH:
+            raise ExpressionError(f"an expression may nest at most"
+                                  f" {_MAX_DEPTH} operations")
+        try:
+            return self._compile(node)
+        finally:
+            self.depth -= 1
+
+    def _compile(self, node: ast.AST) -> _Node:
+        if isinstance(node, ast.Expression):
+            return self.compile(node.body)
+        if isinstance(node, ast.Constant):
+            if type(node.value) not in (int, float):
+                raise ExpressionError(f"unsupported literal"
+                                      f" {node.value!r}")
+            return _constant_node(node.value)
+        if isinstance(node, ast.Name):
+            if node.id in CONSTANTS:
+                return _constant_node(CONSTANTS[node.id])
+            if node.id in OPERATIONS:
+                raise ExpressionError(f"operation '{node.id}' must be"
+                                      f" called")
+            self.variables[node.id] = None
+            return _variable_node(node.id)
+        if isinstance(node, ast.UnaryOp) and \
+                isinstance(node.op, (ast.UAdd, ast.USub)):
+            return self._negation(node)
+        if isinstance(node, ast.BinOp) and \
+                type(node.op) in _BINARY_OPERATIONS:
+            return self._call(OPERATIONS[_BINARY_OPERATIONS[type(node.op)]],
+                              [node.left, node.right])
+        if isinstance(node, ast.Call):
+            return self._operation_call(node)
+        raise ExpressionError(f"unsupported syntax"
+                              f" '{self._source(node)}'")
+
+    def _source(self, node: ast.AST) -> str:
+        return ast.get_source_segment(self.text, node) or \
+            type(node).__name__
+
+    def _negation(self, node: ast.UnaryOp) -> _Node:
+        operand = self.compile(node.operand)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        if operand.is_constant:
+            return _constant_node(-operand.constant)
+        scalar = operand.scalar
+        vector = operand.vector
+        return _Node(
+            lambda variables: -scalar(variables),
+            None if vector is None else lambda columns: -vector(columns),
+            size=operand.size + 1, float_result=operand.float_result
+        )
+
+    def _operation_call(self, node: ast.Call) -> _Node:
+        if not isinstance(node.func, ast.Name) or \
+                node.func.id not in OPERATIONS:
+            raise ExpressionError(f"unknown operation"
+                                  f" '{self._source(node.func)}'")
+        operation = OPERATIONS[node.func.id]
+        names = operation.operands
+        given = len(node.args) + len(node.keywords)
+        if given != operation.arity:
+            raise ExpressionError(f"{operation.name} takes"
+                                  f" {operation.arity} operand(s), got"
+                                  f" {given}")
+        args = dict(zip(names, node.args))
+        for keyword in node.keywords:
+            if keyword.arg not in names or keyword.arg in args:
+                raise ExpressionError(f"unexpected operand"
+                                      f" '{keyword.arg}' of"
+                                      f" {operation.name}")
+            args[keyword.arg] = keyword.value
+        return self._call(operation, [args[name] for name in names])
+
+    def _call(self, operation: Operation, args: List[ast.AST]) -> _Node:
+        nodes = [self.compile(arg) for arg in args]
+        scalar = _scalar_call(operation, nodes)
+        unbounded = operation.name in _UNBOUNDED_OPERATIONS
+        if all(node.is_constant for node in nodes):
+            constants = [node.constant for node in nodes]
+            if unbounded and estimate_cost(operation.name, constants) > \
+                    _MAX_FOLDED_COST:
+                self._validate_size(operation, constants)
+            else:
+                try:
+                    return _constant_node(scalar({}))
+                except EXPRESSION_ERRORS:
+                    # reported when the expression is evaluated
+                    pass
+        if unbounded:
+            self.costs.append(_cost_function(operation, args, nodes))
+        float_result = operation.float_result or \
+            any(node.float_result for node in nodes)
+        return _Node(scalar, _vector_call(operation, nodes),
+                     size=1 + sum(node.size for node in nodes),
+                     float_result=float_result)
+
+    @staticmethod
+    def _validate_size(operation: Operation, constants: List[Any]) -> None:
+        """Raise an ExpressionError if a factorial or power of constants
+        exceeds the maximum supported size.
+        """
+        try:
+            if operation.name == "pow":
+                validate_power(*constants, CoreConfig.POW_MAX_RESULT_BITS)
+            elif type(constants[0]) is int:
+                factorial_engine.validate(constants[0])
+        except ValueError as e:
+            raise ExpressionError(str(e)) from None
+
+
+class Expression:
+    """A compiled expression, see the module documentation.
+
+    `variables` holds the names of the variables of the expression in
+    order of appearance.
+    """
+
+    def __init__(self, text: str):
+        if len(text) > CoreConfig.EXPRESSION_MAX_LENGTH:
+            raise ExpressionError(f"an expression may contain at most"
+                                  f" {CoreConfig.EXPRESSION_MAX_LENGTH}"
+                                  f" characters")
+        try:
+            tree = ast.parse(text.strip(), mode="eval")
+            compiler = _Compiler(text.strip())
+            root = compiler.compile(tree)
+        except SyntaxError as e:
+            raise ExpressionError(f"invalid expression: {e.msg}") from None
+        except RecursionError:
+            raise ExpressionError("the expression is nested too deeply") \
+                from None
+        self.text = text
+        self.variables = tuple(compiler.variables)
+        self.size = root.size
+        self._scalar = root.scalar
+        self._vector = root.vector
+        self._float_result = root.float_result
+        self._costs = tuple(compiler.costs)
+
+    def __repr__(self) -> str:
+        return f"Expression({self.text!r})"
+
+    def evaluate(self, variables: Mapping[str, Any]) -> Any:
+        """Evaluate the expression for scalar int or float variables."""
+        for name in self.variables:
+            if name not in variables:
+                raise TypeError(f"missing variable '{name}'")
+            if type(variables[name]) not in (int, float):
+                raise TypeError(f"unsupported type for variable {name}: "
+                                f"'{get_object_type_name(variables[name])}'."
+                                f" Expected int or float.")
+        return self._scalar(variables)
+
+    def evaluate_many(
+            self, columns: Mapping[str, Sequence[Any]]
+    ) -> List[Any]:
+        """Evaluate the expression for every row of equally long columns
+        of variables and return the results in row order.
+
+        The rows are evaluated at once in float64 with the vectorized
+        engine when NumPy is available and every operation of the
+        expression has a vectorized kernel, and one by one otherwise.
+        Like in batches, see `is_vectorizable`, rows whose scalar result
+        would not be a float, such as sums of ints, or whose ints are
+        too large for float64 are evaluated one by one, and so are rows
+        whose float64 result is not finite, so that errors are reported
+        like for scalars, with the index of the failing row.
+        """
+        missing = [name for name in self.variables if name not in columns]
+        if missing:
+            raise TypeError(f"missing variable '{missing[0]}'")
+        lengths = {len(columns[name]) for name in self.variables}
+        if len(lengths) > 1:
+            raise ValueError("all the variables must have the same length")
+        rows = lengths.pop() if lengths else 1
+
+        results: Optional[List[Any]] = None
+        if self._vector is not None and has_numpy():
+            variables = [columns[name] for name in self.variables]
+            exact = [
+                is_vectorizable([column[i] for column in variables],
+                                self._float_result)
+                for i in range(rows)
+            ]
+            if any(exact):
+                results = self._evaluate_vector(columns, rows)
+        if results is None:
+            return [self._evaluate_row(columns, i) for i in range(rows)]
+        for i, value in enumerate(results):
+            if not exact[i] or isinstance(value, complex) or \
+                    not math.isfinite(value):
+                results[i] = self._evaluate_row(columns, i)
+        return results
+
+    def _evaluate_vector(
+            self, columns: Mapping[str, Sequence[Any]], rows: int
+    ) -> Optional[List[Any]]:
+        try:
+            arrays = {}
+            for name in self.variables:
+                array = as_array(columns[name])
+                if array.dtype.kind not in ("i", "u", "f"):
+                    return None
+                arrays[name] = array.astype(np.float64, copy=False)
+            with np.errstate(all="ignore"):
+                values = np.broadcast_to(self._vector(arrays), (rows,))
+        except EXPRESSION_ERRORS:
+            return None
+        return values.tolist()
+
+    def _evaluate_row(
+            self, columns: Mapping[str, Sequence[Any]], i: int
+    ) -> Any:
+        variables = {name: columns[name][i] for name in self.variables}
+        try:
+            return self.evaluate(variables)
+        except EXPRESSION_ERRORS as e:
+            raise type(e)(f"row {i}: {e}") from None
+
+    def estimate_cost(self, variables: Mapping[str, Any]) -> float:
+        """Return a rough cost estimate of evaluating the expression for
+        scalar variables, in the units of `estimate_cost`.
+        """
+        return BASE_COST * self.size + sum(
+            estimate(variables) for estimate in self._costs
+        )
+
+    def estimate_many_cost(
+            self, columns: Mapping[str, Sequence[Any]]
+    ) -> float:
+        """Return a rough cost estimate of `evaluate_many`."""
+        lengths = [len(columns[name]) for name in self.variables
+                   if name in columns]
+        rows = max(lengths, default=1)
+        cost = BASE_COST * self.size * rows
+        for i in range(rows) if self._costs else ():
+            variables = {
+                name: column[i] for name, column in columns.items()
+                if i < len(column)
+            }
+            cost += sum(estimate(variables) for estimate in self._costs)
+        return cost
+
+
+@lru_cache(maxsize=CoreConfig.EXPRESSION_CACHE_SIZE)
+def compile_expression(text: str) -> Expression:
+    """Return the compiled plan of an expression, from the LRU cache of
+    plans when the same expression text was compiled before. Raises an
+    ExpressionError if the expression is not valid.
+    """
+    return Expression(text)
+
+
+def evaluate_expression(text: str, variables: Mapping[str, Any]) -> Any:
+    """Evaluate an expression for scalar variables, with its cached
+    plan. Unlike a compiled plan, this function can be submitted to a
+    process executor.
+    """
+    return compile_expression(text).evaluate(variables)
+
+
+def evaluate_expression_many(
+        text: str, columns: Mapping[str, Sequence[Any]]
+) -> List[Any]:
+    """Evaluate an expression for every row of columns of variables,
+    with its cached plan, see `Expression.evaluate_many`.
+    """
+    return compile_expression(text).evaluate_many(columns)
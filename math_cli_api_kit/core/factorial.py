@@ -0,0 +1,234 @@
+"""This module provides an exact factorial engine.
+
+Factorials are computed without recursion per integer: large values use
+the divide-and-conquer (binary splitting) implementation of
+`math.factorial`, and values close to a previously computed factorial
+are extended from that checkpoint by a binary-splitting product of the
+remaining factors. Recent results are kept in a bounded LRU cache, and
+inputs above a configurable maximum are rejected before any work is
+done.
+
+Results can also be streamed as a decimal string, chunk by chunk,
+without building the whole string in memory, as the CLI prints them,
+or converted at once to a `DecimalText`, e.g. on an executor so that
+the conversion, which grows about quadratically with the size of the
+integer, does not block an event loop. A `DecimalText` holds the whole
+string, so the API responses and batch results built from it need
+memory for the digits as well as for the integer. Decimal strings of
+any length can be parsed back.
+"""
+
+import math
+import sys
+import threading
+from bisect import bisect_right, insort
+from collections import OrderedDict
+from typing import Any, Iterator, List, Optional
+
+from math_cli_api_kit.config import CoreConfig
+from math_cli_api_kit.core.validation import validate_factorial
+
+# below this value a factorial is cheaper to compute than to cache
+_MIN_CACHED_INPUT = 64
+
+# extend a checkpoint only when the missing factors are at most this
+# fraction of the requested input
+_CHECKPOINT_FRACTION = 8
+
+_DECIMAL_CHUNK_DIGITS = 1024
+
+
+def product_range(lo: int, hi: int) -> int:
+    """Return the product of the integers from lo to hi (inclusive),
+    splitting the range in halves so that the multiplied numbers stay
+    balanced in size.
+    """
+    if hi < lo:
+        return 1
+    if hi - lo < 8:
+        result = lo
+        for i in range(lo + 1, hi + 1):
+            result *= i
+        return result
+    mid = (lo + hi) // 2
+    return product_range(lo, mid) * product_range(mid + 1, hi)
+
+
+def is_large_int(value: Any) -> bool:
+    """Check whether a value is an integer too large to be converted to
+    a decimal string in one piece, and must be converted with
+    `iter_decimal` instead.
+    """
+    if type(value) is not int:
+        return False
+    limit = getattr(sys, "get_int_max_str_digits", lambda: 0)()
+    # log10(2) ~ 0.30103, so an integer has at most this many digits
+    return bool(limit) and value.bit_length() * 0.30103 + 1 >= limit
+
+
+def iter_decimal(
+        value: int, chunk_digits: int = _DECIMAL_CHUNK_DIGITS
+) -> Iterator[str]:
+    """Yield the decimal representation of an integer in chunks.
+
+    The integer is split recursively by powers of ten, so the
+    conversion is not subject to the interpreter's integer string
+    conversion limit, and the whole string is never held in memory
+    unless the caller joins the chunks.
+    """
+    if value < 0:
+        yield "-"
+        value = -value
+
+    powers = [10 ** chunk_digits]
+    while powers[-1] * powers[-1] <= value:
+        powers.append(powers[-1] * powers[-1])
+
+    yield from _iter_digits(value, powers, len(powers) - 1, 0, chunk_digits)
+
+
+def _iter_digits(
+        value: int, powers: List[int], level: int, width: int,
+        chunk_digits: int
+) -> Iterator[str]:
+    # invariant: value < powers[level] ** 2, zero-padded to `width`
+    # digits unless `width` is 0
+    if level < 0:
+        text = str(value)
+        yield text.zfill(width) if width else text
+        return
+
+    high, low = divmod(value, powers[level])
+    low_width = chunk_digits << level
+
+    if high or width:
+        yield from _iter_digits(
+            high, powers, level - 1, width - low_width if width else 0,
+            chunk_digits
+        )
+        yield from _iter_digits(low, powers, level - 1, low_width,
+                                chunk_digits)
+    else:
+        yield from _iter_digits(low, powers, level - 1, 0, chunk_digits)
+
+
+class DecimalText(str):
+    """The decimal representation of an integer too large for a single
+    string conversion, see `is_large_int`, held in memory as a whole.
+    Serializers write it as a number where they can, and as a string
+    otherwise.
+    """
+
+
+def decimal_text(value: Any) -> Any:
+    """Return a large integer, or the large integers of a list, as their
+    `DecimalText`; other values are returned unchanged.
+    """
+    if type(value) is list:
+        return [decimal_text(item) for item in value]
+    if is_large_int(value):
+        return DecimalText("".join(iter_decimal(value)))
+    return value
+
+
+def parse_decimal(text: str) -> int:
+    """Return the integer written in decimal in `text`, the inverse of
+    `iter_decimal`.
+
+    Long strings are split in halves and combined with powers of ten,
+    so the conversion is not subject to the interpreter's integer
+    string conversion limit.
+    """
+    if text[:1] in ("-", "+"):
+        value = parse_decimal(text[1:])
+        return -value if text[0] == "-" else value
+    if len(text) <= _DECIMAL_CHUNK_DIGITS:
+        return int(text)
+    low_digits = len(text) // 2
+    return parse_decimal(text[:-low_digits]) * 10 ** low_digits + \
+        parse_decimal(text[-low_digits:])
+
+
+class FactorialEngine:
+    """Computes exact factorials with an LRU cache of checkpoints and a
+    maximum input size.
+    """
+
+    def __init__(
+            self, max_input: Optional[int] = None,
+            cache_size: Optional[int] = None
+    ):
+        self.max_input = CoreConfig.FACTORIAL_MAX_INPUT \
+            if max_input is None else max_input
+        self.cache_size = CoreConfig.FACTORIAL_CACHE_SIZE \
+            if cache_size is None else cache_size
+        self._cache: "OrderedDict[int, int]" = OrderedDict()
+        self._keys: List[int] = []
+        self._lock = threading.Lock()
+
+    def validate(self, x: int) -> bool:
+        """Validate the attribute x and raise an error if it is not
+        valid or exceeds the maximum input size.
+        """
+        validate_factorial(x)
+        if x > self.max_input:
+            raise ValueError(f"{x}! exceeds the maximum supported input"
+                             f" {self.max_input}.")
+        return True
+
+    def factorial(self, x: int) -> int:
+        """Find x!. Raises a ValueError if x is negative or exceeds
+        the maximum input size.
+        """
+        self.validate(x)
+        if x < _MIN_CACHED_INPUT or not self.cache_size:
+            return math.factorial(x)
+
+        with self._lock:
+            result = self._cache.get(x)
+            if result is not None:
+                self._cache.move_to_end(x)
+                return result
+            i = bisect_right(self._keys, x) - 1
+            base = self._keys[i] if i >= 0 else None
+            base_result = self._cache[base] if base is not None else None
+
+        if base is not None and \
+                x - base <= x // _CHECKPOINT_FRACTION:
+            result = base_result * product_range(base + 1, x)
+        else:
+            result = math.factorial(x)
+
+        self._store(x, result)
+        return result
+
+    def iter_digits(
+            self, x: int, chunk_digits: int = _DECIMAL_CHUNK_DIGITS
+    ) -> Iterator[str]:
+        """Yield the decimal digits of x! in chunks."""
+        return iter_decimal(self.factorial(x), chunk_digits)
+
+    def add_checkpoint(self, x: int, result: int) -> None:
+        """Add a known factorial, such as one loaded from the memo
+        store, to the cache of checkpoints.
+        """
+        if x >= _MIN_CACHED_INPUT and self.cache_size:
+            self._store(x, result)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._keys.clear()
+
+    def _store(self, x: int, result: int) -> None:
+        with self._lock:
+            if x in self._cache:
+                return
+            self._cache[x] = result
+            insort(self._keys, x)
+            while len(self._cache) > self.cache_size:
+                evicted, _ = self._cache.popitem(last=False)
+                del self._keys[bisect_right(self._keys, evicted) - 1]
+
+
+factorial_engine = FactorialEngine()
@@ -1,12 +1,101 @@
 """This module provides classes for algebraic and geometric operations,
 offering a set of basic math calculations.
+
+It also provides the trusted kernels of the operations, which compute
+them without validating their operands. They are meant for callers that
+validated the operands once at their boundary, such as the composite
+geometry formulas, the batch engine and the API handlers, and must not
+be given unchecked input. The kernels of factorials, powers and the
+surfaces of squares and circles look small int operands up in their
+precomputed lookup tables first, when they are enabled. The kernels of
+factorials and integer powers still reject the operands whose result
+would exceed the configured maximum size, as their cost is unbounded.
 """
 
 from typing import Union
 
+from math_cli_api_kit.config import CoreConfig
 from math_cli_api_kit.core.constants import PI, E
+from math_cli_api_kit.core.factorial import factorial_engine
+from math_cli_api_kit.core.tables import lookup_tables
 from math_cli_api_kit.core.validation import validate_int_or_float, \
-    validate_factorial
+    validate_factorial, validate_numbers, validate_power
+
+Number = Union[int, float]
+
+
+# trusted kernels
+def sum_kernel(x: Number, y: Number) -> Number:
+    return x + y
+
+
+def sub_kernel(x: Number, y: Number) -> Number:
+    return x - y
+
+
+def mul_kernel(x: Number, y: Number) -> Number:
+    return x * y
+
+
+def div_kernel(x: Number, y: Number) -> Number:
+    return x / y
+
+
+def pow_kernel(x: Number, y: Number) -> Union[Number, complex]:
+    table = lookup_tables.pow
+    if table is not None:
+        result = table.get(x, y)
+        if result is not None:
+            return result
+    validate_power(x, y, CoreConfig.POW_MAX_RESULT_BITS)
+    return x ** y
+
+
+def square_root_kernel(x: Number) -> Union[Number, complex]:
+    return x ** 0.5
+
+
+def factorial_kernel(x: int) -> int:
+    table = lookup_tables.factorial
+    if table is not None:
+        result = table.get(x)
+        if result is not None:
+            return result
+    return factorial_engine.factorial(x)
+
+
+def exp_kernel(x: Number) -> Number:
+    return E ** x
+
+
+def surface_of_square_kernel(a: Number) -> Number:
+    table = lookup_tables.surface_of_square
+    if table is not None:
+        result = table.get(a)
+        if result is not None:
+            return result
+    return a ** 2
+
+
+def surface_of_circle_kernel(r: Number) -> Number:
+    table = lookup_tables.surface_of_circle
+    if table is not None:
+        result = table.get(r)
+        if result is not None:
+            return result
+    return PI * r ** 2
+
+
+def surface_of_triangle_kernel(b: Number, h: Number) -> Number:
+    return b * h / 2
+
+
+def surface_of_trapezoid_kernel(a: Number, b: Number, h: Number) -> Number:
+    return (a + b) / 2 * h
+
+
+def hypotenuse_kernel(a: Number, b: Number) -> Number:
+    return (a ** 2 + b ** 2) ** 0.5
 
 
 class Algebra:
@@ -21,57 +110,64 @@ class Algebra:
     def __init__(self):
         pass
 
+    @staticmethod
     def sum(
-            self, x: Union[int, float], y: Union[int, float]
+            x: Union[int, float], y: Union[int, float]
     ) -> Union[int, float]:
         """Return the sum of x and y."""
         if validate_int_or_float(x, y):
             return x + y
 
+    @staticmethod
     def sub(
-            self, x: Union[int, float], y: Union[int, float]
+            x: Union[int, float], y: Union[int, float]
     ) -> Union[int, float]:
         """Return the subtraction of x by y."""
         if validate_int_or_float(x, y):
             return x - y
 
+    @staticmethod
     def mul(
-            self, x: Union[int, float], y: Union[int, float]
+            x: Union[int, float], y: Union[int, float]
     ) -> Union[int, float]:
         """Return the multiplication of x by y."""
         if validate_int_or_float(x, y):
             return x * y
 
+    @staticmethod
     def div(
-            self, x: Union[int, float], y: Union[int, float]
+            x: Union[int, float], y: Union[int, float]
     ) -> Union[int, float]:
         """Return the division of x by y."""
         if validate_int_or_float(x, y):
             return x / y
 
+    @staticmethod
     def pow(
-            self, x: Union[int, float], y: Union[int, float]
+            x: Union[int, float], y: Union[int, float]
     ) -> Union[int, float]:
-        """Return x**y (x to the power of y)."""
+        """Return x**y (x to the power of y). Raises a ValueError if
+        the result of an integer power exceeds the configured maximum
+        size."""
         if validate_int_or_float(x, y):
-            return x ** y
+            return pow_kernel(x, y)
 
-    def square_root(self, x: Union[int, float]) -> Union[int, float, complex]:
+    @staticmethod
+    def square_root(x: Union[int, float]) -> Union[int, float, complex]:
         """Return the square root of x."""
-        return self.pow(x, 0.5)
+        return Algebra.pow(x, 0.5)
 
-    def factorial(self, x: int) -> int:
+    @staticmethod
+    def factorial(x: int) -> int:
         """Find x!. Raises a ValueError if x is negative or
-        non-integral."""
+        non-integral, or exceeds the configured maximum input."""
         if validate_factorial(x):
-            if x in (0, 1):
-                return 1
-            else:
-                return x * self.factorial(x - 1)
+            return factorial_kernel(x)
 
-    def exp(self, x: Union[int, float]) -> Union[int, float]:
+    @staticmethod
+    def exp(x: Union[int, float]) -> Union[int, float]:
         """Return e raised to the power of x."""
-        return self.pow(E, x)
+        return Algebra.pow(E, x)
 
 
 class Geometry:
@@ -84,40 +180,44 @@ class Geometry:
     """
 
     def __init__(self):
-        self.__algebra = Algebra()
+        pass
 
-    def surface_of_square(self, a: Union[int, float]) -> Union[int, float]:
+    @staticmethod
+    def surface_of_square(a: Union[int, float]) -> Union[int, float]:
         """Return the surface of square."""
-        return self.__algebra.pow(a, 2)
+        validate_numbers(a)
+        return surface_of_square_kernel(a)
 
-    def surface_of_circle(self, r: Union[int, float]) -> Union[int, float]:
+    @staticmethod
+    def surface_of_circle(r: Union[int, float]) -> Union[int, float]:
         """Return the surface of a circle."""
-        return PI * self.__algebra.pow(r, 2)
+        validate_numbers(r)
+        return surface_of_circle_kernel(r)
 
+    @staticmethod
     def surface_of_triangle(
-            self, b: Union[int, float], h: Union[int, float]
+            b: Union[int, float], h: Union[int, float]
     ) -> Union[int, float]:
         """Return the surface of a triangle."""
-        return self.__algebra.div(self.__algebra.mul(b, h), 2)
+        validate_numbers(b, h)
+        return surface_of_triangle_kernel(b, h)
 
+    @staticmethod
     def surface_of_trapezoid(
-            self, a: Union[int, float],
+            a: Union[int, float],
             b: Union[int, float], h: Union[int, float]
     ) -> Union[int, float]:
         """Return the surface of a trapezoid."""
-        return self.__algebra.mul(
-            self.__algebra.div(self.__algebra.sum(a, b), 2), h
-        )
+        validate_numbers(a, b, h)
+        return surface_of_trapezoid_kernel(a, b, h)
 
+    @staticmethod
     def hypotenuse(
-            self, a: Union[int, float], b: Union[int, float]
+            a: Union[int, float], b: Union[int, float]
     ) -> Union[int, float]:
         """The square of the hypotenuse is equal to the sum of the areas
         of the squares on the other two sides. Return the hypotenuse of
         a triangle.
         """
-        return self.__algebra.square_root(
-            self.__algebra.sum(
-                self.__algebra.pow(a, 2), self.__algebra.pow(b, 2)
-            )
-        )
+        validate_numbers(a, b)
+        return hypotenuse_kernel(a, b)
@@ -0,0 +1,321 @@
+"""This module provides a persistent memo store for expensive results.
+
+Results of operations whose estimated cost reaches a threshold, such as
+big factorials and integer powers with large exponents, are kept in an
+SQLite database under a configurable directory, so they survive
+restarts and are shared by the CLI and every API worker. Entries are
+keyed like the result cache, on the operation and its normalized
+operands, and results are stored compactly: integers as their signed
+little-endian bytes and floats as float64.
+
+The database runs in write-ahead-log mode, so several processes can
+read it while one of them writes. Its total size is capped by evicting
+the least recently used entries. The store is a cache: a locked or
+broken database is treated as a miss and never fails a computation.
+
+`AsyncMemoStore` runs the database I/O of a store on a dedicated
+thread, for use inside an event loop such as the API workers.
+
+The store is enabled by setting `CoreConfig.MEMO_DIRECTORY`, or the
+environment variable named by `CoreConfig.MEMO_ENV_VAR`.
+"""
+
+import asyncio
+import os
+import sqlite3
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Sequence
+
+from math_cli_api_kit.config import CoreConfig
+from math_cli_api_kit.core.cache import make_cache_key
+from math_cli_api_kit.core.costs import estimate_cost
+from math_cli_api_kit.core.factorial import FactorialEngine, \
+    factorial_engine
+
+MEMO_FILE_NAME = "memo.sqlite3"
+
+_INT, _FLOAT = b"i", b"f"
+_FLOAT64 = struct.Struct("<d")
+_BUSY_TIMEOUT = 1.0
+# number of least recently used entries read at a time while evicting
+_EVICTION_BATCH = 32
+
+# the total size of the stored results is kept in `memo_size` by
+# triggers, so that every process sharing the database sees it
+_SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS memo (
+    key BLOB PRIMARY KEY,
+    operation TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS memo_used ON memo (used);
+CREATE TABLE IF NOT EXISTS memo_size (total INTEGER NOT NULL);
+INSERT INTO memo_size (total)
+    SELECT (SELECT coalesce(sum(size), 0) FROM memo)
+    WHERE NOT EXISTS (SELECT 1 FROM memo_size);
+CREATE TRIGGER IF NOT EXISTS memo_inserted AFTER INSERT ON memo BEGIN
+    UPDATE memo_size SET total = total + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS memo_updated AFTER UPDATE OF size ON memo
+BEGIN
+    UPDATE memo_size SET total = total - OLD.size + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS memo_deleted AFTER DELETE ON memo BEGIN
+    UPDATE memo_size SET total = total - OLD.size;
+END;
+COMMIT;
+"""
+
+
+def encode_result(result: Any) -> Optional[bytes]:
+    """Return the stored bytes of a result, or None if it cannot be
+    stored.
+    """
+    if type(result) is int:
+        length = result.bit_length() // 8 + 1
+        return _INT + result.to_bytes(length, "little", signed=True)
+    if type(result) is float:
+        return _FLOAT + _FLOAT64.pack(result)
+    return None
+
+
+def decode_result(value: bytes) -> Any:
+    """Return the result stored as `value`."""
+    if value[:1] == _INT:
+        return int.from_bytes(value[1:], "little", signed=True)
+    return _FLOAT64.unpack(value[1:])[0]
+
+
+def memo_directory() -> Optional[str]:
+    """Return the directory of the memo store set in the environment or
+    the configuration, None when the store is disabled.
+    """
+    return os.environ.get(CoreConfig.MEMO_ENV_VAR) or \
+        CoreConfig.MEMO_DIRECTORY
+
+
+class MemoStore:
+    """Persistent store of expensive results, see the module
+    documentation.
+
+    Only operations whose estimated cost reaches `min_cost` are looked
+    up and stored; the total size of the stored results is kept below
+    `max_bytes`.
+    """
+
+    def __init__(
+            self, directory: str, max_bytes: Optional[int] = None,
+            min_cost: Optional[float] = None
+    ):
+        self.path = os.path.join(directory, MEMO_FILE_NAME)
+        self.max_bytes = CoreConfig.MEMO_MAX_BYTES \
+            if max_bytes is None else max_bytes
+        self.min_cost = CoreConfig.MEMO_MIN_COST \
+            if min_cost is None else min_cost
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=_BUSY_TIMEOUT,
+                                   isolation_level=None,
+                                   check_same_thread=False)
+        try:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+        except sqlite3.Error:
+            self._db.close()
+            raise
+
+    def accepts(self, operation: str, operands: Sequence[Any]) -> bool:
+        """Check whether an operation is expensive enough to be
+        memoized.
+        """
+        return estimate_cost(operation, operands) >= self.min_cost
+
+    def get(self, operation: str, operands: Sequence[Any]) -> Any:
+        """Return the stored result of an operation, or None."""
+        key = make_cache_key(operation, operands)
+        if key is None:
+            return None
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    "SELECT value FROM memo WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE memo SET used = ? WHERE key = ?",
+                        (time.time(), key)
+                    )
+            except sqlite3.Error:
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return decode_result(row[0])
+
+    def set(
+            self, operation: str, operands: Sequence[Any], result: Any
+    ) -> None:
+        """Store the result of an operation, evicting the least recently
+        used results while the store is over its size cap.
+        """
+        key = make_cache_key(operation, operands)
+        value = encode_result(result)
+        if key is None or value is None or len(value) > self.max_bytes:
+            return
+        with self._lock:
+            try:
+                self._db.execute("BEGIN IMMEDIATE")
+                try:
+                    # an upsert rather than INSERT OR REPLACE, whose
+                    # deletions do not fire the triggers keeping the size
+                    self._db.execute(
+                        "INSERT INTO memo VALUES (?, ?, ?, ?, ?)"
+                        " ON CONFLICT (key) DO UPDATE SET"
+                        " value = excluded.value, size = excluded.size,"
+                        " used = excluded.used",
+                        (key, operation, value, len(value), time.time())
+                    )
+                    self._evict()
+                    self._db.execute("COMMIT")
+                except BaseException:
+                    self._db.execute("ROLLBACK")
+                    raise
+            except sqlite3.Error:
+                pass
+
+    def warm_factorials(self, engine: FactorialEngine) -> int:
+        """Load the most recently used factorials into the checkpoints of
+        a factorial engine and return how many were loaded.
+        """
+        with self._lock:
+            try:
+                rows = self._db.execute(
+                    "SELECT key, value FROM memo"
+                    " WHERE operation = 'factorial'"
+                    " ORDER BY used DESC LIMIT ?", (engine.cache_size,)
+                ).fetchall()
+            except sqlite3.Error:
+                return 0
+        for key, value in reversed(rows):
+            # keys end with the normalized operand, e.g. b"i1000"
+            x = int(key.rsplit(b"\x1f", 1)[1][1:])
+            engine.add_checkpoint(x, decode_result(value))
+        return len(rows)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            try:
+                (entries,) = self._db.execute(
+                    "SELECT count(*) FROM memo"
+                ).fetchone()
+                size = self._size()
+            except sqlite3.Error:
+                entries, size = 0, 0
+            return {"hits": self.hits, "misses": self.misses,
+                    "entries": entries, "bytes": size}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM memo")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _size(self) -> int:
+        (size,) = self._db.execute(
+            "SELECT total FROM memo_size"
+        ).fetchone()
+        return size
+
+    def _evict(self) -> None:
+        size = self._size()
+        while size > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM memo ORDER BY used LIMIT ?",
+                (_EVICTION_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            for key, entry_size in rows:
+                self._db.execute("DELETE FROM memo WHERE key = ?", (key,))
+                size -= entry_size
+                if size <= self.max_bytes:
+                    break
+
+
+def open_memo_store() -> Optional[MemoStore]:
+    """Open the configured memo store, None when it is disabled or
+    cannot be opened.
+    """
+    directory = memo_directory()
+    if not directory:
+        return None
+    try:
+        return MemoStore(directory)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def warm_factorial_engine(directory: str) -> None:
+    """Load the most recently used factorials of the memo store in
+    `directory` into the checkpoints of the factorial engine of the
+    current process, e.g. in the initializer of a worker process.
+    """
+    try:
+        store = MemoStore(directory)
+    except (OSError, sqlite3.Error):
+        return
+    try:
+        store.warm_factorials(factorial_engine)
+    finally:
+        store.close()
+
+
+class AsyncMemoStore:
+    """Asynchronous access to a `MemoStore`, whose database I/O runs on
+    a dedicated thread so that it never blocks the event loop.
+
+    Lookups are awaited, while results are stored in the background;
+    `close` waits for the pending writes.
+    """
+
+    def __init__(self, store: MemoStore):
+        self.store = store
+        self.min_cost = store.min_cost
+        self._thread = ThreadPoolExecutor(max_workers=1,
+                                          thread_name_prefix="memo")
+
+    async def get(self, operation: str, operands: Sequence[Any]) -> Any:
+        """Return the stored result of an operation, or None."""
+        return await asyncio.wrap_future(
+            self._thread.submit(self.store.get, operation, operands)
+        )
+
+    def set(
+            self, operation: str, operands: Sequence[Any], result: Any
+    ) -> None:
+        """Store the result of an operation in the background."""
+        self._thread.submit(self.store.set, operation, operands, result)
+
+    async def warm_factorials(self, engine: FactorialEngine) -> int:
+        """Load the most recently used factorials into the checkpoints of
+        a factorial engine, see `MemoStore.warm_factorials`.
+        """
+        return await asyncio.wrap_future(
+            self._thread.submit(self.store.warm_factorials, engine)
+        )
+
+    def close(self) -> None:
+        self._thread.shutdown(wait=True)
+        self.store.close()
@@ -0,0 +1,214 @@
+"""This module provides lightweight Prometheus-style metrics.
+
+A `MetricsStore` holds request and error counters and latency
+histograms for a fixed list of label sets, and a fixed list of named
+counters, in one flat array of float64 values whose layout only
+depends on the label sets, the histogram buckets and the counter
+names. Every worker process writes to its own store, from
+its event loop thread only, so no locks are needed. When the store is
+backed by a file in a shared directory, `render_metrics` sums the
+stores of all workers on scrape and renders them in the Prometheus
+text exposition format.
+"""
+
+import mmap
+import os
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+
+STAGES = ("parse", "compute", "serialize")
+PARSE, COMPUTE, SERIALIZE = range(len(STAGES))
+
+_REQUESTS = 0
+_ERRORS = 1
+_HISTOGRAMS = 2
+
+
+class MetricsStore:
+    """Counters and histograms of one worker, for every label set.
+
+    Each label set owns a block of `stride` values: the request count,
+    the error count, then one histogram for the request latency and one
+    per stage of `STAGES`. A histogram is made of one count per bucket,
+    one for the values above the last bucket, and the sum of all
+    observed values. The named `counters`, given as (name, help text),
+    follow the blocks of the label sets.
+    """
+
+    def __init__(
+            self, label_sets: Sequence[Labels], buckets: Sequence[float],
+            path: Optional[str] = None,
+            counters: Sequence[Tuple[str, str]] = ()
+    ):
+        self.label_sets = tuple(label_sets)
+        self.buckets = tuple(buckets)
+        self.histogram_size = len(self.buckets) + 2
+        self.stride = _HISTOGRAMS + self.histogram_size * (1 + len(STAGES))
+        self.path = path
+        self._offsets = {
+            labels: i * self.stride for i, labels in enumerate(self.label_sets)
+        }
+        self.counters = tuple(counters)
+        self._counter_offsets = {
+            name: len(self.label_sets) * self.stride + i
+            for i, (name, _) in enumerate(self.counters)
+        }
+        size = len(self.label_sets) * self.stride + len(self.counters)
+
+        self._mmap: Optional[mmap.mmap] = None
+        if path is None:
+            self.values = memoryview(array("d", bytes(size * 8)))
+        else:
+            with open(path, "wb+") as fh:
+                fh.truncate(size * 8)
+                self._mmap = mmap.mmap(fh.fileno(), size * 8)
+            self.values = memoryview(self._mmap).cast("d")
+
+    @property
+    def offsets(self) -> Dict[Labels, int]:
+        return self._offsets
+
+    def counter_offset(self, name: str) -> int:
+        return self._counter_offsets[name]
+
+    def offset(self, labels: Labels) -> Optional[int]:
+        """Return the offset of the values of a label set, or None if it
+        is not tracked.
+        """
+        return self._offsets.get(labels)
+
+    def record(
+            self, offset: int, seconds: float, error: bool,
+            stages: Iterable[Tuple[int, float]] = ()
+    ) -> None:
+        """Count a request of the label set at `offset` and observe its
+        latency and the latencies of its stages, given as (index in
+        `STAGES`, seconds).
+        """
+        values = self.values
+        values[offset + _REQUESTS] += 1
+        if error:
+            values[offset + _ERRORS] += 1
+        self._observe(offset + _HISTOGRAMS, seconds)
+        for stage, stage_seconds in stages:
+            self._observe(
+                offset + _HISTOGRAMS + (stage + 1) * self.histogram_size,
+                stage_seconds
+            )
+
+    def increment(self, name: str, amount: float = 1) -> None:
+        """Add `amount` to a named counter."""
+        self.values[self._counter_offsets[name]] += amount
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self.values.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def _observe(self, offset: int, seconds: float) -> None:
+        values = self.values
+        values[offset + bisect_left(self.buckets, seconds)] += 1
+        values[offset + self.histogram_size - 1] += seconds
+
+
+def read_values(store: MetricsStore, directory: Optional[str]) -> List[float]:
+    """Return the values of `store`, summed with the values of all other
+    worker stores in `directory` when one is given.
+    """
+    if directory is None:
+        return store.values.tolist()
+    totals = [0.0] * len(store.values)
+    for name in os.listdir(directory):
+        values = array("d")
+        with open(os.path.join(directory, name), "rb") as fh:
+            values.frombytes(fh.read())
+        if len(values) != len(totals):
+            continue
+        totals = [a + b for a, b in zip(totals, values)]
+    return totals
+
+
+def _format_labels(labels: Labels, *extra: Tuple[str, str]) -> str:
+    return ",".join(f'{name}="{value}"' for name, value in (*labels, *extra))
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _render_histogram(
+        lines: List[str], name: str, labels: Labels, values: List[float],
+        buckets: Sequence[float], *extra: Tuple[str, str]
+) -> None:
+    cumulative = 0.0
+    for bound, count in zip((*buckets, "+Inf"), values):
+        cumulative += count
+        le = bound if isinstance(bound, str) else repr(float(bound))
+        lines.append(f"{name}_bucket{{"
+                     f"{_format_labels(labels, *extra, ('le', le))}}}"
+                     f" {_format_number(cumulative)}")
+    label_text = _format_labels(labels, *extra)
+    lines.append(f"{name}_sum{{{label_text}}} {values[-1]!r}")
+    lines.append(f"{name}_count{{{label_text}}} {_format_number(cumulative)}")
+
+
+def render_metrics(
+        store: MetricsStore, prefix: str, directory: Optional[str] = None
+) -> str:
+    """Render the metrics of all workers in the Prometheus text
+    exposition format. Label sets without requests are omitted.
+    """
+    values = read_values(store, directory)
+    size = store.histogram_size
+    blocks = [
+        (labels, values[offset:offset + store.stride])
+        for labels, offset in store.offsets.items()
+        if values[offset + _REQUESTS]
+    ]
+    lines: List[str] = []
+
+    for metric, index, help_text in (
+            ("requests_total", _REQUESTS, "Total number of requests."),
+            ("errors_total", _ERRORS,
+             "Total number of requests answered with an error status."),
+    ):
+        name = f"{prefix}_{metric}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for labels, block in blocks:
+            lines.append(f"{name}{{{_format_labels(labels)}}}"
+                         f" {_format_number(block[index])}")
+
+    for counter, help_text in store.counters:
+        name = f"{prefix}_{counter}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        value = values[store.counter_offset(counter)]
+        lines.append(f"{name} {_format_number(value)}")
+
+    name = f"{prefix}_request_duration_seconds"
+    lines.append(f"# HELP {name} Request latency, from the request"
+                 f" middleware to the response middleware.")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, block in blocks:
+        _render_histogram(lines, name, labels,
+                          block[_HISTOGRAMS:_HISTOGRAMS + size],
+                          store.buckets)
+
+    name = f"{prefix}_stage_duration_seconds"
+    lines.append(f"# HELP {name} Latency of the stages of a request: JSON"
+                 f" parse, core compute and JSON serialize.")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, block in blocks:
+        for stage_index, stage in enumerate(STAGES):
+            start = _HISTOGRAMS + (stage_index + 1) * size
+            stage_values = block[start:start + size]
+            if stage_values[-1] or any(stage_values[:-1]):
+                _render_histogram(lines, name, labels, stage_values,
+                                  store.buckets, ("stage", stage))
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,179 @@
+"""This module provides request coalescing and micro-batching for the
+cheap operations computed inside an event loop.
+
+A `MicroBatcher` collects the concurrent calls of the same operation
+for a short window, or until a maximum number of calls is pending, and
+evaluates them together: with the vectorized engine when the group is
+large enough, NumPy is available and the operation's vectorized kernel
+computes the same floats as its trusted kernel, and with the trusted
+kernels otherwise, so that batching never changes a result. Identical
+calls in flight at the same time are computed once and share their
+result (single-flight).
+
+The batcher counts the calls, the coalesced calls, the batches and the
+evaluated items, so that its hit ratio and mean batch size can be
+monitored.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from math_cli_api_kit.core.batch import vector_evaluate
+from math_cli_api_kit.core.cache import make_cache_key
+from math_cli_api_kit.core.costs import BASE_COST, estimate_cost
+from math_cli_api_kit.core.metrics import MetricsStore
+from math_cli_api_kit.core.registry import OPERATIONS, Operation
+from math_cli_api_kit.core.vector_operations import has_numpy
+
+# counters recorded to the metrics store of the batcher, if any
+MICROBATCH_COUNTERS = (
+    ("microbatch_requests_total",
+     "Total number of calls submitted to the micro-batcher."),
+    ("microbatch_coalesced_total",
+     "Total number of calls answered with the result of an identical"
+     " call in flight."),
+    ("microbatch_batches_total", "Total number of evaluated batches."),
+    ("microbatch_items_total",
+     "Total number of items evaluated in batches."),
+    ("microbatch_vectorized_total",
+     "Total number of items evaluated with the vectorized engine."),
+)
+
+# operands, single-flight key and the futures of the callers waiting
+# for the result, resolved with (succeeded, result or exception)
+_Call = Tuple[Tuple[Any, ...], Optional[bytes], List["asyncio.Future"]]
+
+
+class MicroBatcher:
+    """Coalesces and micro-batches the calls of cheap operations, see
+    the module documentation.
+
+    Calls are collected for `window` seconds, or until the end of the
+    current event loop iteration when it is 0, and a batch is evaluated
+    as soon as `max_items` calls are pending. Batches of at least
+    `vectorize_threshold` items are vectorized.
+    """
+
+    def __init__(
+            self, window: float, max_items: int, vectorize_threshold: int,
+            metrics: Optional[MetricsStore] = None
+    ):
+        self.window = window
+        self.max_items = max_items
+        self.vectorize_threshold = vectorize_threshold
+        self.metrics = metrics
+        self.requests = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.items = 0
+        self.vectorized = 0
+        self._pending: Dict[str, List[_Call]] = {}
+        self._handles: Dict[str, asyncio.Handle] = {}
+        self._in_flight: Dict[bytes, _Call] = {}
+
+    @staticmethod
+    def accepts(operation: Operation, operands: Tuple[Any, ...]) -> bool:
+        """Check whether a call is cheap enough to be micro-batched.
+        Expensive calls, such as big factorials, should rather be
+        offloaded from the event loop.
+        """
+        return estimate_cost(operation.name, operands) <= BASE_COST
+
+    async def submit(
+            self, operation: Operation, operands: Tuple[Any, ...]
+    ) -> Any:
+        """Compute an operation for validated operands, in the next
+        batch of the operation or with an identical call in flight.
+        """
+        self._count("microbatch_requests_total")
+        self.requests += 1
+        # every caller waits for its own future, so that a cancelled
+        # caller does not cancel the others
+        future = asyncio.get_running_loop().create_future()
+        key = make_cache_key(operation.name, operands)
+        call = self._in_flight.get(key) if key is not None else None
+        if call is not None:
+            self._count("microbatch_coalesced_total")
+            self.coalesced += 1
+            call[2].append(future)
+        else:
+            self._enqueue(operation.name, (operands, key, [future]))
+
+        succeeded, result = await future
+        if not succeeded:
+            raise result
+        return result
+
+    def flush(self) -> None:
+        """Evaluate every pending batch now."""
+        for name in list(self._pending):
+            self._flush(name)
+
+    def stats(self) -> Dict[str, float]:
+        """Return the counters, the ratio of coalesced calls and the
+        mean number of items per batch.
+        """
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "items": self.items,
+            "vectorized": self.vectorized,
+            "hit_ratio": self.coalesced / self.requests
+            if self.requests else 0.0,
+            "mean_batch_size": self.items / self.batches
+            if self.batches else 0.0,
+        }
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        if self.metrics is not None:
+            self.metrics.increment(name, amount)
+
+    def _enqueue(self, name: str, call: _Call) -> None:
+        if call[1] is not None:
+            self._in_flight[call[1]] = call
+        pending = self._pending.setdefault(name, [])
+        pending.append(call)
+        if len(pending) >= self.max_items:
+            self._flush(name)
+        elif len(pending) == 1:
+            loop = asyncio.get_running_loop()
+            self._handles[name] = loop.call_later(
+                self.window, self._flush, name
+            ) if self.window > 0 else loop.call_soon(self._flush, name)
+
+    def _flush(self, name: str) -> None:
+        handle = self._handles.pop(name, None)
+        if handle is not None:
+            handle.cancel()
+        calls = self._pending.pop(name, None)
+        if not calls:
+            return
+
+        operation = OPERATIONS[name]
+        rows = [operands for operands, _, _ in calls]
+        values: List[Optional[float]] = [None] * len(rows)
+        if operation.exact_vector and has_numpy() and \
+                len(rows) >= self.vectorize_threshold:
+            values = vector_evaluate(operation, rows)
+            vectorized = sum(value is not None for value in values)
+            self._count("microbatch_vectorized_total", vectorized)
+            self.vectorized += vectorized
+        self._count("microbatch_batches_total")
+        self._count("microbatch_items_total", len(calls))
+        self.batches += 1
+        self.items += len(calls)
+
+        for (operands, key, futures), value in zip(calls, values):
+            if value is not None:
+                outcome = (True, value)
+            else:
+                try:
+                    outcome = (True, operation.kernel(*operands))
+                except Exception as e:
+                    outcome = (False, e)
+            if key is not None:
+                del self._in_flight[key]
+            for future in futures:
+                if not future.done():
+                    future.set_result(outcome)
@@ -0,0 +1,473 @@
+"""This module provides the arbitrary-precision and exact-rational
+numeric backends of the math operations.
+
+The "decimal" backend computes with `decimal.Decimal` numbers rounded
+to a configurable number of significant digits, the "fraction" backend
+with exact `fractions.Fraction` numbers. Results that are not rational,
+such as square roots, exponentials, non-integral powers and the surface
+of a circle, are rounded to the configured precision in both backends.
+Factorials are exact integers in both.
+
+Operands are converted exactly: floats from their shortest
+representation, so `0.1` is one tenth, and strings such as "0.10" or
+"1/3" are parsed. Composite geometric formulas are evaluated exactly
+and rounded once.
+
+π, e, square roots and exponentials are computed by integer fixed-point
+kernels: the Chudnovsky series for π and the Taylor series of exp, both
+summed by binary splitting, and Newton's integer square root. Constants
+and kernel results are memoized per precision.
+"""
+
+import math
+from decimal import Context, Decimal, DivisionUndefined, \
+    InvalidOperation, MAX_PREC, Overflow
+from fractions import Fraction
+from functools import lru_cache, wraps
+from typing import Any, Callable, Optional, Tuple, Union
+
+from math_cli_api_kit.config import NUMERIC_BACKENDS, CoreConfig
+from math_cli_api_kit.core.factorial import is_large_int, iter_decimal
+from math_cli_api_kit.core.math_operations import Algebra
+from math_cli_api_kit.core.registry import ALGEBRA, OPERATIONS
+from math_cli_api_kit.core.validation import get_object_type_name, \
+    validate_power
+
+Exact = Union[int, Decimal, Fraction]
+
+_OPERAND_TYPES = (int, float, Decimal, Fraction)
+
+# extra digits carried by the kernels beyond the requested precision
+_GUARD_DIGITS = 10
+
+# beyond this magnitude exp overflows, or underflows to zero, at any
+# precision
+_EXP_LIMIT = 10 ** 7
+
+# 640320**3 / 24 and the digits gained by every term of the Chudnovsky
+# series
+_CHUDNOVSKY_C3_24 = 640320 ** 3 // 24
+_CHUDNOVSKY_DIGITS_PER_TERM = 14.18
+
+_PARSE_CONTEXT = Context(prec=MAX_PREC, traps=[InvalidOperation])
+
+
+@lru_cache(maxsize=None)
+def _context(precision: int) -> Context:
+    return Context(prec=precision)
+
+
+def validate_precision(precision: int) -> int:
+    """Validate a precision in significant digits and raise an error if
+    it is not valid.
+    """
+    if type(precision) is not int:
+        raise TypeError(f"unsupported precision type: "
+                        f"'{get_object_type_name(precision)}'. Expected"
+                        f" int.")
+    if not 1 <= precision <= CoreConfig.MAX_PRECISION:
+        raise ValueError(f"precision must be between 1 and"
+                         f" {CoreConfig.MAX_PRECISION}")
+    return precision
+
+
+def parse_operand(text: str) -> Union[Decimal, Fraction]:
+    """Parse a decimal number such as "0.10", keeping its digits, or a
+    rational number such as "1/3" exactly.
+    """
+    try:
+        return _PARSE_CONTEXT.create_decimal(text.strip())
+    except InvalidOperation:
+        try:
+            return Fraction(text)
+        except (ValueError, ZeroDivisionError):
+            raise ValueError(f"invalid number: '{text}'")
+
+
+def _round(value: Fraction, precision: int) -> Decimal:
+    """Round a rational number to `precision` significant digits."""
+    return _context(precision).divide(Decimal(value.numerator),
+                                      Decimal(value.denominator))
+
+
+def _is_integral(value: Union[Decimal, Fraction]) -> bool:
+    """Check whether a number is integral without converting it to an
+    int, which takes quadratic time for numbers such as 1e100000.
+    """
+    if type(value) is Fraction:
+        return value.denominator == 1
+    _, digits, exponent = value.as_tuple()
+    return exponent >= 0 or not any(digits[exponent:])
+
+
+def _is_even(value: Union[Decimal, Fraction]) -> bool:
+    """Check whether an integral number is even, from its last digit."""
+    if type(value) is Fraction:
+        return value.numerator % 2 == 0
+    _, digits, exponent = value.as_tuple()
+    units = len(digits) - 1 + exponent
+    return exponent > 0 or units < 0 or digits[units] % 2 == 0
+
+
+def _chudnovsky_split(a: int, b: int) -> Tuple[int, int, int]:
+    if b - a == 1:
+        if a == 0:
+            p = q = 1
+        else:
+            p = (6 * a - 5) * (2 * a - 1) * (6 * a - 1)
+            q = a * a * a * _CHUDNOVSKY_C3_24
+        t = p * (13591409 + 545140134 * a)
+        return p, q, -t if a & 1 else t
+    m = (a + b) // 2
+    p1, q1, t1 = _chudnovsky_split(a, m)
+    p2, q2, t2 = _chudnovsky_split(m, b)
+    return p1 * p2, q1 * q2, q2 * t1 + p1 * t2
+
+
+@lru_cache(maxsize=CoreConfig.PRECISION_CACHE_SIZE)
+def pi_fixed(digits: int) -> int:
+    """Return π * 10**digits, truncated to an integer."""
+    one = 10 ** digits
+    terms = int(digits / _CHUDNOVSKY_DIGITS_PER_TERM) + 2
+    _, q, t = _chudnovsky_split(0, terms)
+    return q * 426880 * math.isqrt(10005 * one * one) // t
+
+
+def _exp_split(
+        a: int, b: int, p: int, q: int
+) -> Tuple[int, int, int]:
+    """Sum the terms a to b - 1 of the Taylor series of exp(p / q),
+    divided by term a - 1, as a fraction T / Q, and return (P, Q, T)
+    where P / Q is the ratio of the terms b - 1 and a - 1.
+    """
+    if b - a == 1:
+        return p, q * a, p
+    m = (a + b) // 2
+    p1, q1, t1 = _exp_split(a, m, p, q)
+    p2, q2, t2 = _exp_split(m, b, p, q)
+    return p1 * p2, q1 * q2, t1 * q2 + p1 * t2
+
+
+def exp_fixed(x: Fraction, digits: int) -> int:
+    """Return exp(x) * 10**digits for 0 <= x <= 1, truncated to an
+    integer.
+    """
+    one = 10 ** digits
+    if not x:
+        return one
+    # enough terms for the remainder, below 1 / terms!, to vanish
+    terms, log_factorial = 2, 0.0
+    while log_factorial < digits + 2:
+        log_factorial += math.log10(terms)
+        terms += 1
+    _, q, t = _exp_split(1, terms, x.numerator, x.denominator)
+    return one + t * one // q
+
+
+@lru_cache(maxsize=CoreConfig.PRECISION_CACHE_SIZE)
+def _e_fixed(digits: int) -> int:
+    return exp_fixed(Fraction(1), digits)
+
+
+@lru_cache(maxsize=CoreConfig.PRECISION_CACHE_SIZE)
+def pi_decimal(precision: int) -> Decimal:
+    """Return π rounded to `precision` significant digits."""
+    digits = precision + _GUARD_DIGITS
+    return _context(precision).scaleb(Decimal(pi_fixed(digits)), -digits)
+
+
+@lru_cache(maxsize=CoreConfig.PRECISION_CACHE_SIZE)
+def exp_decimal(x: Fraction, precision: int) -> Decimal:
+    """Return e**x rounded to `precision` significant digits."""
+    if x > _EXP_LIMIT:
+        raise OverflowError("numerical result out of range")
+    if x < -_EXP_LIMIT:
+        return Decimal(0)
+    # e**x = e**n * e**r with an integer n and 0 <= r < 1
+    n = math.floor(x)
+    digits = precision + _GUARD_DIGITS + len(str(abs(n)))
+    wide = _context(digits)
+    power = wide.power(wide.scaleb(Decimal(_e_fixed(digits)), -digits), n)
+    remainder = wide.scaleb(Decimal(exp_fixed(x - n, digits)), -digits)
+    return _context(precision).multiply(power, remainder)
+
+
+@lru_cache(maxsize=CoreConfig.PRECISION_CACHE_SIZE)
+def sqrt_decimal(x: Fraction, precision: int) -> Decimal:
+    """Return the square root of x rounded to `precision` significant
+    digits.
+    """
+    if x < 0:
+        raise ValueError("The result is not a real number")
+    if not x:
+        return Decimal(0)
+    numerator, denominator = x.numerator, x.denominator
+    # about log10(x), so that the root has precision + guard digits
+    magnitude = int((numerator.bit_length() - denominator.bit_length())
+                    * 0.30103)
+    digits = precision + _GUARD_DIGITS - magnitude // 2
+    if digits >= 0:
+        scaled, remainder = divmod(numerator * 10 ** (2 * digits),
+                                   denominator)
+        root = math.isqrt(scaled)
+        if not remainder and root * root == scaled:
+            # exact roots, such as the hypotenuse of 3 and 4, without
+            # trailing zeros
+            while digits > 0 and not root % 10:
+                root //= 10
+                digits -= 1
+    else:
+        root = math.isqrt(numerator // (denominator * 10 ** (-2 * digits)))
+    return _context(precision).scaleb(Decimal(root), -digits)
+
+
+def _arithmetic_errors(method: Callable) -> Callable:
+    """Report the decimal signals of a method as the built-in errors
+    raised by the float operations.
+    """
+    @wraps(method)
+    def wrapper(*args: Any) -> Any:
+        try:
+            return method(*args)
+        except ZeroDivisionError:
+            raise ZeroDivisionError("division by zero")
+        except InvalidOperation as e:
+            if e.args and DivisionUndefined in e.args[0]:
+                raise ZeroDivisionError("division by zero")
+            raise ValueError("The result is not a real number")
+        except Overflow:
+            raise OverflowError("numerical result out of range")
+
+    return wrapper
+
+
+class PreciseAlgebra:
+    """Provides the operations of `Algebra` with `Decimal` numbers
+    rounded to `precision` significant digits ("decimal") or with exact
+    `Fraction` numbers ("fraction").
+    """
+
+    def __init__(
+            self, numeric: str = "decimal", precision: Optional[int] = None
+    ):
+        if numeric not in NUMERIC_BACKENDS[1:]:
+            raise ValueError(f"unknown numeric backend '{numeric}'."
+                             f" Expected decimal or fraction.")
+        self.numeric = numeric
+        self.precision = validate_precision(
+            CoreConfig.DEFAULT_PRECISION if precision is None else precision
+        )
+        self.context = _context(self.precision)
+        self._fraction = numeric == "fraction"
+
+    def convert(self, x: Any) -> Union[Decimal, Fraction]:
+        """Convert an operand to a number of the backend. Floats are
+        converted from their shortest representation and strings are
+        parsed with `parse_operand`.
+        """
+        if type(x) is str:
+            x = parse_operand(x)
+        operand_type = type(x)
+        if operand_type not in _OPERAND_TYPES:
+            raise TypeError(f"unsupported operand type: "
+                            f"'{get_object_type_name(x)}'. Expected int,"
+                            f" float, Decimal, Fraction or str.")
+        if operand_type is float:
+            if not math.isfinite(x):
+                raise ValueError(f"{x} is not a finite number")
+            x = Decimal(repr(x))
+        elif operand_type is Decimal and not x.is_finite():
+            raise ValueError(f"{x} is not a finite number")
+
+        if self._fraction:
+            return Fraction(x)
+        if operand_type is Fraction:
+            return _round(x, self.precision)
+        return Decimal(x)
+
+    def exact(self, x: Any) -> Fraction:
+        """Convert an operand to the exact rational number it stands
+        for in the backend.
+        """
+        return Fraction(self.convert(x))
+
+    def rational(self, value: Fraction) -> Union[Decimal, Fraction]:
+        """Return an exact result, rounded in the decimal backend."""
+        return value if self._fraction else _round(value, self.precision)
+
+    def rounded(self, value: Decimal) -> Union[Decimal, Fraction]:
+        """Return a result rounded to the precision as a number of the
+        backend.
+        """
+        return Fraction(value) if self._fraction else value
+
+    @_arithmetic_errors
+    def sum(self, x: Any, y: Any) -> Union[Decimal, Fraction]:
+        """Return the sum of x and y."""
+        x, y = self.convert(x), self.convert(y)
+        return x + y if self._fraction else self.context.add(x, y)
+
+    @_arithmetic_errors
+    def sub(self, x: Any, y: Any) -> Union[Decimal, Fraction]:
+        """Return the subtraction of x by y."""
+        x, y = self.convert(x), self.convert(y)
+        return x - y if self._fraction else self.context.subtract(x, y)
+
+    @_arithmetic_errors
+    def mul(self, x: Any, y: Any) -> Union[Decimal, Fraction]:
+        """Return the multiplication of x by y."""
+        x, y = self.convert(x), self.convert(y)
+        return x * y if self._fraction else self.context.multiply(x, y)
+
+    @_arithmetic_errors
+    def div(self, x: Any, y: Any) -> Union[Decimal, Fraction]:
+        """Return the division of x by y."""
+        x, y = self.convert(x), self.convert(y)
+        return x / y if self._fraction else self.context.divide(x, y)
+
+    @_arithmetic_errors
+    def pow(self, x: Any, y: Any) -> Union[Decimal, Fraction]:
+        """Return x**y (x to the power of y). Integral powers of
+        fractions are exact, and rejected when their numerator or
+        denominator would exceed `CoreConfig.POW_MAX_RESULT_BITS` bits.
+        Integral exponents above `CoreConfig.POW_MAX_RESULT_BITS` are
+        rejected in both backends, unless x is 0, 1 or -1.
+        """
+        x, y = self.convert(x), self.convert(y)
+        if not x and y < 0:
+            raise ZeroDivisionError("division by zero")
+        if _is_integral(y):
+            max_bits = CoreConfig.POW_MAX_RESULT_BITS
+            # compared without arithmetic, which would overflow the
+            # context for exponents such as 1e1000000
+            if y > max_bits or y < -max_bits:
+                if x and x != 1 and x != -1:
+                    raise ValueError(f"the result of the power exceeds the"
+                                     f" maximum supported size of"
+                                     f" {max_bits} bits.")
+                # only the parity of the exponent matters
+                y = (2 if _is_even(y) else 1) * (1 if y > 0 else -1)
+            if self._fraction:
+                validate_power(max(abs(x.numerator), x.denominator),
+                               abs(int(y)), max_bits)
+                return x ** int(y)
+            return self.context.power(x, int(y))
+        if x < 0:
+            raise ValueError("The result is not a real number")
+        if self._fraction:
+            wide = self.precision + _GUARD_DIGITS
+            return Fraction(self.context.power(_round(x, wide),
+                                               _round(y, wide)))
+        return self.context.power(x, y)
+
+    @_arithmetic_errors
+    def square_root(self, x: Any) -> Union[Decimal, Fraction]:
+        """Return the square root of x."""
+        return self.rounded(sqrt_decimal(self.exact(x), self.precision))
+
+    def factorial(self, x: Any) -> int:
+        """Find x!. Raises a ValueError if x is negative or
+        non-integral, or exceeds the configured maximum input."""
+        x = self.convert(x)
+        if x < 0 or x != int(x):
+            raise ValueError(f"{x} is negative or non-integral.")
+        return Algebra.factorial(int(x))
+
+    @_arithmetic_errors
+    def exp(self, x: Any) -> Union[Decimal, Fraction]:
+        """Return e raised to the power of x."""
+        return self.rounded(exp_decimal(self.exact(x), self.precision))
+
+
+class PreciseGeometry:
+    """Provides the operations of `Geometry` with the numeric backends
+    of `PreciseAlgebra`. Every formula is evaluated exactly and rounded
+    once.
+    """
+
+    def __init__(
+            self, numeric: str = "decimal", precision: Optional[int] = None
+    ):
+        self.algebra = PreciseAlgebra(numeric, precision)
+
+    def surface_of_square(self, a: Any) -> Union[Decimal, Fraction]:
+        """Return the surface of square."""
+        return self.algebra.mul(a, a)
+
+    @_arithmetic_errors
+    def surface_of_circle(self, r: Any) -> Union[Decimal, Fraction]:
+        """Return the surface of a circle."""
+        algebra = self.algebra
+        r = algebra.exact(r)
+        pi = Fraction(pi_decimal(algebra.precision + _GUARD_DIGITS))
+        return algebra.rounded(_round(pi * r * r, algebra.precision))
+
+    @_arithmetic_errors
+    def surface_of_triangle(
+            self, b: Any, h: Any
+    ) -> Union[Decimal, Fraction]:
+        """Return the surface of a triangle."""
+        algebra = self.algebra
+        return algebra.rational(algebra.exact(b) * algebra.exact(h) / 2)
+
+    @_arithmetic_errors
+    def surface_of_trapezoid(
+            self, a: Any, b: Any, h: Any
+    ) -> Union[Decimal, Fraction]:
+        """Return the surface of a trapezoid."""
+        algebra = self.algebra
+        return algebra.rational(
+            (algebra.exact(a) + algebra.exact(b)) / 2 * algebra.exact(h)
+        )
+
+    @_arithmetic_errors
+    def hypotenuse(self, a: Any, b: Any) -> Union[Decimal, Fraction]:
+        """Return the hypotenuse of a triangle."""
+        algebra = self.algebra
+        a, b = algebra.exact(a), algebra.exact(b)
+        return algebra.rounded(sqrt_decimal(a * a + b * b,
+                                            algebra.precision))
+
+
+@lru_cache(maxsize=None)
+def precise_operations(
+        numeric: str, precision: int
+) -> Tuple[PreciseAlgebra, PreciseGeometry]:
+    """Return the algebra and geometry operations of a numeric backend
+    and precision.
+    """
+    return PreciseAlgebra(numeric, precision), \
+        PreciseGeometry(numeric, precision)
+
+
+def run_precise(
+        operation: str, numeric: str, precision: int, *operands: Any
+) -> str:
+    """Compute a registered operation with a numeric backend and return
+    the text of its result, see `format_exact`. The operation is looked
+    up by name so that the call, formatting included, can be sent to a
+    worker process.
+    """
+    algebra, geometry = precise_operations(numeric, precision)
+    family = algebra if OPERATIONS[operation].family == ALGEBRA \
+        else geometry
+    return format_exact(getattr(family, operation)(*operands))
+
+
+def _format_int(value: int) -> str:
+    return "".join(iter_decimal(value)) if is_large_int(value) \
+        else str(value)
+
+
+def format_exact(value: Exact) -> str:
+    """Return the text of a result of the numeric backends, e.g.
+    "0.3333333333333333333333333333" or "1/3".
+    """
+    if type(value) is Fraction:
+        if value.denominator == 1:
+            return _format_int(value.numerator)
+        return f"{_format_int(value.numerator)}/" \
+               f"{_format_int(value.denominator)}"
+    if type(value) is int:
+        return _format_int(value)
+    return str(value)
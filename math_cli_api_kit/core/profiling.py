@@ -0,0 +1,224 @@
+"""This module provides opt-in profiling of the core operations.
+
+While a `Profile` is enabled, the methods of `Algebra` and `Geometry`,
+the trusted kernels and the validation functions they call are wrapped
+to record, per method, the number of calls, the cumulative time and the
+time spent in validation, including nested calls. The originals are
+restored when the profile is disabled, so profiling costs nothing while
+it is off.
+
+A profile also records the self time of every instrumented call stack
+and can write it as a collapsed-stack file for flamegraph tools, and,
+when created with `cprofile=True`, a cProfile/pstats dump of all Python
+functions.
+
+Profiling is enabled with the `profile_operations` context manager, or
+for the CLI and the API workers by setting the `MATH_CLI_API_KIT_PROFILE`
+environment variable to an output path prefix.
+"""
+
+import cProfile
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from math_cli_api_kit.config import CoreConfig
+from math_cli_api_kit.core import math_operations, registry
+from math_cli_api_kit.core.math_operations import Algebra, Geometry
+
+# validation functions looked up as globals of the math_operations module
+_VALIDATION_FUNCTIONS = ("validate_int_or_float", "validate_numbers",
+                         "validate_factorial")
+
+_active: Optional["Profile"] = None
+
+
+def profile_output_prefix() -> Optional[str]:
+    """Return the output path prefix set in the environment, if any."""
+    return os.environ.get(CoreConfig.PROFILE_ENV_VAR) or None
+
+
+class MethodStats:
+    """Call count, cumulative time and validation time of a method."""
+
+    __slots__ = ("calls", "cumulative", "validation")
+
+    def __init__(self):
+        self.calls = 0
+        self.cumulative = 0.0
+        self.validation = 0.0
+
+
+class Profile:
+    """Profile of the core operations, see the module documentation."""
+
+    def __init__(self, cprofile: bool = False):
+        self.stats: Dict[str, MethodStats] = {}
+        # self time by collapsed call stack, in seconds
+        self.stacks: Dict[str, float] = {}
+        self.cprofile = cProfile.Profile() if cprofile else None
+        self._local = threading.local()
+        self._originals: List[Tuple[object, str, object]] = []
+        self._registry: Dict[str, Tuple[Callable, Callable]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def enable(self) -> "Profile":
+        """Instrument the core operations. Only one profile can be
+        enabled at a time.
+        """
+        global _active
+        if _active is not None:
+            raise RuntimeError("another profile is already enabled")
+        _active = self
+
+        for cls in (Algebra, Geometry):
+            for name, attribute in list(vars(cls).items()):
+                if isinstance(attribute, staticmethod):
+                    wrapped = self._wrap(f"{cls.__name__}.{name}",
+                                         attribute.__func__)
+                    self._patch(cls, name, staticmethod(wrapped))
+        for name, function in list(vars(math_operations).items()):
+            if name.endswith("_kernel"):
+                self._patch(math_operations, name, self._wrap(name, function))
+        for name in _VALIDATION_FUNCTIONS:
+            function = getattr(math_operations, name)
+            self._patch(math_operations, name,
+                        self._wrap(name, function, validation=True))
+
+        # registry entries hold the original functions
+        for name, operation in registry.OPERATIONS.items():
+            cls = Algebra if operation.family == registry.ALGEBRA \
+                else Geometry
+            self._registry[name] = (operation.function, operation.kernel)
+            _replace_functions(
+                name, getattr(cls, operation.function.__name__),
+                getattr(math_operations, operation.kernel.__name__)
+            )
+
+        if self.cprofile is not None:
+            self.cprofile.enable()
+        return self
+
+    def disable(self) -> None:
+        """Restore the original operations."""
+        global _active
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        for target, name, original in reversed(self._originals):
+            setattr(target, name, original)
+        self._originals.clear()
+        for name, (function, kernel) in self._registry.items():
+            _replace_functions(name, function, kernel)
+        self._registry.clear()
+        if _active is self:
+            _active = None
+
+    def format_stats(self) -> str:
+        """Return a table of the recorded method statistics, slowest
+        first. Methods that were not called are omitted.
+        """
+        lines = [f"{'method':<34}{'calls':>10}{'cumulative ms':>15}"
+                 f"{'validation ms':>15}{'validation':>12}"]
+        for name, stats in sorted(self.stats.items(),
+                                  key=lambda item: -item[1].cumulative):
+            if not stats.calls:
+                continue
+            share = stats.validation / stats.cumulative \
+                if stats.cumulative else 0.0
+            lines.append(f"{name:<34}{stats.calls:>10}"
+                         f"{stats.cumulative * 1e3:>15.3f}"
+                         f"{stats.validation * 1e3:>15.3f}{share:>12.1%}")
+        return "\n".join(lines)
+
+    def dump_collapsed(self, path: str) -> None:
+        """Write the self time of every call stack, in microseconds, in
+        the collapsed-stack format of flamegraph tools.
+        """
+        with open(path, "w", encoding="utf-8") as fh:
+            for stack, seconds in sorted(self.stacks.items()):
+                fh.write(f"{stack} {round(seconds * 1e6)}\n")
+
+    def dump_pstats(self, path: str) -> None:
+        """Write the cProfile statistics, readable with `pstats`."""
+        if self.cprofile is None:
+            raise ValueError("the profile was created without cprofile")
+        self.cprofile.create_stats()
+        self.cprofile.dump_stats(path)
+
+    def dump(self, prefix: str) -> List[str]:
+        """Write all outputs of the profile with the given path prefix
+        and return their paths.
+        """
+        paths = [f"{prefix}.collapsed", f"{prefix}.txt"]
+        self.dump_collapsed(paths[0])
+        with open(paths[1], "w", encoding="utf-8") as fh:
+            fh.write(self.format_stats() + "\n")
+        if self.cprofile is not None:
+            paths.append(f"{prefix}.pstats")
+            self.dump_pstats(paths[-1])
+        return paths
+
+    def _patch(self, target: object, name: str, value: object) -> None:
+        self._originals.append((target, name, vars(target)[name]))
+        setattr(target, name, value)
+
+    def _wrap(
+            self, key: str, function: Callable, validation: bool = False
+    ) -> Callable:
+        local = self._local
+        stats = self.stats.setdefault(key, MethodStats())
+        stacks = self.stacks
+        perf_counter = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            frames = getattr(local, "frames", None)
+            if frames is None:
+                frames = local.frames = []
+            # key, time in children, time in validation
+            frame = [key, 0.0, 0.0]
+            frames.append(frame)
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                frames.pop()
+                stats.calls += 1
+                stats.cumulative += elapsed
+                stats.validation += elapsed if validation else frame[2]
+                stack = ";".join([*(f[0] for f in frames), key])
+                stacks[stack] = stacks.get(stack, 0.0) + elapsed - frame[1]
+                if frames:
+                    frames[-1][1] += elapsed
+                    frames[-1][2] += elapsed if validation else frame[2]
+
+        wrapper.__name__ = function.__name__
+        wrapper.__qualname__ = function.__qualname__
+        wrapper.__doc__ = function.__doc__
+        wrapper.__wrapped__ = function
+        return wrapper
+
+
+def _replace_functions(
+        name: str, function: Callable, kernel: Callable
+) -> None:
+    for operations in (registry.OPERATIONS, registry.ALGEBRA_OPERATIONS,
+                       registry.GEOMETRY_OPERATIONS):
+        if name in operations:
+            operations[name] = operations[name]._replace(function=function,
+                                                         kernel=kernel)
+
+
+@contextmanager
+def profile_operations(cprofile: bool = False) -> Iterator[Profile]:
+    """Profile the core operations for the duration of the block."""
+    profile = Profile(cprofile).enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
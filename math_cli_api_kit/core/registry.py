@@ -0,0 +1,212 @@
+"""This module provides the registry of math operations.
+
+Every algebraic and geometric operation is described once by an
+Operation entry: its callable, trusted kernel, vectorized callable,
+operand names and types, help texts and a precompiled operands
+validator. The API
+handlers, the batch endpoint, the OpenAPI schemas and the CLI commands
+are all generated from this registry, so a new operation only needs to
+be registered here to reach every surface.
+
+Vectorized callables are resolved on their first call, so that
+importing the registry does not import NumPy.
+"""
+
+import importlib
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional, \
+    Tuple
+
+from math_cli_api_kit.core import math_operations
+from math_cli_api_kit.core.math_operations import Algebra, Geometry
+from math_cli_api_kit.core.validation import compile_operands_validator
+
+ALGEBRA = "algebra"
+GEOMETRY = "geometry"
+
+
+class Operation(NamedTuple):
+    name: str
+    family: str
+    function: Callable
+    # computes the operation without validating the operands, for
+    # callers that validated them with `validator`
+    kernel: Callable
+    vector_function: Optional[Callable]
+    operands: Tuple[str, ...]
+    operand_types: Tuple[type, ...]
+    operand_help: Tuple[str, ...]
+    help: str
+    # whether the scalar result is always a float, regardless of the
+    # operand types
+    float_result: bool
+    # whether the vectorized callable returns the very floats of the
+    # kernel; transcendental NumPy functions may differ in the last ulp
+    exact_vector: bool
+    validator: Callable[[Mapping[str, Any]], Tuple[Any, ...]]
+
+    @property
+    def arity(self) -> int:
+        return len(self.operands)
+
+
+OPERATIONS: Dict[str, Operation] = {}
+
+
+def register_operation(
+        name: str, family: str, function: Callable,
+        vector_function: Optional[Callable], operands: Dict[str, str],
+        help: str, float_result: bool = False, operand_type: type = float,
+        exact_vector: bool = False
+) -> Operation:
+    """Register an operation and return its registry entry.
+
+    `operands` maps every operand name, in call order, to its help
+    text. The trusted kernel of the operation is looked up by name in
+    `math_operations`.
+    """
+    names = tuple(operands)
+    types = (operand_type,) * len(names)
+    operation = Operation(
+        name=name,
+        family=family,
+        function=function,
+        kernel=getattr(math_operations, f"{name}_kernel"),
+        vector_function=vector_function,
+        operands=names,
+        operand_types=types,
+        operand_help=tuple(operands.values()),
+        help=help,
+        float_result=float_result,
+        exact_vector=exact_vector,
+        validator=compile_operands_validator(names, types),
+    )
+    OPERATIONS[name] = operation
+    return operation
+
+
+def get_operations(family: str) -> Dict[str, Operation]:
+    """Return the registered operations of a family by name."""
+    return {
+        name: operation for name, operation in OPERATIONS.items()
+        if operation.family == family
+    }
+
+
+@lru_cache(maxsize=None)
+def _resolve_vector_kernel(class_name: str, name: str) -> Callable:
+    module = importlib.import_module(
+        "math_cli_api_kit.core.vector_operations"
+    )
+    return getattr(getattr(module, class_name), name)
+
+
+def vector_kernel(class_name: str, name: str) -> Callable:
+    """Return a function calling the vectorized method `name` of a class
+    of `vector_operations`, importing the module on the first call.
+    """
+    def kernel(*arrays: Any) -> Any:
+        return _resolve_vector_kernel(class_name, name)(*arrays)
+
+    kernel.__name__ = kernel.__qualname__ = f"{class_name}.{name}"
+    return kernel
+
+
+def _vector_algebra(name: str) -> Callable:
+    return vector_kernel("VectorAlgebra", name)
+
+
+def _vector_geometry(name: str) -> Callable:
+    return vector_kernel("VectorGeometry", name)
+
+
+# algebra operations
+register_operation(
+    "sum", ALGEBRA, Algebra.sum, _vector_algebra("sum"),
+    {"x": "Calculate the sum by 'y'", "y": "Calculate the sum by 'x'"},
+    help="Return the sum of x and y.", exact_vector=True
+)
+register_operation(
+    "sub", ALGEBRA, Algebra.sub, _vector_algebra("sub"),
+    {"x": "Calculate the subtraction by 'y'",
+     "y": "Calculate the subtraction by 'x'"},
+    help="Return the subtraction of x by y.", exact_vector=True
+)
+register_operation(
+    "mul", ALGEBRA, Algebra.mul, _vector_algebra("mul"),
+    {"x": "Calculate the multiplication by 'y'",
+     "y": "Calculate the multiplication by 'x'"},
+    help="Return the multiplication of x by y.", exact_vector=True
+)
+register_operation(
+    "div", ALGEBRA, Algebra.div, _vector_algebra("div"),
+    {"x": "Calculate the division by 'y'",
+     "y": "Calculate the division by 'x'"},
+    help="Return the division of x by y.", float_result=True,
+    exact_vector=True
+)
+register_operation(
+    "pow", ALGEBRA, Algebra.pow, _vector_algebra("pow"),
+    {"x": "Calculate x to the power of 'y'",
+     "y": "Calculate 'x' to the power of its"},
+    help="Return x**y (x to the power of y)."
+)
+register_operation(
+    "square_root", ALGEBRA, Algebra.square_root,
+    _vector_algebra("square_root"), {"x": "Calculate its square root"},
+    help="Return the square root of x.", float_result=True
+)
+register_operation(
+    "factorial", ALGEBRA, Algebra.factorial, None,
+    {"x": "Calculate its factorial"},
+    help="Find x! Raises a ValueError if x is negative or non-integral.",
+    operand_type=int
+)
+register_operation(
+    "exp", ALGEBRA, Algebra.exp, _vector_algebra("exp"),
+    {"x": "Calculate 'e' raised to the power of its"},
+    help="Return e raised to the power of x.", float_result=True
+)
+
+# geometry operations
+register_operation(
+    "surface_of_square", GEOMETRY, Geometry.surface_of_square,
+    _vector_geometry("surface_of_square"),
+    {"a": "Calculate the surface of a square"},
+    help="Return the surface of square."
+)
+register_operation(
+    "surface_of_circle", GEOMETRY, Geometry.surface_of_circle,
+    _vector_geometry("surface_of_circle"),
+    {"r": "Calculate the surface of a circle by radius"},
+    help="Return the surface of a circle.", float_result=True
+)
+register_operation(
+    "surface_of_triangle", GEOMETRY, Geometry.surface_of_triangle,
+    _vector_geometry("surface_of_triangle"),
+    {"b": "Calculate the surface of a triangle by its base",
+     "h": "Calculate the surface of a triangle by its height"},
+    help="Return the surface of a triangle.", float_result=True,
+    exact_vector=True
+)
+register_operation(
+    "surface_of_trapezoid", GEOMETRY, Geometry.surface_of_trapezoid,
+    _vector_geometry("surface_of_trapezoid"),
+    {"a": "Calculate the surface of a trapezoid by base 1",
+     "b": "Calculate the surface of a trapezoid by base 2",
+     "h": "Calculate the surface of a trapezoid by its height"},
+    help="Return the surface of a trapezoid.", float_result=True,
+    exact_vector=True
+)
+register_operation(
+    "hypotenuse", GEOMETRY, Geometry.hypotenuse,
+    _vector_geometry("hypotenuse"),
+    {"a": "Calculate the hypotenuse by the size of the base",
+     "b": "Calculate the hypotenuse by the size of the altitude"},
+    help="The square of the hypotenuse is equal to the sum of the areas"
+         " of the squares on the other two sides. Return the hypotenuse"
+         " of a triangle.", float_result=True
+)
+
+ALGEBRA_OPERATIONS = get_operations(ALGEBRA)
+GEOMETRY_OPERATIONS = get_operations(GEOMETRY)
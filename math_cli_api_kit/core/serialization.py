@@ -0,0 +1,276 @@
+"""This module provides the serializers of the Math API requests and
+responses.
+
+JSON is parsed and written with the fastest available backend: orjson,
+then ujson, then the standard library `json` module. Every backend
+produces the same values as the standard library: bodies holding
+integers wider than 64 bits or non-finite floats, which orjson does not
+represent exactly, are handed to the standard library instead.
+
+Responses are built from pre-encoded constant fragments, so only the
+result itself is serialized per request. Besides JSON, two compact
+binary response formats can be selected through the `Accept` header:
+raw little-endian float64 values (`application/x-float64`) and
+MessagePack (`application/msgpack`). MessagePack is an optional
+dependency of this package, install it with
+`pip install math-cli-api-kit[msgpack]`.
+"""
+
+import json
+import math
+import re
+import struct
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from math_cli_api_kit.core.factorial import DecimalText, is_large_int, \
+    iter_decimal
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+JSON_BACKENDS = ("auto", "orjson", "ujson", "json")
+
+JSON, FLOAT64, MSGPACK = "json", "float64", "msgpack"
+CONTENT_TYPES = {
+    JSON: "application/json",
+    FLOAT64: "application/x-float64",
+    MSGPACK: "application/msgpack",
+}
+_MEDIA_TYPES = {
+    "application/json": JSON,
+    "application/*": JSON,
+    "*/*": JSON,
+    "application/x-float64": FLOAT64,
+    "application/msgpack": MSGPACK,
+    "application/x-msgpack": MSGPACK,
+}
+
+_SUCCESS_SUFFIX = b',"message":"Success"}'
+_PREFIXES: Dict[str, bytes] = {}
+
+# integer literals of 19 digits or more may not fit in 64 bits
+_WIDE_INTEGER = re.compile(rb"\d{19}")
+
+_INT64_MIN = -(1 << 63)
+_UINT64_MAX = (1 << 64) - 1
+
+
+def _stdlib_dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def _orjson_dumps(value: Any) -> bytes:
+    try:
+        body = orjson.dumps(value)
+    except TypeError:
+        # integers wider than 64 bits
+        return _stdlib_dumps(value)
+    if b"null" in body:
+        # non-finite floats are written as null by orjson
+        return _stdlib_dumps(value)
+    return body
+
+
+def _orjson_loads(body: bytes) -> Any:
+    if _WIDE_INTEGER.search(body):
+        # orjson reads integers wider than 64 bits as floats
+        return json.loads(body)
+    try:
+        return orjson.loads(body)
+    except ValueError:
+        # NaN and Infinity literals are only read by the standard library
+        return json.loads(body)
+
+
+def _ujson_dumps(value: Any) -> bytes:
+    return ujson.dumps(value).encode()
+
+
+def json_backend(name: str = "auto") -> Tuple[str, Callable, Callable]:
+    """Return the name and the dumps and loads functions of a JSON
+    backend. "auto" selects the fastest installed backend.
+    """
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"unknown JSON backend '{name}'. Expected one of"
+                         f" {', '.join(JSON_BACKENDS)}.")
+    if name in ("auto", "orjson") and orjson is not None:
+        return "orjson", _orjson_dumps, _orjson_loads
+    if name in ("auto", "ujson") and ujson is not None:
+        return "ujson", _ujson_dumps, ujson.loads
+    if name not in ("auto", "json"):
+        raise ImportError(f"the {name} JSON backend is not installed")
+    return "json", _stdlib_dumps, json.loads
+
+
+def has_msgpack() -> bool:
+    """Check whether MessagePack is available for responses."""
+    return msgpack is not None
+
+
+@lru_cache(maxsize=256)
+def negotiate_format(accept: Optional[str], binary: bool = True) -> str:
+    """Return the response format preferred by an `Accept` header.
+
+    The supported media type with the highest quality wins, JSON when
+    none is supported. Binary formats are only considered when `binary`
+    is true, and MessagePack only when it is installed.
+    """
+    if not accept or not binary:
+        return JSON
+    best, best_quality = JSON, -1.0
+    for media_range in accept.split(","):
+        media_type, _, parameters = media_range.partition(";")
+        response_format = _MEDIA_TYPES.get(media_type.strip().lower())
+        if response_format is None or \
+                (response_format == MSGPACK and msgpack is None):
+            continue
+        quality = 1.0
+        for parameter in parameters.split(";"):
+            name, _, value = parameter.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > best_quality:
+            best, best_quality = response_format, quality
+    return best if best_quality > 0 else JSON
+
+
+def _msgpack_value(value: Any) -> Any:
+    """Return a value MessagePack can pack, sending integers outside
+    the 64-bit range as decimal strings. Large integers are expected to
+    be converted to `DecimalText` beforehand, off the event loop.
+    """
+    if type(value) is int and not _INT64_MIN <= value <= _UINT64_MAX:
+        return "".join(iter_decimal(value)) if is_large_int(value) \
+            else str(value)
+    if type(value) is DecimalText:
+        return str(value)
+    return value
+
+
+def _float64(value: Any) -> float:
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        try:
+            return float(value)
+        except OverflowError:
+            pass
+    raise ValueError("The result cannot be represented as float64")
+
+
+class Serializer:
+    """Parses request bodies and builds response bodies with the
+    configured JSON backend and the binary response formats.
+    """
+
+    def __init__(self, backend: str = "auto"):
+        self.backend, self.dumps, self._loads = json_backend(backend)
+
+    def loads(self, body: bytes) -> Any:
+        """Parse a JSON request body, None when the body is empty."""
+        if not body:
+            return None
+        return self._loads(body)
+
+    def loads_exact(self, body: bytes) -> Any:
+        """Parse a JSON request body with its fractional numbers as
+        `Decimal`, for the numeric backends, None when the body is
+        empty.
+        """
+        if not body:
+            return None
+        return json.loads(body, parse_float=Decimal)
+
+    def result_body(
+            self, response_format: str, key: str, result: Any
+    ) -> bytes:
+        """Serialize the result of an operation, or a list of results,
+        under `key`.
+
+        Raises ValueError when the result cannot be represented in the
+        requested format.
+        """
+        if response_format == FLOAT64:
+            if type(result) is list:
+                return struct.pack(f"<{len(result)}d",
+                                   *map(_float64, result))
+            return struct.pack("<d", _float64(result))
+        if response_format == MSGPACK:
+            result = list(map(_msgpack_value, result)) \
+                if type(result) is list else _msgpack_value(result)
+            return msgpack.packb({key: result, "message": "Success"})
+        prefix = _PREFIXES.get(key)
+        if prefix is None:
+            prefix = _PREFIXES[key] = f'{{"{key}":'.encode()
+        # the digits of a large integer are written as a JSON number
+        body = result.encode() if type(result) is DecimalText \
+            else self.dumps(result)
+        return b"".join((prefix, body, _SUCCESS_SUFFIX))
+
+    def batch_body(
+            self, response_format: str, results: List[dict]
+    ) -> Tuple[bytes, Dict[str, str]]:
+        """Serialize the results of a batch and return the body with the
+        headers to send along.
+
+        float64 bodies hold one value per item, NaN for the items that
+        failed or whose result is not representable, and their number is
+        sent in the `X-Failed-Items` header.
+        """
+        if response_format == FLOAT64:
+            values = []
+            failed = 0
+            for item in results:
+                try:
+                    values.append(_float64(item["result"]))
+                except (KeyError, ValueError):
+                    values.append(math.nan)
+                    failed += 1
+            return struct.pack(f"<{len(values)}d", *values), \
+                {"X-Failed-Items": str(failed)}
+        if response_format == MSGPACK:
+            for item in results:
+                if "result" in item:
+                    item["result"] = _msgpack_value(item["result"])
+            return msgpack.packb({"results": results,
+                                  "message": "Success"}), {}
+        return self.result_body(JSON, "results", results), {}
+
+    def array_body(
+            self, response_format: str, key: str, result: Any
+    ) -> bytes:
+        """Serialize a NumPy array result, or a mapping of named arrays,
+        under `key`.
+
+        float64 bodies hold the values of the arrays, in order, written
+        straight from their memory; the other formats hold the arrays
+        as (nested) lists.
+        """
+        if response_format == FLOAT64:
+            arrays = result.values() if isinstance(result, Mapping) \
+                else (result,)
+            return b"".join(
+                array.astype("<f8", copy=False).tobytes() for array in arrays
+            )
+        result = {name: array.tolist() for name, array in result.items()} \
+            if isinstance(result, Mapping) else result.tolist()
+        if response_format == MSGPACK:
+            return msgpack.packb({key: result, "message": "Success"})
+        return self.result_body(JSON, key, result)
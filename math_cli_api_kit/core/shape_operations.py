@@ -0,0 +1,266 @@
+"""This module provides array-based geometric operations on polygons
+and point clouds.
+
+Points are given as flat coordinate buffers, `x0, y0, x1, y1, ...`, or
+equivalently as `(n, 2)` arrays; many polygons are given as one
+coordinate buffer holding the vertices of all polygons, one after the
+other, and an offsets array where polygon `i` has the vertices
+`offsets[i]` to `offsets[i + 1] - 1` (the layout of Arrow and GeoArrow
+lists). Contiguous float64 buffers are used without copying, and every
+operation works on whole arrays, so no Python object is created per
+vertex or per point.
+
+- `polygon_areas`: the shoelace areas of many polygons.
+- `polygon_perimeters`: the perimeters of many polygons.
+- `pairwise_distances`: the matrix of the distances between two point
+  sets.
+- `nearest_distances`: the distance from every point to its nearest
+  target, and the index of that target.
+- `convex_hull`: the vertices of the convex hull of a point set.
+
+NumPy is an optional dependency of this package, install it with
+`pip install math-cli-api-kit[vector]`.
+"""
+
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from math_cli_api_kit.config import CoreConfig
+from math_cli_api_kit.core.validation import validate_numeric_arrays, \
+    validate_polygon_offsets
+from math_cli_api_kit.core.vector_operations import ArrayLike, as_array, \
+    np
+
+
+def as_points(coordinates: ArrayLike) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Return the x and y coordinates of a flat coordinate buffer, or of
+    an `(n, 2)` array, as float64 views of the same memory when it is
+    already contiguous float64.
+    """
+    coordinates = as_array(coordinates)
+    validate_numeric_arrays(coordinates)
+    flat = np.ascontiguousarray(coordinates, dtype=np.float64).reshape(-1)
+    if flat.size % 2:
+        raise ValueError("coordinates must hold an x and a y value per"
+                         " point")
+    return flat[0::2], flat[1::2]
+
+
+def as_offsets(offsets: ArrayLike, vertex_count: int) -> "np.ndarray":
+    """Return validated polygon offsets as an int64 array. Integral
+    float offsets, such as those of float64 request bodies, are
+    accepted.
+    """
+    offsets = as_array(offsets)
+    if offsets.dtype.kind == "f" and \
+            np.array_equal(offsets, np.trunc(offsets)):
+        offsets = offsets.astype(np.int64)
+    elif offsets.dtype.kind == "u":
+        offsets = offsets.astype(np.int64)
+    validate_polygon_offsets(offsets, vertex_count)
+    return offsets
+
+
+def _polygon_edges(
+        coordinates: ArrayLike, offsets: Optional[ArrayLike]
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Return the x and y coordinates of the vertices, relative to the
+    first vertex of their polygon, the index of the next vertex of every
+    vertex and the validated offsets.
+    """
+    x, y = as_points(coordinates)
+    offsets = as_offsets(np.array([0, x.size]) if offsets is None
+                         else offsets, x.size)
+    starts = offsets[:-1]
+    counts = offsets[1:] - starts
+    # shifting every polygon to its first vertex keeps the precision of
+    # the cross products of polygons far from the origin
+    x = x - np.repeat(x[starts], counts)
+    y = y - np.repeat(y[starts], counts)
+    following = np.arange(1, x.size + 1)
+    following[offsets[1:] - 1] = starts
+    return x, y, following, offsets
+
+
+class ShapeGeometry:
+    """Provides array-based geometric operations on polygons and point
+    clouds, see the module documentation.
+
+    Every method accepts flat coordinate buffers and returns NumPy
+    arrays.
+    """
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def polygon_areas(
+            coordinates: ArrayLike, offsets: Optional[ArrayLike] = None
+    ) -> "np.ndarray":
+        """Return the areas of polygons with the shoelace formula. The
+        coordinates hold a single polygon when no offsets are given.
+        """
+        x, y, following, offsets = _polygon_edges(coordinates, offsets)
+        cross = x * y[following]
+        cross -= x[following] * y
+        areas = np.add.reduceat(cross, offsets[:-1])
+        areas = np.abs(areas, out=areas)
+        areas /= 2
+        return areas
+
+    @staticmethod
+    def polygon_perimeters(
+            coordinates: ArrayLike, offsets: Optional[ArrayLike] = None
+    ) -> "np.ndarray":
+        """Return the perimeters of polygons. The coordinates hold a
+        single polygon when no offsets are given.
+        """
+        x, y, following, offsets = _polygon_edges(coordinates, offsets)
+        lengths = np.hypot(x[following] - x, y[following] - y)
+        return np.add.reduceat(lengths, offsets[:-1])
+
+    @staticmethod
+    def pairwise_distances(
+            points: ArrayLike, targets: Optional[ArrayLike] = None
+    ) -> "np.ndarray":
+        """Return the matrix of the distances from every point to every
+        target, or to every other point when no targets are given.
+        """
+        x, y = as_points(points)
+        tx, ty = (x, y) if targets is None else as_points(targets)
+        distances = np.subtract.outer(x, tx)
+        np.square(distances, out=distances)
+        dy = np.subtract.outer(y, ty)
+        np.square(dy, out=dy)
+        distances += dy
+        return np.sqrt(distances, out=distances)
+
+    @staticmethod
+    def nearest_distances(
+            points: ArrayLike, targets: ArrayLike,
+            chunk_size: Optional[int] = None
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Return the distance from every point to its nearest target and
+        the index of that target.
+
+        The points are compared with all targets in chunks of about
+        `chunk_size` distances, so that the memory used does not grow
+        with the number of points.
+        """
+        x, y = as_points(points)
+        tx, ty = as_points(targets)
+        if not tx.size:
+            raise ValueError("at least one target is required")
+        chunk_size = chunk_size or CoreConfig.DISTANCE_CHUNK_SIZE
+        rows = max(chunk_size // tx.size, 1)
+        distances = np.empty(x.size, dtype=np.float64)
+        indices = np.empty(x.size, dtype=np.int64)
+        squared = np.empty((min(rows, x.size), tx.size), dtype=np.float64)
+        dy = np.empty_like(squared)
+        for start in range(0, x.size, rows):
+            stop = min(start + rows, x.size)
+            chunk, chunk_dy = squared[:stop - start], dy[:stop - start]
+            np.subtract.outer(x[start:stop], tx, out=chunk)
+            np.square(chunk, out=chunk)
+            np.subtract.outer(y[start:stop], ty, out=chunk_dy)
+            np.square(chunk_dy, out=chunk_dy)
+            chunk += chunk_dy
+            nearest = chunk.argmin(axis=1)
+            indices[start:stop] = nearest
+            distances[start:stop] = chunk[np.arange(stop - start), nearest]
+        return np.sqrt(distances, out=distances), indices
+
+    @staticmethod
+    def convex_hull(points: ArrayLike) -> "np.ndarray":
+        """Return the indices of the vertices of the convex hull of the
+        points, in counter-clockwise order from the lowest leftmost
+        point. Points on the edges of the hull are not vertices.
+
+        The hull is found with quickhull: every step keeps the points
+        outside of an edge of the hull found so far, with array
+        operations, so the number of Python-level steps grows with the
+        number of hull vertices rather than the number of points.
+        """
+        x, y = as_points(points)
+        if not x.size:
+            return np.empty(0, dtype=np.int64)
+        order = np.lexsort((y, x))
+        first, last = int(order[0]), int(order[-1])
+        if x[first] == x[last] and y[first] == y[last]:
+            return np.array([first], dtype=np.int64)
+
+        every = np.arange(x.size)
+
+        def outside(
+                start: int, end: int, candidates: "np.ndarray"
+        ) -> Tuple["np.ndarray", "np.ndarray"]:
+            """Return the candidates strictly to the right of the edge
+            from `start` to `end`, and how far they are from it.
+            """
+            cross = (x[end] - x[start]) * (y[candidates] - y[start])
+            cross -= (y[end] - y[start]) * (x[candidates] - x[start])
+            right = cross < 0
+            return candidates[right], -cross[right]
+
+        hull = []
+        # edges still to process, the last one first: its end points
+        # and the points outside of it
+        stack = [(last, first, outside(last, first, every)),
+                 (first, last, outside(first, last, every))]
+        while stack:
+            start, end, (candidates, heights) = stack.pop()
+            if not candidates.size:
+                hull.append(start)
+                continue
+            # the farthest points lie on a line parallel to the edge, of
+            # which only the ends are vertices: take the one farthest
+            # along the edge, so that the others end up on an edge
+            tied = candidates[heights == heights.max()]
+            along = (x[end] - x[start]) * (x[tied] - x[start])
+            along += (y[end] - y[start]) * (y[tied] - y[start])
+            apex = int(tied[along.argmax()])
+            stack.append((apex, end, outside(apex, end, candidates)))
+            stack.append((start, apex, outside(start, apex, candidates)))
+        return np.array(hull, dtype=np.int64)
+
+
+class ShapeOperation(NamedTuple):
+    """A shape operation with the names of its array operands, the
+    optional ones last.
+    """
+    name: str
+    function: Callable[..., Any]
+    operands: Tuple[str, ...]
+    required: int
+    help: str
+
+
+SHAPE_OPERATIONS: Dict[str, ShapeOperation] = {
+    operation.name: operation for operation in (
+        ShapeOperation(
+            "polygon_area", ShapeGeometry.polygon_areas,
+            ("coordinates", "offsets"), 1,
+            "Return the areas of polygons."
+        ),
+        ShapeOperation(
+            "polygon_perimeter", ShapeGeometry.polygon_perimeters,
+            ("coordinates", "offsets"), 1,
+            "Return the perimeters of polygons."
+        ),
+        ShapeOperation(
+            "pairwise_distances", ShapeGeometry.pairwise_distances,
+            ("points", "targets"), 1,
+            "Return the distances from every point to every target."
+        ),
+        ShapeOperation(
+            "nearest_distances", ShapeGeometry.nearest_distances,
+            ("points", "targets"), 2,
+            "Return the distance from every point to its nearest target"
+            " and the index of that target."
+        ),
+        ShapeOperation(
+            "convex_hull", ShapeGeometry.convex_hull, ("points",), 1,
+            "Return the indices of the vertices of the convex hull of"
+            " points, in counter-clockwise order."
+        ),
+    )
+}
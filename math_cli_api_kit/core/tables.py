@@ -0,0 +1,198 @@
+"""This module provides precomputed lookup tables for common
+integer-domain operands.
+
+Much of the traffic uses small int operands: factorials of up to a
+thousand, the surfaces of squares and circles of integer sides and
+radii, and powers of small integer bases and exponents. The kernels of
+these operations look int operands up in the enabled tables before
+computing.
+
+A lookup costs about as much as a few arithmetic operations, so a table
+only pays off for results that are expensive to compute: factorials
+above all, and powers with large results. The tables are therefore
+enabled per operation.
+
+Every table is built on its first lookup, or at once by
+`LookupTables.build`, with the same expressions as the kernels, so
+looked up results are bit-identical to computed ones. Tables are kept
+in typed arrays when their results fit: float64 for floats and int64
+for integers; big integers, such as factorials, are kept in a list.
+"""
+
+import math
+import sys
+import threading
+from array import array
+from itertools import product
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, \
+    Tuple
+
+from math_cli_api_kit.config import CoreConfig
+from math_cli_api_kit.core.constants import PI
+
+TABLE_OPERATIONS = ("factorial", "pow", "surface_of_square",
+                    "surface_of_circle")
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def _pack(values: Sequence[Any]) -> Sequence[Any]:
+    """Return the values in the most compact sequence that holds them
+    exactly.
+    """
+    if all(type(value) is float for value in values):
+        return array("d", values)
+    if all(type(value) is int and _INT64_MIN <= value <= _INT64_MAX
+           for value in values):
+        return array("q", values)
+    return list(values)
+
+
+class LookupTable:
+    """Precomputed results of an operation of one or two operands, for
+    every combination of int operands between the bounds, inclusive.
+    """
+
+    def __init__(
+            self, compute: Callable[..., Any],
+            bounds: Sequence[Tuple[int, int]]
+    ):
+        if not 1 <= len(bounds) <= 2:
+            raise ValueError("lookup tables have one or two operands")
+        self.compute = compute
+        self.bounds = tuple(bounds)
+        (self._x_low, x_high), (self._y_low, y_high) = \
+            (*self.bounds, (0, 0))[:2]
+        self._x_size = max(x_high - self._x_low + 1, 0)
+        self._y_size = max(y_high - self._y_low + 1, 0)
+        self._values: Optional[Sequence[Any]] = None
+        self._lock = threading.Lock()
+
+    def get(self, x: Any, y: Any = 0) -> Any:
+        """Return the precomputed result for the operands, or None if
+        they are not ints between the bounds.
+        """
+        if type(x) is int and type(y) is int:
+            x -= self._x_low
+            y -= self._y_low
+            if 0 <= x < self._x_size and 0 <= y < self._y_size:
+                values = self._values
+                if values is None:
+                    values = self.build()
+                return values[x * self._y_size + y]
+        return None
+
+    def build(self) -> Sequence[Any]:
+        """Compute the table, if it is not built yet, and return it."""
+        with self._lock:
+            if self._values is None:
+                self._values = _pack([
+                    self.compute(*operands) for operands in product(*(
+                        range(low, high + 1) for low, high in self.bounds
+                    ))
+                ])
+            return self._values
+
+    @property
+    def built(self) -> bool:
+        return self._values is not None
+
+    def memory_usage(self) -> int:
+        """Return the number of bytes used by the table, 0 until it is
+        built.
+        """
+        values = self._values
+        if values is None:
+            return 0
+        size = sys.getsizeof(values)
+        if isinstance(values, list):
+            size += sum(sys.getsizeof(value) for value in values)
+        return size
+
+
+class LookupTables:
+    """The lookup tables of the operations, see the module
+    documentation. The enabled tables and their ranges are read from
+    the configuration unless they are given; the table of an operation
+    is None while it is disabled.
+    """
+
+    def __init__(
+            self, operations: Optional[Iterable[str]] = None,
+            factorial_max: Optional[int] = None,
+            square_max: Optional[int] = None,
+            circle_max: Optional[int] = None,
+            pow_max_base: Optional[int] = None,
+            pow_max_exponent: Optional[int] = None
+    ):
+        self.factorial_max = CoreConfig.FACTORIAL_TABLE_MAX \
+            if factorial_max is None else factorial_max
+        self.square_max = CoreConfig.SQUARE_TABLE_MAX \
+            if square_max is None else square_max
+        self.circle_max = CoreConfig.CIRCLE_TABLE_MAX \
+            if circle_max is None else circle_max
+        self.pow_max_base = CoreConfig.POW_TABLE_MAX_BASE \
+            if pow_max_base is None else pow_max_base
+        self.pow_max_exponent = CoreConfig.POW_TABLE_MAX_EXPONENT \
+            if pow_max_exponent is None else pow_max_exponent
+        self.factorial: Optional[LookupTable] = None
+        self.surface_of_square: Optional[LookupTable] = None
+        self.surface_of_circle: Optional[LookupTable] = None
+        self.pow: Optional[LookupTable] = None
+        self.enable(*(CoreConfig.LOOKUP_TABLES
+                      if operations is None else operations))
+
+    def enable(self, *operations: str) -> None:
+        """Enable the tables of the operations, which are built on their
+        first lookup.
+        """
+        for operation in operations:
+            if operation not in TABLE_OPERATIONS:
+                raise ValueError(f"no lookup table for '{operation}'")
+            if getattr(self, operation) is None:
+                setattr(self, operation, self._create(operation))
+
+    def disable(self, *operations: str) -> None:
+        """Disable the tables of the operations, or all of them, and
+        free their memory.
+        """
+        for operation in operations or TABLE_OPERATIONS:
+            setattr(self, operation, None)
+
+    def tables(self) -> Dict[str, LookupTable]:
+        """Return the enabled tables by operation."""
+        return {
+            operation: getattr(self, operation)
+            for operation in TABLE_OPERATIONS
+            if getattr(self, operation) is not None
+        }
+
+    def build(self) -> None:
+        """Build every enabled table now instead of on first use."""
+        for table in self.tables().values():
+            table.build()
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Return the number of bytes used by every enabled table."""
+        return {
+            operation: table.memory_usage()
+            for operation, table in self.tables().items()
+        }
+
+    def _create(self, operation: str) -> LookupTable:
+        # the same expressions as the kernels
+        if operation == "factorial":
+            return LookupTable(math.factorial, [
+                (0, min(self.factorial_max, CoreConfig.FACTORIAL_MAX_INPUT))
+            ])
+        if operation == "surface_of_square":
+            return LookupTable(lambda a: a ** 2, [(0, self.square_max)])
+        if operation == "surface_of_circle":
+            return LookupTable(lambda r: PI * r ** 2, [(0, self.circle_max)])
+        return LookupTable(lambda x, y: x ** y, [
+            (-self.pow_max_base, self.pow_max_base),
+            (0, self.pow_max_exponent)
+        ])
+
+
+lookup_tables = LookupTables()
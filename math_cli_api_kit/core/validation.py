@@ -5,7 +5,9 @@ It includes checks for data types, such as integers and floats, as well
 as functions for validating strings that represent numbers.
 """
 
-from typing import Union, Any
+from typing import Any, Callable, Mapping, Tuple, Union
+
+_NUMBER_TYPES = (int, float)
 
 
 def get_object_type_name(obj: Any) -> str:
@@ -17,15 +19,25 @@ def validate_int_or_float(x: Union[int, float], y: Union[int, float]) -> bool:
     """Validate the attributes x and y and raise an error if they are
     not valid.
     """
-
-    if (get_object_type_name(x) not in ("int", "float")) or \
-            (get_object_type_name(y) not in ("int", "float")):
+    if type(x) not in _NUMBER_TYPES or type(y) not in _NUMBER_TYPES:
         raise TypeError(f"unsupported operand type(s) for operands x and y: "
                         f"'{get_object_type_name(x)}' and"
                         f"'{get_object_type_name(y)}'. Expected int or float.")
     return True
 
 
+def validate_numbers(*values: Union[int, float]) -> bool:
+    """Validate any number of operands at once and raise an error if one
+    of them is not an int or a float.
+    """
+    for value in values:
+        if type(value) not in _NUMBER_TYPES:
+            raise TypeError(f"unsupported operand type: "
+                            f"'{get_object_type_name(value)}'. Expected int"
+                            f" or float.")
+    return True
+
+
 def validate_factorial(x: int) -> bool:
     """Validate the attribute x and raise an error if it is
     not valid.
@@ -38,6 +50,27 @@ def validate_factorial(x: int) -> bool:
     return True
 
 
+def power_bits(x: int, y: int) -> int:
+    """Return the estimated bit length of the integer power x**y, 0 when
+    it stays small whatever the exponent.
+    """
+    if y <= 0 or -1 <= x <= 1:
+        return 0
+    return y * x.bit_length()
+
+
+def validate_power(
+        x: Union[int, float], y: Union[int, float], max_bits: int
+) -> bool:
+    """Validate the size of the result of x**y and raise an error if it
+    is an integer power whose estimated bit length exceeds `max_bits`.
+    """
+    if type(x) is int and type(y) is int and power_bits(x, y) > max_bits:
+        raise ValueError(f"the result of the power exceeds the maximum"
+                         f" supported size of {max_bits} bits.")
+    return True
+
+
 def is_numeric_string(s: str) -> bool:
     """Check if the number in the string is valid."""
     s = s.strip()
@@ -69,3 +102,77 @@ def all_not_none_and_integer(*args: str) -> bool:
     are integers.
     """
     return all(arg is not None and is_integer_string(arg) for arg in args)
+
+
+def validate_numeric_arrays(*arrays: Any) -> bool:
+    """Validate the dtype of whole operand arrays once per batch and
+    raise an error if any of them is not integral or floating-point.
+    """
+    for arr in arrays:
+        if arr.dtype.kind not in ("i", "u", "f"):
+            raise TypeError(f"unsupported operand dtype(s): "
+                            f"'{', '.join(str(a.dtype) for a in arrays)}'."
+                            f" Expected integer or floating-point arrays.")
+    return True
+
+
+def validate_factorial_array(arr: Any) -> bool:
+    """Validate an array of factorial operands and raise an error if it
+    is not valid.
+    """
+    if arr.dtype.kind not in ("i", "u"):
+        raise TypeError(f"unsupported operand dtype for x!: "
+                        f"'{arr.dtype}'. Expected integer array.")
+    if arr.size and arr.min() < 0:
+        raise ValueError(f"{arr.min()} is negative or non-integral.")
+    return True
+
+
+def validate_polygon_offsets(offsets: Any, vertex_count: int) -> bool:
+    """Validate the vertex offsets of polygons and raise an error if
+    they do not start at 0, end at `vertex_count` and give every polygon
+    at least 3 vertices.
+    """
+    if offsets.dtype.kind not in ("i", "u"):
+        raise TypeError(f"unsupported offsets dtype: '{offsets.dtype}'."
+                        f" Expected integer array.")
+    if offsets.ndim != 1 or offsets.size < 2:
+        raise ValueError("offsets must hold at least 2 values")
+    if offsets[0] != 0 or offsets[-1] != vertex_count:
+        raise ValueError(f"offsets must start at 0 and end at the number"
+                         f" of vertices, {vertex_count}")
+    if (offsets[1:] - offsets[:-1]).min() < 3:
+        raise ValueError("every polygon must have at least 3 vertices")
+    return True
+
+
+def compile_operands_validator(
+        names: Tuple[str, ...], types: Tuple[type, ...]
+) -> Callable[[Mapping[str, Any]], Tuple[Any, ...]]:
+    """Build a validator for a mapping of named operands.
+
+    The returned function extracts the operands in order and raises a
+    TypeError if one of them is missing or has an unsupported type.
+    The accepted types are resolved once, when the validator is built,
+    instead of on every call.
+    """
+    accepted = tuple((int,) if t is int else _NUMBER_TYPES for t in types)
+    expected = tuple(
+        " or ".join(t.__name__ for t in a) for a in accepted
+    )
+    checks = tuple(zip(names, accepted, expected))
+
+    def validator(operands: Mapping[str, Any]) -> Tuple[Any, ...]:
+        values = []
+        for name, accepted_types, expected_names in checks:
+            if name not in operands:
+                raise TypeError(f"missing operand '{name}'")
+            value = operands[name]
+            if type(value) not in accepted_types:
+                raise TypeError(f"unsupported operand type for {name}: "
+                                f"'{get_object_type_name(value)}'. Expected"
+                                f" {expected_names}.")
+            values.append(value)
+        return tuple(values)
+
+    return validator
@@ -0,0 +1,198 @@
+"""This module provides vectorized counterparts of the Algebra and
+Geometry classes, evaluating whole batches of operands at once.
+
+Operands may be NumPy arrays, `array.array` instances, any object
+exposing the buffer protocol, plain sequences or scalars (which are
+broadcast against the other operands). The dtype of every batch is
+validated once instead of once per element, and composite geometric
+formulas are evaluated as fused array expressions. Results agree with
+the scalar classes up to floating-point rounding of the last digit.
+
+NumPy is an optional dependency of this package, install it with
+`pip install math-cli-api-kit[vector]`.
+"""
+
+from typing import Any
+
+from math_cli_api_kit.core.constants import PI, E
+from math_cli_api_kit.core.factorial import factorial_engine
+from math_cli_api_kit.core.validation import validate_numeric_arrays, \
+    validate_factorial_array
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+ArrayLike = Any
+
+
+def has_numpy() -> bool:
+    """Check whether NumPy is available for vectorized operations."""
+    return np is not None
+
+
+def as_array(values: ArrayLike) -> "np.ndarray":
+    """Return the operands as a NumPy array without copying them when
+    the input already exposes a compatible buffer.
+    """
+    if np is None:
+        raise ImportError("vectorized operations require NumPy, install it"
+                          " with `pip install math-cli-api-kit[vector]`")
+    if isinstance(values, np.ndarray):
+        return values
+    return np.asarray(values)
+
+
+def _empty_result(*arrays: "np.ndarray") -> "np.ndarray":
+    """Return an uninitialized float64 array with the broadcast shape of
+    the operands, used as the output buffer of fused expressions.
+    """
+    return np.empty(np.broadcast_shapes(*(a.shape for a in arrays)),
+                    dtype=np.float64)
+
+
+class VectorAlgebra:
+    """Provides vectorized algebraic operations: `addition`,
+    `subtraction`, `multiplication`, `division`, and `powers`.
+
+    Every method accepts array-like operands and returns a NumPy array
+    with the element-wise results.
+    """
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def sum(xs: ArrayLike, ys: ArrayLike) -> "np.ndarray":
+        """Return the element-wise sum of xs and ys."""
+        xs, ys = as_array(xs), as_array(ys)
+        validate_numeric_arrays(xs, ys)
+        return np.add(xs, ys)
+
+    @staticmethod
+    def sub(xs: ArrayLike, ys: ArrayLike) -> "np.ndarray":
+        """Return the element-wise subtraction of xs by ys."""
+        xs, ys = as_array(xs), as_array(ys)
+        validate_numeric_arrays(xs, ys)
+        return np.subtract(xs, ys)
+
+    @staticmethod
+    def mul(xs: ArrayLike, ys: ArrayLike) -> "np.ndarray":
+        """Return the element-wise multiplication of xs by ys."""
+        xs, ys = as_array(xs), as_array(ys)
+        validate_numeric_arrays(xs, ys)
+        return np.multiply(xs, ys)
+
+    @staticmethod
+    def div(xs: ArrayLike, ys: ArrayLike) -> "np.ndarray":
+        """Return the element-wise division of xs by ys. Raises a
+        ZeroDivisionError if any divisor is zero.
+        """
+        xs, ys = as_array(xs), as_array(ys)
+        validate_numeric_arrays(xs, ys)
+        if not np.all(ys):
+            raise ZeroDivisionError("division by zero")
+        return np.true_divide(xs, ys)
+
+    @staticmethod
+    def pow(xs: ArrayLike, ys: ArrayLike) -> "np.ndarray":
+        """Return xs**ys element-wise (xs to the power of ys).
+
+        Negative bases raised to fractional powers produce complex
+        results, matching the scalar `Algebra.pow`.
+        """
+        xs, ys = as_array(xs), as_array(ys)
+        validate_numeric_arrays(xs, ys)
+        if ys.dtype.kind in ("i", "u") and xs.dtype.kind in ("i", "u") \
+                and ys.size and ys.min() < 0:
+            xs = xs.astype(np.float64)
+        return np.emath.power(xs, ys)
+
+    @staticmethod
+    def square_root(xs: ArrayLike) -> "np.ndarray":
+        """Return the element-wise square root of xs."""
+        xs = as_array(xs)
+        validate_numeric_arrays(xs)
+        return np.emath.sqrt(xs)
+
+    @staticmethod
+    def factorial(xs: ArrayLike) -> "np.ndarray":
+        """Find xs! element-wise. Raises a ValueError if any value is
+        negative or exceeds the configured maximum input. The results are
+        returned as an object array of exact Python integers.
+        """
+        xs = as_array(xs)
+        validate_factorial_array(xs)
+        out = np.empty(xs.shape, dtype=object)
+        out.flat[:] = [
+            factorial_engine.factorial(x) for x in xs.ravel().tolist()
+        ]
+        return out
+
+    @staticmethod
+    def exp(xs: ArrayLike) -> "np.ndarray":
+        """Return e raised to the power of xs element-wise."""
+        xs = as_array(xs)
+        validate_numeric_arrays(xs)
+        return np.power(E, xs)
+
+
+class VectorGeometry:
+    """Provides vectorized geometric operations: surface of a `square`,
+    `circle`, `triangle`, `trapezoid`, and `hypotenuse`.
+
+    Every method accepts array-like operands and returns a NumPy array
+    with the element-wise results.
+    """
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def surface_of_square(a: ArrayLike) -> "np.ndarray":
+        """Return the surfaces of squares."""
+        a = as_array(a)
+        validate_numeric_arrays(a)
+        return np.multiply(a, a)
+
+    @staticmethod
+    def surface_of_circle(r: ArrayLike) -> "np.ndarray":
+        """Return the surfaces of circles."""
+        r = as_array(r)
+        validate_numeric_arrays(r)
+        out = np.multiply(r, r, out=_empty_result(r))
+        out *= PI
+        return out
+
+    @staticmethod
+    def surface_of_triangle(
+            b: ArrayLike, h: ArrayLike
+    ) -> "np.ndarray":
+        """Return the surfaces of triangles."""
+        b, h = as_array(b), as_array(h)
+        validate_numeric_arrays(b, h)
+        out = np.multiply(b, h, out=_empty_result(b, h))
+        out /= 2
+        return out
+
+    @staticmethod
+    def surface_of_trapezoid(
+            a: ArrayLike, b: ArrayLike, h: ArrayLike
+    ) -> "np.ndarray":
+        """Return the surfaces of trapezoids."""
+        a, b, h = as_array(a), as_array(b), as_array(h)
+        validate_numeric_arrays(a, b, h)
+        out = np.add(a, b, out=_empty_result(a, b, h))
+        out /= 2
+        out *= h
+        return out
+
+    @staticmethod
+    def hypotenuse(a: ArrayLike, b: ArrayLike) -> "np.ndarray":
+        """Return the hypotenuses of right triangles with legs a and b."""
+        a, b = as_array(a), as_array(b)
+        validate_numeric_arrays(a, b)
+        out = np.multiply(a, a, out=_empty_result(a, b))
+        out += np.multiply(b, b, dtype=np.float64)
+        return np.sqrt(out, out=out)
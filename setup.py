@@ -4,18 +4,42 @@ package.
 For more information about this package and its usage, please refer to
 the README.md file or the official GitHub repository:
 https://github.com/gasparyanvazgen/math-cli-api-kit
+
+The package metadata is read from the configuration module without
+importing the package.
 """
 
-from typing import Literal
+import ast
+from types import SimpleNamespace
+from typing import Any, Dict, Literal
 
 from setuptools import setup, find_packages
 
-from math_cli_api_kit.config import APIConfig, GITHUB_REPO_URL
-
 __version__: Literal["Module version"]
 __author__: Literal["Author full name"]
 
-api_config = APIConfig()
+
+def read_literals(body: list) -> Dict[str, Any]:
+    """Return the names assigned to literal values in a statement list."""
+    literals = {}
+    for node in body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and \
+                isinstance(node.targets[0], ast.Name):
+            try:
+                literals[node.targets[0].id] = ast.literal_eval(node.value)
+            except ValueError:
+                continue
+    return literals
+
+
+with open("math_cli_api_kit/config/__init__.py", "r", encoding="utf-8") as fh:
+    config_module = ast.parse(fh.read())
+
+GITHUB_REPO_URL = read_literals(config_module.body)["GITHUB_REPO_URL"]
+api_config = SimpleNamespace(**next(
+    read_literals(node.body) for node in config_module.body
+    if isinstance(node, ast.ClassDef) and node.name == "APIConfig"
+))
 
 __version__ = api_config.API_VERSION
 __author__ = api_config.API_CONTACT_NAME
@@ -53,5 +77,15 @@ setup(
         "sanic-openapi==21.12.0",
         "websockets==10.0",
     ],
+    entry_points={
+        "console_scripts": [
+            "math-cli = math_cli_api_kit.cli.shim:main",
+        ],
+    },
+    extras_require={
+        "vector": ["numpy>=1.20"],
+        "msgpack": ["msgpack>=1.0"],
+        "client": ["httpx>=0.23"],
+    },
     zip_safe=False
 )
@@ -0,0 +1,54 @@
+"""Helpers of the tests that run the Math API on a local port."""
+
+import itertools
+import unittest
+from contextlib import AsyncExitStack
+from typing import Any, Dict
+from unittest import mock
+
+from math_cli_api_kit.config import APIConfig
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+BASE_PATH = "/api/math/api"
+
+_app_ids = itertools.count()
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class APITestCase(unittest.IsolatedAsyncioTestCase):
+    """Serves a new app for every test, created with the `APIConfig`
+    attributes of `config`, and sends requests to it with
+    `self.client`.
+    """
+
+    config: Dict[str, Any] = {}
+
+    async def asyncSetUp(self) -> None:
+        # imported here, so that the tests of the core modules run
+        # without Sanic
+        from sanic import Sanic
+
+        from math_cli_api_kit.api import create_app
+        from math_cli_api_kit.api.serve import local_server
+
+        # lets several apps start in the same process
+        Sanic.test_mode = True
+        self.stack = AsyncExitStack()
+        if self.config:
+            self.stack.enter_context(
+                mock.patch.multiple(APIConfig, **self.config)
+            )
+        self.app = create_app(f"test_app_{next(_app_ids)}")
+        self.url = await self.stack.enter_async_context(
+            local_server(self.app)
+        )
+        self.client = await self.stack.enter_async_context(
+            httpx.AsyncClient(base_url=self.url + BASE_PATH, timeout=60)
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.stack.aclose()
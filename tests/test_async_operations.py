@@ -0,0 +1,170 @@
+"""Asynchronous operations, their cost estimates and their bounds."""
+
+import asyncio
+import math
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from math_cli_api_kit.config import APIConfig, CoreConfig
+from math_cli_api_kit.core.async_operations import AsyncAlgebra, \
+    AsyncGeometry, AsyncOperations, ComputeRejectedError, \
+    ComputeTimeoutError, ComputeUnavailableError
+from math_cli_api_kit.core.costs import BASE_COST, estimate_cost, \
+    estimate_precise_cost
+from math_cli_api_kit.core.executors import IsolatedProcessExecutor
+from math_cli_api_kit.core.validation import power_bits, validate_power
+
+from tests.api_helpers import APITestCase
+
+
+class TestCosts(unittest.TestCase):
+
+    def test_power_bits(self):
+        self.assertEqual(power_bits(2, 10), 20)
+        self.assertEqual(power_bits(1, 10 ** 9), 0)
+        self.assertEqual(power_bits(-1, 10 ** 9), 0)
+        self.assertEqual(power_bits(10, -5), 0)
+        self.assertTrue(validate_power(2.0, 10 ** 9, 64))
+        with self.assertRaises(ValueError):
+            validate_power(3, 100, 64)
+
+    def test_estimate_cost(self):
+        self.assertEqual(estimate_cost("sum", (1, 2)), BASE_COST)
+        self.assertEqual(estimate_cost("factorial", (2,)), BASE_COST)
+        self.assertAlmostEqual(estimate_cost("factorial", (1024,)),
+                               1024 * 10)
+        self.assertEqual(estimate_cost("pow", (3, 10 ** 6)), 2 * 10 ** 6)
+        self.assertEqual(estimate_cost("pow", (3.0, 10 ** 6)), BASE_COST)
+
+    def test_precise_cost_grows_with_precision_and_exponent(self):
+        def cost(operation, numeric, precision, *operands):
+            return estimate_precise_cost(operation, numeric, precision,
+                                         operands)
+
+        self.assertLess(cost("div", "decimal", 28, 1, 3),
+                        cost("div", "decimal", 5000, 1, 3))
+        self.assertLess(cost("pow", "decimal", 28, 3, 10),
+                        cost("pow", "decimal", 28, 3, 10 ** 9))
+        self.assertLess(cost("pow", "decimal", 28, 3, 10 ** 9),
+                        cost("pow", "decimal", 5000, 3, 10 ** 9))
+        self.assertGreater(cost("pow", "fraction", 28, "3/2", 10 ** 6),
+                           APIConfig.EXECUTOR_COST_THRESHOLD)
+        # larger exponents are rejected before any work is done
+        self.assertEqual(cost("pow", "decimal", 28, 2, Decimal("1e100000")),
+                         cost("pow", "decimal", 28, 2, Decimal("1e1000")))
+        self.assertGreater(cost("factorial", "decimal", 28, 30_000),
+                           estimate_cost("factorial", (30_000,)))
+
+
+class TestAsyncOperations(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.executor = ThreadPoolExecutor(1)
+
+    async def asyncTearDown(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    async def test_cheap_operations_are_computed_inline(self):
+        algebra = AsyncAlgebra(cost_threshold=1000)
+        self.assertEqual(await algebra.sum(1, 2), 3)
+        self.assertEqual(await algebra.factorial(5), 120)
+        self.assertEqual(await AsyncGeometry().hypotenuse(3, 4), 5.0)
+
+    async def test_expensive_operations_are_offloaded(self):
+        algebra = AsyncAlgebra(self.executor, cost_threshold=1000)
+        self.assertEqual(await algebra.factorial(2000),
+                         math.factorial(2000))
+        self.assertEqual(algebra.pending, 0)
+
+    async def test_expensive_operations_need_an_executor(self):
+        algebra = AsyncAlgebra(cost_threshold=1000)
+        with self.assertRaises(ComputeRejectedError):
+            await algebra.factorial(2000)
+        with self.assertRaises(ComputeRejectedError):
+            await algebra.pow(3, 10 ** 5)
+
+    async def test_invalid_operands(self):
+        algebra = AsyncAlgebra()
+        with self.assertRaises(TypeError):
+            await algebra.sum(1, "2")
+        with self.assertRaises(TypeError):
+            await algebra.run("sum", 1)
+        with self.assertRaises(ValueError):
+            await algebra.pow(3, CoreConfig.POW_MAX_RESULT_BITS)
+
+    async def test_timeout_and_max_pending(self):
+        release = threading.Event()
+        operations = AsyncOperations(self.executor, cost_threshold=0,
+                                     timeout=0.05, max_pending=1)
+        with self.assertRaises(ComputeTimeoutError):
+            await operations.compute(1, release.wait, 5)
+        self.assertEqual(operations.pending, 0)
+
+        operations.timeout = None
+        task = asyncio.ensure_future(operations.compute(1, release.wait, 5))
+        await asyncio.sleep(0)
+        with self.assertRaises(ComputeUnavailableError):
+            await operations.compute(1, abs, -1)
+        release.set()
+        self.assertTrue(await task)
+        self.assertEqual(await operations.compute(1, abs, -1), 1)
+
+
+class TestComputeBoundsAPI(APITestCase):
+
+    config = {"COMPUTE_TIMEOUT": 1.0}
+
+    async def test_oversized_powers_are_rejected(self):
+        response = await self.client.post("/algebra/pow", json={
+            "x": 3, "y": CoreConfig.POW_MAX_RESULT_BITS
+        })
+        self.assertEqual(response.status_code, 400)
+        response = await self.client.post("/expression", json={
+            "expression": "9 ** 9 ** 9"
+        })
+        self.assertEqual(response.status_code, 400)
+
+    async def test_slow_operations_time_out(self):
+        self.assertIsInstance(self.app.ctx.executor, IsolatedProcessExecutor)
+        response = await self.client.post("/algebra/sum",
+                                          json={"x": 1, "y": 2})
+        self.assertEqual(response.status_code, 200)
+        started = time.perf_counter()
+        slow = asyncio.ensure_future(self.client.post(
+            "/algebra/pow?numeric=fraction",
+            json={"x": "3/2", "y": "2097151.5"}
+        ))
+        await asyncio.sleep(0.05)
+        # the event loop keeps answering cheap requests meanwhile
+        response = await self.client.post("/algebra/sum",
+                                          json={"x": 1, "y": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(slow.done())
+        self.assertEqual((await slow).status_code, 504)
+        self.assertLess(time.perf_counter() - started, 5)
+        # the process running the operation is terminated
+        for _ in range(50):
+            if not self.app.ctx.executor._running:
+                break
+            await asyncio.sleep(0.1)
+        self.assertEqual(self.app.ctx.executor._running, {})
+
+
+class TestMaxPendingAPI(APITestCase):
+
+    config = {"COMPUTE_MAX_PENDING": 0}
+
+    async def test_expensive_operations_are_unavailable(self):
+        response = await self.client.post("/algebra/factorial",
+                                          json={"x": 30_000})
+        self.assertEqual(response.status_code, 503)
+        response = await self.client.post("/algebra/factorial",
+                                          json={"x": 30})
+        self.assertEqual(response.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""Batches of math operations, evaluated in the core and by the batch
+endpoint.
+"""
+
+import math
+import unittest
+from unittest import mock
+
+from math_cli_api_kit.core.batch import evaluate_batch, is_vectorizable, \
+    vector_evaluate
+from math_cli_api_kit.core.factorial import parse_decimal
+from math_cli_api_kit.core.registry import OPERATIONS
+from math_cli_api_kit.core.vector_operations import has_numpy
+
+from tests.api_helpers import APITestCase
+
+
+def item(operation, **operands):
+    return {"operation": operation, "operands": operands}
+
+
+class TestEvaluateBatch(unittest.TestCase):
+
+    def test_results_keep_the_item_order(self):
+        results = evaluate_batch([
+            item("sum", x=1, y=2),
+            item("hypotenuse", a=3, b=4),
+            item("factorial", x=5),
+        ], vectorize_threshold=64)
+        self.assertEqual([result["result"] for result in results],
+                         [3, 5.0, 120])
+        self.assertTrue(all(result["status"] == 200 for result in results))
+
+    def test_errors_are_reported_per_item(self):
+        results = evaluate_batch([
+            item("div", x=1, y=0),
+            item("unknown", x=1),
+            {"operation": "sum"},
+            item("sum", x="1", y=2),
+            item("sum", x=1, y=2),
+        ], vectorize_threshold=64)
+        self.assertEqual([result["status"] for result in results],
+                         [400, 404, 400, 400, 200])
+        self.assertEqual(results[0]["message"], "division by zero")
+
+    def test_large_ints_are_sent_as_decimal_strings(self):
+        (result,) = evaluate_batch([item("factorial", x=3000)], 64)
+        self.assertEqual(parse_decimal(result["result"]),
+                         math.factorial(3000))
+
+    @unittest.skipUnless(has_numpy(), "NumPy is not installed")
+    def test_vectorized_groups_match_the_scalar_path(self):
+        items = [item("div", x=x, y=3) for x in range(-50, 50)]
+        items += [item("sum", x=x, y=1) for x in range(100)]
+        items.append(item("div", x=2081918845191089988, y=484))
+        items.append(item("div", x=1, y=0))
+        vectorized = evaluate_batch(items, vectorize_threshold=2)
+        scalar = evaluate_batch(items, vectorize_threshold=10 ** 9)
+        self.assertEqual(vectorized, scalar)
+        self.assertIs(type(vectorized[100]["result"]), int)
+
+    @unittest.skipUnless(has_numpy(), "NumPy is not installed")
+    def test_inexact_vector_kernels_are_not_used(self):
+        items = [item(operation, **{name: 0.1 + i / 7 for name in names})
+                 for operation, names in (
+                     ("exp", "x"), ("pow", "xy"), ("hypotenuse", "ab"),
+                     ("square_root", "x"), ("surface_of_square", "a"),
+                     ("surface_of_circle", "r"),
+                 ) for i in range(100)]
+        with mock.patch("math_cli_api_kit.core.batch.vector_evaluate",
+                        side_effect=AssertionError) as patched:
+            results = evaluate_batch(items, vectorize_threshold=2)
+        patched.assert_not_called()
+        self.assertEqual(results, [
+            {"result": OPERATIONS[entry["operation"]].kernel(
+                *entry["operands"].values()
+            ), "message": "Success", "status": 200}
+            for entry in items
+        ])
+        for entry in OPERATIONS.values():
+            operands = [1.5] * entry.arity
+            self.assertEqual(vector_evaluate(entry, [operands]), [
+                entry.kernel(*operands) if entry.exact_vector else None
+            ])
+
+    def test_is_vectorizable(self):
+        self.assertTrue(is_vectorizable([1, 2], True))
+        self.assertTrue(is_vectorizable([1, 2.0], False))
+        self.assertFalse(is_vectorizable([1, 2], False))
+        self.assertFalse(is_vectorizable([2 ** 60, 1.0], True))
+        self.assertFalse(is_vectorizable([True, 1.0], True))
+
+
+class TestBatchAPI(APITestCase):
+
+    async def test_batch(self):
+        response = await self.client.post("/batch", json=[
+            item("sum", x=1, y=2), item("div", x=1, y=0)
+        ])
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(results[0]["result"], 3)
+        self.assertEqual(results[1]["status"], 400)
+
+    async def test_invalid_batches(self):
+        response = await self.client.post("/batch", json={"x": 1})
+        self.assertEqual(response.status_code, 400)
+        response = await self.client.post("/batch", content=b"[")
+        self.assertEqual(response.status_code, 400)
+
+
+class TestBatchSizeLimit(APITestCase):
+
+    config = {"BATCH_MAX_ITEMS": 2}
+
+    async def test_too_many_items(self):
+        response = await self.client.post(
+            "/batch", json=[item("sum", x=1, y=2)] * 3
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""Benchmark suite: timing helpers, reports and the `bench` command."""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+
+from math_cli_api_kit.bench import compare_results, load_results, \
+    make_report, run_suites, save_results
+from math_cli_api_kit.bench.__main__ import bench
+from math_cli_api_kit.bench.timing import measure_call, summarize_latencies
+
+
+class TestTiming(unittest.TestCase):
+
+    def test_measure_call(self):
+        metrics = measure_call(abs, -1, min_time=0.001, repeat=2)
+        self.assertGreater(metrics["latency_ns"], 0)
+        self.assertAlmostEqual(metrics["throughput"],
+                               1e9 / metrics["latency_ns"])
+        self.assertEqual(metrics["calls"] % 2, 0)
+
+    def test_summarize_latencies(self):
+        metrics = summarize_latencies([i / 1000 for i in range(1, 101)])
+        self.assertAlmostEqual(metrics["latency_ms"], 50.5)
+        self.assertAlmostEqual(metrics["p99_ms"], 100)
+
+
+class TestReports(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        path = os.path.join(self.directory, "report.json")
+        report = make_report({"a": {"latency_ns": 1.0}})
+        save_results(report, path)
+        self.assertEqual(load_results(path), report)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"version": 0, "results": {}}, fh)
+        with self.assertRaises(ValueError):
+            load_results(path)
+
+    def test_regressions(self):
+        baseline = make_report({
+            "a": {"latency_ns": 100, "throughput": 100, "calls": 10},
+            "b": {"latency_ms": 10},
+        })
+        current = make_report({
+            "a": {"latency_ns": 105, "throughput": 50, "calls": 1},
+            "b": {"latency_ms": 20},
+            "c": {"latency_ms": 1},
+        })
+        regressions = compare_results(baseline, current, 0.1)
+        self.assertEqual([(r.benchmark, r.metric) for r in regressions],
+                         [("a", "throughput"), ("b", "latency_ms")])
+        self.assertAlmostEqual(regressions[0].slowdown, 2)
+        self.assertEqual(compare_results(baseline, current, 1.5), [])
+
+
+class TestBenchCommand(unittest.TestCase):
+
+    def test_validation_suite(self):
+        results = run_suites(["validation"], quick=True)
+        self.assertIn("validation.validate_factorial", results)
+        for metrics in results.values():
+            self.assertGreater(metrics["throughput"], 0)
+
+    def test_baseline_regressions_exit_with_1(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            save_results(make_report({
+                "validation.validate_factorial": {"latency_ns": 1e-3}
+            }), path)
+            result = CliRunner(mix_stderr=False).invoke(
+                bench, ["-s", "validation", "--quick", "--baseline", path]
+            )
+        self.assertEqual(result.exit_code, 1, msg=result.output)
+        self.assertIn("validation.validate_factorial",
+                      json.loads(result.stdout)["results"])
+        self.assertIn("regression: validation.validate_factorial",
+                      result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""Content-addressed result cache, its shared socket backend and its
+use by the API.
+"""
+
+import asyncio
+import os
+import socketserver
+import tempfile
+import threading
+import time
+import unittest
+
+from math_cli_api_kit.core.cache import AsyncResultCache, ResultCache, \
+    SocketResultCache, _CacheRequestHandler, _CacheServer, make_cache_key
+
+from tests.api_helpers import APITestCase
+
+
+class TestCacheKey(unittest.TestCase):
+
+    def test_ints_and_floats_have_different_keys(self):
+        self.assertNotEqual(make_cache_key("sum", [2, 2]),
+                            make_cache_key("sum", [2.0, 2]))
+        self.assertEqual(make_cache_key("sum", [2, 2]),
+                         make_cache_key("sum", [2, 2]))
+
+    def test_uncacheable_operands(self):
+        self.assertIsNone(make_cache_key("sum", ["2", 2]))
+        self.assertIsNone(make_cache_key("sum", [True, 2]))
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_lru_eviction_by_entries_and_bytes(self):
+        cache = ResultCache(max_entries=2, max_bytes=10, ttl=None)
+        cache.set(b"a", b"1")
+        cache.set(b"b", b"2")
+        cache.get(b"a")
+        cache.set(b"c", b"3")
+        self.assertIsNone(cache.get(b"b"))
+        self.assertEqual(cache.get(b"a"), b"1")
+        cache.set(b"d", b"0123456789")
+        self.assertEqual(cache.stats()["bytes"], 10)
+        cache.set(b"e", b"too large value")
+        self.assertIsNone(cache.get(b"e"))
+
+    def test_expired_entries_are_misses(self):
+        cache = ResultCache(max_entries=10, max_bytes=100, ttl=0.01)
+        cache.set(b"a", b"1")
+        time.sleep(0.02)
+        self.assertIsNone(cache.get(b"a"))
+        self.assertEqual(cache.stats()["misses"], 1)
+
+
+class _StalledHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        # read the request but never answer it
+        self.request.recv(1024)
+        self.server.stalled.wait(5)
+
+
+class TestSocketResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "cache.sock")
+        self.servers = []
+
+    def tearDown(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        os.rmdir(self.directory)
+
+    def serve(self, handler: type) -> _CacheServer:
+        server = _CacheServer(self.path, handler)
+        server.cache = ResultCache(100, 1 << 20, None)
+        server.stalled = threading.Event()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.servers.append(server)
+        return server
+
+    def test_shared_cache(self):
+        self.serve(_CacheRequestHandler)
+        client = SocketResultCache(self.path, timeout=1.0)
+        self.assertIsNone(client.get(b"k"))
+        client.set(b"k", b"value")
+        self.assertEqual(SocketResultCache(self.path).get(b"k"), b"value")
+        self.assertEqual(client.stats()["entries"], 1)
+        client.close()
+
+    def test_missing_server_is_a_miss(self):
+        client = SocketResultCache(self.path, timeout=1.0)
+        self.assertIsNone(client.get(b"k"))
+        client.set(b"k", b"value")
+
+    def test_stalled_server_times_out_as_a_miss(self):
+        server = self.serve(_StalledHandler)
+        client = SocketResultCache(self.path, timeout=0.05)
+        start = time.monotonic()
+        self.assertIsNone(client.get(b"k"))
+        self.assertLess(time.monotonic() - start, 1.0)
+        # the connection with a pending reply is dropped
+        self.assertIsNone(client._socket)
+        server.stalled.set()
+
+    def test_stalled_server_does_not_block_the_event_loop(self):
+        server = self.serve(_StalledHandler)
+        cache = AsyncResultCache(SocketResultCache(self.path, timeout=0.5))
+
+        async def lookup():
+            ticks = 0
+            get = asyncio.ensure_future(cache.get(b"k"))
+            while not get.done():
+                ticks += 1
+                await asyncio.sleep(0.01)
+            return await get, ticks
+
+        body, ticks = asyncio.run(lookup())
+        self.assertIsNone(body)
+        self.assertGreater(ticks, 10)
+        cache.close()
+        server.stalled.set()
+
+    def test_async_access_to_the_shared_cache(self):
+        self.serve(_CacheRequestHandler)
+        cache = AsyncResultCache(SocketResultCache(self.path, timeout=1.0))
+        cache.set(b"k", b"value")
+        self.assertEqual(asyncio.run(cache.get(b"k")), b"value")
+        cache.close()
+        self.assertIsNone(cache.cache._socket)
+
+
+class TestResultCacheAPI(APITestCase):
+
+    config = {"RESULT_CACHE_ENABLED": True, "METRICS_ENABLED": True}
+
+    async def test_cached_responses_and_their_metrics(self):
+        for _ in range(3):
+            response = await self.client.post("/algebra/sum",
+                                              json={"x": 1, "y": 2})
+            self.assertEqual(response.json()["results"], 3)
+        response = await self.client.post("/expression", json={
+            "expression": "x * 2", "variables": {"x": 4}
+        })
+        self.assertEqual(response.json()["result"], 8)
+        self.assertEqual(len(self.app.ctx.result_cache.cache._entries), 2)
+
+        response = await self.client.get(self.url + "/metrics")
+        lines = response.text.splitlines()
+        self.assertIn("math_api_result_cache_hits_total 2", lines)
+        self.assertIn("math_api_result_cache_misses_total 2", lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""Start-up budget of the command-line interface.
+
+Scripted CLI usage is dominated by process start-up, so running a
+single command must only import click and the core modules it needs.
+"""
+
+import json
+import math
+import subprocess
+import sys
+import unittest
+from typing import List
+
+# import time of a CLI command on top of the import time of click, in
+# milliseconds
+IMPORT_TIME_BUDGET_MS = 100
+
+FORBIDDEN_MODULES = (
+    "numpy", "sanic", "sanic_openapi", "sqlite3",
+    "math_cli_api_kit.core.costs", "math_cli_api_kit.core.executors",
+    "math_cli_api_kit.core.memo", "math_cli_api_kit.core.precision",
+)
+
+RUN_COMMAND = (
+    "import sys, json\n"
+    "from math_cli_api_kit.cli.__main__ import cli\n"
+    "cli.main({args!r}, standalone_mode=False)\n"
+    "print(json.dumps(sorted(sys.modules)))\n"
+)
+
+IMPORT_CLICK = (
+    "import sys, json\n"
+    "import click\n"
+    "print(json.dumps(sorted(sys.modules)))\n"
+)
+
+
+def run_script(script: str, *options: str):
+    return subprocess.run((sys.executable, *options, "-c", script),
+                          check=True, capture_output=True, text=True)
+
+
+def run_command(*args: str):
+    return run_script(RUN_COMMAND.format(args=list(args)))
+
+
+def imported_modules(stdout: str):
+    return json.loads(stdout.splitlines()[-1])
+
+
+def import_time_ms(stderr: str) -> float:
+    """Sum the self times reported by `-X importtime` for the modules
+    imported after the interpreter's start-up, which ends with `site`.
+    """
+    total = 0
+    started = False
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if started:
+            total += int(self_us)
+        elif name.strip() == "site":
+            started = True
+    return total / 1000
+
+
+def best_import_times_ms(*scripts: str) -> List[float]:
+    """Return the best import time of every script over several runs,
+    interleaved so that a busy machine slows them down alike.
+    """
+    best = [math.inf] * len(scripts)
+    for _ in range(7):
+        for i, script in enumerate(scripts):
+            stderr = run_script(script, "-X", "importtime").stderr
+            best[i] = min(best[i], import_time_ms(stderr))
+    return best
+
+
+class TestCLIStartup(unittest.TestCase):
+    def test_commands_do_not_import_heavy_dependencies(self):
+        for args in (("algebra", "sum", "-x", "1", "-y", "2"),
+                     ("geometry", "hypotenuse", "-a", "3", "-b", "4")):
+            modules = imported_modules(run_command(*args).stdout)
+            for name in FORBIDDEN_MODULES:
+                self.assertNotIn(name, modules)
+
+    def test_entry_point_does_not_import_the_operations(self):
+        modules = imported_modules(run_script(
+            "import sys, json\n"
+            "from math_cli_api_kit.cli.__main__ import cli\n"
+            "print(json.dumps(sorted(sys.modules)))\n"
+        ).stdout)
+        self.assertNotIn("math_cli_api_kit.core.registry", modules)
+        self.assertNotIn("math_cli_api_kit.core.math_operations", modules)
+
+    def test_import_time_budget(self):
+        baseline, elapsed = best_import_times_ms(
+            IMPORT_CLICK,
+            RUN_COMMAND.format(args=["algebra", "sum", "-x", "1", "-y", "2"])
+        )
+        self.assertLess(elapsed - baseline, IMPORT_TIME_BUDGET_MS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Synchronous and asynchronous clients of the Math API."""
+
+import asyncio
+import json
+import math
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from math_cli_api_kit.client import AsyncMathClient, MathAPIError, \
+    MathClient, RetryPolicy, has_httpx
+from math_cli_api_kit.client.common import httpx, parse_body
+from math_cli_api_kit.core.factorial import iter_decimal
+
+from tests.api_helpers import APITestCase
+
+NO_RETRY = RetryPolicy(retries=0)
+
+
+def fake_api(failures=0):
+    """Return an httpx transport answering like the Math API, failing
+    the first `failures` requests with a 503, and the list of the
+    requests it received.
+    """
+    requests = []
+
+    def answer(item):
+        operation, operands = item["operation"], item["operands"]
+        if operation == "div" and operands["y"] == 0:
+            return {"message": "division by zero", "status": 400}
+        return {"result": sum(operands.values()), "message": "Success",
+                "status": 200}
+
+    def handler(request):
+        requests.append(request)
+        if len(requests) <= failures:
+            return httpx.Response(503, json={"message": "busy"})
+        body = json.loads(request.content)
+        if request.url.path.endswith("/batch"):
+            return httpx.Response(200, json={
+                "results": [answer(item) for item in body],
+                "message": "Success",
+            })
+        operation = request.url.path.rsplit("/", 1)[-1]
+        entry = answer({"operation": operation, "operands": body})
+        if entry["status"] != 200:
+            return httpx.Response(400, json={"message": entry["message"]})
+        return httpx.Response(200, json={"results": entry["result"],
+                                         "message": "Success"})
+
+    return httpx.MockTransport(handler), requests
+
+
+@unittest.skipUnless(has_httpx(), "httpx is not installed")
+class TestMathClient(unittest.TestCase):
+
+    def test_operations(self):
+        transport, requests = fake_api()
+        with MathClient("http://api", transport=transport) as client:
+            self.assertEqual(client.algebra.sum(3, 4.5), 7.5)
+            self.assertEqual(client.compute("hypotenuse", a=1, b=2), 3)
+            with self.assertRaises(MathAPIError) as context:
+                client.algebra.div(1, 0)
+            self.assertEqual(context.exception.status, 400)
+            with self.assertRaises(ValueError):
+                client.compute("unknown", x=1)
+        self.assertEqual(requests[0].url.path,
+                         "/api/math/api/algebra/sum")
+
+    def test_retries(self):
+        transport, requests = fake_api(failures=2)
+        retry = RetryPolicy(retries=2, backoff=0.001)
+        with MathClient("http://api", transport=transport,
+                        retry=retry) as client:
+            self.assertEqual(client.algebra.sum(1, 2), 3)
+        self.assertEqual(len(requests), 3)
+
+        transport, requests = fake_api(failures=1)
+        with MathClient("http://api", transport=transport,
+                        retry=NO_RETRY) as client:
+            with self.assertRaises(MathAPIError) as context:
+                client.algebra.sum(1, 2)
+        self.assertEqual(context.exception.status, 503)
+
+    def test_concurrent_calls_are_batched(self):
+        transport, requests = fake_api()
+        with MathClient("http://api", transport=transport,
+                        batch_window=0.5, max_batch_items=4) as client, \
+                ThreadPoolExecutor(4) as pool:
+            futures = [pool.submit(client.algebra.sum, i, 1)
+                       for i in range(4)]
+            self.assertEqual([future.result() for future in futures],
+                             [1, 2, 3, 4])
+        self.assertEqual(len(requests), 1)
+        self.assertTrue(requests[0].url.path.endswith("/batch"))
+
+    def test_retry_delays(self):
+        policy = RetryPolicy(retries=5, backoff=0.1, max_backoff=0.3)
+        for attempt in range(5):
+            self.assertTrue(0 <= policy.delay(attempt) <= 0.3)
+
+    def test_big_integers_are_parsed_exactly(self):
+        value = math.factorial(3000)
+        body = '{"results": %s}' % "".join(iter_decimal(value))
+        self.assertEqual(parse_body(body.encode())["results"], value)
+
+
+class TestAsyncMathClient(APITestCase):
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.math = AsyncMathClient(self.url, retry=NO_RETRY)
+
+    async def asyncTearDown(self):
+        await self.math.aclose()
+        await super().asyncTearDown()
+
+    async def test_operations(self):
+        self.assertEqual(await self.math.algebra.sum(3, 4.5), 7.5)
+        self.assertEqual(await self.math.geometry.hypotenuse(3, 4), 5.0)
+        self.assertEqual(await self.math.algebra.factorial(3000),
+                         math.factorial(3000))
+        with self.assertRaises(MathAPIError):
+            await self.math.algebra.div(1, 0)
+
+    async def test_concurrent_calls_share_a_batch(self):
+        results = await asyncio.gather(
+            *(self.math.algebra.mul(i, 2) for i in range(10)),
+            self.math.algebra.div(1, 0), return_exceptions=True
+        )
+        self.assertEqual(results[:10], [2 * i for i in range(10)])
+        self.assertIsInstance(results[10], MathAPIError)
+        self.assertEqual(results[10].status, 400)
+
+    async def test_unbatched_calls(self):
+        self.math.batch_window = None
+        self.assertEqual(await self.math.compute("sub", x=1, y=2), -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Memory-mapped evaluation of operations over binary columns."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from click.testing import CliRunner
+
+from math_cli_api_kit.cli.__main__ import cli
+from math_cli_api_kit.core.vector_operations import np
+
+if np is not None:
+    from math_cli_api_kit.core.columnar import evaluate_columns, \
+        open_column
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestEvaluateColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.a = np.arange(10, dtype=np.float64)
+        self.b = np.arange(10, 20, dtype=np.float64)
+        self.a_path = self.path("a.npy")
+        self.b_path = self.path("b.raw")
+        np.save(self.a_path, self.a)
+        self.b.tofile(self.b_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_files_are_evaluated_by_chunk(self):
+        output = self.path("out.npy")
+        rows = evaluate_columns("hypotenuse",
+                                {"a": self.a_path, "b": self.b_path},
+                                output, chunk_size=3)
+        self.assertEqual(rows, 10)
+        np.testing.assert_allclose(np.load(output),
+                                   np.hypot(self.a, self.b))
+
+    def test_executors(self):
+        for executor in (ThreadPoolExecutor(2), ProcessPoolExecutor(2)):
+            with executor:
+                output = self.path("out.raw")
+                evaluate_columns("sum", {"x": self.a_path,
+                                         "y": self.b_path},
+                                 output, chunk_size=4, executor=executor)
+                np.testing.assert_array_equal(open_column(output),
+                                              self.a + self.b)
+
+    def test_arrays(self):
+        out = np.empty(10)
+        evaluate_columns("mul", {"x": self.a, "y": self.b}, out)
+        np.testing.assert_array_equal(out, self.a * self.b)
+
+    def test_invalid_columns(self):
+        out = np.empty(10)
+        with self.assertRaises(ValueError):
+            evaluate_columns("factorial", {"x": self.a}, out)
+        with self.assertRaises(TypeError):
+            evaluate_columns("sum", {"x": self.a}, out)
+        with self.assertRaises(ValueError):
+            evaluate_columns("sum", {"x": self.a, "y": self.b[:5]}, out)
+        with self.assertRaises(ValueError):
+            evaluate_columns("square_root", {"x": -self.a - 1}, out)
+        with ProcessPoolExecutor(1) as executor, \
+                self.assertRaises(ValueError):
+            evaluate_columns("sum", {"x": self.a, "y": self.b}, out,
+                             executor=executor)
+
+    def test_columns_command(self):
+        output = self.path("out.npy")
+        result = CliRunner().invoke(cli, [
+            "columns", "surface_of_square", "-i", f"a={self.a_path}",
+            "-o", output
+        ])
+        self.assertEqual(result.exit_code, 0, msg=result.output)
+        self.assertEqual(result.output, f"10 rows written to {output}\n")
+        np.testing.assert_array_equal(np.load(output), self.a * self.a)
+        result = CliRunner().invoke(cli, ["columns", "sum", "-i", "x",
+                                          "-o", output])
+        self.assertNotEqual(result.exit_code, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
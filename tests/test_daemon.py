@@ -0,0 +1,111 @@
+"""Resident CLI daemon and the `math-cli` shim."""
+
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from click.testing import CliRunner
+
+from math_cli_api_kit.cli.daemon import CLIDaemon, daemon, daemon_pid
+from math_cli_api_kit.cli.shim import decode_request, encode_request, \
+    forwards, send_request
+from math_cli_api_kit.config import CoreConfig
+
+
+class TestShim(unittest.TestCase):
+
+    def test_requests(self):
+        request = encode_request("run", "math-cli", "algebra", "\udcff")
+        self.assertEqual(decode_request(request),
+                         ["run", "math-cli", "algebra", "\udcff"])
+
+    def test_forwards(self):
+        args = ["algebra", "sum", "-x", "1", "-y", "2"]
+        with mock.patch.dict(os.environ, {CoreConfig.DAEMON_ENV_VAR: "1"}):
+            os.environ.pop(CoreConfig.PROFILE_ENV_VAR, None)
+            self.assertTrue(forwards(args))
+            self.assertFalse(forwards(["serve"]))
+            self.assertFalse(forwards([]))
+            os.environ[CoreConfig.PROFILE_ENV_VAR] = "profile"
+            self.assertFalse(forwards(args))
+        with mock.patch.dict(os.environ, {CoreConfig.DAEMON_ENV_VAR: "0"}):
+            self.assertFalse(forwards(args))
+
+    def test_no_daemon(self):
+        self.assertIsNone(send_request("/nonexistent/math-cli.sock",
+                                       encode_request("ping")))
+
+
+class TestCLIDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "daemon.sock")
+        self.thread = threading.Thread(
+            target=CLIDaemon(self.path, 30).serve, daemon=True
+        )
+        self.thread.start()
+        deadline = time.monotonic() + 30
+        while daemon_pid(self.path) is None:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.05)
+
+    def tearDown(self):
+        send_request(self.path, encode_request("stop"))
+        self.thread.join(10)
+        shutil.rmtree(self.directory)
+
+    def run_command(self, *args):
+        return send_request(self.path,
+                            encode_request("run", "math-cli", *args))
+
+    def test_commands_are_run(self):
+        self.assertEqual(self.run_command("algebra", "sum", "-x", "1",
+                                          "-y", "2"), (0, b"3.0\n", b""))
+        status, output, _ = self.run_command("algebra", "sum", "-x", "1")
+        self.assertEqual(status, 0)
+        self.assertIn(b"You did not enter parameter(s)", output)
+        status, _, error = self.run_command("algebra", "unknown")
+        self.assertEqual(status, 2)
+        self.assertIn(b"No such command", error)
+
+    def test_other_commands_are_refused(self):
+        self.assertEqual(self.run_command("serve")[0], 2)
+        self.assertEqual(send_request(self.path, b"bogus")[0], 2)
+
+    def test_socket_is_private_and_removed_on_stop(self):
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+        self.assertEqual(daemon_pid(self.path), os.getpid())
+        # a second daemon returns at once
+        CLIDaemon(self.path, 30).serve()
+        send_request(self.path, encode_request("stop"))
+        self.thread.join(10)
+        self.assertFalse(self.thread.is_alive())
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_daemon_commands(self):
+        runner = CliRunner()
+        result = runner.invoke(daemon, ["status", "-s", self.path])
+        self.assertEqual(result.output,
+                         f"Daemon running with PID {os.getpid()}\n")
+        result = runner.invoke(daemon, ["stop", "-s", self.path])
+        self.assertEqual(result.output, "Daemon stopped\n")
+        self.thread.join(10)
+        result = runner.invoke(daemon, ["status", "-s", self.path])
+        self.assertEqual(result.output, "Daemon not running\n")
+
+    def test_idle_timeout(self):
+        path = os.path.join(self.directory, "idle.sock")
+        started = time.monotonic()
+        CLIDaemon(path, 0.2).serve()
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Pluggable executor layer for expensive operations."""
+
+import math
+import time
+import unittest
+from concurrent.futures import CancelledError, ProcessPoolExecutor, \
+    ThreadPoolExecutor
+
+from math_cli_api_kit.core.executors import EXECUTOR_KINDS, \
+    InlineExecutor, IsolatedProcessExecutor, create_executor, map_bounded, \
+    parallel_evaluate, run_kernel, run_operation
+from math_cli_api_kit.core.vector_operations import VectorGeometry, np
+
+
+class TestExecutors(unittest.TestCase):
+
+    def test_create_executor(self):
+        kinds = {
+            "inline": InlineExecutor, "thread": ThreadPoolExecutor,
+            "process": ProcessPoolExecutor,
+            "isolated": IsolatedProcessExecutor,
+        }
+        self.assertEqual(set(kinds), set(EXECUTOR_KINDS))
+        for kind, executor_type in kinds.items():
+            executor = create_executor(kind, 1)
+            try:
+                self.assertIsInstance(executor, executor_type)
+                self.assertEqual(
+                    executor.submit(run_operation, "factorial", 20)
+                    .result(timeout=60),
+                    math.factorial(20)
+                )
+            finally:
+                executor.shutdown()
+        with self.assertRaises(ValueError):
+            create_executor("unknown")
+
+    def test_errors_are_raised_by_the_future(self):
+        for kind in ("inline", "isolated"):
+            executor = create_executor(kind, 1)
+            try:
+                with self.assertRaises(ZeroDivisionError):
+                    executor.submit(run_operation, "div", 1, 0) \
+                        .result(timeout=60)
+                with self.assertRaises(TypeError):
+                    executor.submit(run_operation, "sum", "1", 2) \
+                        .result(timeout=60)
+            finally:
+                executor.shutdown()
+        self.assertEqual(run_kernel("sum", 1, 2), 3)
+
+    def test_isolated_tasks_are_cancelled_while_running(self):
+        executor = IsolatedProcessExecutor(max_workers=1)
+        try:
+            running = executor.submit(time.sleep, 30)
+            queued = executor.submit(time.sleep, 0)
+            time.sleep(0.5)
+            self.assertTrue(running.cancel())
+            self.assertTrue(running.process.join(5) is None and
+                            not running.process.is_alive())
+            with self.assertRaises(CancelledError):
+                running.result()
+            self.assertIsNone(queued.result(timeout=60))
+        finally:
+            executor.shutdown()
+
+    def test_map_bounded_keeps_the_order(self):
+        with ThreadPoolExecutor(4) as executor:
+            self.assertEqual(
+                list(map_bounded(executor, math.factorial, range(20), 3)),
+                [math.factorial(x) for x in range(20)]
+            )
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestParallelEvaluate(unittest.TestCase):
+
+    def test_chunks_match_the_whole_evaluation(self):
+        a = np.linspace(0, 100, 1001)
+        b = np.linspace(5, 50, 1001)
+        for executor in (ThreadPoolExecutor(2), ProcessPoolExecutor(2)):
+            with executor:
+                np.testing.assert_array_equal(
+                    parallel_evaluate("hypotenuse", [a, b], executor, 100),
+                    VectorGeometry.hypotenuse(a, b)
+                )
+
+    def test_invalid_operands(self):
+        with ThreadPoolExecutor(1) as executor:
+            with self.assertRaises(ValueError):
+                parallel_evaluate("factorial", [[1, 2]], executor, 1)
+            with self.assertRaises(ValueError):
+                parallel_evaluate("sum", [[1, 2], [1]], executor, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
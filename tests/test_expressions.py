@@ -0,0 +1,137 @@
+"""Expressions composed of the registered math operations."""
+
+import math
+import unittest
+from unittest import mock
+
+from math_cli_api_kit.core.expressions import Expression, ExpressionError, \
+    compile_expression, evaluate_expression
+from math_cli_api_kit.core.vector_operations import has_numpy
+
+
+class TestExpression(unittest.TestCase):
+
+    def test_operators_and_operation_calls(self):
+        self.assertEqual(
+            evaluate_expression("surface_of_square(a) + sum(x, y) * 2",
+                                {"a": 3, "x": 1, "y": 2}),
+            15
+        )
+        self.assertEqual(evaluate_expression("hypotenuse(b=4, a=3)", {}),
+                         5.0)
+        self.assertEqual(evaluate_expression("-x ** 2", {"x": 3}), -9)
+
+    def test_constants_are_folded(self):
+        self.assertEqual(Expression("pi * 2").size, 1)
+        self.assertEqual(evaluate_expression("e", {}), math.e)
+
+    def test_plans_are_cached(self):
+        self.assertIs(compile_expression("sum(x, 1)"),
+                      compile_expression("sum(x, 1)"))
+
+    def test_invalid_expressions(self):
+        for text in ("sum(x)", "unknown(x)", "x.y", "'a'", "sum", "x +",
+                     "sum(x, z=1)"):
+            with self.assertRaises(ExpressionError, msg=text):
+                Expression(text)
+
+    def test_missing_and_invalid_variables(self):
+        plan = Expression("sum(x, y)")
+        with self.assertRaises(TypeError):
+            plan.evaluate({"x": 1})
+        with self.assertRaises(TypeError):
+            plan.evaluate({"x": 1, "y": "2"})
+
+    def test_oversized_constants_are_rejected_when_compiled(self):
+        for text in ("9 ** 9 ** 9", "factorial(10 ** 9)"):
+            with self.assertRaises(ExpressionError, msg=text):
+                Expression(text)
+
+    def test_oversized_variables_are_rejected_when_evaluated(self):
+        with self.assertRaises(ValueError):
+            evaluate_expression("x ** y", {"x": 9, "y": 9 ** 9})
+
+    def test_cost_grows_with_the_operands(self):
+        plan = Expression("factorial(x) + 1")
+        self.assertLess(plan.estimate_cost({"x": 5}),
+                        plan.estimate_cost({"x": 50_000}))
+
+
+class TestEvaluateMany(unittest.TestCase):
+
+    def test_rows_match_the_scalar_results(self):
+        plan = Expression("surface_of_circle(r) * h + sum(x, y)")
+        columns = {"r": [1, 2.5, 3], "h": [2, 1, 0.5], "x": [1, 2, 3],
+                   "y": [4, 5, 6.5]}
+        expected = [
+            plan.evaluate({name: column[i]
+                           for name, column in columns.items()})
+            for i in range(3)
+        ]
+        self.assertEqual(plan.evaluate_many(columns), expected)
+
+    def test_int_results_stay_ints(self):
+        results = Expression("sum(x, y) * 2").evaluate_many(
+            {"x": [1, 2, 2.5], "y": [3, 4, 1]}
+        )
+        self.assertEqual(results, [8, 12, 7.0])
+        self.assertEqual([type(result) for result in results],
+                         [int, int, float])
+
+    def test_large_ints_are_not_rounded_to_float64(self):
+        # float(x) / 484 differs from the correctly rounded x / 484
+        x = 2081918845191089988
+        self.assertNotEqual(float(x) / 484, x / 484)
+        self.assertEqual(
+            Expression("x / y").evaluate_many({"x": [x, 1], "y": [484, 4]}),
+            [x / 484, 0.25]
+        )
+
+    def test_negated_int_results_stay_ints(self):
+        results = Expression("-sum(x, y)").evaluate_many(
+            {"x": [1, 2], "y": [3, 2 ** 60]}
+        )
+        self.assertEqual(results, [-4, -(2 ** 60 + 2)])
+        self.assertEqual([type(result) for result in results], [int, int])
+
+    @unittest.skipUnless(has_numpy(), "NumPy is not installed")
+    def test_only_inexact_rows_are_evaluated_one_by_one(self):
+        plan = Expression("x / y + surface_of_circle(r)")
+        columns = {"x": [1, 2 ** 60 + 1, 3], "y": [2, 3, 4],
+                   "r": [1, 1, 2]}
+        with mock.patch.object(plan, "_evaluate_row",
+                               wraps=plan._evaluate_row) as evaluate_row:
+            results = plan.evaluate_many(columns)
+        self.assertEqual([call.args[1] for call in
+                          evaluate_row.call_args_list], [1])
+        self.assertEqual(results, [
+            plan.evaluate({name: column[i]
+                           for name, column in columns.items()})
+            for i in range(3)
+        ])
+
+    @unittest.skipUnless(has_numpy(), "NumPy is not installed")
+    def test_int_results_are_never_vectorized(self):
+        plan = Expression("sum(x, y) * x")
+        with mock.patch.object(plan, "_evaluate_vector") as evaluate_vector:
+            results = plan.evaluate_many({"x": [1, 2], "y": [3, 4]})
+        evaluate_vector.assert_not_called()
+        self.assertEqual(results, [4, 12])
+
+    def test_errors_name_the_row(self):
+        with self.assertRaisesRegex(ZeroDivisionError, "row 1"):
+            Expression("x / y").evaluate_many({"x": [1, 2], "y": [1, 0]})
+
+    def test_columns_must_have_the_same_length(self):
+        with self.assertRaises(ValueError):
+            Expression("sum(x, y)").evaluate_many({"x": [1, 2], "y": [1]})
+
+    @unittest.skipUnless(has_numpy(), "NumPy is not installed")
+    def test_float_rows_are_vectorized(self):
+        plan = Expression("hypotenuse(a, b)")
+        self.assertEqual(plan.evaluate_many({"a": [3, 5], "b": [4, 12]}),
+                         [5.0, 13.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
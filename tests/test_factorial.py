@@ -0,0 +1,93 @@
+"""Exact factorial engine and decimal conversion of large integers."""
+
+import json
+import math
+import unittest
+
+from math_cli_api_kit.core.factorial import DecimalText, FactorialEngine, \
+    decimal_text, is_large_int, iter_decimal, parse_decimal, product_range
+
+from tests.api_helpers import APITestCase
+
+
+class TestFactorialEngine(unittest.TestCase):
+
+    def test_factorials(self):
+        engine = FactorialEngine(max_input=5000, cache_size=4)
+        for x in (0, 1, 2, 63, 64, 1000, 1100, 900, 5000):
+            self.assertEqual(engine.factorial(x), math.factorial(x), msg=x)
+
+    def test_checkpoints_are_bounded_and_extended(self):
+        engine = FactorialEngine(max_input=10_000, cache_size=2)
+        engine.factorial(1000)
+        engine.factorial(2000)
+        self.assertEqual(engine.factorial(2100), math.factorial(2100))
+        self.assertEqual(sorted(engine._cache), [2000, 2100])
+        self.assertEqual(engine._keys, [2000, 2100])
+
+    def test_invalid_inputs(self):
+        engine = FactorialEngine(max_input=100)
+        with self.assertRaises(ValueError):
+            engine.factorial(-1)
+        with self.assertRaises(ValueError):
+            engine.factorial(101)
+        with self.assertRaises(TypeError):
+            engine.factorial(5.0)
+
+    def test_product_range(self):
+        self.assertEqual(product_range(5, 4), 1)
+        self.assertEqual(product_range(1, 100), math.factorial(100))
+
+
+class TestDecimalConversion(unittest.TestCase):
+
+    def test_round_trip(self):
+        for value in (0, 7, -12345, 10 ** 5000, -(3 ** 20000) + 1):
+            text = "".join(iter_decimal(value, chunk_digits=16))
+            self.assertEqual(parse_decimal(text), value)
+        self.assertEqual("".join(iter_decimal(10 ** 40, 16)),
+                         "1" + "0" * 40)
+
+    def test_large_ints(self):
+        self.assertFalse(is_large_int(10 ** 100))
+        self.assertFalse(is_large_int(1.0))
+        self.assertTrue(is_large_int(10 ** 5000))
+
+    def test_decimal_text(self):
+        value = 10 ** 5000
+        text = decimal_text(value)
+        self.assertIs(type(text), DecimalText)
+        self.assertEqual(parse_decimal(text), value)
+        self.assertEqual(decimal_text([value, 6, 1.5]),
+                         [text, 6, 1.5])
+
+
+class TestFactorialAPI(APITestCase):
+
+    async def test_large_factorials_are_json_numbers(self):
+        response = await self.client.post("/algebra/factorial",
+                                          json={"x": 3000})
+        self.assertEqual(response.status_code, 200)
+        body = response.text
+        self.assertTrue(body.startswith('{"results":4'))
+        (digits, message) = body[len('{"results":'):-1].split(",")
+        self.assertEqual(parse_decimal(digits), math.factorial(3000))
+        self.assertEqual(json.loads("{" + message + "}"),
+                         {"message": "Success"})
+
+    async def test_large_factorials_in_expressions(self):
+        response = await self.client.post("/expression", json={
+            "expression": "factorial(x)", "variables": {"x": [3000, 3]}
+        })
+        results = response.json()["results"]
+        self.assertEqual(parse_decimal(results[0]), math.factorial(3000))
+        self.assertEqual(results[1], 6)
+
+    async def test_oversized_factorials_are_rejected(self):
+        response = await self.client.post("/algebra/factorial",
+                                          json={"x": 10 ** 9})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
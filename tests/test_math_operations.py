@@ -0,0 +1,101 @@
+"""Algebra and Geometry operations and their trusted kernels."""
+
+import math
+import unittest
+
+from math_cli_api_kit.config import CoreConfig
+from math_cli_api_kit.core import math_operations
+from math_cli_api_kit.core.constants import PI
+from math_cli_api_kit.core.math_operations import Algebra, Geometry
+from math_cli_api_kit.core.validation import validate_int_or_float, \
+    validate_numbers
+
+
+class TestAlgebra(unittest.TestCase):
+
+    def test_operations(self):
+        self.assertEqual(Algebra.sum(1, 2.5), 3.5)
+        self.assertEqual(Algebra.sub(1, 2), -1)
+        self.assertEqual(Algebra.mul(3, 4), 12)
+        self.assertEqual(Algebra.div(1, 4), 0.25)
+        self.assertEqual(Algebra.pow(2, 10), 1024)
+        self.assertEqual(Algebra.square_root(16), 4.0)
+        self.assertEqual(Algebra.factorial(10), math.factorial(10))
+        self.assertAlmostEqual(Algebra.exp(1), math.e)
+
+    def test_invalid_operands(self):
+        for operands in (("1", 2), (1, None), (1, [2])):
+            with self.assertRaises(TypeError, msg=operands):
+                Algebra.sum(*operands)
+        with self.assertRaises(ZeroDivisionError):
+            Algebra.div(1, 0)
+        with self.assertRaises(ValueError):
+            Algebra.factorial(-1)
+        with self.assertRaises(ValueError):
+            Algebra.pow(3, CoreConfig.POW_MAX_RESULT_BITS)
+
+
+class TestGeometry(unittest.TestCase):
+
+    def test_operations(self):
+        self.assertEqual(Geometry.surface_of_square(3), 9)
+        self.assertAlmostEqual(Geometry.surface_of_circle(2), PI * 4)
+        self.assertEqual(Geometry.surface_of_triangle(3, 4), 6)
+        self.assertEqual(Geometry.surface_of_trapezoid(2, 4, 3), 9)
+        self.assertEqual(Geometry.hypotenuse(3, 4), 5.0)
+
+    def test_operands_are_validated_once_at_the_boundary(self):
+        for operands in (("3", 4), (3, None), (3, True)):
+            with self.assertRaises(TypeError, msg=operands):
+                Geometry.hypotenuse(*operands)
+        with self.assertRaises(TypeError):
+            Geometry.surface_of_trapezoid(1, 2, "3")
+
+
+class TestKernels(unittest.TestCase):
+
+    def test_kernels_match_the_methods(self):
+        for name, operands in (
+                ("sum", (1, 2.5)), ("sub", (1, 2)), ("mul", (3, 4)),
+                ("div", (1, 4)), ("pow", (2, 10)), ("square_root", (16,)),
+                ("factorial", (30,)), ("exp", (2,)),
+        ):
+            kernel = getattr(math_operations, f"{name}_kernel")
+            self.assertEqual(kernel(*operands),
+                             getattr(Algebra, name)(*operands), msg=name)
+        for name, operands in (
+                ("surface_of_square", (3,)), ("surface_of_circle", (2,)),
+                ("surface_of_triangle", (3, 4)),
+                ("surface_of_trapezoid", (2, 4, 3)),
+                ("hypotenuse", (3, 4)),
+        ):
+            kernel = getattr(math_operations, f"{name}_kernel")
+            self.assertEqual(kernel(*operands),
+                             getattr(Geometry, name)(*operands), msg=name)
+
+    def test_unbounded_kernels_are_still_bounded(self):
+        with self.assertRaises(ValueError):
+            math_operations.pow_kernel(3, CoreConfig.POW_MAX_RESULT_BITS)
+        with self.assertRaises(ValueError):
+            math_operations.factorial_kernel(
+                CoreConfig.FACTORIAL_MAX_INPUT + 1
+            )
+
+
+class TestValidation(unittest.TestCase):
+
+    def test_validate_numbers(self):
+        self.assertTrue(validate_numbers())
+        self.assertTrue(validate_numbers(1, 2.5, -3))
+        for value in ("1", None, True, 1j):
+            with self.assertRaises(TypeError, msg=value):
+                validate_numbers(1, value)
+
+    def test_validate_int_or_float(self):
+        self.assertTrue(validate_int_or_float(1, 2.5))
+        with self.assertRaises(TypeError):
+            validate_int_or_float(1, False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+"""Persistent memo store of expensive results."""
+
+import asyncio
+import math
+import shutil
+import tempfile
+import threading
+import unittest
+
+from math_cli_api_kit.core.factorial import FactorialEngine, \
+    factorial_engine
+from math_cli_api_kit.core.memo import AsyncMemoStore, MemoStore, \
+    decode_result, encode_result, warm_factorial_engine
+
+
+class TestMemoStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = MemoStore(self.directory, min_cost=0)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def test_results_are_encoded_compactly(self):
+        for result in (0, -1, 255, -(2 ** 100), math.factorial(500), 0.1):
+            self.assertEqual(decode_result(encode_result(result)), result)
+        self.assertIsNone(encode_result("1/3"))
+
+    def test_results_are_shared_between_stores(self):
+        self.assertIsNone(self.store.get("factorial", [100]))
+        self.store.set("factorial", [100], math.factorial(100))
+        other = MemoStore(self.directory)
+        try:
+            self.assertEqual(other.get("factorial", [100]),
+                             math.factorial(100))
+        finally:
+            other.close()
+        self.assertEqual(self.store.stats()["entries"], 1)
+
+    def test_least_recently_used_results_are_evicted(self):
+        store = MemoStore(self.directory, max_bytes=100, min_cost=0)
+        try:
+            store.set("pow", [2, 400], 2 ** 400)
+            store.set("pow", [3, 400], 3 ** 400)
+            self.assertIsNone(store.get("pow", [2, 400]))
+            self.assertEqual(store.get("pow", [3, 400]), 3 ** 400)
+        finally:
+            store.close()
+
+    def test_eviction_follows_the_use_order(self):
+        # every result takes 39 or 40 bytes, so three of them fit
+        store = MemoStore(self.directory, max_bytes=120, min_cost=0)
+        try:
+            for y in (300, 301, 302):
+                store.set("pow", [2, y], 2 ** y)
+            self.assertEqual(store.get("pow", [2, 300]), 2 ** 300)
+            store.set("pow", [2, 303], 2 ** 303)
+            self.assertIsNone(store.get("pow", [2, 301]))
+            for y in (300, 302, 303):
+                self.assertEqual(store.get("pow", [2, y]), 2 ** y)
+            self.assertEqual(
+                store.stats()["bytes"],
+                sum(len(encode_result(2 ** y)) for y in (300, 302, 303))
+            )
+        finally:
+            store.close()
+
+    def test_running_size_matches_the_stored_results(self):
+        for x in range(1, 20):
+            self.store.set("factorial", [x * 10], math.factorial(x * 10))
+        self.store.set("factorial", [10], math.factorial(11))
+        other = MemoStore(self.directory)
+        try:
+            other.set("factorial", [20], 1)
+        finally:
+            other.close()
+        (size,) = self.store._db.execute(
+            "SELECT sum(size) FROM memo").fetchone()
+        self.assertEqual(self.store.stats()["bytes"], size)
+        self.store.clear()
+        self.assertEqual(self.store.stats(),
+                         {"hits": 0, "misses": 0, "entries": 0, "bytes": 0})
+
+    def test_running_size_of_an_existing_database(self):
+        self.store.set("factorial", [100], math.factorial(100))
+        self.store._db.executescript(
+            "DROP TABLE memo_size; DROP TRIGGER memo_inserted;"
+            " DROP TRIGGER memo_updated; DROP TRIGGER memo_deleted;"
+        )
+        other = MemoStore(self.directory)
+        try:
+            self.assertEqual(other.stats()["bytes"],
+                             len(encode_result(math.factorial(100))))
+        finally:
+            other.close()
+
+    def test_warm_factorials(self):
+        self.store.set("factorial", [1000], math.factorial(1000))
+        engine = FactorialEngine()
+        self.assertEqual(self.store.warm_factorials(engine), 1)
+        self.assertIn(1000, engine._cache)
+
+    def test_warm_factorial_engine_of_a_worker_process(self):
+        self.store.set("factorial", [1200], math.factorial(1200))
+        factorial_engine.clear_cache()
+        warm_factorial_engine(self.directory)
+        self.assertIn(1200, factorial_engine._cache)
+        factorial_engine.clear_cache()
+
+
+class TestAsyncMemoStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_io_runs_on_a_dedicated_thread(self):
+        store = MemoStore(self.directory, min_cost=0)
+        threads = set()
+        get = store.get
+
+        def recording_get(*args):
+            threads.add(threading.current_thread())
+            return get(*args)
+
+        store.get = recording_get
+        memo = AsyncMemoStore(store)
+
+        async def run():
+            self.assertIsNone(await memo.get("pow", [3, 100]))
+            memo.set("pow", [3, 100], 3 ** 100)
+            return await memo.get("pow", [3, 100])
+
+        try:
+            self.assertEqual(asyncio.run(run()), 3 ** 100)
+        finally:
+            memo.close()
+        self.assertNotIn(threading.main_thread(), threads)
+        self.assertEqual(len(threads), 1)
+
+    def test_close_waits_for_pending_writes(self):
+        memo = AsyncMemoStore(MemoStore(self.directory, min_cost=0))
+        memo.set("pow", [5, 100], 5 ** 100)
+        memo.close()
+        store = MemoStore(self.directory)
+        try:
+            self.assertEqual(store.get("pow", [5, 100]), 5 ** 100)
+        finally:
+            store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
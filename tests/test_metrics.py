@@ -0,0 +1,90 @@
+"""Request metrics and their Prometheus exposition."""
+
+import unittest
+
+from math_cli_api_kit.core.metrics import MetricsStore, render_metrics
+
+from tests.api_helpers import APITestCase
+
+LABELS = (("family", "algebra"), ("operation", "sum"))
+
+
+class TestMetricsStore(unittest.TestCase):
+
+    def test_render(self):
+        store = MetricsStore([LABELS], (0.1, 1.0), counters=(
+            ("frames_total", "Total number of frames."),
+        ))
+        store.record(store.offset(LABELS), 0.5, False, [(0, 0.05)])
+        store.record(store.offset(LABELS), 2.0, True)
+        store.increment("frames_total", 3)
+        lines = render_metrics(store, "test").splitlines()
+        label_text = 'family="algebra",operation="sum"'
+        for line in (
+                f"test_requests_total{{{label_text}}} 2",
+                f"test_errors_total{{{label_text}}} 1",
+                "test_frames_total 3",
+                f'test_request_duration_seconds_bucket{{{label_text},'
+                f'le="0.1"}} 0',
+                f'test_request_duration_seconds_bucket{{{label_text},'
+                f'le="1.0"}} 1',
+                f'test_request_duration_seconds_bucket{{{label_text},'
+                f'le="+Inf"}} 2',
+                f"test_request_duration_seconds_sum{{{label_text}}} 2.5",
+        ):
+            self.assertIn(line, lines)
+        self.assertIsNone(store.offset((("family", "algebra"),)))
+
+    def test_label_sets_without_requests_are_omitted(self):
+        store = MetricsStore([LABELS], (0.1,))
+        self.assertNotIn("operation", render_metrics(store, "test"))
+
+
+class TestRequestLabels(unittest.TestCase):
+
+    def setUp(self):
+        try:
+            from math_cli_api_kit.api.metrics import request_labels
+        except ImportError:  # pragma: no cover - optional dependency
+            self.skipTest("Sanic is not installed")
+        self.request_labels = request_labels
+
+    def test_known_operations(self):
+        self.assertEqual(
+            self.request_labels("app.math.algebra_operation", "sum"), LABELS
+        )
+        self.assertEqual(
+            self.request_labels("app.math.batch_operation", ""),
+            (("family", "batch"), ("operation", "batch"))
+        )
+        self.assertIsNone(self.request_labels("app.metrics", ""))
+
+    def test_unknown_operations_share_one_label_set(self):
+        for route, operation in (("algebra_operation", "hypotenuse"),
+                                 ("geometry_operation", "x" * 100),
+                                 ("shape_operation", "sum")):
+            labels = self.request_labels(f"app.math.{route}", operation)
+            self.assertEqual(labels[1], ("operation", "unknown"))
+
+
+class TestMetricsAPI(APITestCase):
+
+    async def test_requests_are_counted(self):
+        await self.client.post("/algebra/sum", json={"x": 1, "y": 2})
+        await self.client.post("/algebra/sum", json={"x": 1})
+        for i in range(3):
+            await self.client.post(f"/algebra/unknown{i}", json={})
+        response = await self.client.get(self.url + "/metrics")
+        self.assertEqual(response.status_code, 200)
+        lines = response.text.splitlines()
+        self.assertIn('math_api_requests_total{family="algebra",'
+                      'operation="sum"} 2', lines)
+        self.assertIn('math_api_errors_total{family="algebra",'
+                      'operation="sum"} 1', lines)
+        self.assertIn('math_api_requests_total{family="algebra",'
+                      'operation="unknown"} 3', lines)
+        self.assertNotIn("unknown0", response.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
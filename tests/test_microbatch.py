@@ -0,0 +1,104 @@
+"""Request coalescing and micro-batching of cheap operations."""
+
+import asyncio
+import unittest
+
+from math_cli_api_kit.core.microbatch import MICROBATCH_COUNTERS, \
+    MicroBatcher
+from math_cli_api_kit.core.metrics import MetricsStore
+from math_cli_api_kit.core.registry import OPERATIONS
+from math_cli_api_kit.core.vector_operations import has_numpy
+
+from tests.api_helpers import APITestCase
+
+
+class TestMicroBatcher(unittest.IsolatedAsyncioTestCase):
+
+    async def test_calls_are_batched(self):
+        batcher = MicroBatcher(0, 256, 1000)
+        results = await asyncio.gather(*(
+            batcher.submit(OPERATIONS["sum"], (i, 1)) for i in range(10)
+        ))
+        self.assertEqual(results, [i + 1 for i in range(10)])
+        self.assertEqual(batcher.batches, 1)
+        self.assertEqual(batcher.stats()["mean_batch_size"], 10)
+
+    async def test_identical_calls_are_coalesced(self):
+        batcher = MicroBatcher(0.01, 256, 1000)
+        results = await asyncio.gather(*(
+            batcher.submit(OPERATIONS["mul"], (3, 4)) for _ in range(4)
+        ))
+        self.assertEqual(results, [12] * 4)
+        self.assertEqual((batcher.items, batcher.coalesced), (1, 3))
+        self.assertEqual(batcher.stats()["hit_ratio"], 0.75)
+
+    async def test_max_items_flushes_a_batch(self):
+        batcher = MicroBatcher(60, 3, 1000)
+        results = await asyncio.wait_for(asyncio.gather(*(
+            batcher.submit(OPERATIONS["sub"], (i, 1)) for i in range(3)
+        )), 5)
+        self.assertEqual(results, [-1, 0, 1])
+
+    async def test_errors_are_raised_to_their_callers(self):
+        batcher = MicroBatcher(0, 256, 1000)
+        results = await asyncio.gather(
+            batcher.submit(OPERATIONS["div"], (1, 0)),
+            batcher.submit(OPERATIONS["div"], (1, 2)),
+            return_exceptions=True
+        )
+        self.assertIsInstance(results[0], ZeroDivisionError)
+        self.assertEqual(results[1], 0.5)
+
+    @unittest.skipUnless(has_numpy(), "NumPy is not installed")
+    async def test_large_batches_are_vectorized(self):
+        store = MetricsStore([], (1.0,), counters=MICROBATCH_COUNTERS)
+        batcher = MicroBatcher(0, 256, 4, store)
+        results = await asyncio.gather(*(
+            batcher.submit(OPERATIONS["div"], (3 * i, 4))
+            for i in range(8)
+        ))
+        self.assertEqual(results, [0.75 * i for i in range(8)])
+        self.assertEqual(batcher.vectorized, 8)
+        self.assertEqual(
+            store.values[store.counter_offset("microbatch_vectorized_total")],
+            8
+        )
+
+    async def test_inexact_operations_use_the_scalar_kernel(self):
+        batcher = MicroBatcher(0, 256, 4)
+        rows = [(0.1 + i / 7, 0.3 + i / 11) for i in range(8)]
+        for name in ("pow", "hypotenuse"):
+            operation = OPERATIONS[name]
+            results = await asyncio.gather(*(
+                batcher.submit(operation, row) for row in rows
+            ))
+            self.assertEqual(results,
+                             [operation.kernel(*row) for row in rows])
+        self.assertEqual(batcher.vectorized, 0)
+
+    def test_accepts_only_cheap_calls(self):
+        self.assertTrue(MicroBatcher.accepts(OPERATIONS["sum"], (1, 2)))
+        self.assertFalse(MicroBatcher.accepts(OPERATIONS["factorial"],
+                                              (5000,)))
+
+
+class TestMicroBatchAPI(APITestCase):
+
+    config = {"MICROBATCH_ENABLED": True}
+
+    async def test_concurrent_requests(self):
+        responses = await asyncio.gather(*(
+            self.client.post("/algebra/sum", json={"x": i, "y": 1})
+            for i in range(20)
+        ))
+        self.assertEqual([response.json()["results"]
+                          for response in responses],
+                         [i + 1 for i in range(20)])
+        self.assertEqual(self.app.ctx.microbatcher.requests, 20)
+        response = await self.client.post("/algebra/div",
+                                          json={"x": 1, "y": 0})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
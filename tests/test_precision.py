@@ -0,0 +1,158 @@
+"""Arbitrary-precision decimal and exact fraction numeric backends."""
+
+import math
+import time
+import unittest
+from decimal import Decimal
+from fractions import Fraction
+
+from click.testing import CliRunner
+
+from math_cli_api_kit.cli.__main__ import cli
+from math_cli_api_kit.config import CoreConfig
+from math_cli_api_kit.core.precision import PreciseAlgebra, \
+    format_exact, parse_operand, pi_decimal, run_precise
+
+from tests.api_helpers import APITestCase
+
+PI_50 = "3.1415926535897932384626433832795028841971693993751"
+
+
+class TestPreciseOperations(unittest.TestCase):
+
+    def test_decimal_backend(self):
+        self.assertEqual(run_precise("sum", "decimal", 28, 0.1, 0.2), "0.3")
+        self.assertEqual(run_precise("div", "decimal", 5, 1, 3), "0.33333")
+        self.assertEqual(run_precise("hypotenuse", "decimal", 28, 3, 4),
+                         "5")
+        self.assertEqual(run_precise("exp", "decimal", 30, 1),
+                         "2.71828182845904523536028747135")
+        self.assertEqual(run_precise("surface_of_circle", "decimal", 50, 1),
+                         PI_50)
+
+    def test_fraction_backend(self):
+        self.assertEqual(run_precise("div", "fraction", 28, 1, 3), "1/3")
+        self.assertEqual(run_precise("pow", "fraction", 28, "2/3", -2),
+                         "9/4")
+        self.assertEqual(run_precise("surface_of_trapezoid", "fraction", 28,
+                                     "1/2", "1/3", 1), "5/12")
+
+    def test_factorials_are_exact_strings(self):
+        for numeric in ("decimal", "fraction"):
+            self.assertEqual(run_precise("factorial", numeric, 5, 5), "120")
+            self.assertEqual(run_precise("factorial", numeric, 5, 30),
+                             str(math.factorial(30)))
+
+    def test_constants(self):
+        self.assertEqual(str(pi_decimal(50)), PI_50)
+        self.assertTrue(str(pi_decimal(1000)).startswith(PI_50[:-1]))
+        self.assertEqual(len(str(pi_decimal(1000))), 1001)
+
+    def test_operands(self):
+        self.assertEqual(parse_operand("0.10"), Decimal("0.10"))
+        self.assertEqual(parse_operand("1/3"), Fraction(1, 3))
+        with self.assertRaises(ValueError):
+            parse_operand("abc")
+        algebra = PreciseAlgebra("fraction")
+        self.assertEqual(algebra.convert(0.1), Fraction(1, 10))
+        with self.assertRaises(ValueError):
+            algebra.convert(math.inf)
+        with self.assertRaises(TypeError):
+            algebra.convert(None)
+
+    def test_errors(self):
+        with self.assertRaises(ZeroDivisionError):
+            run_precise("div", "decimal", 28, 1, 0)
+        with self.assertRaises(ZeroDivisionError):
+            run_precise("pow", "fraction", 28, 0, -1)
+        with self.assertRaises(ValueError):
+            run_precise("square_root", "decimal", 28, -1)
+        with self.assertRaises(ValueError):
+            run_precise("factorial", "decimal", 28, "2.5")
+        with self.assertRaises(OverflowError):
+            run_precise("pow", "decimal", 28, 10, 10 ** 6)
+        with self.assertRaises(ValueError):
+            PreciseAlgebra("float")
+        with self.assertRaises(ValueError):
+            PreciseAlgebra("decimal", CoreConfig.MAX_PRECISION + 1)
+
+    def test_fraction_powers_are_bounded(self):
+        bits = CoreConfig.POW_MAX_RESULT_BITS
+        with self.assertRaises(ValueError):
+            run_precise("pow", "fraction", 28, "3/2", bits)
+        with self.assertRaises(ValueError):
+            run_precise("pow", "fraction", 28, "2/3", -bits)
+
+    def test_huge_integral_exponents_are_rejected_at_once(self):
+        for numeric in ("decimal", "fraction"):
+            for x, y in ((2, Decimal("1e100000")), ("0.5", "-1e100000"),
+                         (3, 10 ** 30)):
+                started = time.perf_counter()
+                with self.assertRaises(ValueError, msg=(numeric, x, y)):
+                    run_precise("pow", numeric, 28, x, y)
+                self.assertLess(time.perf_counter() - started, 0.5)
+        # only the parity of the exponent matters for 0, 1 and -1
+        for x, y, result in ((1, Decimal("1e1000000"), "1"),
+                             (-1, Decimal("1e1000000"), "1"),
+                             (-1, 10 ** 30 + 1, "-1"),
+                             (0, Decimal("1e1000000"), "0")):
+            self.assertEqual(run_precise("pow", "decimal", 28, x, y),
+                             result)
+
+    def test_format_exact(self):
+        self.assertEqual(format_exact(Fraction(4, 2)), "2")
+        self.assertEqual(format_exact(Decimal("1.50")), "1.50")
+        self.assertEqual(format_exact(10 ** 5000), "1" + "0" * 5000)
+
+
+class TestPreciseCLI(unittest.TestCase):
+
+    def test_numeric_option(self):
+        result = CliRunner().invoke(cli, [
+            "algebra", "div", "-x", "1", "-y", "3", "--numeric", "fraction"
+        ])
+        self.assertEqual(result.output, "1/3\n")
+        result = CliRunner().invoke(cli, [
+            "algebra", "sum", "-x", "0.1", "-y", "0.2", "--numeric",
+            "decimal", "--precision", "5"
+        ])
+        self.assertEqual(result.output, "0.3\n")
+
+
+class TestPreciseAPI(APITestCase):
+
+    async def test_numeric_query_arguments(self):
+        response = await self.client.post("/algebra/div?numeric=fraction",
+                                          json={"x": 1, "y": 3})
+        self.assertEqual(response.json()["results"], "1/3")
+        response = await self.client.post(
+            "/algebra/div?numeric=decimal&precision=5", json={"x": 1, "y": 3}
+        )
+        self.assertEqual(response.json()["results"], "0.33333")
+        response = await self.client.post(
+            "/algebra/factorial?numeric=decimal", json={"x": 5}
+        )
+        self.assertEqual(response.json()["results"], "120")
+
+    async def test_invalid_query_arguments(self):
+        for query in ("numeric=double", "numeric=decimal&precision=0",
+                      "numeric=decimal&precision=x"):
+            response = await self.client.post(f"/algebra/div?{query}",
+                                              json={"x": 1, "y": 3})
+            self.assertEqual(response.status_code, 400, msg=query)
+        response = await self.client.post(
+            "/algebra/pow?numeric=fraction",
+            json={"x": "3/2", "y": CoreConfig.POW_MAX_RESULT_BITS}
+        )
+        self.assertEqual(response.status_code, 400)
+        started = time.perf_counter()
+        response = await self.client.post(
+            "/algebra/pow?numeric=decimal", content=b'{"x":2,"y":1e100000}',
+            headers={"Content-Type": "application/json"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertLess(time.perf_counter() - started, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Opt-in profiling of the core operations."""
+
+import os
+import pstats
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from math_cli_api_kit.config import CoreConfig
+from math_cli_api_kit.core import math_operations
+from math_cli_api_kit.core.math_operations import Algebra, Geometry
+from math_cli_api_kit.core.profiling import Profile, profile_operations
+from math_cli_api_kit.core.registry import OPERATIONS
+
+
+class TestProfile(unittest.TestCase):
+
+    def test_calls_and_validation_are_recorded(self):
+        with profile_operations() as profile:
+            Algebra.sum(1, 2)
+            Geometry.hypotenuse(3, 4)
+            OPERATIONS["sum"].kernel(1, 2)
+        calls = {name: stats.calls for name, stats in profile.stats.items()
+                 if stats.calls}
+        self.assertEqual(calls, {
+            "Algebra.sum": 1, "Geometry.hypotenuse": 1, "sum_kernel": 1,
+            "hypotenuse_kernel": 1, "validate_int_or_float": 1,
+            "validate_numbers": 1,
+        })
+        stats = profile.stats["Geometry.hypotenuse"]
+        self.assertGreater(stats.validation, 0)
+        self.assertLessEqual(stats.validation, stats.cumulative)
+        self.assertIn("Geometry.hypotenuse;hypotenuse_kernel",
+                      profile.stacks)
+        self.assertIn("Algebra.sum", profile.format_stats())
+
+    def test_originals_are_restored(self):
+        function = OPERATIONS["sum"].function
+        kernel = math_operations.sum_kernel
+        sum_method = vars(Algebra)["sum"]
+        with profile_operations():
+            self.assertIsNot(OPERATIONS["sum"].function, function)
+        self.assertIs(OPERATIONS["sum"].function, function)
+        self.assertIs(math_operations.sum_kernel, kernel)
+        self.assertIs(vars(Algebra)["sum"], sum_method)
+
+    def test_only_one_profile_is_enabled(self):
+        with profile_operations():
+            with self.assertRaises(RuntimeError):
+                Profile().enable()
+
+    def test_dump(self):
+        with tempfile.TemporaryDirectory() as directory:
+            prefix = os.path.join(directory, "profile")
+            with profile_operations(cprofile=True) as profile:
+                Algebra.factorial(20)
+            paths = profile.dump(prefix)
+            self.assertEqual(paths, [f"{prefix}.collapsed", f"{prefix}.txt",
+                                     f"{prefix}.pstats"])
+            with open(paths[0], encoding="utf-8") as fh:
+                self.assertTrue(fh.readline().startswith("Algebra.factorial"))
+            pstats.Stats(paths[2])
+        with self.assertRaises(ValueError):
+            Profile().dump_pstats(prefix)
+
+
+class TestCLIProfiling(unittest.TestCase):
+
+    def test_profile_environment_variable(self):
+        # in a new process, as the commands are only profiled when they
+        # are built after the profile is enabled, like in real use
+        with tempfile.TemporaryDirectory() as directory:
+            prefix = os.path.join(directory, "cli")
+            env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+            env[CoreConfig.PROFILE_ENV_VAR] = prefix
+            result = subprocess.run(
+                (sys.executable, "-m", "math_cli_api_kit.cli", "algebra",
+                 "sum", "-x", "1", "-y", "2"),
+                capture_output=True, text=True, env=env
+            )
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertEqual(result.stdout, "3.0\n")
+            self.assertIn("Profile written to", result.stderr)
+            with open(f"{prefix}.txt", encoding="utf-8") as fh:
+                self.assertIn("sum_kernel", fh.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Operation registry and the API and CLI surfaces generated from it."""
+
+import unittest
+
+from click.testing import CliRunner
+
+from math_cli_api_kit.cli.__main__ import cli
+from math_cli_api_kit.core.math_operations import Algebra, Geometry
+from math_cli_api_kit.core.registry import ALGEBRA, GEOMETRY, OPERATIONS, \
+    get_operations
+
+from tests.api_helpers import APITestCase
+
+
+class TestRegistry(unittest.TestCase):
+
+    def test_every_operation_is_registered(self):
+        self.assertEqual(
+            set(get_operations(ALGEBRA)),
+            {"sum", "sub", "mul", "div", "pow", "square_root", "factorial",
+             "exp"}
+        )
+        self.assertEqual(
+            set(get_operations(GEOMETRY)),
+            {"surface_of_square", "surface_of_circle", "surface_of_triangle",
+             "surface_of_trapezoid", "hypotenuse"}
+        )
+        for name, operation in OPERATIONS.items():
+            family = Algebra if operation.family == ALGEBRA else Geometry
+            self.assertEqual(operation.function, getattr(family, name))
+
+    def test_kernels_match_the_functions(self):
+        operands = {"x": 3, "y": 2, "a": 3, "b": 4, "h": 2, "r": 1}
+        for operation in OPERATIONS.values():
+            values = operation.validator(operands)
+            self.assertEqual(operation.kernel(*values),
+                             operation.function(*values),
+                             msg=operation.name)
+
+    def test_validators(self):
+        validate = OPERATIONS["sum"].validator
+        self.assertEqual(validate({"x": 1, "y": 2.5}), (1, 2.5))
+        for operands in ({"x": 1}, {"x": "1", "y": 2}, {"x": True, "y": 1}):
+            with self.assertRaises(TypeError, msg=operands):
+                validate(operands)
+        with self.assertRaises(TypeError):
+            OPERATIONS["factorial"].validator({"x": 5.0})
+
+
+class TestCLICommands(unittest.TestCase):
+
+    def invoke(self, *args):
+        result = CliRunner().invoke(cli, args)
+        self.assertEqual(result.exit_code, 0, msg=result.output)
+        return result.output
+
+    def test_operation_commands(self):
+        self.assertEqual(self.invoke("algebra", "pow", "-x", "2", "-y", "3"),
+                         "8.0\n")
+        self.assertEqual(self.invoke("geometry", "hypotenuse", "-a", "3",
+                                     "-b", "4"), "5.0\n")
+        self.assertEqual(self.invoke("algebra", "factorial", "-x", "5"),
+                         "120\n")
+
+    def test_invalid_operands(self):
+        self.assertIn("is not 'int' or 'float'",
+                      self.invoke("algebra", "sum", "-x", "a", "-y", "2"))
+        self.assertIn("is not 'int'",
+                      self.invoke("algebra", "factorial", "-x", "2.5"))
+
+
+class TestOperationAPI(APITestCase):
+
+    async def test_operation_endpoints(self):
+        response = await self.client.post("/algebra/sum",
+                                          json={"x": 1, "y": 2})
+        self.assertEqual(response.json(),
+                         {"results": 3, "message": "Success"})
+        response = await self.client.post("/geometry/hypotenuse",
+                                          json={"a": 3, "b": 4})
+        self.assertEqual(response.json(),
+                         {"result": 5.0, "message": "Success"})
+
+    async def test_errors(self):
+        response = await self.client.post("/algebra/unknown",
+                                          json={"x": 1})
+        self.assertEqual(response.status_code, 404)
+        response = await self.client.post("/geometry/sum",
+                                          json={"x": 1, "y": 2})
+        self.assertEqual(response.status_code, 404)
+        response = await self.client.post("/algebra/sum", json={"x": 1})
+        self.assertEqual(response.status_code, 400)
+        response = await self.client.post("/algebra/div",
+                                          json={"x": 1, "y": 0})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+"""JSON backends and the binary response formats."""
+
+import json
+import math
+import struct
+import unittest
+
+from math_cli_api_kit.core.factorial import decimal_text, parse_decimal
+from math_cli_api_kit.core.serialization import FLOAT64, JSON, MSGPACK, \
+    JSON_BACKENDS, Serializer, has_msgpack, json_backend, msgpack, \
+    negotiate_format
+
+from tests.api_helpers import APITestCase
+
+
+def installed_backends():
+    names = []
+    for name in JSON_BACKENDS[1:]:
+        try:
+            names.append(json_backend(name)[0])
+        except ImportError:
+            pass
+    return names
+
+
+class TestJSONBackends(unittest.TestCase):
+
+    def test_backends_match_the_standard_library(self):
+        values = [1, -2.5, 2 ** 64 + 1, -(2 ** 70), [math.inf, 3],
+                  {"x": 10 ** 30, "y": 0.1}]
+        for name in installed_backends():
+            serializer = Serializer(name)
+            for value in values:
+                body = serializer.dumps(value)
+                self.assertEqual(json.loads(body), value, msg=name)
+                self.assertEqual(serializer.loads(body), value, msg=name)
+            self.assertIsNone(serializer.loads(b""))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            json_backend("yaml")
+
+    def test_exact_parsing(self):
+        operands = Serializer().loads_exact(b'{"x": 0.1, "y": 2}')
+        self.assertEqual(str(operands["x"]), "0.1")
+        self.assertEqual(operands["y"], 2)
+
+
+class TestResponseFormats(unittest.TestCase):
+
+    def setUp(self):
+        self.serializer = Serializer()
+
+    def test_negotiate_format(self):
+        self.assertEqual(negotiate_format(None), JSON)
+        self.assertEqual(negotiate_format("text/html"), JSON)
+        self.assertEqual(negotiate_format("application/x-float64"), FLOAT64)
+        self.assertEqual(negotiate_format(
+            "application/x-float64;q=0.5, application/json"
+        ), JSON)
+        self.assertEqual(negotiate_format("application/x-float64;q=0"),
+                         JSON)
+        self.assertEqual(negotiate_format("application/x-float64", False),
+                         JSON)
+        self.assertEqual(negotiate_format("application/msgpack"),
+                         MSGPACK if has_msgpack() else JSON)
+
+    def test_json_results(self):
+        self.assertEqual(self.serializer.result_body(JSON, "results", 3),
+                         b'{"results":3,"message":"Success"}')
+        value = 10 ** 5000
+        body = self.serializer.result_body(JSON, "results",
+                                           decimal_text(value))
+        self.assertEqual(parse_decimal(body[11:-21].decode()), value)
+
+    def test_float64_results(self):
+        self.assertEqual(self.serializer.result_body(FLOAT64, "result", 2),
+                         struct.pack("<d", 2.0))
+        self.assertEqual(
+            self.serializer.result_body(FLOAT64, "results", [1, 0.5]),
+            struct.pack("<2d", 1.0, 0.5)
+        )
+        with self.assertRaises(ValueError):
+            self.serializer.result_body(FLOAT64, "result", 10 ** 400)
+        with self.assertRaises(ValueError):
+            self.serializer.result_body(FLOAT64, "result", "1/3")
+
+    def test_float64_batches(self):
+        body, headers = self.serializer.batch_body(FLOAT64, [
+            {"result": 1}, {"status": 400, "message": "division by zero"},
+            {"result": 10 ** 400},
+        ])
+        values = struct.unpack("<3d", body)
+        self.assertEqual(values[0], 1.0)
+        self.assertTrue(math.isnan(values[1]) and math.isnan(values[2]))
+        self.assertEqual(headers, {"X-Failed-Items": "2"})
+
+    @unittest.skipUnless(has_msgpack(), "msgpack is not installed")
+    def test_msgpack_results(self):
+        body = self.serializer.result_body(MSGPACK, "results",
+                                           [2 ** 70, 1.5])
+        self.assertEqual(msgpack.unpackb(body), {
+            "results": [str(2 ** 70), 1.5], "message": "Success"
+        })
+        body, headers = self.serializer.batch_body(MSGPACK, [
+            {"result": 2 ** 70}, {"status": 400, "message": "x"},
+        ])
+        self.assertEqual(msgpack.unpackb(body)["results"], [
+            {"result": str(2 ** 70)}, {"status": 400, "message": "x"}
+        ])
+
+
+class TestResponseFormatAPI(APITestCase):
+
+    async def test_accept_header(self):
+        response = await self.client.post(
+            "/algebra/sum", json={"x": 1, "y": 2},
+            headers={"Accept": "application/x-float64"}
+        )
+        self.assertEqual(response.headers["content-type"],
+                         "application/x-float64")
+        self.assertEqual(struct.unpack("<d", response.content), (3.0,))
+        response = await self.client.post(
+            "/algebra/sum", json={"x": 1, "y": 2},
+            headers={"Accept": "text/html"}
+        )
+        self.assertEqual(response.json(),
+                         {"results": 3, "message": "Success"})
+
+    @unittest.skipUnless(has_msgpack(), "msgpack is not installed")
+    async def test_msgpack_batches(self):
+        response = await self.client.post(
+            "/batch", json=[
+                {"operation": "sum", "operands": {"x": 1, "y": 2}},
+                {"operation": "div", "operands": {"x": 1, "y": 0}},
+            ], headers={"Accept": "application/msgpack"}
+        )
+        results = msgpack.unpackb(response.content)["results"]
+        self.assertEqual(results[0]["result"], 3)
+        self.assertEqual(results[1]["status"], 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Multi-worker runtime of the `serve` command."""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import unittest
+
+from tests.api_helpers import BASE_PATH, APITestCase, httpx
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestListenSocket(unittest.TestCase):
+
+    def setUp(self):
+        try:
+            from math_cli_api_kit.api.serve import listen_socket
+        except ImportError:  # pragma: no cover - optional dependency
+            self.skipTest("Sanic is not installed")
+        self.listen_socket = listen_socket
+
+    @unittest.skipUnless(hasattr(socket, "SO_REUSEPORT"),
+                         "SO_REUSEPORT is not available")
+    def test_port_is_shared_for_rolling_restarts(self):
+        first = self.listen_socket("127.0.0.1", 0)
+        port = first.getsockname()[1]
+        second = self.listen_socket("127.0.0.1", port)
+        try:
+            first.listen()
+            second.listen()
+            self.assertEqual(second.getsockname()[1], port)
+        finally:
+            first.close()
+            second.close()
+
+
+class TestPrewarm(APITestCase):
+
+    config = {"EXECUTOR": "process", "EXECUTOR_WORKERS": 2}
+
+    async def test_prewarm_starts_the_executor_processes(self):
+        from math_cli_api_kit.api.serve import prewarm
+
+        prewarm(self.app)
+        self.assertEqual(len(self.app.ctx.executor._processes), 2)
+        response = await self.client.post("/algebra/sum",
+                                          json={"x": 1, "y": 2})
+        self.assertEqual(response.status_code, 200)
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestServeCommand(unittest.TestCase):
+
+    def test_serve_until_sigterm(self):
+        port = free_port()
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        process = subprocess.Popen(
+            (sys.executable, "-m", "math_cli_api_kit.cli", "serve", "-p",
+             str(port), "-w", "1", "--no-uvloop"),
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env
+        )
+        try:
+            url = f"http://127.0.0.1:{port}{BASE_PATH}/algebra/sum"
+            deadline = time.monotonic() + 60
+            while True:
+                try:
+                    response = httpx.post(url, json={"x": 1, "y": 2})
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline or \
+                            process.poll() is not None:
+                        raise
+                    time.sleep(0.2)
+            self.assertEqual(response.json()["results"], 3)
+            process.send_signal(signal.SIGTERM)
+            self.assertEqual(process.wait(60), 0)
+            self.assertIn(b"prewarmed", process.stdout.read())
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
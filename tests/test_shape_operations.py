@@ -0,0 +1,186 @@
+"""Array-based geometric operations on polygons and point clouds."""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+
+from math_cli_api_kit.cli.__main__ import cli
+from math_cli_api_kit.core.shape_operations import ShapeGeometry
+from math_cli_api_kit.core.vector_operations import np
+from tests.api_helpers import APITestCase
+
+
+def monotone_chain(points):
+    """Return the vertices of the convex hull of distinct points,
+    without the points on its edges, as a set.
+    """
+    points = sorted(set(points))
+    if len(points) < 3:
+        return set(points)
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    hull = []
+    for chain in (points, points[::-1]):
+        half = []
+        for point in chain:
+            while len(half) >= 2 and cross(half[-2], half[-1], point) <= 0:
+                half.pop()
+            half.append(point)
+        hull += half[:-1]
+    return set(hull)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestShapeGeometry(unittest.TestCase):
+
+    def test_polygon_areas_and_perimeters(self):
+        coordinates = [0, 0, 1, 0, 1, 1, 0, 0, 4, 0, 0, 3]
+        offsets = [0, 3, 6]
+        self.assertEqual(
+            ShapeGeometry.polygon_areas(coordinates, offsets).tolist(),
+            [0.5, 6.0]
+        )
+        self.assertEqual(
+            ShapeGeometry.polygon_perimeters(coordinates[6:]).tolist(),
+            [12.0]
+        )
+
+    def test_polygons_far_from_the_origin(self):
+        square = np.array([0, 0, 1, 0, 1, 1, 0, 1], dtype=np.float64)
+        square += 1e9
+        self.assertEqual(ShapeGeometry.polygon_areas(square).tolist(), [1.0])
+        self.assertEqual(ShapeGeometry.polygon_perimeters(square).tolist(),
+                         [4.0])
+
+    def test_integral_float_offsets_are_accepted(self):
+        coordinates = [0, 0, 2, 0, 0, 2, 0, 0, 1, 0, 1, 1, 0, 1]
+        self.assertEqual(
+            ShapeGeometry.polygon_areas(coordinates, [0.0, 3.0, 7.0]).tolist(),
+            [2.0, 1.0]
+        )
+        for offsets in ([0, 3.5, 7], [0, 5, 3, 7], [1, 7], [0, 3, 8]):
+            with self.assertRaises((TypeError, ValueError), msg=offsets):
+                ShapeGeometry.polygon_areas(coordinates, offsets)
+
+    def test_pairwise_distances(self):
+        distances = ShapeGeometry.pairwise_distances([0, 0, 3, 4])
+        self.assertEqual(distances.tolist(), [[0.0, 5.0], [5.0, 0.0]])
+        distances = ShapeGeometry.pairwise_distances([0, 0], [0, 1, 1, 0])
+        self.assertEqual(distances.tolist(), [[1.0, 1.0]])
+
+    def test_odd_coordinates_are_rejected(self):
+        with self.assertRaises(ValueError):
+            ShapeGeometry.polygon_areas([0, 0, 1])
+
+    def test_nearest_distances(self):
+        distances, indices = ShapeGeometry.nearest_distances(
+            [0, 0, 10, 0], [1, 0, 9, 0, 20, 0], chunk_size=2
+        )
+        self.assertEqual(distances.tolist(), [1.0, 1.0])
+        self.assertEqual(indices.tolist(), [0, 1])
+
+    def test_convex_hull_excludes_points_on_edges(self):
+        square = [0, 0, 2, 0, 2, 2, 0, 2, 1, 0, 1, 1]
+        self.assertEqual(ShapeGeometry.convex_hull(square).tolist(),
+                         [0, 1, 2, 3])
+
+    def test_convex_hull_tied_apexes(self):
+        # (1, 2), (2, 2) and (3, 2) are equally far from the bottom edge;
+        # (2, 2) lies between the other two and is not a vertex
+        for points in ([0, 0, 4, 0, 2, 2, 3, 2, 1, 2],
+                       [0, 0, 4, 0, 2, 2, 1, 2, 3, 2],
+                       [0, 0, 4, 0, 3, 2, 2, 2, 1, 2]):
+            hull = ShapeGeometry.convex_hull(points).tolist()
+            self.assertEqual(
+                sorted((points[2 * i], points[2 * i + 1]) for i in hull),
+                [(0, 0), (1, 2), (3, 2), (4, 0)]
+            )
+
+    def test_convex_hull_matches_monotone_chain_on_grids(self):
+        rng = random.Random(7)
+        for _ in range(500):
+            points = [(rng.randrange(5), rng.randrange(5))
+                      for _ in range(rng.randrange(1, 30))]
+            flat = [value for point in points for value in point]
+            hull = [points[i] for i in ShapeGeometry.convex_hull(flat)]
+            self.assertEqual(len(hull), len(set(hull)))
+            self.assertEqual(set(hull), monotone_chain(points))
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestShapesCommand(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_inline_numbers(self):
+        result = CliRunner().invoke(cli, [
+            "shapes", "polygon_area", "--coordinates", "0,0,4,0,0,3"
+        ])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(result.output, "6.0\n")
+
+    def test_array_files(self):
+        points = os.path.join(self.directory, "points.npy")
+        np.save(points, np.array([0, 0, 10, 0], dtype=np.float64))
+        targets = os.path.join(self.directory, "targets.f64")
+        np.array([1, 0, 9, 0, 20, 0], dtype=np.float64).tofile(targets)
+        result = CliRunner().invoke(cli, [
+            "shapes", "nearest_distances", "--points", points,
+            "--targets", targets
+        ])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(result.output, "1.0 0\n1.0 1\n")
+
+    def test_invalid_operands(self):
+        result = CliRunner().invoke(cli, [
+            "shapes", "convex_hull", "--points", "0,0,1"
+        ])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("x and a y value", result.output)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestShapesAPI(APITestCase):
+
+    async def test_json_operands(self):
+        response = await self.client.post("/shapes/polygon_area", json={
+            "coordinates": [0, 0, 1, 0, 1, 1, 0, 0, 4, 0, 0, 3],
+            "offsets": [0, 3, 6]
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["result"], [0.5, 6.0])
+
+    async def test_float64_body(self):
+        body = np.array([0, 0, 10, 0, 1, 0, 9, 0, 20, 0],
+                        dtype="<f8").tobytes()
+        response = await self.client.post(
+            "/shapes/nearest_distances", params={"sizes": "4"},
+            content=body,
+            headers={"content-type": "application/x-float64"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["result"],
+                         {"distances": [1.0, 1.0], "indices": [0, 1]})
+
+    async def test_invalid_requests(self):
+        response = await self.client.post("/shapes/unknown",
+                                          json={"points": [0, 0]})
+        self.assertEqual(response.status_code, 404)
+        for body in ({"points": [0, 0, 1]}, {"points": "0,0"}, [0, 0]):
+            response = await self.client.post("/shapes/convex_hull",
+                                              json=body)
+            self.assertEqual(response.status_code, 400, body)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""WebSocket stream of continuous computations."""
+
+import json
+import math
+import sys
+import unittest
+from types import SimpleNamespace
+
+from tests.api_helpers import BASE_PATH, APITestCase
+
+try:
+    import websockets
+except ImportError:  # pragma: no cover - optional dependency
+    websockets = None
+
+
+class TestStreamFrames(APITestCase):
+
+    async def answer(self, frame):
+        from math_cli_api_kit.api.main.blueprint.math_api import \
+            _answer_frame
+
+        request = SimpleNamespace(app=self.app, ctx=SimpleNamespace())
+        return json.loads(await _answer_frame(request, frame))
+
+    async def test_frames(self):
+        self.assertEqual(await self.answer(json.dumps({
+            "id": "a", "operation": "hypotenuse", "operands": {"a": 3, "b": 4}
+        })), {"id": "a", "result": 5.0, "message": "Success", "status": 200})
+        answer = await self.answer(b'{"id": 1, "operation": "div",'
+                                   b' "operands": {"x": 1, "y": 0}}')
+        self.assertEqual((answer["id"], answer["status"]), (1, 400))
+        for frame, status in (("not json", 400), ("[1]", 400),
+                              ('{"operation": "x", "operands": {}}', 404)):
+            answer = await self.answer(frame)
+            self.assertEqual((answer["id"], answer["status"]),
+                             (None, status), msg=frame)
+
+
+# the WebSocket receive of Sanic 21.12 passes coroutines to asyncio.wait,
+# which Python 3.11 rejects
+@unittest.skipIf(sys.version_info >= (3, 11),
+                 "Sanic 21.12 WebSockets do not support Python 3.11")
+@unittest.skipIf(websockets is None, "websockets is not installed")
+class TestStreamAPI(APITestCase):
+
+    config = {"STREAM_MAX_IN_FLIGHT": 2}
+
+    def connect(self):
+        url = "ws" + self.url[len("http"):] + BASE_PATH + "/stream"
+        return websockets.connect(url)
+
+    async def exchange(self, *frames):
+        async with self.connect() as ws:
+            for frame in frames:
+                await ws.send(frame if isinstance(frame, str)
+                              else json.dumps(frame))
+            answers = [json.loads(await ws.recv()) for _ in frames]
+        return {answer["id"]: answer for answer in answers}
+
+    async def test_frames_are_answered(self):
+        answers = await self.exchange(*(
+            {"id": i, "operation": "hypotenuse",
+             "operands": {"a": 3 * i, "b": 4 * i}}
+            for i in range(10)
+        ), {"id": "f", "operation": "factorial", "operands": {"x": 3000}})
+        for i in range(10):
+            self.assertEqual(answers[i]["result"], 5.0 * i)
+            self.assertEqual(answers[i]["status"], 200)
+        self.assertEqual(answers["f"]["status"], 200)
+        self.assertTrue(str(math.factorial(3000)).startswith(
+            str(answers["f"]["result"])[:10]
+        ))
+
+    async def test_errors_are_answered(self):
+        answers = await self.exchange(
+            {"id": 1, "operation": "div", "operands": {"x": 1, "y": 0}},
+            {"id": 2, "operation": "unknown", "operands": {}},
+            {"id": 3, "operation": "sum", "operands": {"x": "1", "y": 2}},
+        )
+        self.assertEqual(
+            [answers[i]["status"] for i in (1, 2, 3)], [400, 404, 400]
+        )
+        self.assertEqual(answers[1]["message"], "division by zero")
+        async with self.connect() as ws:
+            await ws.send("not json")
+            answer = json.loads(await ws.recv())
+        self.assertEqual((answer["id"], answer["status"]), (None, 400))
+
+    async def test_frames_are_counted(self):
+        await self.exchange(
+            {"id": 1, "operation": "sum", "operands": {"x": 1, "y": 2}},
+            {"id": 2, "operation": "div", "operands": {"x": 1, "y": 0}},
+        )
+        response = await self.client.get(self.url + "/metrics")
+        lines = response.text.splitlines()
+        self.assertIn("math_api_stream_connections_total 1", lines)
+        self.assertIn("math_api_stream_frames_total 2", lines)
+        self.assertIn("math_api_stream_errors_total 1", lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Streaming NDJSON and CSV evaluation of the `stream` command."""
+
+import io
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from click.testing import CliRunner
+
+from math_cli_api_kit.cli.__main__ import cli
+from math_cli_api_kit.cli.stream_cli import read_csv_rows, \
+    read_ndjson_rows, stream_evaluate
+
+NDJSON = (
+    '{"operation": "sum", "operands": {"x": 1, "y": 2}}\n'
+    '\n'
+    'not json\n'
+    '{"operation": "hypotenuse", "operands": {"a": 3, "b": 4}}\n'
+)
+
+CSV = (
+    "operation,x,y\n"
+    "sum,1,2\n"
+    "div,1,0\n"
+    "square_root,16,\n"
+)
+
+
+class TestStreamEvaluate(unittest.TestCase):
+
+    def test_ndjson_rows(self):
+        rows = list(read_ndjson_rows(io.StringIO(NDJSON)))
+        self.assertEqual(len(rows), 3)
+        self.assertIsNone(rows[1])
+
+    def test_csv_rows(self):
+        rows = list(read_csv_rows(io.StringIO(CSV)))
+        self.assertEqual(rows[0], {"operation": "sum",
+                                   "operands": {"x": 1, "y": 2}})
+        self.assertEqual(rows[2]["operands"], {"x": 16})
+
+    def test_results_are_written_in_order_by_chunk(self):
+        for executor in (None, ThreadPoolExecutor(2)):
+            output = io.StringIO()
+            stream_evaluate(read_ndjson_rows(io.StringIO(NDJSON)), output,
+                            "ndjson", chunk_size=1, vectorize_threshold=64,
+                            executor=executor, max_pending=2)
+            results = [json.loads(line)
+                       for line in output.getvalue().splitlines()]
+            self.assertEqual([result["status"] for result in results],
+                             [200, 400, 200])
+            self.assertEqual(results[2]["result"], 5.0)
+            if executor is not None:
+                executor.shutdown()
+
+    def test_csv_results(self):
+        output = io.StringIO()
+        stream_evaluate(read_csv_rows(io.StringIO(CSV)), output, "csv",
+                        chunk_size=2, vectorize_threshold=64)
+        self.assertEqual(output.getvalue().splitlines(), [
+            "result,error", "3,", ",division by zero", "4.0,"
+        ])
+
+
+class TestStreamCommand(unittest.TestCase):
+
+    def test_stdin(self):
+        result = CliRunner().invoke(cli, ["stream"], input=NDJSON)
+        self.assertEqual(result.exit_code, 0, msg=result.output)
+        self.assertEqual(len(result.output.splitlines()), 3)
+
+    def test_csv_format(self):
+        result = CliRunner().invoke(cli, ["stream", "-f", "csv"], input=CSV)
+        self.assertEqual(result.output.splitlines()[1], "3,")
+
+
+if __name__ == "__main__":
+    unittest.main()
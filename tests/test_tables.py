@@ -0,0 +1,81 @@
+"""Precomputed lookup tables of the integer-domain operations."""
+
+import math
+import unittest
+from array import array
+
+from math_cli_api_kit.core import math_operations
+from math_cli_api_kit.core.constants import PI
+from math_cli_api_kit.core.tables import TABLE_OPERATIONS, LookupTable, \
+    LookupTables, lookup_tables
+
+
+class TestLookupTable(unittest.TestCase):
+
+    def test_lookups(self):
+        table = LookupTable(lambda x, y: x * 10 + y, [(-2, 2), (0, 3)])
+        self.assertFalse(table.built)
+        self.assertEqual(table.get(-2, 0), -20)
+        self.assertEqual(table.get(2, 3), 23)
+        self.assertTrue(table.built)
+        for operands in ((3, 0), (0, 4), (0, -1), (1.0, 1), (True, 1)):
+            self.assertIsNone(table.get(*operands), msg=operands)
+
+    def test_values_are_packed(self):
+        self.assertIsInstance(LookupTable(float, [(0, 3)]).build(),
+                              array)
+        self.assertEqual(LookupTable(int, [(0, 3)]).build().typecode, "q")
+        self.assertIsInstance(
+            LookupTable(lambda x: 2 ** (64 * x), [(0, 3)]).build(), list
+        )
+
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            LookupTable(abs, [])
+
+
+class TestLookupTables(unittest.TestCase):
+
+    def test_enable_and_disable(self):
+        tables = LookupTables((), factorial_max=10)
+        self.assertEqual(tables.tables(), {})
+        tables.enable("factorial", "pow")
+        self.assertEqual(set(tables.tables()), {"factorial", "pow"})
+        self.assertEqual(tables.memory_usage()["factorial"], 0)
+        tables.build()
+        self.assertGreater(tables.memory_usage()["factorial"], 0)
+        self.assertEqual(tables.factorial.get(10), math.factorial(10))
+        self.assertIsNone(tables.factorial.get(11))
+        tables.disable("pow")
+        self.assertIsNone(tables.pow)
+        tables.disable()
+        self.assertEqual(tables.tables(), {})
+        with self.assertRaises(ValueError):
+            tables.enable("sum")
+
+
+class TestKernelsWithTables(unittest.TestCase):
+
+    def setUp(self):
+        self.enabled = tuple(lookup_tables.tables())
+        lookup_tables.enable(*TABLE_OPERATIONS)
+
+    def tearDown(self):
+        lookup_tables.disable()
+        lookup_tables.enable(*self.enabled)
+
+    def test_results_are_identical_to_computed_ones(self):
+        for x in (0, 1, 500, 1000, 1001):
+            self.assertEqual(math_operations.factorial_kernel(x),
+                             math.factorial(x))
+        for x, y in ((-32, 3), (2, 64), (7, 0), (33, 2), (2, 0.5)):
+            self.assertEqual(math_operations.pow_kernel(x, y), x ** y)
+        for a in (0, 3, 10_000, 10_001, 2.5):
+            self.assertEqual(math_operations.surface_of_square_kernel(a),
+                             a ** 2)
+            self.assertEqual(math_operations.surface_of_circle_kernel(a),
+                             PI * a ** 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Vectorized counterparts of the Algebra and Geometry classes."""
+
+import array
+import math
+import unittest
+
+from math_cli_api_kit.core.math_operations import Algebra, Geometry
+from math_cli_api_kit.core.vector_operations import VectorAlgebra, \
+    VectorGeometry, as_array, np
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestVectorAlgebra(unittest.TestCase):
+
+    def test_results_match_the_scalar_operations(self):
+        xs, ys = [1.5, -2.0, 3.0, 10.0], [2.0, 4.0, 0.5, 3.0]
+        for name in ("sum", "sub", "mul", "div", "pow"):
+            vector = getattr(VectorAlgebra, name)(xs, ys).tolist()
+            scalar = [getattr(Algebra, name)(x, y) for x, y in zip(xs, ys)]
+            for got, expected in zip(vector, scalar):
+                self.assertAlmostEqual(got, expected, msg=name)
+
+    def test_scalars_are_broadcast(self):
+        self.assertEqual(VectorAlgebra.mul([1, 2, 3], 2).tolist(),
+                         [2, 4, 6])
+
+    def test_buffers_are_not_copied(self):
+        values = np.arange(4, dtype=np.float64)
+        self.assertIs(as_array(values), values)
+        buffer = array.array("d", [1.0, 2.0])
+        self.assertTrue(np.shares_memory(as_array(buffer),
+                                         np.frombuffer(buffer)))
+
+    def test_division_by_zero(self):
+        with self.assertRaises(ZeroDivisionError):
+            VectorAlgebra.div([1, 2], [1, 0])
+
+    def test_invalid_dtypes(self):
+        with self.assertRaises(TypeError):
+            VectorAlgebra.sum(["a"], [1])
+        with self.assertRaises(TypeError):
+            VectorAlgebra.factorial([1.5])
+
+    def test_negative_values(self):
+        with self.assertRaises(ValueError):
+            VectorAlgebra.factorial([3, -1])
+        self.assertEqual(VectorAlgebra.square_root([-4]).tolist(), [2j])
+        self.assertEqual(VectorAlgebra.pow([2], [-1]).tolist(), [0.5])
+
+    def test_factorials_are_exact(self):
+        self.assertEqual(VectorAlgebra.factorial([0, 5, 30]).tolist(),
+                         [1, 120, math.factorial(30)])
+
+    def test_exp(self):
+        self.assertAlmostEqual(VectorAlgebra.exp([1.0]).tolist()[0], math.e)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestVectorGeometry(unittest.TestCase):
+
+    def test_results_match_the_scalar_operations(self):
+        a, b, h = [1.0, 2.5], [3.0, 4.0], [2.0, 0.5]
+        cases = {
+            "surface_of_square": (a,),
+            "surface_of_circle": (a,),
+            "surface_of_triangle": (b, h),
+            "surface_of_trapezoid": (a, b, h),
+            "hypotenuse": (a, b),
+        }
+        for name, operands in cases.items():
+            vector = getattr(VectorGeometry, name)(*operands).tolist()
+            scalar = [getattr(Geometry, name)(*row)
+                      for row in zip(*operands)]
+            for got, expected in zip(vector, scalar):
+                self.assertAlmostEqual(got, expected, msg=name)
+
+
+if __name__ == "__main__":
+    unittest.main()